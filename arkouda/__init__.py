@@ -14,3 +14,7 @@ from arkouda.categorical import *
 from arkouda.logger import *
 from arkouda.timeclass import *
 from arkouda.infoclass import *
+from arkouda.asyncclient import *
+from arkouda.profiler import *
+from arkouda.cache import *
+from arkouda.typecheck import *
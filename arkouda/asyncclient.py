@@ -0,0 +1,278 @@
+import asyncio, itertools, json, os
+from typing import cast, Dict, Optional, Tuple, Union
+import numpy as np # type: ignore
+import zmq # type: ignore
+import zmq.asyncio # type: ignore
+from arkouda import security
+from arkouda import client
+from arkouda.logger import getArkoudaLogger
+from arkouda.message import RequestMessage, MessageFormat
+from arkouda.pdarrayclass import pdarray, _bytes_to_ndarray
+
+__all__ = ["AsyncClient"]
+
+logger = getArkoudaLogger(name='Arkouda Async Client')
+
+class AsyncClient:
+    """
+    A connection to an arkouda server on which many requests may be in flight
+    at once, for use from asyncio code. Each request is tagged with an ID that
+    the server echoes back with its reply, so replies are matched to requests
+    regardless of which coroutine is awaiting them.
+
+    Attributes
+    ----------
+    pspStr : str
+        The "protocol://server:port" address of the arkouda server
+    connected : bool
+        Whether the connect message has been acknowledged by the server
+
+    Notes
+    -----
+    The server executes requests in the order they arrive, so an AsyncClient
+    overlaps the time spent sending, transferring and awaiting requests,
+    not the server-side work itself. pdarrays created through an AsyncClient
+    live in the same symbol table as those of the module-level connection
+    established with ak.connect, which must also be open for them to be
+    deleted when they are garbage-collected.
+
+    Examples
+    --------
+    >>> async def fetch(a, b):
+    ...     async with ak.AsyncClient('localhost', 5555) as ac:
+    ...         return await asyncio.gather(ac.to_ndarray(a), ac.to_ndarray(b))
+    >>> asyncio.run(fetch(ak.arange(0, 3, 1), ak.ones(2)))
+    [array([0, 1, 2]), array([1., 1.])]
+    """
+
+    def __init__(self, server : str="localhost", port : int=5555,
+                 access_token : str=None, connect_url : str=None) -> None:
+        """
+        Creates the DEALER socket used to talk to the arkouda server. The
+        connect message is sent by connect() or on entering an async with
+        block.
+
+        Parameters
+        ----------
+        server : str, optional
+            The hostname of the server (must be visible to the current
+            machine). Defaults to `localhost`.
+        port : int, optional
+            The port of the server. Defaults to 5555.
+        access_token : str, optional
+            The token used to connect to an existing socket to enable access to
+            an Arkouda server where authentication is enabled. Defaults to None.
+        connect_url : str, optional
+            The complete url in the format of tcp://server:port?token=<token_value>
+            where the token is optional
+
+        Raises
+        ------
+        ConnectionError
+            Raised if there's an error in connecting to the Arkouda server
+        ValueError
+            Raised if there's an error in parsing the connect_url parameter
+        """
+        if connect_url:
+            url_values = client._parse_url(connect_url)
+            server = url_values[0]
+            port = url_values[1]
+            if len(url_values) == 3:
+                access_token = url_values[2]
+
+        self.pspStr = "tcp://{}:{}".format(server,port)
+        tunnel_server = os.getenv('ARKOUDA_TUNNEL_SERVER')
+        if tunnel_server:
+            (self.pspStr, _) = client._start_tunnel(addr=self.pspStr,
+                                                    tunnel_server=tunnel_server)
+        logger.debug("psp = {}".format(self.pspStr))
+
+        self.username = security.get_username()
+        self.token = cast(str, client._set_access_token(access_token=access_token,
+                                                        connect_string=self.pspStr))
+        self.context = zmq.asyncio.Context.instance()
+        self.socket = self.context.socket(zmq.DEALER)
+        try:
+            self.socket.connect(self.pspStr)
+        except Exception as e:
+            raise ConnectionError(e)
+        self.connected = False
+        self._ids = itertools.count()
+        self._pending : Dict[bytes, Tuple[asyncio.Future, bool]] = {}
+        self._receiver : Optional[asyncio.Task] = None
+        # set once receiving fails, after which every request fails with it
+        self._error : Optional[Exception] = None
+
+    async def __aenter__(self) -> 'AsyncClient':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def connect(self) -> str:
+        """
+        Sends the connect message to the arkouda server.
+
+        Returns
+        -------
+        str
+            The server's confirmation message
+
+        Raises
+        ------
+        RuntimeError
+            Raised if there is a server-side error
+        """
+        return_message = cast(str, await self._request(cmd="connect"))
+        self.connected = True
+        return return_message
+
+    async def close(self) -> None:
+        """
+        Closes the connection to the arkouda server. Requests still awaiting
+        a reply are cancelled.
+
+        Returns
+        -------
+        None
+        """
+        if self._receiver is not None:
+            self._receiver.cancel()
+            self._receiver = None
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self.socket.close(linger=0)
+        self.connected = False
+
+    async def generic_msg(self, cmd : str, args : str=None, recv_bytes : bool=False,
+                          payload : Union[bytes,memoryview]=None) -> Union[str, memoryview]:
+        """
+        Sends a message composed of a command and corresponding arguments to
+        the arkouda server and awaits the reply, without blocking other
+        requests of this client.
+
+        Parameters
+        ----------
+        cmd : str
+            The server-side command to be executed
+        args : str
+            A space-delimited list of command arguments
+        recv_bytes : bool
+            Indicates if the return message will be binary, default to False
+        payload : Union[bytes,memoryview]
+            Raw binary data sent along with the string args, defaults to None
+
+        Returns
+        -------
+        Union[str, memoryview]
+            The string or binary return message
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the client is not connected to the server or if
+            there is a server-side error thrown
+        ConnectionError
+            Raised if receiving replies from the server has failed
+        """
+        if not self.connected:
+            raise RuntimeError("client is not connected to a server")
+        return await self._request(cmd=cmd, args=args, recv_bytes=recv_bytes,
+                                   payload=payload)
+
+    async def to_ndarray(self, pda : pdarray) -> np.ndarray:
+        """
+        Transfer a pdarray to a np.ndarray, subject to the same
+        client.maxTransferBytes limit as pdarray.to_ndarray.
+
+        Parameters
+        ----------
+        pda : pdarray
+            The array to transfer
+
+        Returns
+        -------
+        np.ndarray
+            A numpy ndarray with the same attributes and data as the pdarray
+
+        Raises
+        ------
+        RuntimeError
+            Raised if there is a server-side error thrown or if the pdarray
+            size exceeds client.maxTransferBytes
+        """
+        if pda.size * pda.dtype.itemsize > client.maxTransferBytes:
+            raise RuntimeError(('Array exceeds allowed size for transfer. Increase ' +
+                               'client.maxTransferBytes to allow'))
+        rep_msg = await self.generic_msg(cmd="tondarray", args=pda.name, recv_bytes=True)
+        return _bytes_to_ndarray(rep_msg, pda.dtype, pda.size)
+
+    async def _request(self, cmd : str, args : str=None, recv_bytes : bool=False,
+                       payload : Union[bytes,memoryview]=None) -> Union[str, memoryview]:
+        """
+        Sends a request tagged with a new request ID and awaits the reply
+        carrying the same ID.
+        """
+        if self._error is not None:
+            raise self._error
+        req_id = str(next(self._ids)).encode()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = (future, recv_bytes)
+        if self._receiver is None:
+            self._receiver = asyncio.ensure_future(self._receive())
+
+        if payload is None:
+            message = RequestMessage(user=self.username, token=self.token, cmd=cmd,
+                                     format=MessageFormat.STRING, args=cast(str,args))
+            frames = [json.dumps(message.asdict()).encode()]
+        else:
+            message = RequestMessage(user=self.username, token=self.token, cmd=cmd,
+                                     format=MessageFormat.BINARY, args=cast(str,args))
+            # the payload follows the header in a frame of its own, uncopied
+            frames = ['{}BINARY_PAYLOAD'.format(json.dumps(message.asdict())).encode(),
+                      payload]
+        logger.debug('sending message {} with request id {}'.format(message, req_id))
+        # The empty frame delimits the request ID, which the server's REP
+        # socket returns as the envelope of the reply
+        await self.socket.send_multipart([req_id, b''] + frames, copy=False)
+        try:
+            return await future
+        finally:
+            self._pending.pop(req_id, None)
+
+    async def _receive(self) -> None:
+        """
+        Receives replies for as long as the client is open and hands each to
+        the request awaiting it. If receiving fails, the error is raised in
+        every pending request and in any request made afterwards.
+        """
+        while True:
+            try:
+                frames = await self.socket.recv_multipart(copy=False)
+            except Exception as e:
+                logger.error('receiving replies failed: {}'.format(e))
+                error = ConnectionError('receiving replies from {} failed: {}'.\
+                                        format(self.pspStr, e))
+                error.__cause__ = e
+                self._error = error
+                for future, _ in self._pending.values():
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            req_id = frames[0].bytes
+            body = frames[-1]
+            if req_id not in self._pending:
+                logger.debug('discarding reply to cancelled request {}'.format(req_id))
+                continue
+            future, recv_bytes = self._pending[req_id]
+            if future.done():
+                continue
+            try:
+                if recv_bytes:
+                    future.set_result(client._check_binary_reply(body.buffer))
+                else:
+                    future.set_result(client._parse_reply_message(body.bytes.decode()))
+            except Exception as e:
+                future.set_exception(e)
@@ -0,0 +1,351 @@
+from collections import OrderedDict
+import weakref
+from typing import cast, Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, \
+     TypeVar, Union
+
+__all__ = ["enable_reduction_cache", "disable_reduction_cache",
+           "clear_reduction_cache", "reduction_cache_info", "enable_groupby_cache",
+           "disable_groupby_cache", "clear_groupby_cache", "groupby_cache_info"]
+
+T = TypeVar('T')
+
+# whether reduction results are cached
+reductionCacheEnabled = False
+# number of reductions answered from and missing from the cache
+reductionCacheHits = 0
+reductionCacheMisses = 0
+# whether groupings are cached, and up to how many bytes of server memory
+# for each server
+groupbyCacheEnabled = False
+groupbyCacheMaxBytes = 0
+# number of groupings found in and missing from the cache, and evicted
+groupbyCacheHits = 0
+groupbyCacheMisses = 0
+groupbyCacheEvictions = 0
+
+# the caches of all clients, which the functions below act on together
+_caches : 'weakref.WeakSet[ArrayCache]' = weakref.WeakSet()
+
+class ArrayCache:
+    """
+    The versions of the arrays of one server and the reduction results and
+    groupings cached for them. Each client holds its own, since two servers
+    hand out the same array names, and resets it when it connects, since
+    names are only unique within one server session.
+    """
+
+    def __init__(self) -> None:
+        # number of times each server-side array was modified in place, by name
+        self.versions : Dict[str, int] = {}
+        # version of each array and the reduction results computed at that version
+        self.results : Dict[str, Tuple[int, Dict[str, object]]] = {}
+        # cached groupings, least recently used first, each holding the names and
+        # versions of the arrays it is made of, the grouping and its size in bytes
+        self.groupings : 'OrderedDict[Hashable, Tuple[List[Tuple[str, int]], Any, int]]' = \
+                                                                           OrderedDict()
+        # keys of the cached groupings computed from or made of each array, by name
+        self.groupingKeys : Dict[str, Set[Hashable]] = {}
+        self.groupingBytes = 0
+        _caches.add(self)
+
+    def version(self, name : str) -> int:
+        """
+        Returns the number of times the array of the given name was modified
+        in place, which identifies its contents along with the name.
+        """
+        return self.versions.get(name, 0)
+
+    def modified(self, name : str) -> None:
+        """
+        Records that the array of the given name is modified in place, which
+        invalidates its cached results.
+        """
+        self.versions[name] = self.versions.get(name, 0) + 1
+        self.results.pop(name, None)
+        self._drop_groupings(name)
+
+    def forget(self, name : str) -> None:
+        """
+        Drops the cached results of an array whose pdarray was deleted, along
+        with the groupings computed from it, which can no longer be looked up.
+        Its version is kept, since another pdarray may refer to the same array.
+        """
+        self.results.pop(name, None)
+        self._drop_groupings(name)
+
+    def reset(self) -> None:
+        """
+        Drops all versions and cached results, since the names of arrays are
+        only unique within one server session.
+        """
+        self.versions.clear()
+        self.results.clear()
+        self.clear_groupings()
+
+    def cached_reduction(self, name : str, key : str, compute : Callable[[], T]) -> T:
+        """
+        Returns the result of the reduction identified by key over the array of
+        the given name, calling compute unless it was cached since the array
+        was last modified.
+        """
+        global reductionCacheHits, reductionCacheMisses
+        if not reductionCacheEnabled:
+            return compute()
+        current = self.version(name)
+        entry = self.results.get(name)
+        if entry is not None and entry[0] == current and key in entry[1]:
+            reductionCacheHits += 1
+            return cast(T, entry[1][key])
+        reductionCacheMisses += 1
+        result = compute()
+        if entry is None or entry[0] != current:
+            entry = self.results[name] = (current, {})
+        entry[1][key] = result
+        return result
+
+    def cached_grouping(self, key : Hashable) -> Any:
+        """
+        Returns the grouping cached under key, None if there is none or if one
+        of the arrays it is made of was modified since it was cached.
+        """
+        global groupbyCacheHits, groupbyCacheMisses
+        entry = self.groupings.get(key)
+        if entry is not None and all(self.version(name) == v for name, v in entry[0]):
+            self.groupings.move_to_end(key)
+            groupbyCacheHits += 1
+            return entry[1]
+        if entry is not None:
+            self.evict(key)
+        groupbyCacheMisses += 1
+        return None
+
+    def cache_grouping(self, key : Hashable, names : List[str], grouping : Any,
+                       nbytes : int) -> None:
+        """
+        Caches a grouping of nbytes bytes of server memory under key, evicting
+        the least recently used groupings to stay within groupbyCacheMaxBytes.
+        The grouping is dropped once any of the arrays of the given names, which
+        include those the grouping is made of and was computed from, is
+        modified or deleted.
+        """
+        if not groupbyCacheEnabled or nbytes > groupbyCacheMaxBytes:
+            return
+        if key in self.groupings:
+            self.evict(key)
+        self.shrink(groupbyCacheMaxBytes - nbytes)
+        self.groupings[key] = ([(name, self.version(name)) for name in names],
+                               grouping, nbytes)
+        self.groupingBytes += nbytes
+        for name in names:
+            self.groupingKeys.setdefault(name, set()).add(key)
+
+    def shrink(self, max_bytes : int) -> None:
+        """
+        Evicts the least recently used groupings until those left hold at
+        most max_bytes of server memory.
+        """
+        while self.groupings and self.groupingBytes > max_bytes:
+            self.evict(next(iter(self.groupings)))
+
+    def evict(self, key : Hashable) -> None:
+        """
+        Drops a cached grouping, whose arrays are deleted from the server once
+        no other object refers to them.
+        """
+        global groupbyCacheEvictions
+        names, _, nbytes = self.groupings.pop(key)
+        self.groupingBytes -= nbytes
+        groupbyCacheEvictions += 1
+        for name, _ in names:
+            keys = self.groupingKeys.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.groupingKeys[name]
+
+    def clear_groupings(self) -> None:
+        self.groupings.clear()
+        self.groupingKeys.clear()
+        self.groupingBytes = 0
+
+    def _drop_groupings(self, name : str) -> None:
+        for key in list(self.groupingKeys.get(name, ())):
+            self.evict(key)
+
+def enable_reduction_cache() -> None:
+    """
+    Caches the results of the scalar reductions of pdarrays, such as sum,
+    min, max and is_sorted, so that repeating a reduction on an array that
+    was not modified in the meantime costs no server request. The cache is
+    disabled by default.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    An array is known to be modified when it is through the pdarray methods
+    of the client that cached its results, i.e. __setitem__, fill and the
+    op= operators. Modifications made through other clients, including
+    other ak.client.Client objects of the same process attached to the
+    array, or through generic_msg, are not seen, and reductions then return
+    stale results. Only enable the cache when a single client modifies the
+    arrays through their pdarray methods, or clear it when other
+    modifications occur.
+    """
+    global reductionCacheEnabled
+    reductionCacheEnabled = True
+
+def disable_reduction_cache() -> None:
+    """
+    Stops caching the results of scalar reductions and drops those cached.
+    This is the default.
+
+    Returns
+    -------
+    None
+    """
+    global reductionCacheEnabled
+    reductionCacheEnabled = False
+    for c in _caches:
+        c.results.clear()
+
+def clear_reduction_cache() -> None:
+    """
+    Drops the cached results of scalar reductions and resets the hit and
+    miss counts.
+
+    Returns
+    -------
+    None
+    """
+    global reductionCacheHits, reductionCacheMisses
+    for c in _caches:
+        c.results.clear()
+    reductionCacheHits = 0
+    reductionCacheMisses = 0
+
+def reduction_cache_info() -> Dict[str, Union[bool, int, float]]:
+    """
+    Reports how effective the cache of scalar reduction results is.
+
+    Returns
+    -------
+    Dict[str, Union[bool, int, float]]
+        enabled, whether results are cached, hits and misses, the numbers of
+        reductions answered from and missing from the cache since it was
+        last cleared, hit_rate, the fraction of hits, and entries, the
+        number of cached results
+
+    Examples
+    --------
+    >>> ak.enable_reduction_cache()
+    >>> a = ak.arange(0, 10, 1)
+    >>> a.sum(), a.sum()
+    (45, 45)
+    >>> ak.reduction_cache_info()
+    {'enabled': True, 'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1}
+    """
+    lookups = reductionCacheHits + reductionCacheMisses
+    return {'enabled' : reductionCacheEnabled, 'hits' : reductionCacheHits,
+            'misses' : reductionCacheMisses,
+            'hit_rate' : reductionCacheHits / lookups if lookups else 0.0,
+            'entries' : sum(len(results) for c in _caches
+                            for _, results in c.results.values())}
+
+def enable_groupby_cache(max_bytes : Optional[int]=None) -> None:
+    """
+    Caches the permutation, segments and unique keys computed by
+    ak.GroupBy, so that grouping the same unmodified key arrays again costs
+    no server request. Least recently used groupings are evicted once the
+    cached arrays of a server exceed max_bytes of its memory.
+
+    Parameters
+    ----------
+    max_bytes : Optional[int]
+        The maximum number of bytes of the memory of each server held by
+        cached groupings, defaults to None, meaning one tenth of the memory of the
+        server, which requires a connection
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        Raised if max_bytes is negative
+    RuntimeError
+        Raised if max_bytes is None and the server config cannot be retrieved
+
+    Notes
+    -----
+    Key arrays are identified by name and by the number of times they were
+    modified through their pdarray methods, as for the reduction cache, so
+    modifications made by other clients are not seen. Each client caches
+    the groupings of the arrays it created separately. The arrays of an
+    evicted grouping are deleted from the server once no GroupBy refers to
+    them anymore.
+    """
+    global groupbyCacheEnabled, groupbyCacheMaxBytes
+    if max_bytes is None:
+        from arkouda.client import get_config
+        config = get_config()
+        max_bytes = int(config['physicalMemory']) * int(config['numLocales']) // 10
+    if max_bytes < 0:
+        raise ValueError('max_bytes must be non-negative')
+    groupbyCacheEnabled = True
+    groupbyCacheMaxBytes = max_bytes
+    for c in _caches:
+        c.shrink(max_bytes)
+
+def disable_groupby_cache() -> None:
+    """
+    Stops caching groupings and drops those cached. This is the default.
+
+    Returns
+    -------
+    None
+    """
+    global groupbyCacheEnabled
+    groupbyCacheEnabled = False
+    for c in _caches:
+        c.clear_groupings()
+
+def clear_groupby_cache() -> None:
+    """
+    Drops the cached groupings and resets the hit, miss and eviction counts.
+
+    Returns
+    -------
+    None
+    """
+    global groupbyCacheHits, groupbyCacheMisses, groupbyCacheEvictions
+    for c in _caches:
+        c.clear_groupings()
+    groupbyCacheHits = 0
+    groupbyCacheMisses = 0
+    groupbyCacheEvictions = 0
+
+def groupby_cache_info() -> Dict[str, Union[bool, int, float]]:
+    """
+    Reports how effective the cache of groupings is.
+
+    Returns
+    -------
+    Dict[str, Union[bool, int, float]]
+        enabled, whether groupings are cached, hits and misses, the numbers
+        of groupings found in and missing from the cache since it was last
+        cleared, hit_rate, the fraction of hits, evictions, the number of
+        groupings dropped, entries, the number of cached groupings, and
+        bytes and max_bytes, the server memory they hold and may hold
+    """
+    lookups = groupbyCacheHits + groupbyCacheMisses
+    return {'enabled' : groupbyCacheEnabled, 'hits' : groupbyCacheHits,
+            'misses' : groupbyCacheMisses,
+            'hit_rate' : groupbyCacheHits / lookups if lookups else 0.0,
+            'evictions' : groupbyCacheEvictions,
+            'entries' : sum(len(c.groupings) for c in _caches),
+            'bytes' : sum(c.groupingBytes for c in _caches),
+            'max_bytes' : groupbyCacheMaxBytes}
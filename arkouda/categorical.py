@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import cast, List, Optional, Sequence, Union, Dict
 import numpy as np # type: ignore
 import itertools
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 from arkouda.strings import Strings
 from arkouda.pdarrayclass import pdarray, RegistrationError, unregister_pdarray_by_name
 from arkouda.groupbyclass import GroupBy, broadcast
@@ -13,6 +13,7 @@ from arkouda.dtypes import int64 as akint64
 from arkouda.sorting import argsort
 from arkouda.logger import getArkoudaLogger
 from arkouda.infoclass import information, list_registry
+from arkouda.pdarrayIO import get_datasets, _saved_globstr, _read_saved
 
 __all__ = ['Categorical']
 
@@ -562,6 +563,93 @@ class Categorical:
             newvals = wherediditgo[oldvals]
             return Categorical.from_codes(newvals, newidx)
 
+    @typechecked
+    def save(self, prefix_path : str, dataset : str='categorical_array',
+             mode : str='truncate') -> str:
+        """
+        Save the Categorical to HDF5, including its permutation and segments
+        if it has them, so that it can be loaded and grouped again without
+        sorting it. The result is a collection of HDF5 files, one file per
+        locale of the arkouda server, where each filename starts with
+        prefix_path.
+
+        Parameters
+        ----------
+        prefix_path : str
+            Directory and filename prefix that all output files share
+        dataset : str
+            The root name of the datasets of the components, which are saved
+            as ``<dataset>.codes``, ``<dataset>.categories``,
+            ``<dataset>.permutation`` and ``<dataset>.segments``, defaults
+            to categorical_array
+        mode : str {'truncate' | 'append'}
+            By default, truncate (overwrite) output files, if they exist.
+            If 'append', add the datasets to existing files.
+
+        Returns
+        -------
+        str
+            The message of the server for the last component saved
+
+        Raises
+        ------
+        ValueError
+            Raised if mode is neither 'truncate' nor 'append'
+        RuntimeError
+            Raised if a server-side error is thrown saving the components
+
+        See Also
+        --------
+        load, pdarray.save, Strings.save
+        """
+        if mode.lower() not in ('truncate', 'append'):
+            raise ValueError("Allowed modes are 'truncate' and 'append'")
+        msg = ''
+        for i, (n, p) in enumerate(sorted(self._get_components_dict().items())):
+            msg = p.save(prefix_path, dataset=f"{dataset}.{n}",
+                         mode=mode if i == 0 else 'append')
+        return msg
+
+    @staticmethod
+    @typechecked
+    def load(prefix_path : str, dataset : str='categorical_array') -> Categorical:
+        """
+        Load a Categorical saved with ``Categorical.save``, with its
+        permutation and segments if they were saved, in which case the
+        Categorical is grouped without sorting it again.
+
+        Parameters
+        ----------
+        prefix_path : str
+            Filename prefix used to save the Categorical
+        dataset : str
+            The root name of the datasets the Categorical was saved as,
+            defaults to categorical_array
+
+        Returns
+        -------
+        Categorical
+            The Categorical that was saved
+
+        Raises
+        ------
+        ValueError
+            Raised if the codes or categories of dataset are not in the files
+
+        See Also
+        --------
+        save, GroupBy.load
+        """
+        available = set(get_datasets(_saved_globstr(prefix_path)))
+        names = {n : f"{dataset}.{n}" for n in sorted(Categorical.RegisterablePieces)
+                 if f"{dataset}.{n}" in available}
+        missing = Categorical.RequiredPieces - set(names.keys())
+        if len(missing) > 0:
+            raise ValueError("Categorical {} is missing {} in the files of {}".\
+                             format(dataset, sorted(missing), prefix_path))
+        data = _read_saved(prefix_path, list(names.values()))
+        return Categorical(None, **{n : data[d] for n, d in names.items()})
+
     @typechecked()
     def register(self, user_defined_name: str) -> Categorical:
         """
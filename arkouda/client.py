@@ -1,15 +1,18 @@
-import json, os
-from typing import cast, Mapping, Optional, Tuple, Union
-import warnings, pkg_resources
+import atexit, json, os, queue, re, tempfile, threading, time, weakref
+from contextlib import contextmanager
+from typing import cast, Callable, ContextManager, Dict, Iterator, List, Mapping, Optional, \
+     Tuple, Union
+import warnings
 import zmq # type: ignore
 import pyfiglet # type: ignore
-from arkouda import security, io_util
+from arkouda import security, io_util, profiler, cache
 from arkouda.logger import getArkoudaLogger
 from arkouda.message import RequestMessage, MessageFormat, ReplyMessage, \
      MessageType
 
 __all__ = [ "connect", "disconnect", "shutdown", "get_config", "get_mem_used", 
-           "__version__", "ruok"]
+           "get_server_metrics", "__version__", "ruok", "batch", "Client", 
+           "ClientPool"]
 
 # Try to read the version from the file located at ../VERSION
 VERSIONFILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
@@ -21,16 +24,12 @@ else:
     # Fall back to the version defined at build time in setup.py
     # pkg_resources is a subpackage of setuptools
     # __package__ is the name of the current package, i.e. "arkouda"
+    # It is imported here since it is slow to import and otherwise unused
+    import pkg_resources
     __version__ = pkg_resources.require(__package__)[0].version
 
-# stuff for zmq connection
-pspStr = ''
+# zmq context shared by the sockets of all clients
 context = zmq.Context()
-socket = context.socket(zmq.REQ)
-connected = False
-# username and token for when basic authentication is enabled
-username = ''
-token = ''
 # verbose flag for arkouda module
 verboseDefVal = False
 verbose = verboseDefVal
@@ -39,6 +38,53 @@ pdarrayIterThreshDefVal = 100
 pdarrayIterThresh  = pdarrayIterThreshDefVal
 maxTransferBytesDefVal = 2**30
 maxTransferBytes = maxTransferBytesDefVal
+# deletes of pdarrays garbage-collected by Python are queued and sent along
+# with the next request, or on their own once either threshold is reached
+deleteQueueMaxCountDefVal = 1000
+deleteQueueMaxCount = deleteQueueMaxCountDefVal
+deleteQueueMaxBytesDefVal = 2**30
+deleteQueueMaxBytes = deleteQueueMaxBytesDefVal
+# use the compact message framing with servers that support it
+compactMessagesDefVal = True
+compactMessages = compactMessagesDefVal
+# array transfers smaller than this many bytes are sent uncompressed even if
+# the client was connected with a compression codec
+compressionThresholdDefVal = 2**16
+compressionThreshold = compressionThresholdDefVal
+# array transfers smaller than this many bytes go through the socket even if
+# the client exchanges arrays with the server through shared memory
+sharedMemoryThresholdDefVal = 2**20
+sharedMemoryThreshold = sharedMemoryThresholdDefVal
+
+# commands that batch() may queue because their reply is either ignored or
+# a single created pdarray, which is represented by a placeholder until flushed
+BATCHABLE_COMMANDS = frozenset(["binopvv", "binopvs", "binopsv", "opeqvv", "opeqvs",
+                                "efunc", "efunc3vv", "efunc3vs", "efunc3sv", "efunc3ss",
+                                "[slice]", "[pdarray]", "[int]=val", "[pdarray]=val",
+                                "[pdarray]=pdarray", "[slice]=val", "[slice]=pdarray",
+                                "set", "delete", "create", "arange", "linspace", "randint",
+                                "randomNormal", "histogram", "broadcast", "deleteMany"])
+# commands that cannot be executed as part of a batch message
+UNBATCHED_COMMANDS = frozenset(["connect", "disconnect", "shutdown", "noop", "ruok", 
+                                "batch", "array", "tondarray", "tondarrayslice",
+                                "arrayshm", "tondarrayshm", "shmprobe"])
+# commands that are not preceded by the queued deletes
+DELETELESS_COMMANDS = frozenset(["connect", "disconnect", "shutdown", "deleteMany"])
+batchPlaceholderPattern = re.compile(r'__batch_\d+__')
+# first byte of a message in the compact framing, which no JSON message starts 
+# with, followed in requests by the user, token, cmd and args separated by 
+# COMPACT_SEPARATOR and in replies by the message type code and the message
+COMPACT_MARKER = b'\x01'
+COMPACT_SEPARATOR = '\x1f'
+# codecs with which array transfers may be compressed
+COMPRESSION_CODECS = frozenset(["zlib"])
+
+# connection, batch and delete queue state kept by each Client; reading one of
+# these from the module returns the state of the calling thread's client
+CLIENT_ATTRIBUTES = frozenset(["socket", "pspStr", "connected", "username", "token",
+                               "deleteQueue", "deleteQueueBytes", "batchDepth",
+                               "batchQueue", "batchFirst", "batchNext",
+                               "batchPlaceholders", "batchResolved", "arrayCache"])
 
 logger = getArkoudaLogger(name='Arkouda Client') 
 clientLogger = getArkoudaLogger(name='Arkouda User Logger', logFormat='%(message)s')   
@@ -50,21 +96,31 @@ print('Client Version: {}'.format(__version__))
 # reset settings to default values
 def set_defaults() -> None:
     """
-    Sets client variables including verbose, maxTransferBytes and 
-    pdarrayIterThresh to default values.
+    Sets client variables including verbose, maxTransferBytes, 
+    pdarrayIterThresh, deleteQueueMaxCount, deleteQueueMaxBytes, 
+    compactMessages, compressionThreshold and sharedMemoryThreshold to 
+    default values.
     
     Returns
     -------
     None
     """
-    global verbose, maxTransferBytes, pdarrayIterThresh
+    global verbose, maxTransferBytes, pdarrayIterThresh, deleteQueueMaxCount, \
+           deleteQueueMaxBytes, compactMessages, compressionThreshold, \
+           sharedMemoryThreshold
     verbose = verboseDefVal
     pdarrayIterThresh  = pdarrayIterThreshDefVal
     maxTransferBytes = maxTransferBytesDefVal
+    deleteQueueMaxCount = deleteQueueMaxCountDefVal
+    deleteQueueMaxBytes = deleteQueueMaxBytesDefVal
+    compactMessages = compactMessagesDefVal
+    compressionThreshold = compressionThresholdDefVal
+    sharedMemoryThreshold = sharedMemoryThresholdDefVal
 
 # create context, request end of socket, and connect to it
 def connect(server : str="localhost", port : int=5555, timeout : int=0, 
-                           access_token : str=None, connect_url=None) -> None:
+                           access_token : str=None, connect_url=None,
+                           compression : str=None, shared_memory : bool=False) -> None:
     """
     Connect to a running arkouda server.
 
@@ -84,6 +140,16 @@ def connect(server : str="localhost", port : int=5555, timeout : int=0,
     connect_url : str, optional
         The complete url in the format of tcp://server:port?token=<token_value>
         where the token is optional
+    compression : str, optional
+        The codec, 'zlib', with which the bytes of arrays transferred by 
+        ak.array and pdarray.to_ndarray are compressed, which pays off on 
+        slow links such as tunnelled connections. Defaults to None, in 
+        which case arrays are sent uncompressed.
+    shared_memory : bool, optional
+        Whether to exchange the arrays transferred by ak.array and 
+        pdarray.to_ndarray through files in the server's shared memory 
+        directory, normally /dev/shm, rather than through the socket, if the
+        server runs on the same host. Defaults to False.
 
     Returns
     -------
@@ -94,7 +160,8 @@ def connect(server : str="localhost", port : int=5555, timeout : int=0,
     ConnectionError 
         Raised if there's an error in connecting to the Arkouda server
     ValueError
-        Raised if there's an error in parsing the connect_url parameter
+        Raised if there's an error in parsing the connect_url parameter or
+        if compression is not a supported codec
     RuntimeError
         Raised if there is a server-side error
 
@@ -102,64 +169,28 @@ def connect(server : str="localhost", port : int=5555, timeout : int=0,
     -----
     On success, prints the connected address, as seen by the server. If called
     with an existing connection, the socket will be re-initialized.
-    """
-    global context, socket, pspStr, connected, verbose, username, token
-
-    logger.debug("ZMQ version: {}".format(zmq.zmq_version()))
-
-    if connect_url:
-        url_values = _parse_url(connect_url)
-        server = url_values[0]
-        port = url_values[1]
-        if len(url_values) == 3:
-            access_token=url_values[2]
-    
-    # "protocol://server:port"
-    pspStr = "tcp://{}:{}".format(server,port)
-    
-    # check to see if tunnelled connection is desired. If so, start tunnel
-    tunnel_server = os.getenv('ARKOUDA_TUNNEL_SERVER')
-    if tunnel_server:
-        (pspStr, _) = _start_tunnel(addr=pspStr, tunnel_server=tunnel_server)
-    
-    logger.debug("psp = {}".format(pspStr))
-
-    # create and configure socket for connections to arkouda server
-    socket = context.socket(zmq.REQ) # request end of the zmq connection
-
-    # if timeout is specified, set send and receive timeout params
-    if timeout > 0:
-        socket.setsockopt(zmq.SNDTIMEO, timeout*1000)
-        socket.setsockopt(zmq.RCVTIMEO, timeout*1000)
-    
-    # set token and username global variables
-    username = security.get_username()
-    token = cast(str, _set_access_token(access_token=access_token, 
-                                        connect_string=pspStr))
 
-    # connect to arkouda server
-    try:
-        socket.connect(pspStr)
-    except Exception as e:
-        raise ConnectionError(e)
-
-    # send the connect message
-    cmd = "connect"
-    logger.debug("[Python] Sending request: {}".format(cmd))
-
-    # send connect request to server and get the response confirming if
-    # the connect request succeeded and, if not not, the error message
-    return_message = _send_string_message(cmd=cmd)
-    logger.debug("[Python] Received response: {}".format(str(return_message)))
-    connected = True
-
-    conf = get_config()
-    if conf['arkoudaVersion'] != __version__:
-        warnings.warn(('Version mismatch between client ({}) and server ({}); ' +
-                      'this may cause some commands to fail or behave ' +
-                      'incorrectly! Updating arkouda is strongly recommended.').\
-                      format(__version__, conf['arkoudaVersion']), RuntimeWarning)
-    clientLogger.info(return_message)
+    Arrays smaller than client.compressionThreshold bytes are sent 
+    uncompressed. Before compressing, the bytes of the array elements are
+    shuffled so that the bytes of equal significance are contiguous, with 
+    which sorted IDs and low-cardinality codes typically compress 5-10x. If
+    the server does not support the requested codec, a warning is issued and
+    arrays are sent uncompressed.
+
+    With shared_memory, arrays of at least client.sharedMemoryThreshold bytes
+    are written by the server to a file that pdarray.to_ndarray maps into
+    memory, and by ak.array to a file that the server reads, each deleting 
+    the file once done with it. Whether the server is on the same host is
+    checked at connect; if not, a warning is issued and arrays go through 
+    the socket. Shared memory takes precedence over compression. Each array
+    mapped from shared memory holds an open file descriptor until it is 
+    garbage-collected.
+    """
+    clientLogger.info(defaultClient.connect(server=server, port=port, timeout=timeout,
+                                            access_token=access_token, 
+                                            connect_url=connect_url,
+                                            compression=compression,
+                                            shared_memory=shared_memory))
 
 def _parse_url(url : str) -> Tuple[str,int,Optional[str]]:
     """
@@ -307,136 +338,822 @@ def _start_tunnel(addr : str, tunnel_server : str) -> Tuple[str,object]:
     except Exception as e:
         raise ConnectionError(e)
 
-def _send_string_message(cmd : str, recv_bytes : bool=False, 
-                                   args : str=None) -> Union[str, bytes]:
+def _parse_reply_message(raw_message : str) -> str:
     """
-    Generates a RequestMessage encapsulating command and requesting
-    user information, sends it to the Arkouda server, and returns 
-    either a string or binary depending upon the message format.
+    Deserializes a JSON-formatted ReplyMessage, raising an error or warning
+    if the server sent one, and returns the message string.
 
     Parameters
     ----------
-    cmd : str
-        The name of the command to be executed by the Arkouda server
-    recv_bytes : bool, defaults to False
-        A boolean indicating whether the return message will be in bytes
-        as opposed to a string
-    args : str
-        A delimited string containing 1..n command arguments
+    raw_message : str
+        The JSON-formatted reply
 
     Returns
     -------
-    Union[str,bytes]
-        The response string or byte array sent back from the Arkouda server
-        
+    str
+        The msg field of the reply
+
     Raises
     ------
     RuntimeError
-        Raised if the return message contains the word "Error", indicating 
-        a server-side error was thrown
+        Raised if the reply is an error message
     ValueError
-        Raised if the return message is malformed JSON or is missing 1..n
-        expected fields       
+        Raised if the reply is malformed JSON or is missing 1..n expected fields
     """
-    message = RequestMessage(user=username, token=token, cmd=cmd, 
-                          format=MessageFormat.STRING, args=cast(str,args))
-
-    logger.debug('sending message {}'.format(message))
-
-    socket.send_string(json.dumps(message.asdict()))
-
-    if recv_bytes:
-        return_message = socket.recv()
+    try:
+        return_message = ReplyMessage.fromdict(json.loads(raw_message))
 
         # raise errors or warnings sent back from the server
-        if return_message.startswith(b"Error:"): 
-            raise RuntimeError(return_message.decode())
-        elif return_message.startswith(b"Warning:"): 
-            warnings.warn(return_message.decode())
-        return return_message
-    else:
-        raw_message = socket.recv_string()
-        try:
-            return_message = ReplyMessage.fromdict(json.loads(raw_message))
-
-            # raise errors or warnings sent back from the server
-            if return_message.msgType == MessageType.ERROR:
-                raise RuntimeError(return_message.msg)
-            elif return_message.msgType == MessageType.WARNING:
-                warnings.warn(return_message.msg)
-            return return_message.msg
-        except KeyError as ke:
-            raise ValueError('Return message is missing the {} field'.format(ke))
-        except json.decoder.JSONDecodeError:
-            raise ValueError('Return message is not valid JSON: {}'.\
-                             format(raw_message))
-
-def _send_binary_message(cmd : str, payload : bytes, recv_bytes : bool=False,
-                                            args : str=None) -> Union[str, bytes]:
-    """
-    Generates a RequestMessage encapsulating command and requesting user information,
-    information prepends the binary payload, sends the binary request to the Arkouda 
-    server, and returns either a string or binary depending upon the message format.
+        if return_message.msgType == MessageType.ERROR:
+            raise RuntimeError(return_message.msg)
+        elif return_message.msgType == MessageType.WARNING:
+            warnings.warn(return_message.msg)
+        return return_message.msg
+    except KeyError as ke:
+        raise ValueError('Return message is missing the {} field'.format(ke))
+    except json.decoder.JSONDecodeError:
+        raise ValueError('Return message is not valid JSON: {}'.\
+                         format(raw_message))
+
+def _parse_compact_reply(raw_message : bytes) -> str:
+    """
+    Decodes a reply in the compact framing, raising an error or warning if 
+    the server sent one, and returns the message string.
 
     Parameters
     ----------
-    cmd : str
-        The name of the command to be executed by the Arkouda server    
-    payload : bytes
-        The bytes to be converted to a pdarray, Strings, or Categorical object
-        on the Arkouda server
-    recv_bytes : bool, defaults to False
-        A boolean indicating whether the return message will be in bytes
-        as opposed to a string
-    args : str
-        A delimited string containing 1..n command arguments
+    raw_message : bytes
+        The reply, starting with COMPACT_MARKER and the message type code, 
+        N, W or E
 
     Returns
     -------
-    Union[str,bytes]
-        The response string or byte array sent back from the Arkouda server
+    str
+        The message of the reply
 
     Raises
     ------
     RuntimeError
-        Raised if the return message contains the word "Error", indicating 
-        a server-side error was thrown
+        Raised if the reply is an error message
     ValueError
-        Raised if the return message is malformed JSON or is missing 1..n
-        expected fields
+        Raised if the message type code is unknown
+    """
+    msg_type = raw_message[1:2]
+    msg = raw_message[2:].decode()
+    if msg_type == b'E':
+        raise RuntimeError(msg)
+    elif msg_type == b'W':
+        warnings.warn(msg)
+    elif msg_type != b'N':
+        raise ValueError('Return message has unknown type {!r}'.format(msg_type))
+    return msg
+
+def _check_binary_reply(return_message : memoryview) -> memoryview:
+    """
+    Raises the error or warning carried by a binary reply, if any, and 
+    otherwise returns the reply unchanged.
+    """
+    # raise errors or warnings sent back from the server
+    if return_message[:6] == b"Error:":
+        raise RuntimeError(bytes(return_message).decode())
+    elif return_message[:8] == b"Warning:":
+        warnings.warn(bytes(return_message).decode())
+    return return_message
+
+class PendingReply(str):
+    """
+    The reply returned by generic_msg for a command queued by batch(). Its
+    value is the placeholder name the server will substitute with the name of
+    the array created by the command once the batch is flushed.
+    """
+    pass
+
+class Client:
     """
-    message = RequestMessage(user=username, token=token, cmd=cmd, 
-                                format=MessageFormat.BINARY, args=cast(str,args))
+    A connection to an arkouda server with its own REQ socket, batch queue
+    and delete queue. The module-level functions of arkouda.client, and thus
+    all arkouda functions, send their requests through the client that is
+    current for the calling thread: the one selected with Client.use, if any,
+    and otherwise the default client connected by ak.connect.
 
-    logger.debug('sending message {}'.format(message))
+    Attributes
+    ----------
+    pspStr : str
+        The "protocol://server:port" address of the arkouda server
+    connected : bool
+        Whether the client is connected to the server
+    username : str
+        The username sent with each request
+    token : str
+        The access token sent with each request when authentication is enabled
 
-    socket.send('{}BINARY_PAYLOAD'.\
-                format(json.dumps(message.asdict())).encode() + payload)
+    Notes
+    -----
+    Requests are serialized by a lock, so a Client may be shared by several
+    threads, which then take turns on its socket; a batch() holds the lock
+    until it exits. For threads to talk to the server concurrently, each
+    needs a Client of its own, for example checked out of a ClientPool.
+    Since all clients connected to one server share its symbol table, a
+    pdarray created through one client may be used through any other.
+    """
 
-    if recv_bytes:
-        binary_return_message = cast(bytes, socket.recv())
-        # raise errors or warnings sent back from the server
-        if binary_return_message.startswith(b"Error:"): \
-                                   raise RuntimeError(binary_return_message.decode())
-        elif binary_return_message.startswith(b"Warning:"): \
-                                        warnings.warn(binary_return_message.decode())
-        return binary_return_message
-    else:
-        raw_message = socket.recv_string()
+    def __init__(self) -> None:
+        self.pspStr = ''
+        self.socket = context.socket(zmq.REQ)
+        self.connected = False
+        self.timeout = 0
+        # username and token for when basic authentication is enabled
+        self.username = ''
+        self.token = ''
+        # whether the server accepts the compact message framing
+        self.compact = False
+        # codec with which array transfers are compressed, if any
+        self.compression : Optional[str] = None
+        # directory through which arrays are exchanged with a server on the
+        # same host, if any
+        self.sharedMemoryDir : Optional[str] = None
+        self.lock = threading.RLock()
+        # whether a request is awaiting its reply on the socket
+        self.sending = False
+        self.deleteLock = threading.Lock()
+        self.deleteQueue : List[str] = []
+        self.deleteQueueBytes = 0
+        # versions and cached reduction results and groupings of the arrays
+        # of the server
+        self.arrayCache = cache.ArrayCache()
+        # state of the enclosing batch() context(s), if any
+        self.batchDepth = 0
+        self.batchQueue : List[str] = []
+        self.batchFirst = 0
+        self.batchNext = 0
+        self.batchPlaceholders : Dict[str, Callable[[],
+                                       Optional[Callable[[str], None]]]] = {}
+        self.batchResolved : Dict[str, str] = {}
+        _clients.add(self)
+
+    def connect(self, server : str="localhost", port : int=5555, timeout : int=0,
+                access_token : str=None, connect_url : str=None,
+                compression : str=None, shared_memory : bool=False) -> str:
+        """
+        Connect to a running arkouda server. See arkouda.client.connect for
+        a description of the parameters and errors.
+
+        Returns
+        -------
+        str
+            The connected address, as seen by the server
+        """
+        logger.debug("ZMQ version: {}".format(zmq.zmq_version()))
+
+        if compression is not None and compression not in COMPRESSION_CODECS:
+            raise ValueError('compression must be one of {}'.format(
+                             sorted(COMPRESSION_CODECS)))
+        if connect_url:
+            url_values = _parse_url(connect_url)
+            server = url_values[0]
+            port = url_values[1]
+            if len(url_values) == 3:
+                access_token=url_values[2]
+
+        with self.lock:
+            # "protocol://server:port"
+            self.pspStr = "tcp://{}:{}".format(server,port)
+
+            # check to see if tunnelled connection is desired. If so, start tunnel
+            tunnel_server = os.getenv('ARKOUDA_TUNNEL_SERVER')
+            if tunnel_server:
+                (self.pspStr, _) = _start_tunnel(addr=self.pspStr,
+                                                 tunnel_server=tunnel_server)
+
+            logger.debug("psp = {}".format(self.pspStr))
+
+            # create and configure socket for connections to arkouda server
+            self.socket = context.socket(zmq.REQ) # request end of the zmq connection
+
+            # queued deletes and cached results refer to arrays of the previous
+            # connection, if any
+            self._take_deletes()
+            self.arrayCache.reset()
+
+            # if timeout is specified, set send and receive timeout params
+            self.timeout = timeout
+            if timeout > 0:
+                self.socket.setsockopt(zmq.SNDTIMEO, timeout*1000)
+                self.socket.setsockopt(zmq.RCVTIMEO, timeout*1000)
+
+            # set token and username
+            self.username = security.get_username()
+            self.token = cast(str, _set_access_token(access_token=access_token,
+                                                     connect_string=self.pspStr))
+            # the connect and getconfig messages use JSON, which all servers accept
+            self.compact = False
+            self.compression = None
+            self.sharedMemoryDir = None
+
+            # connect to arkouda server
+            try:
+                self.socket.connect(self.pspStr)
+            except Exception as e:
+                raise ConnectionError(e)
+
+            # send the connect message
+            cmd = "connect"
+            logger.debug("[Python] Sending request: {}".format(cmd))
+
+            # send connect request to server and get the response confirming if
+            # the connect request succeeded and, if not not, the error message
+            return_message = cast(str, self._send_string_message(cmd=cmd))
+            logger.debug("[Python] Received response: {}".format(str(return_message)))
+            self.connected = True
+
+            conf = json.loads(cast(str, self.generic_msg(cmd="getconfig")))
+            if conf['arkoudaVersion'] != __version__:
+                warnings.warn(('Version mismatch between client ({}) and server ({}); ' +
+                              'this may cause some commands to fail or behave ' +
+                              'incorrectly! Updating arkouda is strongly recommended.').\
+                              format(__version__, conf['arkoudaVersion']), RuntimeWarning)
+            self.compact = bool(conf.get('compactMessages', False))
+            if compression in conf.get('compressionCodecs', []):
+                self.compression = compression
+            elif compression is not None:
+                warnings.warn(('Server does not support {} compression; arrays ' +
+                               'will be transferred uncompressed').format(compression),
+                              RuntimeWarning)
+            if shared_memory:
+                self.sharedMemoryDir = self._probe_shared_memory(
+                                                     conf.get('sharedMemoryDir', ''))
+                if self.sharedMemoryDir is None:
+                    warnings.warn(('Server does not share memory with this host; ' +
+                                   'arrays will be transferred through the socket'),
+                                  RuntimeWarning)
+            return return_message
+
+    def _probe_shared_memory(self, directory : str) -> Optional[str]:
+        """
+        Returns directory if the server sees a file that the client creates
+        in it, which shows that they run on the same host, and None otherwise.
+        """
+        if not directory:
+            return None
+        try:
+            fd, path = tempfile.mkstemp(prefix='arkouda_', dir=directory)
+        except OSError as e:
+            logger.debug('cannot create a file in {}: {}'.format(directory, e))
+            return None
+        try:
+            os.close(fd)
+            visible = self.generic_msg(cmd="shmprobe", args=path) == 'true'
+        finally:
+            os.unlink(path)
+        return directory if visible else None
+
+    def disconnect(self) -> str:
+        """
+        Disconnects the client from the Arkouda server, first sending any
+        queued commands and deletes.
+
+        Returns
+        -------
+        str
+            The server's confirmation message
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the client is not connected to the Arkouda server
+        ConnectionError
+            Raised if there's an error disconnecting from the Arkouda server
+        """
+        with self.lock:
+            if not self.connected:
+                raise RuntimeError('not connected, cannot disconnect')
+            self._flush_batch()
+            self._flush_deletes()
+            # send disconnect message to server
+            message = "disconnect"
+            logger.debug("[Python] Sending request: {}".format(message))
+            return_message = cast(str, self._send_string_message(message))
+            logger.debug("[Python] Received response: {}".format(return_message))
+            try:
+                self.socket.disconnect(self.pspStr)
+            except Exception as e:
+                raise ConnectionError(e)
+            self.connected = False
+            return return_message
+
+    def shutdown(self) -> None:
+        """
+        Sends a shutdown message to the Arkouda server. See
+        arkouda.client.shutdown.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the client is not connected to the Arkouda server or
+            there is an error in disconnecting from the server
+        """
+        with self.lock:
+            if not self.connected:
+                raise RuntimeError('not connected, cannot shutdown server')
+            # the server deletes everything on shutdown
+            self._take_deletes()
+            # send shutdown message to server
+            message = "shutdown"
+
+            logger.debug("[Python] Sending request: {}".format(message))
+            return_message = cast(str, self._send_string_message(message))
+            logger.debug("[Python] Received response: {}".format(return_message))
+
+            try:
+                self.socket.disconnect(self.pspStr)
+            except Exception as e:
+                raise RuntimeError(e)
+            self.connected = False
+
+    def generic_msg(self, cmd : str, args : Union[str,bytes]=None, send_bytes : bool=False,
+                    recv_bytes : bool=False,
+                    payload : Union[bytes,memoryview]=None) -> Union[str, memoryview]:
+        """
+        Sends a binary or string message composed of a command and corresponding
+        arguments to the arkouda_server through this client. See
+        arkouda.client.generic_msg.
+        """
+        with self.lock:
+            if not self.connected:
+                raise RuntimeError("client is not connected to a server")
+
+            try:
+                if self.batchDepth > 0:
+                    if cmd in BATCHABLE_COMMANDS and payload is None and not send_bytes \
+                                                                  and not recv_bytes:
+                        return self._queue_batched(cmd, cast(str,args))
+                    # Any other command must see the results of the queued ones
+                    self._flush_batch()
+                # Args formatted with a placeholder name before it was flushed must
+                # refer to the array that was created for it
+                if self.batchResolved and isinstance(args, str):
+                    args = self._substitute_placeholders(args)
+                # Queued deletes are sent in a frame of their own ahead of the request
+                deletes = self._take_deletes() if self.deleteQueue and \
+                                     cmd not in DELETELESS_COMMANDS else None
+                if payload is not None:
+                    return self._send_binary_message(cmd=cmd, payload=payload,
+                                                     recv_bytes=recv_bytes,
+                                                     args=cast(str,args), deletes=deletes)
+                elif send_bytes:
+                    return self._send_binary_message(cmd=cmd,
+                                                     payload=cast(bytes,args),
+                                                     recv_bytes=recv_bytes, deletes=deletes)
+                else:
+                    return self._send_string_message(cmd=cmd, args=cast(str,args),
+                                                     recv_bytes=recv_bytes, deletes=deletes)
+
+            except KeyboardInterrupt as e:
+                # if the user interrupts during command execution, the socket gets out
+                # of sync reset the socket before raising the interrupt exception
+                self.sending = False
+                self.socket = context.socket(zmq.REQ)
+                if self.timeout > 0:
+                    self.socket.setsockopt(zmq.SNDTIMEO, self.timeout*1000)
+                    self.socket.setsockopt(zmq.RCVTIMEO, self.timeout*1000)
+                self.socket.connect(self.pspStr)
+                raise e
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Context manager that queues the commands sent through this client and
+        sends them as a single message. See arkouda.client.batch.
+        """
+        with self.lock:
+            self.batchDepth += 1
+            try:
+                yield
+            finally:
+                self.batchDepth -= 1
+                if self.batchDepth == 0:
+                    try:
+                        if self.connected:
+                            self._flush_batch()
+                    finally:
+                        self.batchResolved = {}
+
+    @contextmanager
+    def use(self) -> Iterator['Client']:
+        """
+        Context manager that makes this client the current client of the
+        calling thread, through which arkouda functions send their requests.
+
+        Yields
+        ------
+        Client
+            This client
+
+        Examples
+        --------
+        >>> c = ak.Client()
+        >>> c.connect('localhost', 5555)
+        >>> with c.use():
+        ...     a = ak.arange(0, 10, 1)
+        """
+        previous = getattr(_threadLocal, 'client', None)
+        _threadLocal.client = self
+        try:
+            yield self
+        finally:
+            _threadLocal.client = previous
+
+    def _send_string_message(self, cmd : str, recv_bytes : bool=False,
+                             args : str=None,
+                             deletes : Optional[str]=None) -> Union[str, memoryview]:
+        """
+        Generates a RequestMessage encapsulating command and requesting
+        user information, sends it to the Arkouda server, and returns
+        either a string or binary depending upon the message format.
+
+        Parameters
+        ----------
+        cmd : str
+            The name of the command to be executed by the Arkouda server
+        recv_bytes : bool, defaults to False
+            A boolean indicating whether the return message will be in bytes
+            as opposed to a string
+        args : str
+            A delimited string containing 1..n command arguments
+        deletes : Optional[str]
+            The args of a deleteMany of queued deletes, which the server
+            executes before the command
+
+        Returns
+        -------
+        Union[str,memoryview]
+            The response string or a writable view of the binary reply sent back
+            from the Arkouda server
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the return message contains the word "Error", indicating
+            a server-side error was thrown
+        ValueError
+            Raised if the return message is malformed JSON or is missing 1..n
+            expected fields
+        """
+        start = time.perf_counter()
+        if self.compact and compactMessages:
+            logger.debug('sending compact message %s %s', cmd, args)
+            return self._exchange(cmd, self._encode_compact(cmd, args), recv_bytes, start,
+                                  deletes=deletes)
+        message = RequestMessage(user=self.username, token=self.token, cmd=cmd,
+                              format=MessageFormat.STRING, args=cast(str,args))
+
+        logger.debug('sending message {}'.format(message))
+
+        return self._exchange(cmd, json.dumps(message.asdict()).encode(), 
+                              recv_bytes, start, deletes=deletes)
+
+    def _send_binary_message(self, cmd : str, payload : Union[bytes,memoryview],
+                             recv_bytes : bool=False, args : str=None,
+                             deletes : Optional[str]=None) -> Union[str, memoryview]:
+        """
+        Generates a RequestMessage encapsulating command and requesting user information,
+        information prepends the binary payload, sends the binary request to the Arkouda
+        server, and returns either a string or binary depending upon the message format.
+
+        Parameters
+        ----------
+        cmd : str
+            The name of the command to be executed by the Arkouda server
+        payload : Union[bytes,memoryview]
+            The bytes to be converted to a pdarray, Strings, or Categorical object
+            on the Arkouda server. Any object supporting the buffer protocol, such
+            as a memoryview of a contiguous np.ndarray, is sent without an
+            intermediate conversion to bytes.
+        recv_bytes : bool, defaults to False
+            A boolean indicating whether the return message will be in bytes
+            as opposed to a string
+        args : str
+            A delimited string containing 1..n command arguments
+        deletes : Optional[str]
+            The args of a deleteMany of queued deletes, which the server
+            executes before the command
+
+        Returns
+        -------
+        Union[str,memoryview]
+            The response string or a writable view of the binary reply sent back
+            from the Arkouda server
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the return message contains the word "Error", indicating
+            a server-side error was thrown
+        ValueError
+            Raised if the return message is malformed JSON or is missing 1..n
+            expected fields
+        """
+        start = time.perf_counter()
+        if self.compact and compactMessages:
+            logger.debug('sending compact message %s %s', cmd, args)
+            header = self._encode_compact(cmd, args)
+        else:
+            message = RequestMessage(user=self.username, token=self.token, cmd=cmd,
+                                        format=MessageFormat.BINARY, args=cast(str,args))
+
+            logger.debug('sending message {}'.format(message))
+            header = json.dumps(message.asdict()).encode()
+
+        # The payload follows the header in a frame of its own, so that it is
+        # handed to zmq without being copied
+        return self._exchange(cmd, header + b'BINARY_PAYLOAD', recv_bytes, start,
+                              payload=payload, deletes=deletes)
+
+    def _encode_compact(self, cmd : str, args : Optional[str]) -> bytes:
+        """
+        Encodes the header of a request in the compact framing, which the
+        server splits into fields without parsing JSON.
+        """
+        return COMPACT_MARKER + COMPACT_SEPARATOR.join((self.username, 
+                    self.token if self.token else '', cmd, args if args else '')).encode()
+
+    def _exchange(self, cmd : str, request : bytes, recv_bytes : bool,
+                  start : float, payload : Union[bytes,memoryview]=None,
+                  deletes : Optional[str]=None) -> Union[str, memoryview]:
+        """
+        Sends an encoded request and returns its reply, either parsed as a
+        ReplyMessage or as a writable view of the binary reply, which is not
+        copied out of the zmq message buffer. A binary payload is sent as a
+        frame after the request, and the args of a deleteMany of queued deletes
+        as a frame before it. If profiling is enabled, the exchange is
+        recorded; start is the time at which encoding began.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the reply is an error message
+        ValueError
+            Raised if a string reply is malformed JSON or is missing 1..n
+            expected fields
+        """
+        self.sending = True
+        try:
+            sent = time.perf_counter()
+            frames = [request] if payload is None else [request, payload]
+            if deletes is not None:
+                frames.insert(0, b'DELETE_MANY ' + deletes.encode())
+            self.socket.send_multipart(frames, copy=False)
+            reply = self.socket.recv(copy=False)
+            received = time.perf_counter()
+        finally:
+            self.sending = False
+        try:
+            if recv_bytes:
+                return _check_binary_reply(reply.buffer)
+            else:
+                raw_message = reply.bytes
+                if raw_message[:1] == COMPACT_MARKER:
+                    return _parse_compact_reply(raw_message)
+                return _parse_reply_message(raw_message.decode())
+        finally:
+            if profiler.activeProfiles:
+                request_bytes = len(request) if payload is None else \
+                                len(request) + memoryview(payload).nbytes
+                if deletes is not None:
+                    request_bytes += len(deletes)
+                profiler._record(cmd, request_bytes, len(reply), start, sent, received)
+
+    def _queue_batched(self, cmd : str, args : Optional[str]) -> PendingReply:
+        """
+        Queues a command for the next batch flush and returns its placeholder reply.
+        """
+        if self.batchResolved and args:
+            args = self._substitute_placeholders(args)
+        if self.deleteQueue and cmd != 'deleteMany':
+            self._flush_deletes()
+        self.batchQueue.append('{} {}'.format(cmd, args if args else ''))
+        name = PendingReply('__batch_{}__'.format(self.batchNext))
+        self.batchNext += 1
+        logger.debug('queued {} {} as {}'.format(cmd, args, name))
+        return name
+
+    def _track_placeholder(self, name : str,
+                           resolve : Callable[[], Optional[Callable[[Optional[str]], None]]]) -> None:
+        """
+        Registers a (weak) callback that receives the reply of the batched command
+        that will create the array named by placeholder name.
+        """
+        self.batchPlaceholders[name] = resolve
+
+    def _substitute_placeholders(self, args : str) -> str:
+        """
+        Replaces the placeholder names of already flushed batch commands in args,
+        which may have been formatted before the flush, with the actual names.
+        """
+        return batchPlaceholderPattern.sub(lambda m: self.batchResolved.get(m.group(0),
+                                                                       m.group(0)), args)
+
+    def _flush_batch(self) -> None:
+        """
+        Sends all queued commands to the server as one batch message and resolves
+        the placeholder pdarrays returned for them.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if one of the batched commands fails server-side
+        """
+        with self.lock:
+            if not self.batchQueue:
+                return
+            queue, first = self.batchQueue, self.batchFirst
+            self.batchQueue = []
+            self.batchFirst = self.batchNext
+            names = ['__batch_{}__'.format(first + i) for i in range(len(queue))]
+            try:
+                replies = self._send_batch(queue, first)
+            except:
+                # Placeholders of a failed batch can never be resolved
+                for name in names:
+                    resolve = self.batchPlaceholders.pop(name, None)
+                    if resolve is not None:
+                        callback = resolve()
+                        if callback is not None:
+                            callback(None)
+                raise
+            for name, reply in zip(names, replies):
+                if reply.startswith('created '):
+                    self.batchResolved[name] = reply.split()[1]
+                resolve = self.batchPlaceholders.pop(name, None)
+                if resolve is not None:
+                    callback = resolve()
+                    if callback is not None:
+                        callback(reply)
+
+    def _send_batch(self, commands : List[str], first : int) -> List[str]:
+        """
+        Sends a list of "cmd args" strings to the server as one batch message and
+        returns the reply to each command, raising any warnings they carry.
+        """
+        raw_replies = json.loads(cast(str, self._send_string_message(cmd='batch',
+                          args='{} {} {}'.format(len(commands), first, json.dumps(commands)))))
+        return [_parse_reply_message(raw) for raw in raw_replies]
+
+    def _queue_delete(self, name : str, nbytes : int) -> None:
+        """
+        Queues the deletion of a server-side array, sending the queued deletes
+        if deleteQueueMaxCount names or deleteQueueMaxBytes bytes are pending.
+        """
+        if not self.connected:
+            return
+        with self.deleteLock:
+            self.deleteQueue.append(name)
+            self.deleteQueueBytes += nbytes
+            full = len(self.deleteQueue) >= deleteQueueMaxCount or \
+                   self.deleteQueueBytes >= deleteQueueMaxBytes
+        # pdarrays may be garbage-collected by any thread and while a request
+        # is in flight, in which case the deletes wait for the next request
+        if full and not self.sending and self.lock.acquire(blocking=False):
+            try:
+                self._flush_deletes()
+            finally:
+                self.lock.release()
+
+    def _take_deletes(self) -> str:
+        """
+        Empties the delete queue and returns the args of a deleteMany message
+        for the names it held.
+        """
+        with self.deleteLock:
+            names, self.deleteQueue, self.deleteQueueBytes = self.deleteQueue, [], 0
+        return '{} {}'.format(len(names), ' '.join(names))
+
+    def _flush_deletes(self) -> None:
+        """
+        Sends the queued deletes to the server as a single deleteMany message,
+        or queues that message if a batch() is open.
+        """
+        if self.deleteQueue and self.connected:
+            self.generic_msg(cmd='deleteMany', args=self._take_deletes())
+
+class ClientPool:
+    """
+    A fixed number of Client connections to one arkouda server, which
+    threads check out for their exclusive use. While a thread holds a
+    connection, arkouda functions called by that thread send their requests
+    through it.
+
+    Parameters
+    ----------
+    size : int
+        The number of connections, defaults to 4
+    server : str, optional
+        The hostname of the server. Defaults to `localhost`.
+    port : int, optional
+        The port of the server. Defaults to 5555.
+    timeout : int, optional
+        The timeout in seconds for client send and receive operations.
+        Defaults to 0 seconds, whicn is interpreted as no timeout.
+    access_token : str, optional
+        The token used to access a server where authentication is enabled
+    connect_url : str, optional
+        The complete url in the format of tcp://server:port?token=<token_value>
+    compression : str, optional
+        The codec with which array transfers are compressed, if any
+    shared_memory : bool, optional
+        Whether to exchange arrays through shared memory with a server on 
+        the same host
+
+    Raises
+    ------
+    ValueError
+        Raised if size is less than 1 or compression is not a supported codec
+    ConnectionError
+        Raised if there's an error in connecting to the Arkouda server
+
+    Examples
+    --------
+    >>> def partial_sum(i):
+    ...     with pool.connection():
+    ...         return ak.arange(i*10, (i+1)*10, 1).sum()
+    >>> with ak.ClientPool(4, 'localhost', 5555) as pool:
+    ...     with ThreadPoolExecutor(4) as executor:
+    ...         sum(executor.map(partial_sum, range(8)))
+    3160
+    """
+
+    def __init__(self, size : int=4, server : str="localhost", port : int=5555,
+                 timeout : int=0, access_token : str=None,
+                 connect_url : str=None, compression : str=None,
+                 shared_memory : bool=False) -> None:
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        self.clients = [Client() for _ in range(size)]
+        self.idle : 'queue.Queue[Client]' = queue.Queue()
+        for client in self.clients:
+            client.connect(server=server, port=port, timeout=timeout,
+                           access_token=access_token, connect_url=connect_url,
+                           compression=compression, shared_memory=shared_memory)
+            self.idle.put(client)
+
+    def __enter__(self) -> 'ClientPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[Client]:
+        """
+        Context manager that checks out an idle connection, waiting for one
+        to be returned if necessary, and makes it the current client of the
+        calling thread until the block exits.
+
+        Yields
+        ------
+        Client
+            The checked out connection
+        """
+        client = self.idle.get()
         try:
-            return_message = ReplyMessage.fromdict(json.loads(raw_message))
-
-            # raise errors or warnings sent back from the server
-            if return_message.msgType == MessageType.ERROR:
-                raise RuntimeError(return_message.msg)
-            elif return_message.msgType == MessageType.WARNING:
-                warnings.warn(return_message.msg)
-            return return_message.msg
-        except KeyError as ke:
-            raise ValueError('Return message is missing the {} field'.format(ke))
-        except json.decoder.JSONDecodeError:
-            raise ValueError('{} is not valid JSON, may be server-side error'.\
-                             format(raw_message))
+            with client.use():
+                yield client
+        finally:
+            self.idle.put(client)
+
+    def close(self) -> None:
+        """
+        Disconnects all connections of the pool.
+
+        Returns
+        -------
+        None
+        """
+        for client in self.clients:
+            if client.connected:
+                client.disconnect()
+
+# all clients, whose queued deletes are sent at exit
+_clients : 'weakref.WeakSet[Client]' = weakref.WeakSet()
+# the client connected by ak.connect
+defaultClient = Client()
+# the client selected with Client.use by each thread, if any
+_threadLocal = threading.local()
+
+def _current_client() -> Client:
+    """
+    Returns the client through which the calling thread sends its requests.
+    """
+    return getattr(_threadLocal, 'client', None) or defaultClient
+
+def __getattr__(name : str):
+    if name in CLIENT_ATTRIBUTES:
+        return getattr(_current_client(), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 # message arkouda server the client is disconnecting from the server
 def disconnect() -> None:
@@ -452,20 +1169,8 @@ def disconnect() -> None:
     ConnectionError
         Raised if there's an error disconnecting from the Arkouda server
     """
-    global socket, pspStr, connected, verbose, token
-
-    if connected:
-        # send disconnect message to server
-        message = "disconnect"
-        logger.debug("[Python] Sending request: {}".format(message))
-        return_message = cast(str,_send_string_message(message))
-        logger.debug("[Python] Received response: {}".format(return_message))
-        try:
-            socket.disconnect(pspStr)
-        except Exception as e:
-            raise ConnectionError(e)
-        connected = False
-        clientLogger.info(return_message)
+    if defaultClient.connected:
+        clientLogger.info(defaultClient.disconnect())
     else:
         clientLogger.info("not connected; cannot disconnect")
     
@@ -489,45 +1194,38 @@ def shutdown() -> None:
         Raised if the client is not connected to the Arkouda server or
         there is an error in disconnecting from the server
     """
-    global socket, pspStr, connected, verbose
-
-    if not connected:
-        raise RuntimeError('not connected, cannot shutdown server')
-    # send shutdown message to server
-    message = "shutdown"
-
-    logger.debug("[Python] Sending request: {}".format(message))
-    return_message = cast(str,_send_string_message(message))
-    logger.debug("[Python] Received response: {}".format(return_message))
-
-    try:
-        socket.disconnect(pspStr)
-    except Exception as e:
-        raise RuntimeError(e)
-    connected = False
+    defaultClient.shutdown()
 
 def generic_msg(cmd : str, args : Union[str,bytes]=None, send_bytes : bool=False, 
-                recv_bytes : bool=False) -> Union[str, bytes]:
+                recv_bytes : bool=False, 
+                payload : Union[bytes,memoryview]=None) -> Union[str, memoryview]:
     """
     Sends a binary or string message composed of a command and corresponding 
     arguments to the arkouda_server, returning the response sent by the server.
+    The message is sent through the current client of the calling thread,
+    which is the default client unless another was selected with Client.use.
 
     Parameters
     ----------
     cmd : str
         The server-side command to be executed
     args : Union[str,bytes]
-        A space-delimited list of command arguments or a byte array, the latter
-        of which is for creating an Arkouda array
+        A space-delimited list of command arguments or, if send_bytes is True, 
+        a byte array sent as the binary payload of the message
     send_bytes : bool
         Indicates if the message to be sent is binary, defaults to False
     recv_bytes : bool
         Indicates if the return message will be binary, default to False
+    payload : Union[bytes,memoryview]
+        Raw binary data sent along with the string args, for example the 
+        buffer of an np.ndarray used to create an Arkouda array. Defaults
+        to None, in which case no binary payload is sent.
 
     Returns
     -------
-    Union[str, bytes]
-        The string or binary return message
+    Union[str, memoryview]
+        The string or binary return message, the latter being a writable
+        view of the reply buffer
     
     Raises
     ------
@@ -540,29 +1238,103 @@ def generic_msg(cmd : str, args : Union[str,bytes]=None, send_bytes : bool=False
     Notes
     -----
     If the server response is a string, the string corresponds to a success  
-    confirmation, warn message, or error message. A response of type bytes 
-    corresponds to an Arkouda array output as a numpy array.
+    confirmation, warn message, or error message. A binary response 
+    corresponds to an Arkouda array output as a numpy array; it is returned 
+    as a memoryview over the received zmq message so that it can be wrapped
+    with np.frombuffer without copying.
     """
-    global socket, pspStr, connected, verbose
+    return _current_client().generic_msg(cmd=cmd, args=args, send_bytes=send_bytes,
+                                         recv_bytes=recv_bytes, payload=payload)
 
-    if not connected:
-        raise RuntimeError("client is not connected to a server")
-    
-    try:
-        if send_bytes:
-            return _send_binary_message(cmd=cmd, 
-                                            payload=cast(bytes,args), 
-                                            recv_bytes=recv_bytes)         
-        else:
-            return _send_string_message(cmd=cmd, args=cast(str,args), 
-                                            recv_bytes=recv_bytes)
-                
-    except KeyboardInterrupt as e:
-        # if the user interrupts during command execution, the socket gets out 
-        # of sync reset the socket before raising the interrupt exception
-        socket = context.socket(zmq.REQ)
-        socket.connect(pspStr)
-        raise e
+def batch() -> ContextManager[None]:
+    """
+    Context manager that queues commands and sends them to the Arkouda server
+    as a single message, saving one round trip per command. This mostly
+    benefits sequences of small operations on a high-latency connection.
+
+    Yields
+    ------
+    None
+
+    Raises
+    ------
+    RuntimeError
+        Raised on exit if a queued command fails server-side; the arrays
+        created by the commands of the failed batch are discarded, but the
+        in-place modifications (setitem, in-place arithmetic, deletion) made
+        by the commands before the failing one remain applied
+
+    Notes
+    -----
+    Only commands whose result is a new pdarray or that modify an array in
+    place (arithmetic, element-wise functions, indexing, setitem, deletion
+    and array creation) are queued. Their results are placeholder pdarrays
+    that may be passed to further commands in the batch. Any other command,
+    or reading the dtype, size, ndim, shape or itemsize of a placeholder,
+    first flushes the queue. The queue is also flushed when the outermost
+    batch() exits. The batch applies to the current client of the calling
+    thread, which other threads cannot use until the batch exits.
+
+    A batch is not a transaction: the server executes its commands in order
+    and stops at the first failing one without undoing the previous ones.
+
+    Examples
+    --------
+    >>> a = ak.arange(0, 10, 1)
+    >>> with ak.batch():
+    ...     b = a * 2
+    ...     c = ak.abs(b - 15)
+    ...     c[0] = 0
+    >>> c
+    array([0, 13, 11, 9, 7, 5, 3, 1, 1, 3])
+    """
+    return _current_client().batch()
+
+
+def _track_placeholder(name : str, resolve : Callable[[], Optional[Callable[[Optional[str]], None]]]) -> None:
+    """
+    Registers a (weak) callback that receives the reply of the batched command
+    that will create the array named by placeholder name.
+    """
+    _current_client()._track_placeholder(name, resolve)
+
+def _flush_batch() -> None:
+    """
+    Sends the commands queued by the current client's batch() to the server.
+    """
+    _current_client()._flush_batch()
+
+def _transfer_codec(nbytes : int) -> Optional[str]:
+    """
+    Returns the codec with which an array transfer of nbytes bytes is to be
+    compressed on the current client, None if it is to be sent raw.
+    """
+    codec = _current_client().compression
+    if codec is None or nbytes < compressionThreshold:
+        return None
+    return codec
+
+def _shared_memory_dir(nbytes : int) -> Optional[str]:
+    """
+    Returns the directory through which an array transfer of nbytes bytes
+    is to be made on the current client, None if it is to go through the
+    socket.
+    """
+    directory = _current_client().sharedMemoryDir
+    if directory is None or nbytes == 0 or nbytes < sharedMemoryThreshold:
+        return None
+    return directory
+
+@atexit.register
+def _flush_deletes_at_exit() -> None:
+    """
+    Sends the deletes still queued when the interpreter exits.
+    """
+    for client in list(_clients):
+        try:
+            client._flush_deletes()
+        except Exception:
+            pass
 
 def get_config() -> Mapping[str, Union[str, int, float]]:
     """
@@ -612,6 +1384,43 @@ def get_mem_used() -> int:
     mem_used_message = cast(str,generic_msg(cmd="getmemused"))
     return int(mem_used_message)
 
+def get_server_metrics() -> Mapping[str, object]:
+    """
+    Get the metrics the server records about the commands it executes and
+    the size of its symbol table.
+
+    Returns
+    -------
+    Mapping[str, object]
+        uptime (seconds since the server started)
+        commands (for each command name, the count, errors, totalTime, 
+            minTime and maxTime in seconds and maxMemDelta, the largest
+            increase in memory used by one execution, in bytes)
+        symTabEntries (number of objects in the symbol table)
+        symTabBytes (bytes used by the objects in the symbol table)
+        symTabHistory (list of time, entries and bytes samples of the 
+            symbol table size, oldest first)
+
+    Raises
+    ------
+    RuntimeError
+        Raised if there is a server-side error in getting the metrics
+    ValueError
+        Raised if there's an error in parsing the JSON-formatted metrics
+
+    Notes
+    -----
+    Memory deltas are those of the memory allocated by the server if it
+    was started with --memTrack=true and of the symbol table otherwise. The
+    server writes the same metrics to the file given by --metricsFile, if
+    any, every --metricsInterval seconds and at shutdown.
+    """
+    raw_message = cast(str,generic_msg(cmd="getmetrics"))
+    try:
+        return json.loads(raw_message)
+    except json.decoder.JSONDecodeError:
+        raise ValueError('Returned metrics are not valid JSON: {}'.format(raw_message))
+
 def _no_op() -> str:
     """
     Send a no-op message just to gather round trip time
@@ -1,7 +1,7 @@
 from typing import cast, Tuple, Union
 from enum import Enum
 import numpy as np # type: ignore
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 import builtins
 
 __all__ = ["DTypes", "DTypeObjects", "dtype", "bool", "int64", "float64", 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 import enum
-from typing import cast, List, Sequence, Tuple, Union, TYPE_CHECKING, Any
+from typing import cast, Dict, Hashable, List, Optional, Sequence, Tuple, Union, \
+     TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from arkouda.categorical import Categorical
 import numpy as np # type: ignore
-from typeguard import typechecked
-from arkouda.client import generic_msg
+from arkouda.typecheck import typechecked
+from arkouda.client import generic_msg, batchPlaceholderPattern
+from arkouda import cache
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.sorting import argsort, coargsort
 from arkouda.strings import Strings
@@ -14,6 +16,7 @@ from arkouda.pdarraysetops import concatenate
 from arkouda.numeric import cumsum
 from arkouda.logger import getArkoudaLogger
 from arkouda.dtypes import int64
+from arkouda.pdarrayIO import get_datasets, _saved_globstr, _read_saved
 
 __all__ = ["GroupBy", "broadcast", "GROUPBY_REDUCTION_TYPES"]
 
@@ -49,6 +52,23 @@ class GroupByReductionType(enum.Enum):
 GROUPBY_REDUCTION_TYPES = frozenset([member.value for _, member 
                                   in GroupByReductionType.__members__.items()])
 
+def _component_arrays(objs : Sequence[Any]) -> List[pdarray]:
+    """
+    Returns the pdarrays making up a sequence of pdarrays, Strings,
+    Categoricals and lists thereof.
+    """
+    arrays : List[pdarray] = []
+    for obj in objs:
+        if isinstance(obj, pdarray):
+            arrays.append(obj)
+        elif isinstance(obj, Strings):
+            arrays.extend([obj.offsets, obj.bytes])
+        elif hasattr(obj, 'codes'):
+            arrays.extend(_component_arrays([obj.codes, obj.categories]))
+        else:
+            arrays.extend(_component_arrays(obj))
+    return arrays
+
 class GroupBy:
     """
     Group an array or list of arrays by value, usually in preparation 
@@ -88,6 +108,9 @@ class GroupBy:
     -----
     Only accepts (list of) pdarrays of int64 dtype, Strings, or Categorical.
 
+    If the cache enabled by ak.enable_groupby_cache holds a grouping of the
+    same, unmodified keys, its permutation, segments and unique_keys are
+    reused rather than computed again.
     """
     Reductions = GROUPBY_REDUCTION_TYPES
 
@@ -106,18 +129,10 @@ class GroupBy:
             self.keys = cast(pdarray, keys)
             self.nkeys = 1
             self.size = cast(int, keys.size)
-            if assume_sorted:
-                self.permutation = cast(pdarray, arange(self.size))
-            else:
-                self.permutation = cast(pdarray, argsort(keys))
         elif hasattr(keys, "group"): # for Strings or Categorical
             self.nkeys = 1
             self.keys = cast(Union[Strings,Categorical],keys)
             self.size = cast(int, self.keys.size) # type: ignore
-            if assume_sorted:
-                self.permutation = cast(pdarray,arange(self.size))
-            else:
-                self.permutation = cast(Union[Strings, Categorical],keys).group()
         else:
             self.keys = cast(Union[pdarray, Strings, Categorical],keys)
             self.nkeys = len(keys)
@@ -125,13 +140,49 @@ class GroupBy:
             for k in keys:
                 if k.size != self.size:
                     raise ValueError("Key arrays must all be same size")
-            if assume_sorted:
-                self.permutation = cast(pdarray, arange(self.size))
-            else:
-                self.permutation = cast(pdarray, coargsort(cast(Sequence[pdarray],keys)))
+
+        cached = self._cache_key()
+        if cached is not None:
+            arrayCache, cacheKey = cached
+            grouping = arrayCache.cached_grouping(cacheKey)
+            if grouping is not None:
+                self.permutation, self.segments, self.unique_keys = grouping
+                return
+
+        if assume_sorted:
+            self.permutation = cast(pdarray, arange(self.size))
+        elif isinstance(keys, pdarray):
+            self.permutation = cast(pdarray, argsort(keys))
+        elif hasattr(keys, "group"):
+            self.permutation = cast(Union[Strings, Categorical],keys).group()
+        else:
+            self.permutation = cast(pdarray, coargsort(cast(Sequence[pdarray],keys)))
             
         # self.permuted_keys = self.keys[self.permutation]
         self.find_segments()       
+
+        if cached is not None:
+            results = _component_arrays([self.permutation, self.segments, self.unique_keys])
+            arrayCache.cache_grouping(cacheKey, [name for name, _ in cacheKey[2]] + 
+                                      [r.name for r in results],
+                                      (self.permutation, self.segments, self.unique_keys),
+                                      sum(r.size * r.itemsize for r in results))
+
+    def _cache_key(self) -> Optional[Tuple[cache.ArrayCache, Hashable]]:
+        """
+        Returns the cache of the client that created the key arrays and the
+        key identifying the grouping of these keys in it, None if the
+        groupby cache is disabled or a key is an ak.batch() placeholder,
+        whose name is not final.
+        """
+        if not cache.groupbyCacheEnabled:
+            return None
+        arrays = _component_arrays([self.keys] if self.nkeys == 1 else self.keys)
+        if any(batchPlaceholderPattern.fullmatch(a.name) for a in arrays):
+            return None
+        arrayCache = arrays[0]._client.arrayCache
+        return arrayCache, (self.assume_sorted, self.hash_strings,
+                            tuple((a.name, arrayCache.version(a.name)) for a in arrays))
             
     def find_segments(self) -> None:
         from arkouda.categorical import Categorical
@@ -938,6 +989,166 @@ class GroupBy:
         repMsg = generic_msg(cmd=cmd,args=args)
         return create_pdarray(repMsg)
 
+    def _components(self) -> Dict[str,Any]:
+        """
+        Returns the keys, unique_keys, permutation and segments of the
+        grouping by the names of their datasets in GroupBy.save, relative
+        to its dataset name.
+        """
+        components : Dict[str,Any] = {'permutation' : self.permutation,
+                                      'segments' : self.segments}
+        if isinstance(self.keys, (list, tuple)):
+            for i, (k, u) in enumerate(zip(self.keys, self.unique_keys)):
+                components['key{}'.format(i)] = k
+                components['unique_key{}'.format(i)] = u
+        else:
+            components['key'] = self.keys
+            components['unique_key'] = self.unique_keys
+        return components
+
+    @typechecked
+    def save(self, prefix_path : str, dataset : str='groupby',
+             mode : str='truncate') -> str:
+        """
+        Save the grouping to HDF5: its keys, unique keys, permutation,
+        segments and its assume_sorted and hash_strings flags, so that
+        ``GroupBy.load`` restores it without sorting the keys again. The result is a collection of HDF5 files, one file per
+        locale of the arkouda server, where each filename starts with
+        prefix_path.
+
+        Parameters
+        ----------
+        prefix_path : str
+            Directory and filename prefix that all output files share
+        dataset : str
+            The root name of the datasets of the components, which are
+            saved as ``<dataset>.permutation``, ``<dataset>.segments``,
+            ``<dataset>.key`` and ``<dataset>.unique_key``, or
+            ``<dataset>.key<i>`` and ``<dataset>.unique_key<i>`` for each
+            key of a list of keys, and of the flags, saved as
+            ``<dataset>.flags``, defaults to groupby
+        mode : str {'truncate' | 'append'}
+            By default, truncate (overwrite) output files, if they exist.
+            If 'append', add the datasets to existing files.
+
+        Returns
+        -------
+        str
+            The message of the server for the last component saved
+
+        Raises
+        ------
+        ValueError
+            Raised if mode is neither 'truncate' nor 'append'
+        RuntimeError
+            Raised if a server-side error is thrown saving the components
+
+        See Also
+        --------
+        load, Categorical.save
+
+        Examples
+        --------
+        >>> g = ak.GroupBy([a, b])
+        >>> g.save('/data/grouping')
+        >>> g = ak.GroupBy.load('/data/grouping')
+        """
+        if mode.lower() not in ('truncate', 'append'):
+            raise ValueError("Allowed modes are 'truncate' and 'append'")
+        for i, (n, c) in enumerate(self._components().items()):
+            c.save(prefix_path, dataset='{}.{}'.format(dataset, n),
+                   mode=mode if i == 0 else 'append')
+        flags = array(np.array([self.assume_sorted, self.hash_strings]))
+        return flags.save(prefix_path, dataset='{}.flags'.format(dataset), mode='append')
+
+    @staticmethod
+    @typechecked
+    def load(prefix_path : str, dataset : str='groupby') -> GroupBy:
+        """
+        Load a grouping saved with ``GroupBy.save``, restoring its
+        permutation, segments, unique keys and flags as saved instead of
+        sorting the keys again. Groupings saved without their flags get the
+        default ones, assume_sorted=False and hash_strings=True.
+
+        Parameters
+        ----------
+        prefix_path : str
+            Filename prefix used to save the GroupBy
+        dataset : str
+            The root name of the datasets the GroupBy was saved as,
+            defaults to groupby
+
+        Returns
+        -------
+        GroupBy
+            The GroupBy that was saved
+
+        Raises
+        ------
+        ValueError
+            Raised if the components of dataset are not in the files
+
+        See Also
+        --------
+        save, Categorical.load
+        """
+        from arkouda.categorical import Categorical
+        available = set(get_datasets(_saved_globstr(prefix_path)))
+
+        def saved_name(n : str) -> Optional[str]:
+            # Categorical components are saved as datasets of their own
+            name = '{}.{}'.format(dataset, n)
+            if name in available or '{}.codes'.format(name) in available:
+                return name
+            return None
+
+        if saved_name('permutation') is None or saved_name('segments') is None:
+            raise ValueError("GroupBy {} is not in the files of {}".\
+                             format(dataset, prefix_path))
+        if saved_name('key') is not None:
+            keyNames = ['key']
+            uniqueNames = ['unique_key']
+        else:
+            nkeys = 0
+            while saved_name('key{}'.format(nkeys)) is not None:
+                nkeys += 1
+            if nkeys == 0:
+                raise ValueError("GroupBy {} has no keys in the files of {}".\
+                                 format(dataset, prefix_path))
+            keyNames = ['key{}'.format(i) for i in range(nkeys)]
+            uniqueNames = ['unique_key{}'.format(i) for i in range(nkeys)]
+
+        names = ['permutation', 'segments'] + keyNames + uniqueNames
+        datasets = [cast(str, saved_name(n)) for n in names]
+        categorical = [d for d in datasets if d not in available]
+        flagsName = saved_name('flags')
+        data : Dict[str,Any] = dict(_read_saved(prefix_path,
+                                                [d for d in datasets if d in available] +
+                                                ([flagsName] if flagsName else [])))
+        for d in categorical:
+            data[d] = Categorical.load(prefix_path, dataset=d)
+        components = dict(zip(names, [data[d] for d in datasets]))
+
+        g = GroupBy.__new__(GroupBy)
+        g.logger = getArkoudaLogger(name=GroupBy.__name__)
+        if flagsName:
+            flags = data[flagsName].to_ndarray()
+            g.assume_sorted, g.hash_strings = bool(flags[0]), bool(flags[1])
+        else:
+            g.assume_sorted, g.hash_strings = False, True
+        g.permutation = components['permutation']
+        g.segments = components['segments']
+        if keyNames == ['key']:
+            g.keys = components['key']
+            g.unique_keys = components['unique_key']
+            g.nkeys = 1
+        else:
+            g.keys = [components[n] for n in keyNames]
+            g.unique_keys = [components[n] for n in uniqueNames]
+            g.nkeys = len(keyNames)
+        g.size = cast(int, g.permutation.size)
+        return g
+
 def broadcast(segments : pdarray, values : pdarray, size : Union[int,np.int64]=-1,
               permutation : Union[pdarray, None]=None):
     if segments.size != values.size:
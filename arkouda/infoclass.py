@@ -1,7 +1,7 @@
 import json
 from json import JSONEncoder
 from typing import cast, List, Union
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 from arkouda.client import generic_msg
 
 __all__ = ["AllSymbols", "RegisteredSymbols", "information", "list_registry", "list_symbol_table",
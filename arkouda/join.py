@@ -1,5 +1,5 @@
 from typing import cast, Tuple, Union
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 import numpy as np # type: ignore
 from arkouda.client import generic_msg
 from arkouda.dtypes import int64 as akint64
@@ -0,0 +1,34 @@
+import importlib, sys, types
+from typing import Any, Optional
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is only imported once one of its attributes
+    is accessed, so that heavy optional dependencies such as pandas do not
+    slow down import arkouda for code that never uses them.
+    """
+
+    def __init__(self, name : str) -> None:
+        super().__init__(name)
+        self._module : Optional[types.ModuleType] = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr : str) -> Any:
+        # Only called for attributes not set on the stand-in itself
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name : str) -> types.ModuleType:
+    """
+    Returns a stand-in for the module of the given name, which is imported
+    on first attribute access, or the module itself if it was already
+    imported.
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
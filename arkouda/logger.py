@@ -3,7 +3,7 @@ from typing import cast, List, Optional
 from logging import Logger, Formatter, Handler, StreamHandler, DEBUG, \
      INFO, WARN, ERROR, CRITICAL
 from enum import Enum
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 
 __all__ = ['enableVerbose', 'disableVerbose']
 
@@ -1,12 +1,12 @@
 import numpy as np # type: ignore
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 from typing import cast as type_cast
 from typing import Optional, Tuple, Union, ForwardRef
 from arkouda.client import generic_msg
 from arkouda.dtypes import resolve_scalar_dtype, DTypes, isSupportedNumber, \
      int_scalars, numeric_scalars
 from arkouda.dtypes import _as_dtype
-from arkouda.pdarrayclass import pdarray, create_pdarray
+from arkouda.pdarrayclass import pdarray, create_pdarray, _create_elementwise
 from arkouda.pdarraysetops import unique
 from arkouda.strings import Strings
 
@@ -99,7 +99,7 @@ def abs(pda : pdarray) -> pdarray:
     array([5, 4, 3, 2, 1])    
     """
     repMsg = generic_msg(cmd="efunc", args="{} {}".format("abs", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _create_elementwise(type_cast(str,repMsg), [pda], lambda d: d if d in ('int64', 'float64') else None)
 
 @typechecked
 def log(pda : pdarray) -> pdarray:
@@ -139,7 +139,7 @@ def log(pda : pdarray) -> pdarray:
     array([0, 3.3219280948873626, 6.6438561897747253])
     """
     repMsg = generic_msg(cmd="efunc", args="{} {}".format("log", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _create_elementwise(type_cast(str,repMsg), [pda], lambda d: 'float64')
 
 @typechecked
 def exp(pda : pdarray) -> pdarray:
@@ -171,7 +171,7 @@ def exp(pda : pdarray) -> pdarray:
            33.494295836924771, 13.478894913238722])
     """
     repMsg = generic_msg(cmd="efunc", args="{} {}".format("exp", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _create_elementwise(type_cast(str,repMsg), [pda], lambda d: 'float64')
 
 @typechecked
 def cumsum(pda : pdarray) -> pdarray:
@@ -267,7 +267,7 @@ def sin(pda : pdarray) -> pdarray:
         Raised if the parameter is not a pdarray
     """
     repMsg = generic_msg(cmd="efunc", args="{} {}".format("sin",pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _create_elementwise(type_cast(str,repMsg), [pda], lambda d: 'float64')
 
 @typechecked
 def cos(pda : pdarray) -> pdarray:
@@ -290,7 +290,7 @@ def cos(pda : pdarray) -> pdarray:
         Raised if the parameter is not a pdarray
     """
     repMsg = type_cast(str, generic_msg(cmd="efunc", args="{} {}".format("cos",pda.name)))
-    return create_pdarray(type_cast(str,repMsg))
+    return _create_elementwise(type_cast(str,repMsg), [pda], lambda d: 'float64')
 
 @typechecked
 def where(condition : pdarray, A : Union[numeric_scalars, pdarray], 
@@ -532,4 +532,4 @@ def isnan(pda : pdarray) -> pdarray:
         if the underlying pdarray is not float-based
     """
     rep_msg = generic_msg(cmd="efunc", args=f"isnan {pda.name}")
-    return create_pdarray(type_cast(str, rep_msg))
+    return _create_elementwise(type_cast(str, rep_msg), [pda], lambda d: 'bool')
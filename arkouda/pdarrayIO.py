@@ -1,12 +1,30 @@
-from typeguard import typechecked
-import json, os
+from arkouda.typecheck import typechecked
+import json, os, fnmatch
+import numpy as np # type: ignore
 from typing import cast, Dict, List, Mapping, Optional, Union
 from arkouda.client import generic_msg
+from arkouda.dtypes import dtype as akdtype, int64 as akint64
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.strings import Strings
+from arkouda.timeclass import Datetime
 
-__all__ = ["ls_hdf", "read_hdf", "read_all", "load", "get_datasets",
-           "load_all", "save_all"]
+__all__ = ["ls_hdf", "read_hdf", "read_all", "read_hdf_head", "build_manifest", "load", "get_datasets",
+           "load_all", "save_all", "read_npy", "read_binary", "read_csv", "snapshot",
+           "restore"]
+
+# dtypes of the arrays that can be read from and written to binary files
+BINARY_DTYPES = frozenset(['bool', 'int64', 'float64', 'uint8'])
+
+# Version of the manifests written by build_manifest
+MANIFEST_VERSION = 1
+
+# Fields describing a dataset of each file in a manifest, in the order of
+# the ints sent to the server by read_all
+MANIFEST_FIELDS = ('segmented', 'class', 'bytesize', 'signed', 'boolean',
+                   'length', 'values_length')
+
+# dtypes of the columns that can be read from CSV files
+CSV_DTYPES = frozenset(['int64', 'float64', 'bool', 'str', 'datetime64[ns]'])
 
 @typechecked
 def ls_hdf(filename : str) -> str:
@@ -28,7 +46,9 @@ def ls_hdf(filename : str) -> str:
 
 @typechecked
 def read_hdf(dsetName : str, filenames : Union[str,List[str]],
-             strictTypes: bool=True) \
+             strictTypes: bool=True, rows : Optional[Union[slice, range]]=None,
+             files_subset : Optional[Union[slice, range, List[int]]]=None,
+             manifest : Optional[Union[str, Dict]]=None) \
           -> Union[pdarray, Strings]:
     """
     Read a single dataset from multiple HDF5 files into an Arkouda
@@ -46,6 +66,15 @@ def read_hdf(dsetName : str, filenames : Union[str,List[str]],
         precision and sign across different files. For example, if one 
         file contains a uint32 dataset and another contains an int64
         dataset, the contents of both will be read into an int64 pdarray.
+    rows : Optional[Union[slice, range]]
+        The rows of the concatenation of the files to read, see read_all,
+        defaults to all rows
+    files_subset : Optional[Union[slice, range, List[int]]]
+        The files to read among the sorted files matching filenames, see
+        read_all, defaults to all files
+    manifest : Optional[Union[str, Dict]]
+        A manifest of the files built by build_manifest, or the path of
+        the file it was written to, see read_all
         
     Returns
     -------
@@ -83,12 +112,26 @@ def read_hdf(dsetName : str, filenames : Union[str,List[str]],
     # else:
     #     return create_pdarray(rep_msg)
     return cast(Union[pdarray, Strings], 
-                read_all(filenames, datasets=dsetName, strictTypes=strictTypes))
+                read_all(filenames, datasets=dsetName, strictTypes=strictTypes,
+                         rows=rows, files_subset=files_subset, manifest=manifest))
+
+def _slice_spec(s : Union[slice, range], arg : str) -> str:
+    """
+    Returns the "start:stop" form, with empty bounds for None, of a slice
+    or range of step 1.
+    """
+    if s.step not in (None, 1):
+        raise ValueError("{} must have a step of 1".format(arg))
+    return '{}:{}'.format('' if s.start is None else s.start,
+                          '' if s.stop is None else s.stop)
 
 def read_all(filenames : Union[str,List[str]],
              datasets : Optional[Union[str,List[str]]]=None,
              iterative : bool=False,
-             strictTypes: bool=True) \
+             strictTypes: bool=True,
+             rows : Optional[Union[slice, range]]=None,
+             files_subset : Optional[Union[slice, range, List[int]]]=None,
+             manifest : Optional[Union[str, Dict]]=None) \
              -> Union[pdarray, Strings, Mapping[str,Union[pdarray,Strings]]]:
     """
     Read datasets from HDF5 files.
@@ -108,6 +151,20 @@ def read_all(filenames : Union[str,List[str]],
         file contains a uint32 dataset and another contains an int64
         dataset with the same name, the contents of both will be read 
         into an int64 pdarray.
+    rows : Optional[Union[slice, range]]
+        The rows to read, as a slice or range of step 1 of the indices of
+        the concatenation of the datasets of all files, with Python
+        semantics for negative and missing bounds. Defaults to all rows.
+    files_subset : Optional[Union[slice, range, List[int]]]
+        The files to read, as a slice or range of step 1 or a list of
+        indices into the files matching filenames, sorted by name if
+        filenames is a shell expression. Defaults to all files.
+    manifest : Optional[Union[str, Dict]]
+        A manifest of the files built by build_manifest, or the path of
+        the file it was written to. The dtypes and lengths of the datasets
+        are then taken from the manifest instead of being probed by
+        opening every file, and datasets defaults to all datasets of the
+        manifest.
 
     Returns
     -------
@@ -119,11 +176,16 @@ def read_all(filenames : Union[str,List[str]],
     Raises
     ------
     ValueError 
-        Raised if all datasets are not present in all hdf5 files
+        Raised if all datasets are not present in all hdf5 files, if
+        rows or files_subset has a step other than 1, or if no file or
+        dataset to read is in the manifest or files_subset is out of its
+        range
+    RuntimeError
+        Raised if files_subset selects no file or an index out of range
 
     See Also
     --------
-    read_hdf, get_datasets, ls_hdf
+    read_hdf, read_hdf_head, get_datasets, ls_hdf, build_manifest
 
     Notes
     -----
@@ -139,9 +201,29 @@ def read_all(filenames : Union[str,List[str]],
     If datasets is None, infer the names of datasets from the first file
     and read all of them. Use ``get_datasets`` to show the names of datasets
     to HDF5 files.
+
+    Only the selected rows of the selected files are read by the server,
+    so that reading a fraction of the rows or files reads about that
+    fraction of the data from disk. The rows of a Strings dataset are its
+    strings.
+
+    With a manifest, the files read are those of the manifest that are in
+    filenames or match one of its shell expressions, in the order of the
+    manifest, and are not listed by the server. The manifest must be
+    rebuilt when the files change.
+
+    Examples
+    --------
+    Read the rows 1000 to 1999 of the files of the first week of a month
+
+    >>> ak.read_all('/data/2021-03-*.hdf5', files_subset=slice(0, 7),
+                    rows=slice(1000, 2000))
     """
     if isinstance(filenames, str):
         filenames = [filenames]
+    if manifest is not None:
+        return _read_all_manifest(filenames, datasets, strictTypes, rows,
+                                  files_subset, manifest)
     if datasets is None:
         datasets = get_datasets(filenames[0])
     if isinstance(datasets, str):
@@ -153,24 +235,212 @@ def read_all(filenames : Union[str,List[str]],
         if len(nonexistent) > 0:
             raise ValueError("Dataset(s) not found: {}".format(nonexistent))
     if iterative == True: # iterative calls to server readhdf
-        return {dset:read_hdf(dset, filenames, strictTypes=strictTypes) for dset in datasets}
+        return {dset:read_hdf(dset, filenames, strictTypes=strictTypes, rows=rows,
+                              files_subset=files_subset) for dset in datasets}
     else:  # single call to server readAllHdf
-        rep_msg = generic_msg(cmd="readAllHdf", args="{} {:n} {:n} {} | {}".\
-                format(strictTypes, len(datasets), len(filenames), json.dumps(datasets), 
-                       json.dumps(filenames)))
-        if ',' in rep_msg:
-            rep_msgs = cast(str,rep_msg).split(' , ')
-            d : Dict[str,Union[pdarray,Strings]] = dict()
-            for dset, rm in zip(datasets, rep_msgs):
-                if('+' in cast(str,rm)): #String
-                    d[dset]=Strings(*cast(str,rm).split('+'))
-                else:
-                    d[dset]=create_pdarray(cast(str,rm))
-            return d
-        elif '+' in rep_msg:
-            return Strings(*cast(str,rep_msg).split('+'))
+        rows_spec = 'all' if rows is None else _slice_spec(rows, 'rows')
+        if files_subset is None:
+            files_spec = 'all'
+        elif isinstance(files_subset, (slice, range)):
+            files_spec = _slice_spec(files_subset, 'files_subset')
+        elif len(files_subset) == 0:
+            raise ValueError("files_subset selects no file")
+        else:
+            files_spec = ','.join(str(i) for i in files_subset)
+        rep_msg = generic_msg(cmd="readAllHdf", args="{} {:n} {:n} {} {} {} | {}".\
+                format(strictTypes, len(datasets), len(filenames), rows_spec, files_spec,
+                       json.dumps(datasets), json.dumps(filenames)))
+        return _read_all_reply(cast(str,rep_msg), datasets)
+
+def _read_all_reply(rep_msg : str, datasets : List[str]) \
+             -> Union[pdarray, Strings, Mapping[str,Union[pdarray,Strings]]]:
+    """
+    Returns the pdarrays and Strings created by readAllHdf for datasets.
+    """
+    if ',' in rep_msg:
+        rep_msgs = rep_msg.split(' , ')
+        d : Dict[str,Union[pdarray,Strings]] = dict()
+        for dset, rm in zip(datasets, rep_msgs):
+            if('+' in rm): #String
+                d[dset]=Strings(*rm.split('+'))
+            else:
+                d[dset]=create_pdarray(rm)
+        return d
+    elif '+' in rep_msg:
+        return Strings(*rep_msg.split('+'))
+    else:
+        return create_pdarray(rep_msg)
+
+def _read_all_manifest(filenames : List[str],
+                       datasets : Optional[Union[str,List[str]]],
+                       strictTypes : bool,
+                       rows : Optional[Union[slice, range]],
+                       files_subset : Optional[Union[slice, range, List[int]]],
+                       manifest : Union[str, Dict]) \
+             -> Union[pdarray, Strings, Mapping[str,Union[pdarray,Strings]]]:
+    """
+    Reads datasets of the files of a manifest matching filenames with a
+    single readAllHdf, sending the dtypes and lengths of the manifest so
+    that the server does not probe the files.
+    """
+    if isinstance(manifest, str):
+        with open(manifest, 'r') as f:
+            manifest = json.load(f)
+    manifest = cast(Dict, manifest)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError("Unsupported manifest version {}".\
+                         format(manifest.get('version')))
+    indices = [i for i, name in enumerate(manifest['files'])
+               if any(name == f or fnmatch.fnmatchcase(name, f) for f in filenames)]
+    if files_subset is not None:
+        if isinstance(files_subset, (slice, range)):
+            if files_subset.step not in (None, 1):
+                raise ValueError("files_subset must have a step of 1")
+            indices = indices[files_subset.start:files_subset.stop]
+        elif any(i < -len(indices) or i >= len(indices) for i in files_subset):
+            raise ValueError("files_subset {} is out of range of {} files".\
+                             format(files_subset, len(indices)))
         else:
-            return create_pdarray(cast(str,rep_msg))
+            indices = [indices[i] for i in files_subset]
+    if len(indices) == 0:
+        raise ValueError("No file of the manifest matches {}".format(filenames))
+    if datasets is None:
+        datasets = list(manifest['datasets'].keys())
+    elif isinstance(datasets, str):
+        datasets = [datasets]
+    nonexistent = set(datasets) - set(manifest['datasets'].keys())
+    if len(nonexistent) > 0:
+        raise ValueError("Dataset(s) not in the manifest: {}".format(nonexistent))
+    info = [manifest['datasets'][dset][field][i] for dset in datasets
+            for i in indices for field in MANIFEST_FIELDS]
+    files = [manifest['files'][i] for i in indices]
+    rows_spec = 'all' if rows is None else _slice_spec(rows, 'rows')
+    rep_msg = generic_msg(cmd="readAllHdf", args="{} {:n} {:n} {} all {} | {} | {}".\
+                format(strictTypes, len(datasets), len(files), rows_spec,
+                       json.dumps(datasets), json.dumps(files), json.dumps(info)))
+    return _read_all_reply(cast(str,rep_msg), datasets)
+
+@typechecked
+def build_manifest(filenames : Union[str,List[str]],
+                   path : Optional[str]=None,
+                   datasets : Optional[Union[str,List[str]]]=None) -> Dict:
+    """
+    Build a manifest of HDF5 files, recording the dtype and length of each
+    dataset of each file, so that reading them with ``read_all`` does not
+    have to list or open every file to discover them.
+
+    Parameters
+    ----------
+    filenames : list or str
+        Either a list of filenames or shell expression
+    path : Optional[str]
+        The path of a file, visible to the client, to write the manifest
+        to as JSON, defaults to not writing it
+    datasets : list or str or None
+        (List of) name(s) of dataset(s) to record (default: all datasets
+        of the first file)
+
+    Returns
+    -------
+    Dict
+        The manifest, with the sorted names of the files under "files" and,
+        under "datasets", a dictionary of the fields "segmented", "class"
+        (0 for int, 1 for float, 2 otherwise), "bytesize", "signed",
+        "boolean", "length" and "values_length" of each dataset, listing
+        the value of each file
+
+    Raises
+    ------
+    ValueError
+        Raised if all datasets are not present in all hdf5 files
+    RuntimeError
+        Raised if the server cannot open a file or read a dataset
+
+    See Also
+    --------
+    read_all, get_datasets
+
+    Notes
+    -----
+    The files are probed in parallel by the locales of the server. The
+    manifest is a snapshot of the files and must be rebuilt when they
+    change.
+
+    Examples
+    --------
+    >>> ak.build_manifest('/data/2021-*.hdf5', path='/data/manifest.json')
+    >>> ak.read_all('/data/2021-03-*.hdf5', manifest='/data/manifest.json')
+    """
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    if datasets is None:
+        datasets = get_datasets(filenames[0])
+    elif isinstance(datasets, str):
+        datasets = [datasets]
+    rep_msg = generic_msg(cmd="hdfmanifest", args="{:n} {:n} {} | {}".\
+                format(len(datasets), len(filenames), json.dumps(datasets),
+                       json.dumps(filenames)))
+    reply = json.loads(cast(str,rep_msg))
+    files = reply['files']
+    info = reply['info']
+    nfields = len(MANIFEST_FIELDS)
+    manifest : Dict = {'version' : MANIFEST_VERSION, 'files' : files, 'datasets' : {}}
+    for d, dset in enumerate(reply['datasets']):
+        offset = d * len(files) * nfields
+        manifest['datasets'][dset] = \
+                {field : info[offset + j : offset + len(files) * nfields : nfields]
+                 for j, field in enumerate(MANIFEST_FIELDS)}
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+    return manifest
+
+@typechecked
+def read_hdf_head(filenames : Union[str,List[str]],
+                  datasets : Optional[Union[str,List[str]]]=None, n : int=5,
+                  strictTypes: bool=True) \
+                  -> Union[pdarray, Strings, Mapping[str,Union[pdarray,Strings]]]:
+    """
+    Read the first n rows of datasets from HDF5 files, e.g. to preview
+    them, reading only those rows from disk.
+
+    Parameters
+    ----------
+    filenames : list or str
+        Either a list of filenames or shell expression
+    datasets : list or str or None
+        (List of) name(s) of dataset(s) to read (default: all available)
+    n : int
+        The number of rows to read, defaults to 5
+    strictTypes: bool
+        If True (default), require all dtypes of a given dataset to have
+        the same precision and sign, see read_all
+
+    Returns
+    -------
+    For a single dataset returns an Arkouda pdarray or Arkouda Strings object
+    and for multiple datasets returns a dictionary of Arkouda pdarrays or
+    Arkouda Strings, of at most n elements each.
+
+    Raises
+    ------
+    ValueError
+        Raised if n is negative or if all datasets are not present in all
+        hdf5 files
+
+    See Also
+    --------
+    read_all
+
+    Examples
+    --------
+    >>> ak.read_hdf_head('/data/flows*.hdf5', 'srcIP', n=3)
+    array([167772161, 167772162, 167772161])
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return read_all(filenames, datasets=datasets, strictTypes=strictTypes,
+                    rows=slice(0, n))
 
 @typechecked
 def load(path_prefix : str, dataset : str='array') -> Union[pdarray,Strings]:
@@ -200,9 +470,27 @@ def load(path_prefix : str, dataset : str='array') -> Union[pdarray,Strings]:
     --------
     save, load_all, read_hdf, read_all
     """
+    return read_hdf(dataset, _saved_globstr(path_prefix))
+
+def _saved_globstr(path_prefix : str) -> str:
+    """
+    Returns the shell expression matching the files written by the save
+    methods with path_prefix.
+    """
     prefix, extension = os.path.splitext(path_prefix)
-    globstr = "{}_LOCALE*{}".format(prefix, extension)
-    return read_hdf(dataset, globstr)
+    return "{}_LOCALE*{}".format(prefix, extension)
+
+def _read_saved(path_prefix : str, datasets : List[str]) \
+                                        -> Mapping[str,Union[pdarray,Strings]]:
+    """
+    Reads the datasets saved with path_prefix by the save methods of
+    objects made of several pdarrays and Strings, such as Categorical and
+    GroupBy, with a single call to the server.
+    """
+    data = read_all(_saved_globstr(path_prefix), datasets=datasets)
+    if len(datasets) == 1:
+        return {datasets[0] : cast(Union[pdarray,Strings], data)}
+    return cast(Mapping[str,Union[pdarray,Strings]], data)
 
 @typechecked
 def get_datasets(filename : str) -> List[str]:
@@ -269,7 +557,9 @@ def load_all(path_prefix : str) -> Mapping[str,Union[pdarray,Strings]]:
                                        for dataset in get_datasets(firstname)}
 
 def save_all(columns : Union[Mapping[str,pdarray],List[pdarray]], prefix_path : str, 
-             names : List[str]=None, mode : str='truncate') -> None:
+             names : List[str]=None, mode : str='truncate',
+             compression : Optional[str]=None, compression_opts : Optional[int]=None,
+             shuffle : bool=False, chunk_elems : Optional[int]=None) -> None:
     """
     Save multiple named pdarrays to HDF5 files.
 
@@ -281,9 +571,21 @@ def save_all(columns : Union[Mapping[str,pdarray],List[pdarray]], prefix_path :
         Directory and filename prefix for output files
     names : list of str
         Dataset names for the pdarrays
-    mode : {'truncate' | 'append'}
+    mode : {'truncate' | 'append' | 'append_rows'}
         By default, truncate (overwrite) the output files if they exist.
         If 'append', attempt to create new dataset in existing files.
+        If 'append_rows', append the rows of the columns to the datasets
+        of the same names in the existing files, see pdarray.save.
+    compression : Optional[str]
+        Compress the datasets with 'gzip', or leave them uncompressed
+        (default), see pdarray.save
+    compression_opts : Optional[int]
+        The gzip compression level, from 0 to 9, defaults to 4
+    shuffle : bool
+        If True, apply the HDF5 shuffle filter before compression,
+        defaults to False
+    chunk_elems : Optional[int]
+        The number of elements per HDF5 chunk, defaults to about 1 MB
 
     Returns
     -------
@@ -292,8 +594,9 @@ def save_all(columns : Union[Mapping[str,pdarray],List[pdarray]], prefix_path :
     Raises
     ------
     ValueError 
-        Raised if (1) the lengths of columns and values differ or (2) the mode 
-        is not 'truncate' or 'append'
+        Raised if (1) the lengths of columns and values differ, (2) the mode 
+        is not 'truncate', 'append' or 'append_rows' or (3) the compression
+        options are invalid
 
     See Also
     --------
@@ -308,6 +611,14 @@ def save_all(columns : Union[Mapping[str,pdarray],List[pdarray]], prefix_path :
     specifies the 'append' mode, in which case arkouda will attempt to add
     <columns> as new datasets to existing files. If the wrong number of files
     is present or dataset names already exist, a RuntimeError is raised.
+    In the 'append_rows' mode, the columns are appended to the extendable
+    datasets of existing files, which are created by the first such save,
+    so that repeated saves of batches keep the number of files constant.
+    Each file receives the same rows of every column, pdarray and Strings
+    alike, so the columns stay aligned row by row.
+
+    Compressed datasets are read back by load, load_all and read_all like
+    uncompressed ones, each locale decompressing the chunks it reads.
     """
     if names is not None:
         if len(names) != len(columns):
@@ -322,14 +633,312 @@ def save_all(columns : Union[Mapping[str,pdarray],List[pdarray]], prefix_path :
         pdarrays = cast(List[pdarray],columns)
         if names is None:
             datasetNames = [str(column) for column in range(len(columns))]
-    if (mode.lower() not in 'append') and (mode.lower() not in 'truncate'):
-        raise ValueError("Allowed modes are 'truncate' and 'append'")
+    if (mode.lower() not in 'append') and (mode.lower() not in 'truncate') and \
+                                       (mode.lower() != 'append_rows'):
+        raise ValueError("Allowed modes are 'truncate', 'append' and 'append_rows'")
     first_iter = True
     for arr, name in zip(pdarrays, cast(List[str], datasetNames)):
         '''Append all pdarrays to existing files as new datasets EXCEPT the first one, 
            and only if user requests truncation'''
-        if mode.lower() not in 'append' and first_iter:
-            arr.save(prefix_path=prefix_path, dataset=name, mode='truncate')
+        if mode.lower() == 'append_rows':
+            arr.save(prefix_path=prefix_path, dataset=name, mode='append_rows',
+                     compression=compression, compression_opts=compression_opts,
+                     shuffle=shuffle, chunk_elems=chunk_elems)
+        elif mode.lower() not in 'append' and first_iter:
+            arr.save(prefix_path=prefix_path, dataset=name, mode='truncate',
+                     compression=compression, compression_opts=compression_opts,
+                     shuffle=shuffle, chunk_elems=chunk_elems)
             first_iter = False
         else:
-            arr.save(prefix_path=prefix_path, dataset=name, mode='append')
+            arr.save(prefix_path=prefix_path, dataset=name, mode='append',
+                     compression=compression, compression_opts=compression_opts,
+                     shuffle=shuffle, chunk_elems=chunk_elems)
+
+@typechecked
+def read_npy(path : str) -> pdarray:
+    """
+    Read a one-dimensional array from a NumPy .npy file into a pdarray.
+    The file is read by the arkouda server, each locale reading its own
+    block of the array directly, without passing through the client.
+
+    Parameters
+    ----------
+    path : str
+        The name of a .npy file visible to all locales of the arkouda server
+
+    Returns
+    -------
+    pdarray
+        A pdarray holding the contents of the file
+
+    Raises
+    ------
+    TypeError
+        Raised if path is not a str
+    RuntimeError
+        Raised if the file cannot be read, is not a .npy file, holds an
+        array of more than one dimension or of a dtype other than bool,
+        int64, float64 or uint8 in little-endian byte order
+
+    See Also
+    --------
+    read_binary, pdarray.to_npy
+
+    Examples
+    --------
+    >>> np.save('/shared/a.npy', np.arange(10))
+    >>> ak.read_npy('/shared/a.npy')
+    array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+    """
+    return create_pdarray(generic_msg(cmd="readnpy", args=path))
+
+@typechecked
+def read_binary(path : str, dtype : Union[type, str, np.dtype]=akint64,
+                offset : int=0) -> pdarray:
+    """
+    Read a file of raw native-endian elements, such as written by
+    numpy.ndarray.tofile or pdarray.to_binary, into a pdarray. The file is
+    read by the arkouda server, each locale reading its own block of the
+    array directly, without passing through the client.
+
+    Parameters
+    ----------
+    path : str
+        The name of a file visible to all locales of the arkouda server
+    dtype : Union[type, str, np.dtype]
+        The dtype of the elements, one of bool, int64, float64 or uint8,
+        defaults to int64
+    offset : int
+        The number of bytes to skip at the start of the file, e.g. a
+        header, defaults to 0
+
+    Returns
+    -------
+    pdarray
+        A pdarray holding the elements after offset
+
+    Raises
+    ------
+    TypeError
+        Raised if the dtype is not supported
+    ValueError
+        Raised if offset is negative
+    RuntimeError
+        Raised if the file cannot be read or the bytes after offset are not
+        a whole number of elements
+
+    See Also
+    --------
+    read_npy, pdarray.to_binary
+
+    Examples
+    --------
+    >>> np.arange(10).tofile('/shared/a.bin')
+    >>> ak.read_binary('/shared/a.bin', dtype=ak.int64)
+    array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+    """
+    dt = akdtype(dtype)
+    if dt.name not in BINARY_DTYPES:
+        raise TypeError("Unsupported dtype {} for binary files, must be one of {}".\
+                        format(dt, sorted(BINARY_DTYPES)))
+    if offset < 0:
+        raise ValueError("offset must be non-negative")
+    return create_pdarray(generic_msg(cmd="readbinary", args="{} {} {}".\
+                                      format(dt.name, offset, path)))
+
+@typechecked
+def snapshot(path : str) -> str:
+    """
+    Write every registered object of the arkouda server to a snapshot in
+    the directory path, from which restore, or the server started with
+    --restorePath, reloads them under their registered names. Each locale
+    writes its chunk of every array to a raw binary file of its own in
+    parallel, so the directory need not be on a filesystem shared by the
+    locales.
+
+    Parameters
+    ----------
+    path : str
+        The snapshot directory, created on every locale if it does not
+        exist. The files of an earlier snapshot in it are replaced.
+
+    Returns
+    -------
+    str
+        A message indicating the number of registered arrays written
+
+    Raises
+    ------
+    TypeError
+        Raised if path is not a str
+    RuntimeError
+        Raised if the snapshot cannot be written
+
+    See Also
+    --------
+    restore, pdarray.register, list_registry
+
+    Notes
+    -----
+    Only registered objects are written. A snapshot can only be restored
+    by a server with the same number of locales.
+
+    Examples
+    --------
+    >>> ak.arange(10).register('my_array')
+    >>> ak.snapshot('/scratch/snap')
+    'wrote 1 registered entries to /scratch/snap'
+    """
+    return cast(str, generic_msg(cmd="snapshot", args=path))
+
+@typechecked
+def restore(path : str) -> List[str]:
+    """
+    Reload the registered objects of a snapshot written by snapshot into the
+    arkouda server, registering them under their names so they can be
+    attached to. Each locale reads its chunk of every array from its own
+    file in parallel.
+
+    Parameters
+    ----------
+    path : str
+        The snapshot directory
+
+    Returns
+    -------
+    List[str]
+        The registered names of the restored arrays
+
+    Raises
+    ------
+    TypeError
+        Raised if path is not a str
+    RuntimeError
+        Raised if the snapshot cannot be read, was written by a server with
+        a different number of locales, or if any of its names is already
+        in use, in which case none of its objects is restored
+
+    See Also
+    --------
+    snapshot, pdarray.attach, Strings.attach
+
+    Examples
+    --------
+    >>> ak.restore('/scratch/snap')
+    ['my_array']
+    >>> ak.pdarray.attach('my_array')
+    array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+    """
+    return cast(List[str], json.loads(generic_msg(cmd="restore", args=path)))
+
+def _csv_dtype(dtype : Union[type, str, np.dtype]) -> str:
+    """
+    Returns the name of the CSV column dtype of dtype, which may be any
+    numpy dtype or name equivalent to one of CSV_DTYPES.
+    """
+    if dtype in (str, 'str'):
+        return 'str'
+    dt = np.dtype(dtype)
+    if dt.kind == 'M':
+        return 'datetime64[ns]'
+    if dt.kind in 'US':
+        return 'str'
+    if dt.name not in CSV_DTYPES:
+        raise TypeError("Unsupported dtype {} for CSV columns, must be one of {}".\
+                        format(dtype, sorted(CSV_DTYPES)))
+    return dt.name
+
+@typechecked
+def read_csv(filenames : Union[str, List[str]],
+             columns : Optional[List[str]]=None,
+             dtypes : Optional[Mapping[str, Union[type, str, np.dtype]]]=None,
+             delimiter : str=',') -> Dict[str, Union[pdarray, Strings, Datetime]]:
+    """
+    Read columns of one or more CSV files with a header line into pdarrays,
+    Strings and Datetimes. The files are parsed by the arkouda server,
+    each locale reading and parsing its own share of the bytes of the files
+    in parallel, so that no data passes through the client.
+
+    Parameters
+    ----------
+    filenames : Union[str, List[str]]
+        Either a list of filenames or a shell expression, of files visible
+        to all locales of the arkouda server. All files must have the same
+        header line.
+    columns : Optional[List[str]]
+        The names of the columns to read, in the order of the result,
+        defaults to all the columns of the header
+    dtypes : Optional[Mapping[str, Union[type, str, np.dtype]]]
+        The dtypes of some or all of the columns, among int64, float64,
+        bool, str and datetime64[ns]. The dtypes of the other columns are
+        inferred from the first rows of the first file.
+    delimiter : str
+        The single character separating the fields, defaults to ','
+
+    Returns
+    -------
+    Dict[str, Union[pdarray, Strings, Datetime]]
+        Dictionary of column names to the pdarrays (int64, float64 and
+        bool columns), Strings (str columns) and Datetimes (datetime64[ns]
+        columns) holding the columns
+
+    Raises
+    ------
+    TypeError
+        Raised if a dtype is not supported
+    ValueError
+        Raised if the delimiter is not a single character, or if a column of
+        dtypes is not among columns
+    RuntimeError
+        Raised if no file matches filenames, if a column is not in the
+        header, or if a field cannot be parsed as the dtype of its column
+
+    See Also
+    --------
+    read_all
+
+    Notes
+    -----
+    Fields may be quoted with double quotes, a doubled quote standing for
+    a quote inside a quoted field, and quoted fields may contain the
+    delimiter and newlines. Empty float64 fields are read as NaN and empty
+    str fields as empty strings, whereas empty fields of the other dtypes
+    are errors. Datetime fields are ISO 8601 dates or datetimes, e.g.
+    2021-03-01 or 2021-03-01T12:30:00.5.
+
+    Examples
+    --------
+    >>> df = ak.read_csv('/shared/flows/*.csv', columns=['src', 'dst', 'time'],
+                         dtypes={'time': 'datetime64[ns]'})
+    >>> df['src']
+    array(['10.0.0.1', '10.0.0.2', ... ])
+    """
+    if len(delimiter) != 1 or delimiter in '"\r\n' or ord(delimiter) > 127:
+        raise ValueError("delimiter must be a single ASCII character other than a quote or newline")
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    if dtypes is None:
+        dtypes = {}
+    if columns is None:
+        allColumns = True
+        names = list(dtypes.keys())
+    else:
+        allColumns = False
+        names = list(columns)
+        missing = [name for name in dtypes if name not in names]
+        if missing:
+            raise ValueError("dtypes given for columns {} that are not read".format(missing))
+    types = [_csv_dtype(dtypes[name]) if name in dtypes else '' for name in names]
+    rep_msg = generic_msg(cmd="readcsv", args="{} {} {} {} {} | {} | {}".\
+                          format(ord(delimiter), allColumns, len(names),
+                                 len(filenames), json.dumps(names),
+                                 json.dumps(types), json.dumps(filenames)))
+    result : Dict[str, Union[pdarray, Strings, Datetime]] = {}
+    for col in json.loads(cast(str, rep_msg)):
+        if col['dtype'] == 'str':
+            result[col['name']] = Strings(*col['created'].split('+'))
+        elif col['dtype'] == 'datetime64[ns]':
+            result[col['name']] = Datetime(create_pdarray(col['created']))
+        else:
+            result[col['name']] = create_pdarray(col['created'])
+    return result
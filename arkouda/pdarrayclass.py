@@ -1,11 +1,12 @@
 from __future__ import annotations
-from typing import cast, List, Sequence
-from typeguard import typechecked
-import json, struct
+from typing import cast, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+from arkouda.typecheck import typechecked
+import json, os, weakref, zlib
 import numpy as np # type: ignore
-from arkouda.client import generic_msg
+from arkouda.client import generic_msg, PendingReply, _flush_batch, _track_placeholder, \
+     _current_client, _transfer_codec, _shared_memory_dir, batchPlaceholderPattern
 from arkouda.dtypes import dtype, DTypes, resolve_scalar_dtype, \
-     structDtypeCodes, translate_np_dtype, NUMBER_FORMAT_STRINGS, \
+     translate_np_dtype, NUMBER_FORMAT_STRINGS, \
      int_scalars, numeric_scalars, numpy_scalars
 from arkouda.dtypes import int64 as akint64
 from arkouda.dtypes import str_ as akstr_
@@ -105,6 +106,163 @@ def _parse_single_int_array_value(msg : str) -> object:
         raise ValueError(("unsupported value from server {} {}".\
                               format(mydtype.name, value)))
 
+def _bytes_to_ndarray(buffer : Union[bytes,memoryview], mydtype : np.dtype, 
+                      size : int_scalars) -> np.ndarray:
+    """
+    Wrap the raw bytes of a tondarray reply in a np.ndarray without copying
+    them. The user should not call this function directly.
+
+    Parameters
+    ----------
+    buffer : Union[bytes,memoryview]
+        The array data in the little-endian wire format sent by the server
+    mydtype : np.dtype
+        The element type of the array
+    size : int_scalars
+        The number of elements in the array
+
+    Returns
+    -------
+    np.ndarray
+        A numpy ndarray sharing memory with buffer (on little-endian clients)
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the number of bytes received does not match the expected
+        number of bytes
+    """
+    mydtype = dtype(mydtype)
+    # Make sure the received data has the expected length
+    if len(buffer) != size*mydtype.itemsize:
+        raise RuntimeError("Expected {} bytes but received {}".\
+                           format(size*mydtype.itemsize, len(buffer)))
+    # The wire format is little-endian, so astype is a no-op unless the 
+    # client itself is big-endian
+    return np.frombuffer(buffer, dtype=mydtype.newbyteorder('<')).\
+                                                astype(mydtype, copy=False)
+
+def _compress_ndarray(a : np.ndarray, codec : str) -> bytes:
+    """
+    Compress the bytes of a np.ndarray for transfer to the server, first
+    shuffling them so that the k-th bytes of all elements are contiguous.
+    The user should not call this function directly.
+
+    Parameters
+    ----------
+    a : np.ndarray
+        The contiguous, little-endian array to compress
+    codec : str
+        The compression codec, one of client.COMPRESSION_CODECS
+
+    Returns
+    -------
+    bytes
+        The compressed bytes
+    """
+    shuffled = a.view(np.uint8).reshape(-1, a.itemsize).T.tobytes()
+    return zlib.compress(shuffled, 1)
+
+def _decompress_to_ndarray(buffer : Union[bytes,memoryview], mydtype : np.dtype,
+                           size : int_scalars, codec : str) -> np.ndarray:
+    """
+    Decompress the bytes of a compressed tondarray reply, undoing the
+    shuffle of _compress_ndarray, into a np.ndarray. The user should not
+    call this function directly.
+
+    Parameters
+    ----------
+    buffer : Union[bytes,memoryview]
+        The compressed array data sent by the server
+    mydtype : np.dtype
+        The element type of the array
+    size : int_scalars
+        The number of elements in the array
+    codec : str
+        The compression codec, one of client.COMPRESSION_CODECS
+
+    Returns
+    -------
+    np.ndarray
+        A numpy ndarray holding the decompressed data
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the data cannot be decompressed or the number of bytes
+        decompressed does not match the expected number of bytes
+    """
+    mydtype = dtype(mydtype)
+    if size == 0:
+        return np.empty(0, dtype=mydtype)
+    try:
+        shuffled = zlib.decompress(buffer)
+    except zlib.error as e:
+        raise RuntimeError("Could not decompress array: {}".format(e))
+    if len(shuffled) != size*mydtype.itemsize:
+        raise RuntimeError("Expected {} bytes but decompressed {}".\
+                           format(size*mydtype.itemsize, len(shuffled)))
+    raw = np.frombuffer(shuffled, dtype=np.uint8).reshape(mydtype.itemsize, -1).T.copy()
+    return _bytes_to_ndarray(memoryview(raw).cast('B'), mydtype, size)
+
+def _map_shared_memory(path : str, mydtype : np.dtype, size : int_scalars) -> np.ndarray:
+    """
+    Map a file that the server wrote to shared memory into a np.ndarray
+    without copying, then delete the file, whose memory is released once
+    the array is garbage-collected. The user should not call this function
+    directly.
+
+    Parameters
+    ----------
+    path : str
+        The file holding the array data in little-endian byte order
+    mydtype : np.dtype
+        The element type of the array
+    size : int_scalars
+        The number of elements in the array
+
+    Returns
+    -------
+    np.ndarray
+        A numpy ndarray backed by a copy-on-write mapping of the file
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the size of the file does not match the expected number
+        of bytes
+    """
+    mydtype = dtype(mydtype)
+    try:
+        nbytes = os.path.getsize(path)
+        if nbytes != size*mydtype.itemsize:
+            raise RuntimeError("Expected {} bytes but received {}".\
+                               format(size*mydtype.itemsize, nbytes))
+        mapped = np.memmap(path, dtype=mydtype.newbyteorder('<'), mode='c',
+                           shape=(size,))
+    finally:
+        os.unlink(path)
+    return np.asarray(mapped).astype(mydtype, copy=False)
+
+def _receive_ndarray(cmd : str, args : str, mydtype : np.dtype,
+                     size : int_scalars) -> np.ndarray:
+    """
+    Send a tondarray or tondarrayslice request for size elements and
+    return the reply as a np.ndarray, having the server write the array to
+    shared memory or compress the reply if the current client makes
+    transfers of that size through shared memory or compressed.
+    """
+    nbytes = size*dtype(mydtype).itemsize
+    if _shared_memory_dir(nbytes) is not None:
+        # tondarrayshm takes the args of both tondarray and tondarrayslice
+        path = cast(str, generic_msg(cmd="tondarrayshm", args=args))
+        return _map_shared_memory(path, mydtype, size)
+    codec = _transfer_codec(nbytes)
+    if codec is None:
+        rep_msg = generic_msg(cmd=cmd, args=args, recv_bytes=True)
+        return _bytes_to_ndarray(rep_msg, mydtype, size)
+    rep_msg = generic_msg(cmd=cmd, args="{} {}".format(args, codec), recv_bytes=True)
+    return _decompress_to_ndarray(rep_msg, mydtype, size, codec)
 
 # class for the pdarray
 class pdarray:
@@ -137,6 +295,7 @@ class pdarray:
     OpEqOps = frozenset(["+=", "-=", "*=", "/=", "//=", "&=", "|=", "^=", 
                          "<<=", ">>=","**="])
     objtype = "pdarray"
+    PendingAttribs = frozenset(["dtype", "size", "ndim", "shape", "itemsize"])
 
     __array_priority__ = 1000
 
@@ -149,14 +308,48 @@ class pdarray:
         self.ndim = ndim
         self.shape = shape
         self.itemsize = itemsize
+        # The client of the server holding the array, which is the one the
+        # delete is sent to, whichever client the collecting thread is using
+        if '_client' not in self.__dict__:
+            self._client = _current_client()
 
     def __del__(self):
         try:
             logger.debug('deleting pdarray with name {}'.format(self.name))
-            generic_msg(cmd='delete', args='{}'.format(self.name))
+            self._client.arrayCache.forget(self.name)
+            if not self.__dict__.get('_placeholder', False):
+                self._client._queue_delete(self.name, self.size*self.itemsize)
+            else:
+                # The array of an ak.batch() placeholder may not exist yet, 
+                # so its delete has to be batched along with its creation
+                self._client.generic_msg(cmd='delete', args='{}'.format(self.name))
         except:
             pass
 
+    def __getattr__(self, attr : str):
+        # Only reached for attributes that are not set, which is the case for
+        # the placeholders returned by commands queued in ak.batch()
+        if attr in pdarray.PendingAttribs and 'name' in self.__dict__:
+            _flush_batch()
+            if attr in self.__dict__:
+                return self.__dict__[attr]
+            raise RuntimeError(("the batched command creating {} failed, so the " +
+                                "array does not exist").format(self.name))
+        raise AttributeError("'pdarray' object has no attribute '{}'".format(attr))
+
+    def _resolve(self, repMsg : Optional[str]) -> None:
+        """
+        Fill in a placeholder pdarray from the reply of the batched command
+        that created its array, or, if the batch failed (repMsg is None),
+        drop the attributes predicted for it.
+        """
+        if repMsg is None:
+            for attr in pdarray.PendingAttribs:
+                self.__dict__.pop(attr, None)
+            return
+        pdarray.__init__(self, *_parse_created_msg(repMsg))
+        del self._placeholder
+
     def __bool__(self) -> builtins.bool:
         if self.size != 1:
             raise ValueError(('The truth value of an array with more than one ' +
@@ -245,7 +438,8 @@ class pdarray:
             cmd = "binopvv"
             args= "{} {} {}".format(op, self.name, other.name)
             repMsg = generic_msg(cmd=cmd,args=args)
-            return create_pdarray(repMsg)
+            return _create_elementwise(repMsg, [self, other], 
+                                       lambda l, r: _binop_dtype(op, l, r))
         # pdarray binop scalar
         dt = resolve_scalar_dtype(other)
         if dt not in DTypes:
@@ -255,7 +449,7 @@ class pdarray:
         args = "{} {} {} {}".\
                   format(op, self.name, dt, NUMBER_FORMAT_STRINGS[dt].format(other))
         repMsg = generic_msg(cmd=cmd,args=args)
-        return create_pdarray(repMsg)
+        return _create_elementwise(repMsg, [self, dt], lambda l, r: _binop_dtype(op, l, r))
 
     # reverse binary operators
     # pdarray binop pdarray: taken care of by binop function
@@ -296,7 +490,7 @@ class pdarray:
                       format(op, dt, NUMBER_FORMAT_STRINGS[dt].format(other), 
                                                                     self.name)
         repMsg = generic_msg(cmd=cmd,args=args)
-        return create_pdarray(repMsg)
+        return _create_elementwise(repMsg, [dt, self], lambda l, r: _binop_dtype(op, l, r))
 
     # overload + for pdarray, other can be {pdarray, int, float}
     def __add__(self, other):
@@ -421,6 +615,7 @@ class pdarray:
     def opeq(self, other, op):
         if op not in self.OpEqOps:
             raise ValueError("bad operator {}".format(op))
+        self._client.arrayCache.modified(self.name)
         # pdarray op= pdarray
         if isinstance(other, pdarray):
             if self.size != other.size:
@@ -503,7 +698,8 @@ class pdarray:
             (start,stop,stride) = key.indices(self.size)
             logger.debug('start: {} stop: {} stride: {}'.format(start,stop,stride))
             repMsg = generic_msg(cmd="[slice]", args="{} {} {} {}".format(self.name, start, stop, stride))
-            return create_pdarray(repMsg);
+            return _create_elementwise(repMsg, [self], lambda d: d,
+                                       size=len(range(start, stop, stride)))
         if isinstance(key, pdarray):
             kind, _ = translate_np_dtype(key.dtype)
             if kind not in ("bool", "int"):
@@ -516,6 +712,7 @@ class pdarray:
             raise TypeError("Unhandled key type: {} ({})".format(key, type(key)))
 
     def __setitem__(self, key, value):
+        self._client.arrayCache.modified(self.name)
         if np.isscalar(key) and resolve_scalar_dtype(key) == 'int64':
             orig_key = key
             if key < 0:
@@ -564,6 +761,7 @@ class pdarray:
         TypeError
             Raised if value is not an int, int64, float, or float64         
         """
+        self._client.arrayCache.modified(self.name)
         generic_msg(cmd="set", args="{} {} {}".format(self.name, 
                                         self.dtype.name, self.format_other(value)))
 
@@ -872,7 +1070,7 @@ class pdarray:
 
         See Also
         --------
-        array
+        array, iter_chunks
 
         Examples
         --------
@@ -890,16 +1088,9 @@ class pdarray:
         if arraybytes > maxTransferBytes:
             raise RuntimeError(('Array exceeds allowed size for transfer. Increase ' +
                                'client.maxTransferBytes to allow'))
-        # The reply from the server will be a bytes object
-        rep_msg = generic_msg(cmd="tondarray", args="{}".format(self.name), recv_bytes=True)
-        # Make sure the received data has the expected length
-        if len(rep_msg) != self.size*self.dtype.itemsize:
-            raise RuntimeError("Expected {} bytes but received {}".\
-                               format(self.size*self.dtype.itemsize, len(rep_msg)))
-        # Use struct to interpret bytes as a big-endian numeric array
-        fmt = '>{:n}{}'.format(self.size, structDtypeCodes[self.dtype.name])
-        # Return a numpy ndarray
-        return np.array(struct.unpack(fmt, rep_msg)) # type: ignore
+        # Return a numpy ndarray backed by the received buffer, or by the
+        # decompressed buffer if the transfer is compressed
+        return _receive_ndarray("tondarray", self.name, self.dtype, self.size)
 
     def to_cuda(self):
         """
@@ -962,19 +1153,68 @@ class pdarray:
         if arraybytes > maxTransferBytes:
             raise RuntimeError(("Array exceeds allowed size for transfer. " +
                                "Increase client.maxTransferBytes to allow"))
-        # The reply from the server will be a bytes object
-        rep_msg = generic_msg(cmd="tondarray", args="{}".format(self.name), recv_bytes=True)
-        # Make sure the received data has the expected length
-        if len(rep_msg) != self.size*self.dtype.itemsize:
-            raise RuntimeError("Expected {} bytes but received {}".\
-                               format(self.size*self.dtype.itemsize, len(rep_msg)))
-        # Use struct to interpret bytes as a big-endian numeric array
-        fmt = '>{:n}{}'.format(self.size, structDtypeCodes[self.dtype.name])
-        # Return a numba devicendarray
-        return cuda.to_device(struct.unpack(fmt, rep_msg))
+        # Return a numba devicendarray copied directly from the received buffer
+        return cuda.to_device(_receive_ndarray("tondarray", self.name, self.dtype,
+                                               self.size))
+
+    @typechecked
+    def iter_chunks(self, chunk_bytes : Optional[int_scalars]=None) -> Iterator[np.ndarray]:
+        """
+        Iterate over the array as a sequence of np.ndarray chunks, transferring
+        one chunk at a time from the arkouda server, so that arrays larger than
+        client.maxTransferBytes can be streamed with bounded client memory.
+
+        Parameters
+        ----------
+        chunk_bytes : int_scalars
+            The maximum number of bytes per chunk, defaults to
+            client.maxTransferBytes. Each chunk holds at least one element.
+
+        Yields
+        ------
+        np.ndarray
+            Consecutive, non-overlapping slices of the array, in order
+
+        Raises
+        ------
+        ValueError
+            Raised if chunk_bytes is not positive
+        RuntimeError
+            Raised if there is a server-side error thrown in the course of
+            retrieving a chunk
+
+        See Also
+        --------
+        to_ndarray, array_from_chunks
+
+        Examples
+        --------
+        >>> a = ak.arange(0, 5, 1)
+        >>> [c for c in a.iter_chunks(16)]
+        [array([0, 1]), array([2, 3]), array([4])]
+        """
+        if chunk_bytes is None:
+            from arkouda.client import maxTransferBytes
+            chunk_bytes = maxTransferBytes
+        if chunk_bytes <= 0:
+            raise ValueError("chunk_bytes must be positive")
+        step = builtins.max(1, int(chunk_bytes) // self.dtype.itemsize)
+        for start in range(0, self.size, step):
+            yield self._slice_to_ndarray(start, builtins.min(start + step, self.size))
+
+    def _slice_to_ndarray(self, start : int, stop : int) -> np.ndarray:
+        """
+        Transfer elements [start, stop) of the array to a np.ndarray. Unlike
+        to_ndarray, no maxTransferBytes check is made; callers are expected
+        to bound the slice themselves.
+        """
+        return _receive_ndarray("tondarrayslice", "{} {} {}".format(self.name, start, stop),
+                                self.dtype, stop - start)
 
     @typechecked
-    def save(self, prefix_path : str, dataset : str='array', mode : str='truncate') -> str:
+    def save(self, prefix_path : str, dataset : str='array', mode : str='truncate',
+             compression : Optional[str]=None, compression_opts : Optional[int]=None,
+             shuffle : bool=False, chunk_elems : Optional[int]=None) -> str:
         """
         Save the pdarray to HDF5. The result is a collection of HDF5 files,
         one file per locale of the arkouda server, where each filename starts
@@ -987,9 +1227,26 @@ class pdarray:
             Directory and filename prefix that all output files share
         dataset : str
             Name of the dataset to create in HDF5 files (must not already exist)
-        mode : str {'truncate' | 'append'}
+        mode : str {'truncate' | 'append' | 'append_rows'}
             By default, truncate (overwrite) output files, if they exist.
             If 'append', attempt to create new dataset in existing files.
+            If 'append_rows', append the elements to the extendable dataset
+            of the existing files, creating the files and dataset if needed.
+        compression : Optional[str]
+            Compress the datasets with 'gzip', or leave them uncompressed
+            (default). The 'lzf' filter of h5py is not available to the
+            server and raises a ValueError.
+        compression_opts : Optional[int]
+            The gzip compression level, from 0 to 9, defaults to 4
+        shuffle : bool
+            If True, apply the HDF5 shuffle filter, which groups the bytes
+            of the elements by significance and makes sorted or slowly
+            varying integers such as IDs and timestamps compress much
+            better, defaults to False
+        chunk_elems : Optional[int]
+            The number of elements per HDF5 chunk of compressed or
+            shuffled datasets, defaults to about 1 MB. Giving it without
+            compression or shuffle writes a chunked, unfiltered dataset.
 
         Returns
         -------
@@ -1001,8 +1258,8 @@ class pdarray:
             Raised if a server-side error is thrown saving the pdarray
         ValueError
             Raised if there is an error in parsing the prefix path pointing to
-            file write location or if the mode parameter is neither truncate
-            nor append
+            file write location, if the mode parameter is not truncate,
+            append or append_rows, or if the compression options are invalid
         TypeError
             Raised if any one of the prefix_path, dataset, or mode parameters
             is not a string
@@ -1022,6 +1279,14 @@ class pdarray:
         and the number of output files is less than the number of locales or a
         dataset with the same name already exists, a ``RuntimeError`` will result.
 
+        If the mode is 'append_rows', each locale appends its chunk to the
+        dataset of its file, so that the arrays saved in turn are read back
+        by ``read_all`` as their concatenation, in an order of rows that
+        depends on the chunks. The first save creates the files and an
+        extendable, chunked dataset, which later saves with 'append_rows' grow;
+        datasets saved with another mode cannot grow. The number of locales
+        and the dtype must stay the same.
+
         Examples
         --------
         >>> a = ak.arange(0, 100, 1)
@@ -1034,13 +1299,17 @@ class pdarray:
         >>> b = ak.load('arkouda_range', dataset='array')
         >>> (a == b).all()
         True
+
+        Sorted IDs compress well once shuffled
+
+        >>> a.save('arkouda_range', compression='gzip', shuffle=True)
+
+        Hourly batches grow the datasets of the same files
+
+        >>> batch.save('/data/flows', dataset='srcIP', mode='append_rows')
         """
-        if mode.lower() in 'append':
-            m = 1
-        elif mode.lower() in 'truncate':
-            m = 0
-        else:
-            raise ValueError("Allowed modes are 'truncate' and 'append'")
+        storage = _hdf_storage_args(compression, compression_opts, shuffle, chunk_elems)
+        m = _hdf_write_mode(mode)
 
         """
         If offsets are provided, add to the json_array as the offsets will be used to 
@@ -1050,8 +1319,82 @@ class pdarray:
             json_array = json.dumps([prefix_path])
         except Exception as e:
             raise ValueError(e)
-        return cast(str, generic_msg(cmd="tohdf", args="{} {} {} {} {}".\
-                           format(self.name, dataset, m, json_array, self.dtype)))
+        return cast(str, generic_msg(cmd="tohdf", args="{} {} {} {} {} {}".\
+                           format(self.name, dataset, m, storage, json_array, self.dtype)))
+
+    @typechecked
+    def to_npy(self, path : str) -> str:
+        """
+        Save the pdarray to a NumPy .npy file, which numpy.load reads back
+        into an ndarray. Each locale of the arkouda server writes its chunk
+        of the array directly to the single output file, without passing
+        through the client.
+
+        Parameters
+        ----------
+        path : str
+            The file to write, which must be visible to all locales and is
+            replaced if it exists
+
+        Returns
+        -------
+        str
+            Message indicating the result of the save operation
+
+        Raises
+        ------
+        TypeError
+            Raised if path is not a str
+        RuntimeError
+            Raised if the file cannot be written or the dtype of the pdarray
+            is not supported
+
+        See Also
+        --------
+        to_binary, read_npy, save
+
+        Examples
+        --------
+        >>> a = ak.arange(0, 10, 1)
+        >>> a.to_npy('/shared/a.npy')
+        'wrote array to file'
+        >>> np.load('/shared/a.npy')
+        array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+        """
+        return cast(str, generic_msg(cmd="tobinary", args="{} npy {}".format(self.name, path)))
+
+    @typechecked
+    def to_binary(self, path : str) -> str:
+        """
+        Save the elements of the pdarray to a file in native byte order and
+        without any header, like numpy.ndarray.tofile, so that numpy.fromfile
+        or numpy.memmap can read it. Each locale of the arkouda server writes
+        its chunk of the array directly to the single output file.
+
+        Parameters
+        ----------
+        path : str
+            The file to write, which must be visible to all locales and is
+            replaced if it exists
+
+        Returns
+        -------
+        str
+            Message indicating the result of the save operation
+
+        Raises
+        ------
+        TypeError
+            Raised if path is not a str
+        RuntimeError
+            Raised if the file cannot be written or the dtype of the pdarray
+            is not supported
+
+        See Also
+        --------
+        to_npy, read_binary, save
+        """
+        return cast(str, generic_msg(cmd="tobinary", args="{} raw {}".format(self.name, path)))
 
     @typechecked
     def register(self, user_defined_name: str) -> pdarray:
@@ -1227,6 +1570,69 @@ def create_pdarray(repMsg : str) -> pdarray:
         Raised if a server-side error is thrown in the process of creating
         the pdarray instance
     """
+    if isinstance(repMsg, PendingReply):
+        # The command was queued by ak.batch(), so the array does not exist 
+        # yet; return a placeholder that is filled in when the batch is flushed
+        pda = pdarray.__new__(pdarray)
+        pda.name = str(repMsg)
+        pda._client = _current_client()
+        pda._placeholder = True
+        _track_placeholder(pda.name, weakref.WeakMethod(pda._resolve))
+        logger.debug("created placeholder for batched array {}".format(pda.name))
+        return pda
+    return pdarray(*_parse_created_msg(repMsg))
+
+def _create_elementwise(repMsg : str, operands : Sequence[Union[pdarray, str]],
+                        result_dtype : Callable[..., Optional[str]],
+                        size : Optional[int]=None) -> pdarray:
+    """
+    Return create_pdarray(repMsg) for an elementwise operation on operands,
+    pdarrays or the dtype names of scalars. If the command was queued by
+    ak.batch() and the attributes of the pdarray operands are known, the
+    placeholder gets the dtype result_dtype returns for the dtype names of
+    the operands, unless it is None, and the size of the operands, or size,
+    so that reading them does not flush the batch. The user should not call
+    this function directly.
+    """
+    pda = create_pdarray(repMsg)
+    if isinstance(repMsg, PendingReply):
+        arrays = [x for x in operands if isinstance(x, pdarray)]
+        if builtins.all('size' in x.__dict__ for x in arrays):
+            mydtype = result_dtype(*[x.dtype.name if isinstance(x, pdarray) else x 
+                                     for x in operands])
+            if mydtype is not None:
+                dt = dtype(mydtype)
+                if size is None:
+                    size = arrays[0].size
+                pda.__dict__.update(dtype=dt, size=size, ndim=1, shape=[size],
+                                    itemsize=dt.itemsize)
+    return pda
+
+def _binop_dtype(op : str, left : str, right : str) -> Optional[str]:
+    """
+    Return the name of the dtype the server gives the result of a binary
+    operation on operands of the given dtype names, or None if the client
+    does not predict it.
+    """
+    if op in ("<", ">", "<=", ">=", "==", "!="):
+        return 'bool'
+    if left == right == 'bool' and op in ("&", "|", "^"):
+        return 'bool'
+    if left not in ('int64', 'float64') or right not in ('int64', 'float64'):
+        return None
+    if op == "/":
+        return 'float64'
+    if left == right == 'int64':
+        return 'int64'
+    if op in ("+", "-", "*", "//", "%", "**"):
+        return 'float64'
+    return None
+
+def _parse_created_msg(repMsg : str) -> Tuple[str, str, int, int, List[int], int]:
+    """
+    Parse the name, dtype, size, ndim, shape and itemsize of a pdarray from 
+    a "created" reply message. The user should not call this function directly.
+    """
     try:
         fields = repMsg.split()
         name = fields[1]
@@ -1239,7 +1645,7 @@ def create_pdarray(repMsg : str) -> pdarray:
         raise ValueError(e)
     logger.debug(("created Chapel array with name: {} dtype: {} size: {} ndim: {} shape: {} " +
                   "itemsize: {}").format(name, mydtype, size, ndim, shape, itemsize))
-    return pdarray(name, mydtype, size, ndim, shape, itemsize)
+    return name, mydtype, size, ndim, shape, itemsize
 
 def clear() -> None:
     """
@@ -1256,6 +1662,20 @@ def clear() -> None:
     """
     generic_msg(cmd="clear")
 
+def _reduction(pda : pdarray, op : str) -> numpy_scalars:
+    """
+    Return the result of a reduction of pda, from the reduction cache if it
+    was computed since pda was last modified.
+    """
+    def compute() -> numpy_scalars:
+        repMsg = generic_msg(cmd="reduction", args="{} {}".format(op, pda.name))
+        return parse_single_value(cast(str,repMsg))
+    # The name of a placeholder of ak.batch() only becomes final when the
+    # batch is sent
+    if batchPlaceholderPattern.fullmatch(pda.name):
+        return compute()
+    return pda._client.arrayCache.cached_reduction(pda.name, op, compute)
+
 @typechecked
 def any(pda : pdarray) -> np.bool_:
     """
@@ -1278,8 +1698,7 @@ def any(pda : pdarray) -> np.bool_:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("any", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "any")
 
 @typechecked
 def all(pda : pdarray) -> np.bool_:
@@ -1303,8 +1722,7 @@ def all(pda : pdarray) -> np.bool_:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("all", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "all")
 
 @typechecked
 def is_sorted(pda : pdarray) -> np.bool_:
@@ -1328,8 +1746,7 @@ def is_sorted(pda : pdarray) -> np.bool_:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("is_sorted", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "is_sorted")
 
 @typechecked
 def sum(pda : pdarray) -> np.float64:
@@ -1353,8 +1770,7 @@ def sum(pda : pdarray) -> np.float64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("sum", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "sum")
 
 @typechecked
 def prod(pda : pdarray) -> np.float64:
@@ -1379,9 +1795,7 @@ def prod(pda : pdarray) -> np.float64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("prod", pda.name))
-    
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "prod")
 
 def min(pda : pdarray) -> numpy_scalars:
     """
@@ -1404,8 +1818,7 @@ def min(pda : pdarray) -> numpy_scalars:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction",args="{} {}".format("min", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "min")
 
 @typechecked
 def max(pda : pdarray) -> numpy_scalars:
@@ -1429,8 +1842,7 @@ def max(pda : pdarray) -> numpy_scalars:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("max", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "max")
 
 @typechecked
 def argmin(pda : pdarray) -> np.int64:
@@ -1454,8 +1866,7 @@ def argmin(pda : pdarray) -> np.int64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("argmin", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "argmin")
 
 @typechecked
 def argmax(pda : pdarray) -> np.int64:
@@ -1479,8 +1890,7 @@ def argmax(pda : pdarray) -> np.int64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("argmax", pda.name))
-    return parse_single_value(cast(str,repMsg))
+    return _reduction(pda, "argmax")
 
 @typechecked
 def mean(pda : pdarray) -> np.float64:
@@ -1550,8 +1960,10 @@ def var(pda : pdarray, ddof : int_scalars=0) -> np.float64:
     """
     if ddof >= pda.size:
         raise ValueError("var: ddof must be less than number of values")
-    m = mean(pda)
-    return ((pda - m)**2).sum() / (pda.size - ddof)
+    def compute() -> np.float64:
+        m = mean(pda)
+        return ((pda - m)**2).sum() / (pda.size - ddof)
+    return pda._client.arrayCache.cached_reduction(pda.name, "var {}".format(ddof), compute)
 
 @typechecked
 def std(pda : pdarray, ddof : int_scalars=0) -> np.float64:
@@ -1863,6 +2275,47 @@ def attach_pdarray(user_defined_name: str) -> pdarray:
     return create_pdarray(repMsg)
 
 
+def _hdf_storage_args(compression : Optional[str], compression_opts : Optional[int],
+                      shuffle : bool, chunk_elems : Optional[int]) -> str:
+    """
+    Validates the HDF5 compression options of save methods and returns
+    them as the "<compression> <shuffle> <chunk_elems>" arguments of the
+    tohdf command. The user should not call this function directly.
+    """
+    if compression is None:
+        if compression_opts is not None:
+            raise ValueError("compression_opts requires compression")
+        codec = 'none'
+    elif compression == 'gzip':
+        level = 4 if compression_opts is None else compression_opts
+        if not 0 <= level <= 9:
+            raise ValueError("gzip compression_opts must be a level from 0 to 9")
+        codec = 'gzip:{}'.format(level)
+    elif compression == 'lzf':
+        raise ValueError("lzf compression is specific to h5py and not available " +
+                         "to the arkouda server, use 'gzip' instead")
+    else:
+        raise ValueError("Unsupported compression {}, must be 'gzip' or None".\
+                         format(compression))
+    if chunk_elems is not None and chunk_elems <= 0:
+        raise ValueError("chunk_elems must be positive")
+    return '{} {} {}'.format(codec, shuffle, 0 if chunk_elems is None else chunk_elems)
+
+def _hdf_write_mode(mode : str) -> int:
+    """
+    Returns the tohdf mode of the mode of save methods: 0 for 'truncate',
+    1 for 'append' and 2 for 'append_rows'. The user should not call this
+    function directly.
+    """
+    if mode.lower() == 'append_rows':
+        return 2
+    elif mode.lower() in 'append':
+        return 1
+    elif mode.lower() in 'truncate':
+        return 0
+    else:
+        raise ValueError("Allowed modes are 'truncate', 'append' and 'append_rows'")
+
 @typechecked
 def unregister_pdarray_by_name(user_defined_name:str) -> None:
     """
@@ -1,23 +1,26 @@
+import os, tempfile
 import numpy as np # type: ignore
-import pandas as pd # type: ignore
-import struct
 from typing import cast, Iterable, Optional, Union
-from typeguard import typechecked
-from arkouda.client import generic_msg
-from arkouda.dtypes import structDtypeCodes, NUMBER_FORMAT_STRINGS, float64, int64, \
+from arkouda.typecheck import typechecked
+from arkouda.client import generic_msg, _transfer_codec, _shared_memory_dir
+from arkouda.dtypes import NUMBER_FORMAT_STRINGS, float64, int64, \
      DTypes, isSupportedInt, isSupportedNumber, NumericDTypes, SeriesDTypes,\
     int_scalars, numeric_scalars
 from arkouda.dtypes import dtype as akdtype
-from arkouda.pdarrayclass import pdarray, create_pdarray
+from arkouda.pdarrayclass import pdarray, create_pdarray, _compress_ndarray
 from arkouda.strings import Strings, SArrays
+from arkouda.lazyimport import lazy_import
+
+pd = lazy_import('pandas')
 
 __all__ = ["array", "zeros", "ones", "zeros_like", "ones_like", 
            "arange", "linspace", "randint", "uniform", "standard_normal",
            "random_strings_uniform", "random_strings_lognormal", 
-           "from_series", "suffix_array","lcp_array","suffix_array_file"]
+           "from_series", "suffix_array","lcp_array","suffix_array_file",
+           "array_from_chunks"]
 
 @typechecked
-def from_series(series : pd.Series, 
+def from_series(series : 'pd.Series', 
                     dtype : Optional[Union[type,str]]=None) -> Union[pdarray,Strings]:
     """
     Converts a Pandas Series to an Arkouda pdarray or Strings object. If
@@ -177,21 +180,19 @@ def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
         raise RuntimeError("Only rank-1 pdarrays or ndarrays supported")
     # Check if array of strings
     if a.dtype.kind == 'U' or  'U' in a.dtype.kind:
-        encoded = np.array([elem.encode() for elem in a])
-        # Length of each string, plus null byte terminator
-        lengths = np.array([len(elem) for elem in encoded]) + 1
+        encoded = [elem.encode('utf-8') for elem in a.tolist()]
+        # Length of each string in bytes, plus null byte terminator
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)) + 1
         # Compute zero-up segment offsets
         offsets = np.cumsum(lengths) - lengths
-        # Allocate and fill bytes array with string segments
-        nbytes = offsets[-1] + lengths[-1]
+        nbytes = int(lengths.sum())
         if nbytes > maxTransferBytes:
             raise RuntimeError(("Creating pdarray would require transferring {} bytes," +
                                 " which exceeds allowed transfer size. Increase " +
                                 "ak.maxTransferBytes to force.").format(nbytes))
-        values = np.zeros(nbytes, dtype=np.uint8)
-        for s, o in zip(encoded, offsets):
-            for i, b in enumerate(s):
-                values[o+i] = b
+        # Join the null-terminated segments into one bytes array
+        values = np.frombuffer(b'\x00'.join(encoded) + b'\x00' if encoded else b'',
+                               dtype=np.uint8)
         # Recurse to create pdarrays for offsets and values, then return Strings object
         return Strings(cast(pdarray, array(offsets)), cast(pdarray, array(values)))
     # If not strings, then check that dtype is supported in arkouda
@@ -202,13 +203,87 @@ def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
     if (size * a.itemsize) > maxTransferBytes:
         raise RuntimeError(("Array exceeds allowed transfer size. Increase " +
                             "ak.maxTransferBytes to allow"))
-    # Pack binary array data into a bytes object with a command header
-    # including the dtype and size
-    fmt = ">{:n}{}".format(size, structDtypeCodes[a.dtype.name])
-    req_msg = "{} {:n} ".\
-                    format(a.dtype.name, size).encode() + struct.pack(fmt, *a)
-    repMsg = generic_msg(cmd='array', args=req_msg, send_bytes=True)
-    return create_pdarray(repMsg)
+    # Send the array buffer as raw little-endian bytes, which on little-endian
+    # clients is the ndarray's own memory, with the dtype and size as args
+    a = np.ascontiguousarray(a, dtype=a.dtype.newbyteorder('<'))
+    shm_dir = _shared_memory_dir(size * a.itemsize)
+    codec = _transfer_codec(size * a.itemsize)
+    if shm_dir is not None:
+        # The server reads the array from a file in shared memory
+        fd, path = tempfile.mkstemp(prefix='arkouda_', dir=shm_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                a.tofile(f)
+            repMsg = generic_msg(cmd='arrayshm', args="{} {:n} {}".format(a.dtype.name,
+                                 size, path))
+        finally:
+            os.unlink(path)
+    elif codec is None:
+        repMsg = generic_msg(cmd='array', args="{} {:n}".format(a.dtype.name, size), 
+                             payload=memoryview(a))
+    else:
+        # The codec follows the dtype and size so the server decompresses
+        repMsg = generic_msg(cmd='array', args="{} {:n} {}".format(a.dtype.name, size,
+                             codec), payload=_compress_ndarray(a, codec))
+    return create_pdarray(cast(str,repMsg))
+
+def array_from_chunks(chunks : Iterable) -> Union[pdarray, Strings]:
+    """
+    Build a pdarray or Strings object from an iterable of array-like chunks,
+    sending each chunk to the arkouda server as soon as it is produced. Only
+    one chunk is held client-side at a time, so generator-produced data can
+    be ingested without first building one large np.ndarray.
+
+    Parameters
+    ----------
+    chunks : Iterable
+        An iterable (e.g. a generator) of rank-1 array-likes accepted by
+        ak.array, all of the same dtype. Each chunk is subject to the
+        ak.maxTransferBytes limit, but their total is not.
+
+    Returns
+    -------
+    pdarray or Strings
+        The concatenation of all chunks, in order
+
+    Raises
+    ------
+    ValueError
+        Raised if chunks is empty or the chunks do not share a dtype, as
+        soon as the first differing chunk has been uploaded
+    TypeError
+        Raised if a chunk cannot be converted by ak.array
+    RuntimeError
+        Raised if a chunk exceeds ak.maxTransferBytes
+
+    See Also
+    --------
+    array, pdarray.iter_chunks, Strings.iter_chunks
+
+    Notes
+    -----
+    The chunks are uploaded as separate server-side arrays and concatenated
+    once all of them have arrived, so the server briefly holds two copies
+    of the data.
+
+    Examples
+    --------
+    >>> ak.array_from_chunks(np.arange(i, i+3) for i in range(0, 9, 3))
+    array([0, 1, 2, 3, 4, 5, 6, 7, 8])
+    """
+    from arkouda.pdarraysetops import concatenate
+    parts : list = []
+    for chunk in chunks:
+        part = array(chunk)
+        if parts and (type(part) is not type(parts[0]) or part.dtype != parts[0].dtype):
+            raise ValueError("chunk {} has dtype {}, but the first chunk has dtype {}".\
+                             format(len(parts), part.dtype, parts[0].dtype))
+        parts.append(part)
+    if len(parts) == 0:
+        raise ValueError("array_from_chunks requires at least one chunk")
+    if len(parts) == 1:
+        return parts[0]
+    return concatenate(parts)
 
 def zeros(size : int_scalars, dtype : type=np.float64) -> pdarray:
     """
@@ -0,0 +1,265 @@
+import csv, json, sys, time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+__all__ = ["profile", "enable_profiling", "disable_profiling", "Profile",
+           "ProfileRecord"]
+
+"""
+The ProfileRecord class captures one request sent to the Arkouda server:
+the command, the size of the request and of the reply, the time spent
+waiting for the reply and in the client, and the code that sent it.
+"""
+@dataclass(frozen=True)
+class ProfileRecord():
+    # name of the server command
+    cmd: str
+    # bytes sent, including the request header and any binary payload
+    request_bytes: int
+    # bytes of the reply
+    reply_bytes: int
+    # seconds from sending the request to receiving the reply
+    roundtrip: float
+    # seconds spent encoding the request and decoding the reply
+    client_time: float
+    # outermost arkouda function involved, e.g. arkouda.pdarrayclass.sum
+    api: str
+    # "file:line (function)" of the code that called into arkouda
+    callsite: str
+
+PROFILE_GROUPINGS = ("cmd", "api", "callsite")
+
+class Profile:
+    """
+    The requests recorded while profiling was enabled, which can be
+    aggregated by command, arkouda function or call site and exported as
+    JSON or CSV.
+
+    Attributes
+    ----------
+    records : List[ProfileRecord]
+        The recorded requests, in the order they were sent
+    """
+
+    def __init__(self) -> None:
+        self.records : List[ProfileRecord] = []
+
+    def summary(self, by : str='cmd') -> List[Dict[str, Union[str, int, float]]]:
+        """
+        Aggregates the records sharing the same command, arkouda function or
+        call site.
+
+        Parameters
+        ----------
+        by : str
+            The field to group records by, one of 'cmd', 'api' or 'callsite',
+            defaults to 'cmd'
+
+        Returns
+        -------
+        List[Dict[str, Union[str, int, float]]]
+            One row per group with the number of requests, total request and
+            reply bytes, total and mean round-trip time and total client time,
+            ordered by decreasing total round-trip time
+
+        Raises
+        ------
+        ValueError
+            Raised if by is not a supported grouping
+        """
+        if by not in PROFILE_GROUPINGS:
+            raise ValueError('by must be one of {}'.format(PROFILE_GROUPINGS))
+        groups : Dict[str, Dict[str, Union[str, int, float]]] = {}
+        for record in self.records:
+            key = getattr(record, by)
+            row = groups.get(key)
+            if row is None:
+                row = groups[key] = {by : key, 'count' : 0, 'request_bytes' : 0,
+                                     'reply_bytes' : 0, 'roundtrip' : 0.0,
+                                     'client_time' : 0.0}
+            row['count'] += 1 # type: ignore
+            row['request_bytes'] += record.request_bytes # type: ignore
+            row['reply_bytes'] += record.reply_bytes # type: ignore
+            row['roundtrip'] += record.roundtrip # type: ignore
+            row['client_time'] += record.client_time # type: ignore
+        rows = sorted(groups.values(), key=lambda r: r['roundtrip'], reverse=True)
+        for row in rows:
+            row['mean_roundtrip'] = float(row['roundtrip']) / float(row['count'])
+        return rows
+
+    def table(self, by : str='cmd') -> str:
+        """
+        Formats the summary of the records as a text table.
+
+        Parameters
+        ----------
+        by : str
+            The field to group records by, one of 'cmd', 'api' or 'callsite',
+            defaults to 'cmd'
+
+        Returns
+        -------
+        str
+            The summary with one line per group, times in milliseconds
+        """
+        lines = ['{:<40} {:>7} {:>12} {:>12} {:>12} {:>10} {:>12}'.format(
+                 by, 'count', 'req bytes', 'reply bytes', 'rtt ms', 'mean ms',
+                 'client ms')]
+        for row in self.summary(by):
+            lines.append('{:<40} {:>7} {:>12} {:>12} {:>12.3f} {:>10.3f} {:>12.3f}'.\
+                         format(str(row[by])[-40:], row['count'], row['request_bytes'],
+                                row['reply_bytes'], float(row['roundtrip'])*1e3,
+                                float(row['mean_roundtrip'])*1e3,
+                                float(row['client_time'])*1e3))
+        return '\n'.join(lines)
+
+    def __str__(self) -> str:
+        return self.table()
+
+    def to_json(self, path : str, by : Optional[str]=None) -> None:
+        """
+        Writes the records, or their summary if by is given, to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The file to write
+        by : Optional[str]
+            The grouping of the summary to write, if any, defaults to None
+
+        Returns
+        -------
+        None
+        """
+        with open(path, 'w') as f:
+            json.dump(self._rows(by), f, indent=2)
+
+    def to_csv(self, path : str, by : Optional[str]=None) -> None:
+        """
+        Writes the records, or their summary if by is given, to a CSV file.
+
+        Parameters
+        ----------
+        path : str
+            The file to write
+        by : Optional[str]
+            The grouping of the summary to write, if any, defaults to None
+
+        Returns
+        -------
+        None
+        """
+        if by is None:
+            header = [field.name for field in fields(ProfileRecord)]
+        else:
+            header = [by, 'count', 'request_bytes', 'reply_bytes', 'roundtrip',
+                      'mean_roundtrip', 'client_time']
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(self._rows(by))
+
+    def _rows(self, by : Optional[str]) -> List[Dict[str, Union[str, int, float]]]:
+        if by is None:
+            return [asdict(record) for record in self.records]
+        return self.summary(by)
+
+# profiles receiving the records of the requests sent by all clients
+activeProfiles : List[Profile] = []
+# profile started by enable_profiling, if any
+enabledProfile : Optional[Profile] = None
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    Context manager that records every request sent to the Arkouda server
+    within its block.
+
+    Yields
+    ------
+    Profile
+        The profile receiving the records
+
+    Examples
+    --------
+    >>> with ak.profile() as p:
+    ...     a = ak.arange(0, 10, 1)
+    ...     s = (a * 2).sum()
+    >>> print(p.table())
+    cmd                                        count    req bytes  reply bytes       rtt ms    mean ms    client ms
+    reduction                                      1          101           11        0.412      0.412        0.030
+    arange                                         1           98           47        0.398      0.398        0.041
+    binopvs                                        1          103           47        0.377      0.377        0.036
+    """
+    p = Profile()
+    activeProfiles.append(p)
+    try:
+        yield p
+    finally:
+        activeProfiles.remove(p)
+
+def enable_profiling() -> Profile:
+    """
+    Starts recording every request sent to the Arkouda server until
+    disable_profiling is called.
+
+    Returns
+    -------
+    Profile
+        The profile receiving the records
+    """
+    global enabledProfile
+    if enabledProfile is None:
+        enabledProfile = Profile()
+        activeProfiles.append(enabledProfile)
+    return enabledProfile
+
+def disable_profiling() -> Optional[Profile]:
+    """
+    Stops the recording started by enable_profiling.
+
+    Returns
+    -------
+    Optional[Profile]
+        The profile holding the records, None if profiling was not enabled
+    """
+    global enabledProfile
+    p, enabledProfile = enabledProfile, None
+    if p is not None:
+        activeProfiles.remove(p)
+    return p
+
+def _caller() -> Tuple[str, str]:
+    """
+    Returns the outermost arkouda function on the stack and the location of
+    the code that called it.
+    """
+    frame = sys._getframe(1)
+    api = ''
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('arkouda') and module != 'arkouda.typecheck':
+            api = '{}.{}'.format(module, frame.f_code.co_name)
+        elif not module.startswith(('arkouda', 'typeguard', 'contextlib')):
+            break
+        frame = frame.f_back
+    if frame is None:
+        return api, ''
+    return api, '{}:{} ({})'.format(frame.f_code.co_filename, frame.f_lineno,
+                                    frame.f_code.co_name)
+
+def _record(cmd : str, request_bytes : int, reply_bytes : int, start : float,
+            sent : float, received : float) -> None:
+    """
+    Adds a record of a request to the active profiles, given the times at
+    which its encoding started, it was sent and its reply was received.
+    """
+    end = time.perf_counter()
+    api, callsite = _caller()
+    record = ProfileRecord(cmd=cmd, request_bytes=request_bytes,
+                           reply_bytes=reply_bytes, roundtrip=received - sent,
+                           client_time=(sent - start) + (end - received),
+                           api=api, callsite=callsite)
+    for p in list(activeProfiles):
+        p.records.append(record)
@@ -2,7 +2,7 @@ import os, platform, secrets, json
 from os.path import expanduser
 from pathlib import Path
 from collections import defaultdict 
-from typeguard import typechecked
+from arkouda.typecheck import typechecked
 from arkouda import io_util
 
 username_tokenizer = defaultdict(lambda x : x.split('/')) #type: ignore
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import cast, Sequence, Union
-from typeguard import typechecked, check_type
+from typeguard import check_type
+from arkouda.typecheck import typechecked
 from arkouda.client import generic_msg
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.pdarraycreation import zeros
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import itertools
-from typing import cast, Tuple, List, Optional, Union
-from typeguard import typechecked
+from typing import cast, Iterator, Tuple, List, Optional, Union
+from arkouda.typecheck import typechecked
 from arkouda.client import generic_msg
 from arkouda.pdarrayclass import pdarray, create_pdarray, parse_single_value, \
-     _parse_single_int_array_value, unregister_pdarray_by_name, RegistrationError
+     _parse_single_int_array_value, unregister_pdarray_by_name, RegistrationError, \
+     _hdf_storage_args, _hdf_write_mode
 from arkouda.logger import getArkoudaLogger
 import numpy as np # type: ignore
 from arkouda.dtypes import npstr, int_scalars, str_scalars
@@ -766,7 +767,7 @@ class Strings:
 
         See Also
         --------
-        array
+        array, iter_chunks
 
         Examples
         --------
@@ -780,19 +781,107 @@ class Strings:
         npoffsets = np.hstack((self.offsets.to_ndarray(), np.array([self.nbytes])))
         # Get contents of strings (will error if too large)
         npvalues = self.bytes.to_ndarray()
-        # Compute lengths, discounting null terminators
-        lengths = np.diff(npoffsets) - 1
-        # Numpy dtype is based on max string length
-        dt = '<U{}'.format(lengths.max())
-        res = np.empty(self.size, dtype=dt)
-        # Form a string from each segment and store in numpy array
-        for i, (o, l) in enumerate(zip(npoffsets, lengths)):
-            res[i] = np.str_(''.join(chr(b) for b in npvalues[o:o+l]))
-        return res
+        return Strings._decode_segments(npoffsets, npvalues)
+
+    @typechecked
+    def iter_chunks(self, chunk_bytes : Optional[int_scalars]=None) -> Iterator[np.ndarray]:
+        """
+        Iterate over the strings as a sequence of np.ndarray chunks, transferring
+        one chunk at a time from the arkouda server, so that Strings larger than
+        ak.maxTransferBytes can be streamed with bounded client memory.
+
+        Parameters
+        ----------
+        chunk_bytes : int_scalars
+            The maximum number of bytes (string bytes plus offsets) per chunk,
+            defaults to ak.maxTransferBytes. Each chunk holds at least one
+            string, so a single string longer than chunk_bytes is returned in
+            a chunk of its own.
+
+        Yields
+        ------
+        np.ndarray
+            Consecutive, non-overlapping slices of the strings, in order
+
+        Raises
+        ------
+        ValueError
+            Raised if chunk_bytes is not positive
+        RuntimeError
+            Raised if there is a server-side error thrown in the course of
+            retrieving a chunk
+
+        See Also
+        --------
+        to_ndarray, array_from_chunks
+
+        Examples
+        --------
+        >>> a = ak.array(["hello", "my", "world"])
+        >>> [c for c in a.iter_chunks(24)]
+        [array(['hello'], dtype='<U5'), array(['my'], dtype='<U2'),
+         array(['world'], dtype='<U5')]
+        """
+        if chunk_bytes is None:
+            from arkouda.client import maxTransferBytes
+            chunk_bytes = maxTransferBytes
+        if chunk_bytes <= 0:
+            raise ValueError("chunk_bytes must be positive")
+        itemsize = self.offsets.itemsize
+        # At most this many strings fit in a chunk, so a window of as many
+        # offsets is enough to find where the chunk ends
+        window = max(1, int(chunk_bytes) // itemsize)
+        base, bounds = 0, np.zeros(1, dtype=np.int64)
+        start = 0
+        while start < self.size:
+            if start + 1 >= base + bounds.size:
+                base, bounds = start, self._offset_bounds(start, window)
+            b = bounds[start - base:]
+            # Bytes of the chunks made of the next 1, 2, ... strings
+            cost = b[1:] - b[0] + itemsize * np.arange(1, b.size)
+            n = max(1, int(np.searchsorted(cost, chunk_bytes, side='right')))
+            if n == b.size - 1 and start > base and base + bounds.size - 1 < self.size:
+                # More strings may fit beyond the window, slide it to start
+                base, bounds = start, self._offset_bounds(start, window)
+                continue
+            npvalues = self.bytes._slice_to_ndarray(b[0], b[n])
+            yield Strings._decode_segments(b[:n + 1] - b[0], npvalues)
+            start += n
+
+    def _offset_bounds(self, start : int, count : int) -> np.ndarray:
+        """
+        Transfer the offsets of up to count strings from start on, followed by
+        the offset (or nbytes) bounding the last of them.
+        """
+        stop = min(start + count, self.size)
+        if stop < self.size:
+            return self.offsets._slice_to_ndarray(start, stop + 1)
+        return np.hstack((self.offsets._slice_to_ndarray(start, stop),
+                          np.array([self.nbytes])))
+
+    @staticmethod
+    def _decode_segments(npoffsets : np.ndarray, npvalues : np.ndarray) -> np.ndarray:
+        """
+        Convert null-terminated UTF-8 string segments to a np.ndarray of str.
+        The npoffsets array holds one more entry than there are strings, the
+        last being the total number of bytes in npvalues; it is used to check
+        that the expected number of strings was decoded.
+        """
+        # Segments are contiguous and null-terminated, so decode the whole
+        # buffer at once and split on the terminators
+        segments = npvalues.tobytes().decode('utf-8', errors='replace').split('\x00')
+        # The final terminator leaves an empty trailing segment
+        segments.pop()
+        if len(segments) != npoffsets.size - 1:
+            raise RuntimeError("Expected {} strings but received {}".\
+                               format(npoffsets.size - 1, len(segments)))
+        return np.array(segments, dtype=np.str_)
 
     @typechecked
     def save(self, prefix_path : str, dataset : str='strings_array', 
-             mode : str='truncate') -> str:
+             mode : str='truncate', compression : Optional[str]=None,
+             compression_opts : Optional[int]=None, shuffle : bool=False,
+             chunk_elems : Optional[int]=None) -> str:
         """
         Save the Strings object to HDF5. The result is a collection of HDF5 files,
         one file per locale of the arkouda server, where each filename starts
@@ -805,9 +894,26 @@ class Strings:
             Directory and filename prefix that all output files share
         dataset : str
             The name of the Strings dataset to be written, defaults to strings_array
-        mode : str {'truncate' | 'append'}
+        mode : str {'truncate' | 'append' | 'append_rows'}
             By default, truncate (overwrite) output files, if they exist.
             If 'append', create a new Strings dataset within existing files.
+            If 'append_rows', append the strings to the extendable Strings
+            dataset of the existing files, see pdarray.save.
+        compression : Optional[str]
+            Compress the values and segments datasets with 'gzip', or leave them uncompressed
+            (default). The 'lzf' filter of h5py is not available to the
+            server and raises a ValueError.
+        compression_opts : Optional[int]
+            The gzip compression level, from 0 to 9, defaults to 4
+        shuffle : bool
+            If True, apply the HDF5 shuffle filter, which groups the bytes
+            of the elements by significance and makes sorted or slowly
+            varying integers such as IDs and timestamps compress much
+            better, defaults to False
+        chunk_elems : Optional[int]
+            The number of elements per HDF5 chunk of compressed or
+            shuffled datasets, defaults to about 1 MB. Giving it without
+            compression or shuffle writes a chunked, unfiltered dataset.
 
         Returns
         -------
@@ -816,8 +922,9 @@ class Strings:
         Raises
         ------
         ValueError 
-            Raised if the lengths of columns and values differ, or the mode is 
-            neither 'truncate' nor 'append'
+            Raised if the lengths of columns and values differ, the mode is 
+            not 'truncate', 'append' or 'append_rows', or the compression
+            options are invalid
         TypeError
             Raised if prefix_path, dataset, or mode is not a str
 
@@ -832,20 +939,16 @@ class Strings:
         segments corresponding to the start of each string, (2) the hdf5 group is named 
         via the dataset parameter. 
         """       
-        if mode.lower() in 'append':
-            m = 1
-        elif mode.lower() in 'truncate':
-            m = 0
-        else:
-            raise ValueError("Allowed modes are 'truncate' and 'append'")
+        storage = _hdf_storage_args(compression, compression_opts, shuffle, chunk_elems)
+        m = _hdf_write_mode(mode)
 
         try:
             json_array = json.dumps([prefix_path])
         except Exception as e:
             raise ValueError(e)
         
-        return cast(str, generic_msg(cmd="tohdf", args="{} {} {} {} {} {}".\
-                           format(self.bytes.name, dataset, m, json_array, 
+        return cast(str, generic_msg(cmd="tohdf", args="{} {} {} {} {} {} {}".\
+                           format(self.bytes.name, dataset, m, storage, json_array, 
                                   self.dtype, self.offsets.name)))
         
 
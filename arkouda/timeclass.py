@@ -1,11 +1,13 @@
 from arkouda.pdarrayclass import pdarray
-from pandas import Series, Timestamp, Timedelta as pdTimedelta, date_range as pd_date_range, timedelta_range as pd_timedelta_range, to_datetime, to_timedelta # type: ignore
 from arkouda.dtypes import int64, isSupportedInt
 from arkouda.pdarraycreation import from_series, array as ak_array
 from arkouda.numeric import cast, abs as akabs
 import numpy as np # type: ignore
 import datetime
 from typing import Union
+from arkouda.lazyimport import lazy_import
+
+pd = lazy_import('pandas')
 
 _BASE_UNIT = 'ns'
 
@@ -48,9 +50,9 @@ def _identity(x, **kwargs):
 class _Timescalar:
     def __init__(self, scalar):
         if isinstance(scalar, np.datetime64) or isinstance(scalar, datetime.datetime):
-            scalar = to_datetime(scalar).to_numpy()
+            scalar = pd.to_datetime(scalar).to_numpy()
         elif isinstance(scalar, np.timedelta64) or isinstance(scalar, datetime.timedelta):
-            scalar = to_timedelta(scalar).to_numpy()
+            scalar = pd.to_timedelta(scalar).to_numpy()
         self.unit = np.datetime_data(scalar.dtype)[0]
         self._factor = _get_factor(self.unit)
         # int64 in nanoseconds
@@ -85,7 +87,7 @@ class _AbstractBaseTime(pdarray):
             if array.dtype.kind not in ('M', 'm'):
                 # M = datetime64, m = timedelta64
                 raise TypeError("Invalid dtype: {}".format(array.dtype.name))
-            if isinstance(array, Series):
+            if isinstance(array, pd.Series):
                 # Pandas Datetime and Timedelta
                 # Get units of underlying numpy datetime64 array
                 self.unit = np.datetime_data(array.values.dtype)[0]
@@ -101,7 +103,7 @@ class _AbstractBaseTime(pdarray):
             elif isinstance(array, np.ndarray):
                 # Numpy datetime64 and timedelta64
                 # Force through pandas.Series
-                self.__init__(to_datetime(array).to_series()) # type: ignore
+                self.__init__(pd.to_datetime(array).to_series()) # type: ignore
             elif hasattr(array, 'to_series'):
                 # Pandas DatetimeIndex
                 # Force through pandas.Series
@@ -272,13 +274,13 @@ class _AbstractBaseTime(pdarray):
 
     @staticmethod
     def _is_datetime_scalar(scalar):
-        return (isinstance(scalar, Timestamp) or
+        return (isinstance(scalar, pd.Timestamp) or
                 (isinstance(scalar, np.datetime64) and np.isscalar(scalar)) or
                 isinstance(scalar, datetime.datetime))
 
     @staticmethod
     def _is_timedelta_scalar(scalar):
-        return (isinstance(scalar, pdTimedelta) or
+        return (isinstance(scalar, pd.Timedelta) or
                 (isinstance(scalar, np.timedelta64) and np.isscalar(scalar)) or
                 isinstance(scalar, datetime.timedelta))
 
@@ -378,7 +380,7 @@ class Datetime(_AbstractBaseTime):
     
     def _scalar_callback(self, scalar):
         # Formats a scalar return value as pandas Timestamp
-        return Timestamp(int(scalar), unit=_BASE_UNIT)
+        return pd.Timestamp(int(scalar), unit=_BASE_UNIT)
 
     @staticmethod
     def _is_supported_scalar(scalar):
@@ -393,7 +395,7 @@ class Datetime(_AbstractBaseTime):
         --------
         to_ndarray
         '''
-        return to_datetime(self.to_ndarray())
+        return pd.to_datetime(self.to_ndarray())
 
     def sum(self):
         raise TypeError("Cannot sum datetime64 values")
@@ -450,7 +452,7 @@ class Timedelta(_AbstractBaseTime):
     
     def _scalar_callback(self, scalar):
         # Formats a returned scalar as a pandas.Timedelta
-        return pdTimedelta(int(scalar), unit=_BASE_UNIT)
+        return pd.Timedelta(int(scalar), unit=_BASE_UNIT)
 
     @staticmethod
     def _is_supported_scalar(scalar):
@@ -464,7 +466,7 @@ class Timedelta(_AbstractBaseTime):
         --------
         to_ndarray
         '''
-        return to_timedelta(self.to_ndarray())
+        return pd.to_timedelta(self.to_ndarray())
 
     def std(self, ddof: Union[int, np.int64] = 0):
         '''
@@ -529,7 +531,7 @@ def date_range(start=None, end=None, periods=None, freq=None,
     <https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases>`__.
 
     '''
-    return Datetime(pd_date_range(start, end, periods, freq,
+    return Datetime(pd.date_range(start, end, periods, freq,
                                   tz, normalize, name, closed, **kwargs))
 
 def timedelta_range(start=None, end=None, periods=None, freq=None,
@@ -568,5 +570,5 @@ def timedelta_range(start=None, end=None, periods=None, freq=None,
     To learn more about the frequency strings, please see `this link
     <https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases>`__.
     '''
-    return Timedelta(pd_timedelta_range(start, end, periods, freq,
+    return Timedelta(pd.timedelta_range(start, end, periods, freq,
                                   name, closed, **kwargs))
@@ -0,0 +1,76 @@
+import functools, os, sys
+from typing import Any, Callable, Dict, Optional
+import typeguard # type: ignore
+
+__all__ = ["set_typecheck", "get_typecheck"]
+
+# whether the arguments and return values of the functions decorated with
+# typechecked are checked, on unless ARKOUDA_TYPECHECK is set to false or 0
+typecheckEnabled = os.getenv('ARKOUDA_TYPECHECK', 'true').lower() not in \
+                                                        ('false', '0', 'no', 'off')
+
+def typechecked(func : Optional[Callable]=None) -> Any:
+    """
+    Drop-in replacement of typeguard.typechecked, for functions and methods,
+    whose checks can be turned off with set_typecheck. The decorated
+    function calls either the typeguard wrapper or the original function,
+    so that turning checks off saves the whole cost of typeguard.
+    """
+    # Forward references are resolved in the namespace the function is
+    # declared in, e.g. the body of its class
+    localns = sys._getframe(1).f_locals
+    if func is None:
+        return lambda f: _switch(f, localns)
+    return _switch(func, localns)
+
+def _switch(func : Callable, localns : Dict[str, Any]) -> Callable:
+    checked = typeguard.typechecked(func, _localns=localns)
+    if checked is func:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if typecheckEnabled:
+            return checked(*args, **kwargs)
+        return func(*args, **kwargs)
+    return wrapper
+
+def set_typecheck(enabled : bool) -> None:
+    """
+    Turns the runtime type checking of the arguments and return values of
+    arkouda functions on or off. Checking is on by default, unless the
+    ARKOUDA_TYPECHECK environment variable is set to false or 0 when
+    arkouda is imported.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to check types
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Type checks cost several microseconds per call of typechecked
+    functions such as pdarray.sum or ak.cast, which adds up in loops over
+    many small arrays. With checks off, an argument of the wrong type is no
+    longer reported as a TypeError naming the argument, but fails in
+    whatever way the function body or the server handles it, so checks
+    should only be turned off for code that is already tested.
+    """
+    global typecheckEnabled
+    typecheckEnabled = bool(enabled)
+
+def get_typecheck() -> bool:
+    """
+    Returns whether the arguments and return values of arkouda functions
+    are type checked at runtime.
+
+    Returns
+    -------
+    bool
+        True if type checking is on
+    """
+    return typecheckEnabled
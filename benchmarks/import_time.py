@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import subprocess, sys, time, argparse
+
+# Modules too slow to import that import arkouda must not load, since they
+# are only needed by some functions
+LAZY_MODULES = ['pandas', 'pkg_resources']
+
+def time_import(trials, statement):
+    # Each trial imports in a fresh interpreter, whose own startup is timed
+    # separately and subtracted
+    timings = []
+    for _ in range(trials):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', statement], stdout=subprocess.DEVNULL)
+        timings.append(time.time() - start)
+    return sum(timings) / trials
+
+def time_ak_import(trials):
+    print(">>> import arkouda")
+    baseline = time_import(trials, 'pass')
+    tavg = time_import(trials, 'import arkouda') - baseline
+    print("Average time = {:.4f} sec".format(tavg))
+    print("Average rate = {:.2f} imports/sec".format(1/tavg))
+
+def time_np_import(trials):
+    print(">>> import numpy")
+    baseline = time_import(trials, 'pass')
+    tavg = time_import(trials, 'import numpy') - baseline
+    print("Average time = {:.4f} sec".format(tavg))
+    print("Average rate = {:.2f} imports/sec".format(1/tavg))
+
+def check_correctness():
+    out = subprocess.check_output([sys.executable, '-c', 'import sys, arkouda; ' +
+                                   'print(" ".join(sorted(sys.modules)))'],
+                                  encoding='utf-8')
+    loaded = set(out.split('\n')[-2].split())
+    for module in LAZY_MODULES:
+        assert module not in loaded, "import arkouda imported {}".format(module)
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the time to import arkouda")
+    parser.add_argument('hostname', help='Hostname of arkouda server (unused)')
+    parser.add_argument('port', type=int, help='Port of arkouda server (unused)')
+    parser.add_argument('-n', '--size', type=int, default=1, help='Problem size (unused)')
+    parser.add_argument('-t', '--trials', type=int, default=10, help='Number of times to import arkouda')
+    parser.add_argument('-d', '--dtype', default='int64', help='Dtype of arrays (unused)')
+    parser.add_argument('--numpy', default=False, action='store_true', help='Also time the import of NumPy, which arkouda depends on.')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    parser = create_parser()
+    args = parser.parse_args()
+
+    check_correctness()
+    if args.correctness_only:
+        sys.exit(0)
+
+    print("number of trials = ", args.trials)
+    time_ak_import(args.trials)
+    if args.numpy:
+        time_np_import(args.trials)
+    sys.exit(0)
@@ -5,20 +5,24 @@ import numpy as np
 import arkouda as ak
 import arkouda.client
 
-def time_ak_noop(trial_time):
-    print(">>> arkouda noop")
+def time_ak_noop(trial_time, compact=True):
+    print(">>> arkouda noop ({} messages)".format("compact" if compact else "JSON"))
+    arkouda.client.compactMessages = compact
     start = time.time()
     trials = 0
     while time.time() - start < trial_time:
         trials += 1
         arkouda.client._no_op()
     end = time.time()
+    arkouda.client.set_defaults()
 
     timing = end - start
     tavg = timing / trials
 
-    print("Average time = {:.6f} sec".format(tavg))
-    print("Average rate = {:.2f} ops/sec".format(trials/timing))
+    prefix = "" if compact else "JSON "
+    print("{}Average time = {:.6f} sec".format(prefix, tavg))
+    print("{}Average rate = {:.2f} ops/sec".format(prefix, trials/timing))
+    return tavg
 
 
 def time_np_noop(trial_time):
@@ -38,6 +42,9 @@ def time_np_noop(trial_time):
 
 def check_correctness():
     assert arkouda.client._no_op() == "noop"
+    arkouda.client.compactMessages = False
+    assert arkouda.client._no_op() == "noop"
+    arkouda.client.set_defaults()
 
 def create_parser():
     parser = argparse.ArgumentParser(description="Run a noop benchmark")
@@ -47,6 +54,7 @@ def create_parser():
     parser.add_argument('-t', '--trials', '--trials-time', type=int, default=1, help='Amount of time to run the benchmark')
     parser.add_argument('-d', '--dtype', default='int64', help='Dtype of arrays (unused)')
     parser.add_argument('--numpy', default=False, action='store_true', help='Run the same operation in NumPy to compare performance.')
+    parser.add_argument('--json', default=False, action='store_true', help='Also run with JSON messages to measure the per-message overhead of the compact framing.')
     parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
     return parser
 
@@ -63,7 +71,10 @@ if __name__ == "__main__":
         sys.exit(0)
 
     print("number of trials = ", args.trials)
-    time_ak_noop(args.trials)
+    tavg = time_ak_noop(args.trials)
+    if args.json:
+        json_tavg = time_ak_noop(args.trials, compact=False)
+        print("Per-message saving of compact framing = {:.6f} sec".format(json_tavg - tavg))
     if args.numpy:
         time_np_noop(args.size)
     sys.exit(0)
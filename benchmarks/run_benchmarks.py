@@ -21,7 +21,8 @@ logging.basicConfig(level=logging.INFO)
 
 BENCHMARKS = ['stream', 'argsort', 'coargsort', 'groupby', 'aggregate', 'gather', 'scatter',
               'reduce', 'scan', 'noop', 'setops', 'array_create', 'IO',
-              'str-argsort', 'str-coargsort', 'str-groupby', 'str-gather','sa']
+              'str-argsort', 'str-coargsort', 'str-groupby', 'str-gather','sa',
+              'str-transfer', 'import_time', 'typecheck']
 
 def get_chpl_util_dir():
     """ Get the Chapel directory that contains graph generation utilities. """
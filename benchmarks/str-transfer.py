@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+def make_np_strings(N, seed):
+    if seed is not None:
+        np.random.seed(seed)
+    # Mix ASCII and multi-byte UTF-8 so both encode paths are exercised
+    return np.char.add(np.array(['string ', 'café ', '日本 ']*(N//3+1))[:N],
+                       np.cast['str'](np.random.randint(0, 2**32, N)))
+
+def time_ak_str_transfer(N, trials, seed):
+    print(">>> arkouda string transfer")
+    print("N = {:,}".format(N))
+    a = make_np_strings(N, seed)
+    nbytes = sum(len(s.encode()) + 1 for s in a)
+
+    totimes = []
+    fromtimes = []
+    for i in range(trials):
+        start = time.time()
+        s = ak.array(a)
+        end = time.time()
+        totimes.append(end - start)
+        start = time.time()
+        b = s.to_ndarray()
+        end = time.time()
+        fromtimes.append(end - start)
+    avgto = sum(totimes) / trials
+    avgfrom = sum(fromtimes) / trials
+
+    print("array Average time = {:.4f} sec".format(avgto))
+    print("to_ndarray Average time = {:.4f} sec".format(avgfrom))
+    print("array Average rate = {:.4f} GiB/sec".format(nbytes/2**30/avgto))
+    print("to_ndarray Average rate = {:.4f} GiB/sec".format(nbytes/2**30/avgfrom))
+
+def check_correctness(seed):
+    N = 10**4
+    a = make_np_strings(N, seed)
+    s = ak.array(a)
+    assert (s.to_ndarray() == a).all()
+    assert np.concatenate(list(s.iter_chunks(4096))).tolist() == a.tolist()
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the throughput of sending strings to and receiving strings from the server.")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**6, help='Problem size: number of strings to transfer')
+    parser.add_argument('-t', '--trials', type=int, default=3, help='Number of times to run the benchmark')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    parser.add_argument('-s', '--seed', default=None, type=int, help='Value to initialize random number generator')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+
+    if args.correctness_only:
+        check_correctness(args.seed)
+        sys.exit(0)
+
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_str_transfer(args.size, args.trials, args.seed)
+    sys.exit(0)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import arkouda as ak
+
+OPS = ('sum', 'cast', 'abs')
+
+def make_ops(a):
+    # sum is answered by the reduction cache after its first call, so its
+    # time is that of the client alone
+    return {'sum' : lambda: ak.sum(a),
+            'cast' : lambda: ak.cast(a, ak.float64),
+            'abs' : lambda: ak.abs(a)}
+
+def time_calls(fxn, trial_time):
+    start = time.time()
+    trials = 0
+    while time.time() - start < trial_time:
+        trials += 1
+        fxn()
+    end = time.time()
+    return (end - start) / trials
+
+def time_ak_typecheck(N_per_locale, trial_time):
+    print(">>> arkouda calls with and without type checks")
+    cfg = ak.get_config()
+    N = N_per_locale * cfg["numLocales"]
+    print("numLocales = {}, N = {:,}".format(cfg["numLocales"], N))
+    a = ak.arange(0, N, 1)
+    ops = make_ops(a)
+
+    try:
+        for op in OPS:
+            ak.set_typecheck(True)
+            checked = time_calls(ops[op], trial_time)
+            ak.set_typecheck(False)
+            unchecked = time_calls(ops[op], trial_time)
+            print("  {} checked Average time = {:.6f} sec".format(op, checked))
+            print("  {} unchecked Average time = {:.6f} sec".format(op, unchecked))
+            print("  {} Per-call overhead of type checks = {:.2f} usec".format(
+                                                     op, (checked - unchecked)*1e6))
+    finally:
+        ak.set_typecheck(True)
+
+def check_correctness():
+    a = ak.arange(0, 10, 1)
+    ops = make_ops(a)
+    try:
+        for op in OPS:
+            ak.set_typecheck(True)
+            checked = ops[op]()
+            ak.set_typecheck(False)
+            unchecked = ops[op]()
+            if op == 'sum':
+                assert checked == unchecked
+            else:
+                assert (checked == unchecked).all()
+        ak.set_typecheck(True)
+        try:
+            ak.sum(list(range(10)))
+        except TypeError:
+            pass
+        else:
+            assert False, "ak.sum accepted a list with type checks on"
+    finally:
+        ak.set_typecheck(True)
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the per-call overhead of runtime type checks")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**3, help='Problem size: length of array')
+    parser.add_argument('-t', '--trials', '--trials-time', type=int, default=1, help='Amount of time to run each operation, with and without checks')
+    parser.add_argument('-d', '--dtype', default='int64', help='Dtype of arrays (unused)')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+
+    if args.correctness_only:
+        check_correctness()
+        sys.exit(0)
+
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_typecheck(args.size, args.trials)
+    sys.exit(0)
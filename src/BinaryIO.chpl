@@ -0,0 +1,742 @@
+/* reading and writing pdarrays as raw binary and NumPy .npy files, and
+   snapshots of the registered pdarrays */
+module BinaryIO
+{
+    use IO;
+    use CPtr;
+    use FileSystem;
+    use Path;
+    use List;
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+    use NumPyDType;
+    use Reflection;
+    use Errors;
+    use Logging;
+    use Message;
+    use ServerConfig;
+    use PrivateFiles;
+
+    private config const logLevel = ServerConfig.logLevel;
+    const bioLogger = new Logger(logLevel);
+
+    /*
+     * Magic string that starts every .npy file, followed by the major and
+     * minor version of the format
+     */
+    private const npyMagic = b"\x93NUMPY";
+
+    /*
+     * Reads a NumPy .npy file of a one-dimensional array into a new pdarray.
+     * The header is parsed on the locale running the command and each locale
+     * then reads its own block of the data directly from the file, which
+     * must be visible to all locales.
+     *
+     * :arg cmd: request command
+     * :type cmd: string
+     *
+     * :arg args: path of the file
+     * :type args: string
+     *
+     * :arg st: SymTab to contain the new pdarray
+     * :type st: borrowed SymTab
+     *
+     * :returns: (MsgTuple) the attributes of the new pdarray
+     */
+    proc readnpyMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var path = args;
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s path: %s".format(cmd,path));
+        var (dtype, size, offset) = readNpyHeader(path);
+        return readBinaryEntry(path, offset, size, dtype, st);
+    }
+
+    /*
+     * Reads a file of raw native-endian elements of the given dtype,
+     * starting at the given byte offset, into a new pdarray. Each locale reads
+     * its own block of the data directly from the file, which must be
+     * visible to all locales.
+     *
+     * :arg cmd: request command
+     * :type cmd: string
+     *
+     * :arg args: dtype, byte offset and path of the file
+     * :type args: string
+     *
+     * :arg st: SymTab to contain the new pdarray
+     * :type st: borrowed SymTab
+     *
+     * :returns: (MsgTuple) the attributes of the new pdarray
+     */
+    proc readbinaryMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var (dtypeStr, offsetStr, path) = args.splitMsgToTuple(3);
+        var dtype = str2dtype(dtypeStr);
+        var offset = try! offsetStr:int;
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s dtype: %s offset: %i path: %s".format(
+                                                       cmd,dtypeStr,offset,path));
+        if dtype == DType.UNDEF {
+            var errorMsg = unrecognizedTypeError(cmd, dtypeStr);
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        const fileSize = getFileSize(path);
+        const itemsize = dtypeSize(dtype);
+        if offset < 0 || offset > fileSize || (fileSize - offset) % itemsize != 0 {
+            var errorMsg = "The %i bytes of %s after offset %i are not a whole number of %s elements".format(
+                                      fileSize - offset, path, offset, dtypeStr);
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        return readBinaryEntry(path, offset, (fileSize - offset) / itemsize, dtype, st);
+    }
+
+    /*
+     * Writes a pdarray to a file, either as raw native-endian elements or
+     * as a NumPy .npy file. Locale 0 creates the file and writes the header,
+     * and each locale then writes its own block of the data at its offset,
+     * so the file must be visible to all locales.
+     *
+     * :arg cmd: request command
+     * :type cmd: string
+     *
+     * :arg args: name of the pdarray, format ("npy" or "raw") and path of the file
+     * :type args: string
+     *
+     * :arg st: SymTab containing the pdarray
+     * :type st: borrowed SymTab
+     *
+     * :returns: (MsgTuple)
+     */
+    proc tobinaryMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var (name, format, path) = args.splitMsgToTuple(3);
+        var entry = st.lookup(name);
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s name: %s format: %s path: %s".format(cmd,name,format,path));
+        if format != "npy" && format != "raw" {
+            var errorMsg = "Unsupported binary format %s".format(format);
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var header = if format == "npy" then npyHeader(entry.dtype, entry.size) else b"";
+
+        try {
+            select entry.dtype {
+                when DType.Int64 {
+                    writeBinary(path, header, toSymEntry(entry, int).a);
+                }
+                when DType.Float64 {
+                    writeBinary(path, header, toSymEntry(entry, real).a);
+                }
+                when DType.Bool {
+                    writeBinary(path, header, toSymEntry(entry, bool).a);
+                }
+                when DType.UInt8 {
+                    writeBinary(path, header, toSymEntry(entry, uint(8)).a);
+                }
+                otherwise {
+                    var errorMsg = unrecognizedTypeError(cmd, dtype2str(entry.dtype));
+                    bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                    return new MsgTuple(errorMsg, MsgType.ERROR);
+                }
+            }
+        } catch e: Error {
+            var errorMsg = "Unable to write %s: %s".format(path, e.message());
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var repMsg = "wrote array to file";
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Creates a pdarray of size elements of dtype read from path, starting at
+     * the given byte offset.
+     */
+    private proc readBinaryEntry(path: string, offset: int, size: int, dtype: DType,
+                                 st: borrowed SymTab): MsgTuple throws {
+        overMemLimit(size * dtypeSize(dtype));
+        var rname = st.nextName();
+        try {
+            select dtype {
+                when DType.Int64 {
+                    var entry = new shared SymEntry(size, int);
+                    readBinary(path, offset, entry.a);
+                    st.addEntry(rname, entry);
+                }
+                when DType.Float64 {
+                    var entry = new shared SymEntry(size, real);
+                    readBinary(path, offset, entry.a);
+                    st.addEntry(rname, entry);
+                }
+                when DType.Bool {
+                    var entry = new shared SymEntry(size, bool);
+                    readBinary(path, offset, entry.a);
+                    st.addEntry(rname, entry);
+                }
+                when DType.UInt8 {
+                    var entry = new shared SymEntry(size, uint(8));
+                    readBinary(path, offset, entry.a);
+                    st.addEntry(rname, entry);
+                }
+                otherwise {
+                    var errorMsg = unrecognizedTypeError("readbinary", dtype2str(dtype));
+                    bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                    return new MsgTuple(errorMsg, MsgType.ERROR);
+                }
+            }
+        } catch e: Error {
+            var errorMsg = "Unable to read %s: %s".format(path, e.message());
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var repMsg = "created " + st.attrib(rname);
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Fills A with the elements stored in path from the given byte offset
+     * on. Each locale opens the file and reads the bytes of its local block
+     * in one bulk read.
+     */
+    proc readBinary(path: string, offset: int, ref A: [?D] ?t) throws {
+        const itemsize = numBytes(t);
+        coforall loc in A.targetLocales() do on loc {
+            const myD = A.localSubdomain();
+            if myD.size > 0 {
+                var f = open(path, iomode.r);
+                var r = f.reader(kind=ionative, locking=false,
+                                 start=offset + myD.low*itemsize,
+                                 end=offset + (myD.high+1)*itemsize);
+                ref myA = A.localSlice[myD];
+                r.read(myA);
+                r.close();
+                f.close();
+            }
+        }
+    }
+
+    /*
+     * Writes header followed by the elements of A to path, replacing any
+     * existing file. Each locale writes the bytes of its local block at its
+     * offset in one bulk write.
+     */
+    proc writeBinary(path: string, header: bytes, A: [?D] ?t) throws {
+        const itemsize = numBytes(t);
+        var f = open(path, iomode.cw);
+        if header.size > 0 {
+            var headerBuf: [0..#header.size] uint(8);
+            forall i in headerBuf.domain {
+                headerBuf[i] = header.byte(i);
+            }
+            var w = f.writer(kind=ionative, locking=false);
+            w.write(headerBuf);
+            w.close();
+        }
+        f.close();
+        coforall loc in A.targetLocales() do on loc {
+            const myD = A.localSubdomain();
+            if myD.size > 0 {
+                var lf = open(path, iomode.rw);
+                var lw = lf.writer(kind=ionative, locking=false,
+                                   start=header.size + myD.low*itemsize);
+                lw.write(A.localSlice(myD));
+                lw.close();
+                lf.close();
+            }
+        }
+    }
+
+    /*
+     * Name of the file listing the entries of a snapshot directory
+     */
+    private const snapshotIndex = "snapshot.index";
+
+    /*
+     * Version of the snapshots written by writeSnapshot
+     */
+    private const snapshotVersion = 1;
+
+    /*
+     * Writes every registered entry of the symbol table to a snapshot in the
+     * directory path. Each locale writes its block of every entry to its own
+     * raw binary file, so the directory need not be shared by the locales.
+     *
+     * :arg cmd: request command
+     * :type cmd: string
+     *
+     * :arg args: path of the snapshot directory
+     * :type args: string
+     *
+     * :arg st: SymTab containing the registered entries
+     * :type st: borrowed SymTab
+     *
+     * :returns: (MsgTuple)
+     */
+    proc snapshotMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var path = args;
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s path: %s".format(cmd,path));
+        var n: int;
+        try {
+            n = writeSnapshot(path, st);
+        } catch e: Error {
+            var errorMsg = "Unable to write snapshot %s: %s".format(path, e.message());
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var repMsg = "wrote %i registered entries to %s".format(n, path);
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Reads the entries of a snapshot written by snapshotMsg into the symbol
+     * table and registers them under their names.
+     *
+     * :arg cmd: request command
+     * :type cmd: string
+     *
+     * :arg args: path of the snapshot directory
+     * :type args: string
+     *
+     * :arg st: SymTab to contain the restored entries
+     * :type st: borrowed SymTab
+     *
+     * :returns: (MsgTuple) JSON list of the restored names
+     */
+    proc restoreMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var path = args;
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s path: %s".format(cmd,path));
+        var names: list(string);
+        try {
+            names = restoreSnapshot(path, st);
+        } catch e: Error {
+            var errorMsg = "Unable to restore snapshot %s: %s".format(path, e.message());
+            bioLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var repMsg = "%jt".format(names.toArray());
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Writes the registered entries of st to the directory path, creating
+     * it on every locale, and returns their number. The index is written
+     * last, so that an interrupted snapshot cannot be restored.
+     */
+    proc writeSnapshot(path: string, st: borrowed SymTab): int throws {
+        const indexPath = path + pathSep + snapshotIndex;
+        coforall loc in Locales do on loc {
+            if !exists(path) {
+                try {
+                    mkdir(path, parents=true);
+                } catch e: Error {
+                    // another locale created it on a shared filesystem
+                    if !exists(path) then throw e;
+                }
+            }
+        }
+        if exists(indexPath) then remove(indexPath);
+
+        var index = "arkouda-snapshot %i %i\n".format(snapshotVersion, numLocales);
+        var k = 0;
+        for name in st.registry {
+            var entry = st.lookup(name);
+            writeEntryBlocks(snapshotPrefix(path, k), entry);
+            index += "%s %i %s\n".format(dtype2str(entry.dtype), entry.size, name);
+            k += 1;
+        }
+        var f = open(indexPath, iomode.cw);
+        var w = f.writer(locking=false);
+        w.write(index);
+        w.close();
+        f.close();
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "wrote %i entries to %s".format(k, path));
+        return k;
+    }
+
+    /*
+     * Reads the entries of the snapshot in the directory path into st,
+     * registers them under their names and returns the names. Nothing is
+     * read if any name is already in use, and no entry is left in st if
+     * one of them cannot be read.
+     */
+    proc restoreSnapshot(path: string, st: borrowed SymTab): list(string) throws {
+        var dtypes: list(DType);
+        var sizes: list(int);
+        var names: list(string);
+
+        var f = open(path + pathSep + snapshotIndex, iomode.r);
+        var r = f.reader(locking=false);
+        var line: string;
+        r.readline(line);
+        var header = line.strip().split();
+        if header.size != 3 || header[0] != "arkouda-snapshot" ||
+                                    header[1] != snapshotVersion:string {
+            throw getErrorWithContext(
+                      msg="%s is not a version %i arkouda snapshot".format(path, snapshotVersion),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        // the blocks of the entries are those of the locales that wrote them
+        if header[2]:int != numLocales {
+            throw getErrorWithContext(
+                      msg="%s was written by %s locales, the server has %i".format(
+                                                           path, header[2], numLocales),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        while r.readline(line) {
+            var fields = line.strip("\n", leading=false).split(" ", 2);
+            if fields.size != 3 || str2dtype(fields[0]) == DType.UNDEF {
+                throw getErrorWithContext(
+                          msg="Malformed entry %s in the index of %s".format(line.strip(), path),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+            dtypes.append(str2dtype(fields[0]));
+            sizes.append(fields[1]:int);
+            names.append(fields[2]);
+        }
+        r.close();
+        f.close();
+
+        for name in names {
+            if st.registry.contains(name) || st.contains(name) {
+                throw getErrorWithContext(
+                          msg="The name %s of an entry of the snapshot is already in use".format(name),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+        }
+        // a failed restore leaves none of the entries of the snapshot behind
+        var restored = 0;
+        try {
+            for k in 0..#names.size {
+                var entry = readEntryBlocks(snapshotPrefix(path, k), dtypes[k], sizes[k]);
+                var rname = st.nextName();
+                st.addEntry(rname, entry);
+                st.regName(rname, names[k]);
+                restored += 1;
+            }
+        } catch e: Error {
+            for k in 0..#restored {
+                st.unregName(names[k]);
+                st.deleteEntry(names[k]);
+            }
+            throw e;
+        }
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "restored %i entries from %s".format(names.size, path));
+        return names;
+    }
+
+    /*
+     * Returns the prefix of the block files of the k-th entry of a snapshot
+     */
+    private proc snapshotPrefix(path: string, k: int): string {
+        return path + pathSep + "entry%i".format(k);
+    }
+
+    /*
+     * Writes the blocks of a pdarray to the files of the given prefix with
+     * writeLocalBlocks.
+     */
+    proc writeEntryBlocks(prefix: string, entry: borrowed GenSymEntry,
+                          exclusive = false) throws {
+        select entry.dtype {
+            when DType.Int64 {
+                writeLocalBlocks(prefix, toSymEntry(entry, int).a, exclusive);
+            }
+            when DType.Float64 {
+                writeLocalBlocks(prefix, toSymEntry(entry, real).a, exclusive);
+            }
+            when DType.Bool {
+                writeLocalBlocks(prefix, toSymEntry(entry, bool).a, exclusive);
+            }
+            when DType.UInt8 {
+                writeLocalBlocks(prefix, toSymEntry(entry, uint(8)).a, exclusive);
+            }
+            otherwise {
+                throw getErrorWithContext(
+                          msg=unrecognizedTypeError("writeEntryBlocks", dtype2str(entry.dtype)),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+        }
+    }
+
+    /*
+     * Returns a new pdarray of size elements of dtype read from the files of
+     * the given prefix with readLocalBlocks.
+     */
+    proc readEntryBlocks(prefix: string, dtype: DType, size: int,
+                         exclusive = false): shared GenSymEntry throws {
+        overMemLimit(size * dtypeSize(dtype));
+        select dtype {
+            when DType.Int64 {
+                var entry = new shared SymEntry(size, int);
+                readLocalBlocks(prefix, entry.a, exclusive);
+                return entry;
+            }
+            when DType.Float64 {
+                var entry = new shared SymEntry(size, real);
+                readLocalBlocks(prefix, entry.a, exclusive);
+                return entry;
+            }
+            when DType.Bool {
+                var entry = new shared SymEntry(size, bool);
+                readLocalBlocks(prefix, entry.a, exclusive);
+                return entry;
+            }
+            when DType.UInt8 {
+                var entry = new shared SymEntry(size, uint(8));
+                readLocalBlocks(prefix, entry.a, exclusive);
+                return entry;
+            }
+            otherwise {
+                throw getErrorWithContext(
+                          msg=unrecognizedTypeError("readEntryBlocks", dtype2str(dtype)),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+        }
+    }
+
+    /*
+     * Returns the name of the file holding the block of locale locId of
+     * the arrays written with the given prefix
+     */
+    proc localBlockFile(prefix: string, locId: int): string throws {
+        return "%s_LOCALE%04i".format(prefix, locId);
+    }
+
+    /*
+     * Writes the local block of A of each locale to a file of its own, in
+     * one bulk write. The files are only read back by the same locale, so
+     * they may be on storage local to each locale. If exclusive, the files
+     * are created readable by the server user only and must not exist yet.
+     */
+    proc writeLocalBlocks(prefix: string, A: [?D] ?t, exclusive = false) throws {
+        coforall loc in A.targetLocales() do on loc {
+            const myD = A.localSubdomain();
+            const path = localBlockFile(prefix, here.id);
+            var f = if exclusive then createPrivateFile(path) else open(path, iomode.cw);
+            if myD.size > 0 {
+                var w = f.writer(kind=ionative, locking=false);
+                w.write(A.localSlice(myD));
+                w.close();
+            }
+            f.close();
+        }
+    }
+
+    /*
+     * Fills A with the blocks written by writeLocalBlocks for an array of
+     * the same size and distribution, each locale reading its own file. If
+     * exclusive, as the files were written, symbolic links are refused.
+     */
+    proc readLocalBlocks(prefix: string, ref A: [?D] ?t, exclusive = false) throws {
+        const itemsize = numBytes(t);
+        coforall loc in A.targetLocales() do on loc {
+            const myD = A.localSubdomain();
+            const path = localBlockFile(prefix, here.id);
+            var f = if exclusive then openNoFollow(path) else open(path, iomode.r);
+            defer { try! f.close(); }
+            const fileSize = f.size;
+            if fileSize != myD.size*itemsize {
+                throw getErrorWithContext(
+                          msg="%s holds %i bytes instead of the %i of its block".format(
+                                                       path, fileSize, myD.size*itemsize),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+            if myD.size > 0 {
+                var r = f.reader(kind=ionative, locking=false);
+                ref myA = A.localSlice[myD];
+                r.read(myA);
+                r.close();
+            }
+        }
+    }
+
+    /*
+     * Returns the dtype and number of elements of the one-dimensional array
+     * stored in the .npy file at path, and the byte offset of its data.
+     */
+    proc readNpyHeader(path: string): (DType, int, int) throws {
+        var f = open(path, iomode.r);
+        defer { try! f.close(); }
+        var r = f.reader(kind=iolittle, locking=false);
+        defer { try! r.close(); }
+        var magic: [0..#npyMagic.size] uint(8);
+        var major, minor: uint(8);
+        r.read(magic, major, minor);
+        for i in 0..#npyMagic.size {
+            if magic[i] != npyMagic.byte(i) {
+                throw getErrorWithContext(
+                          msg="%s is not a .npy file".format(path),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+        }
+        // The header length is 2 bytes in version 1.0 and 4 bytes since 2.0
+        var headerLen: int;
+        if major == 1 {
+            var len16: uint(16);
+            r.read(len16);
+            headerLen = len16:int;
+        } else {
+            var len32: uint(32);
+            r.read(len32);
+            headerLen = len32:int;
+        }
+        var headerBuf: [0..#headerLen] uint(8);
+        r.read(headerBuf);
+        var header = createStringWithNewBuffer(c_ptrTo(headerBuf[0]), headerLen);
+        const offset = npyMagic.size + 2 + (if major == 1 then 2 else 4) + headerLen;
+
+        var descr = npyField(header, "descr", path);
+        var dtype = npyDescr2dtype(descr);
+        if dtype == DType.UNDEF {
+            throw getErrorWithContext(
+                      msg="Unsupported dtype %s in %s".format(descr, path),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        var shape = npyField(header, "shape", path);
+        var dims = shape.strip("()").split(",");
+        var size = -1;
+        for dim in dims {
+            if !dim.strip().isEmpty() {
+                if size >= 0 {
+                    throw getErrorWithContext(
+                              msg="Only one-dimensional arrays are supported, %s has shape %s".format(
+                                                                                   path, shape),
+                              lineNumber=getLineNumber(),
+                              routineName=getRoutineName(),
+                              moduleName=getModuleName(),
+                              errorClass="ErrorWithContext");
+                }
+                size = dim.strip():int;
+            }
+        }
+        if size < 0 {
+            throw getErrorWithContext(
+                      msg="Only one-dimensional arrays are supported, %s has shape %s".format(
+                                                                           path, shape),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        if f.size < offset + size*dtypeSize(dtype) {
+            throw getErrorWithContext(
+                      msg="%s is truncated: %i bytes for %i elements of %s".format(
+                                                 path, f.size - offset, size, descr),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        bioLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "header: %s offset: %i".format(header.strip(), offset));
+        return (dtype, size, offset);
+    }
+
+    /*
+     * Returns the header of a version 1.0 .npy file of a one-dimensional
+     * array, padded with spaces so that the data is 64-byte aligned.
+     */
+    proc npyHeader(dtype: DType, size: int): bytes throws {
+        var dict = "{'descr': '%s', 'fortran_order': False, 'shape': (%i,), }".format(
+                                                               dtype2npyDescr(dtype), size);
+        // magic, version, header length, dictionary and terminating newline
+        const unpadded = npyMagic.size + 2 + 2 + dict.size + 1;
+        dict += " " * ((64 - unpadded % 64) % 64) + "\n";
+        // version 1.0, then the little-endian 2-byte length of the dictionary
+        var lenBytes: [0..1] uint(8) = [(dict.size & 0xff):uint(8), (dict.size >> 8):uint(8)];
+        return npyMagic + b"\x01\x00" + createBytesWithNewBuffer(c_ptrTo(lenBytes[0]), 2) +
+               dict.encode();
+    }
+
+    /*
+     * Returns the Python literal of a key of the header dictionary of a .npy
+     * file, without quotes if it is a string.
+     */
+    private proc npyField(header: string, key: string, path: string): string throws {
+        const pattern = "'%s':".format(key);
+        const start = header.find(pattern):int;
+        if start < 0 {
+            throw getErrorWithContext(
+                      msg="Missing %s in the header of %s".format(key, path),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        var value = header[start+pattern.size..].strip();
+        if value.startsWith("'") {
+            return value[1..].partition("'")[0];
+        } else if value.startsWith("(") {
+            return value.partition(")")[0] + ")";
+        }
+        return value.partition(",")[0].strip();
+    }
+
+    /*
+     * Maps the little-endian or byte-order-free NumPy type descriptors of
+     * the dtypes supported by arkouda to their DType
+     */
+    private proc npyDescr2dtype(descr: string): DType {
+        select descr {
+            when "<i8" do return DType.Int64;
+            when "<f8" do return DType.Float64;
+            when "|b1" do return DType.Bool;
+            when "|u1" do return DType.UInt8;
+            otherwise do return DType.UNDEF;
+        }
+    }
+
+    private proc dtype2npyDescr(dtype: DType): string throws {
+        select dtype {
+            when DType.Int64 do return "<i8";
+            when DType.Float64 do return "<f8";
+            when DType.Bool do return "|b1";
+            when DType.UInt8 do return "|u1";
+            otherwise {
+                throw getErrorWithContext(
+                          msg="Unsupported dtype %s".format(dtype2str(dtype)),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+        }
+    }
+}
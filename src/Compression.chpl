@@ -0,0 +1,156 @@
+/* compression of the binary payloads transferred between client and server */
+module Compression
+{
+    use CPtr;
+    use SysCTypes;
+    use ServerConfig;
+    use Reflection;
+    use Errors;
+    use Logging;
+
+    require "zlib.h", "-lz";
+
+    private extern proc compressBound(sourceLen: c_ulong): c_ulong;
+    private extern proc compress2(dest: c_ptr(uint(8)), ref destLen: c_ulong,
+                                  source: c_ptr(uint(8)), sourceLen: c_ulong,
+                                  level: c_int): c_int;
+    private extern proc uncompress(dest: c_ptr(uint(8)), ref destLen: c_ulong,
+                                   source: c_ptr(uint(8)), sourceLen: c_ulong): c_int;
+    private extern const Z_OK: c_int;
+
+    /*
+    zlib compression level of binary replies, 1 favoring speed over ratio
+    */
+    config const compressionLevel = 1;
+
+    private config const logLevel = ServerConfig.logLevel;
+    const cpLogger = new Logger(logLevel);
+
+    /*
+    Compresses the native-endian bytes of an array of elements of itemsize
+    bytes. The bytes are first shuffled so that the k-th bytes of all
+    elements are contiguous, which lets zlib exploit the mostly constant
+    high-order bytes of sorted IDs and small codes.
+
+    :arg data: the array bytes
+    :type data: bytes
+
+    :arg itemsize: the size in bytes of one element
+    :type itemsize: int
+
+    :arg codec: the compression codec, which must be one of ServerConfig.compressionCodecs
+    :type codec: string
+
+    :returns: bytes
+    */
+    proc compressBytes(data: bytes, itemsize: int, codec: string): bytes throws {
+        checkCodec(codec);
+        if data.size == 0 {
+            return b"";
+        }
+        var src = shuffle(bytesToArray(data), itemsize);
+        var destLen = compressBound(src.size:c_ulong);
+        var dest: [0..#(destLen:int)] uint(8);
+        const rc = compress2(c_ptrTo(dest[0]), destLen, c_ptrTo(src[0]), src.size:c_ulong,
+                             compressionLevel:c_int);
+        if rc != Z_OK {
+            throw getErrorWithContext(
+                      msg="zlib compress2 failed with code %i".format(rc),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        cpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "compressed %i bytes to %i".format(data.size, destLen));
+        return createBytesWithNewBuffer(c_ptrTo(dest[0]), destLen:int);
+    }
+
+    /*
+    Decompresses bytes produced by a client with the same shuffle and codec
+    as compressBytes.
+
+    :arg data: the compressed bytes
+    :type data: bytes
+
+    :arg rawSize: the size in bytes of the decompressed array
+    :type rawSize: int
+
+    :arg itemsize: the size in bytes of one element
+    :type itemsize: int
+
+    :arg codec: the compression codec, which must be one of ServerConfig.compressionCodecs
+    :type codec: string
+
+    :returns: bytes
+    */
+    proc decompressBytes(data: bytes, rawSize: int, itemsize: int,
+                                                  codec: string): bytes throws {
+        checkCodec(codec);
+        if rawSize == 0 || data.size == 0 {
+            return b"";
+        }
+        var src = bytesToArray(data);
+        var raw: [0..#rawSize] uint(8);
+        var destLen = rawSize:c_ulong;
+        const rc = uncompress(c_ptrTo(raw[0]), destLen, c_ptrTo(src[0]), src.size:c_ulong);
+        if rc != Z_OK || destLen:int != rawSize {
+            throw getErrorWithContext(
+                      msg="zlib uncompress failed with code %i after %i of %i bytes".format(
+                                                                 rc, destLen, rawSize),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        var unshuffled = unshuffle(raw, itemsize);
+        return createBytesWithNewBuffer(c_ptrTo(unshuffled[0]), rawSize);
+    }
+
+    private proc checkCodec(codec: string) throws {
+        if !compressionCodecs.find(codec)(0) {
+            throw getErrorWithContext(
+                      msg="Unsupported compression codec %s".format(codec),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+    }
+
+    private proc bytesToArray(data: bytes) {
+        var A: [0..#data.size] uint(8);
+        forall i in A.domain {
+            A[i] = data.byte(i);
+        }
+        return A;
+    }
+
+    /*
+    Groups the k-th bytes of all elements together
+    */
+    private proc shuffle(A: [?D] uint(8), itemsize: int) {
+        const n = A.size / itemsize;
+        var shuffled: [D] uint(8);
+        forall i in 0..#n {
+            for k in 0..#itemsize {
+                shuffled[k*n + i] = A[i*itemsize + k];
+            }
+        }
+        return shuffled;
+    }
+
+    /*
+    Inverse of shuffle
+    */
+    private proc unshuffle(A: [?D] uint(8), itemsize: int) {
+        const n = A.size / itemsize;
+        var unshuffled: [D] uint(8);
+        forall i in 0..#n {
+            for k in 0..#itemsize {
+                unshuffled[i*itemsize + k] = A[k*n + i];
+            }
+        }
+        return unshuffled;
+    }
+}
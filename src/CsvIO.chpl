@@ -0,0 +1,941 @@
+/* parallel reading of delimited text (CSV) files into pdarrays and Strings */
+module CsvIO
+{
+    use IO;
+    use CPtr;
+    use Sort;
+    use List;
+    use FileSystem;
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+    use Reflection;
+    use Errors;
+    use Logging;
+    use Message;
+    use ServerConfig;
+    use GenSymIO only jsonToPdArray;
+
+    private config const logLevel = ServerConfig.logLevel;
+    const csvLogger = new Logger(logLevel);
+
+    /*
+     * Number of rows at the start of the first file that are sampled to
+     * infer the dtypes of the columns requested without one
+     */
+    config const csvSampleRows = 1000;
+
+    /*
+     * Maximum number of bytes of a file that a locale reads and parses at
+     * once, beyond which its share of the rows is processed in several
+     * chunks, so that the memory used while parsing stays bounded
+     */
+    config const csvChunkBytes = 64 * 1024 * 1024;
+
+    /* dtypes of the columns, as named by the client */
+    private const csvDtypes = ["int64", "float64", "bool", "str", "datetime64[ns]"];
+
+    private const NEWLINE = 10:uint(8), CR = 13:uint(8), SPACE = 32:uint(8),
+                  QUOTE = 34:uint(8), PLUS = 43:uint(8), MINUS = 45:uint(8),
+                  DOT = 46:uint(8), ZERO = 48:uint(8), NINE = 57:uint(8),
+                  COLON = 58:uint(8), UPPER_T = 84:uint(8), UPPER_Z = 90:uint(8);
+
+    /*
+     * Fields of the rows of a chunk of a file: the bytes of the chunk and,
+     * for every row and selected column, the bounds of the field in them
+     */
+    record ParsedChunk {
+        var bufD: domain(1);
+        var buf: [bufD] uint(8);
+        var rowD: domain(1);
+        var fieldD: domain(2);
+        var fieldLo: [fieldD] int;
+        var fieldHi: [fieldD] int;
+        var fieldQuoted: [fieldD] bool;
+    }
+
+    /*
+     * Reads columns of 1..n CSV files with a header line into new pdarrays
+     * (int64, float64, bool and datetime64[ns] columns) and Strings (str
+     * columns). The files, which must be visible to all locales, are cut
+     * into one byte range per locale of about the same size, aligned to
+     * record boundaries, so that each locale parses its own share of the
+     * rows in parallel, whether there are many small files or a few large
+     * ones. Each locale reads its share in chunks of at most csvChunkBytes
+     * bytes, first to count the rows and string bytes of each chunk, then
+     * to parse it into the columns. The columns without a dtype are typed
+     * from the first csvSampleRows rows of the first file.
+     *
+     * Fields may be quoted with double quotes, with "" standing for a quote
+     * inside a quoted field, and quoted fields may contain the delimiter and
+     * newlines; quotes may only appear in quoted fields. Empty float64
+     * fields are read as NaN and empty str fields as empty strings; an
+     * empty or malformed field of any other dtype is an error.
+     *
+     * :arg cmd: request command
+     * :type cmd: string
+     *
+     * :arg payload: delimiter, whether to read all columns, number of
+     *               columns, number of files, json column names | json
+     *               dtypes | json filenames
+     * :type payload: string
+     *
+     * :arg st: SymTab to contain the new pdarrays and Strings
+     * :type st: borrowed SymTab
+     *
+     * :returns: (MsgTuple) json list of the name, dtype and attributes of
+     *           every column read
+     */
+    proc readcsvMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
+        // reqMsg = "readcsv <delim> <allColumns> <ncols> <nfiles> [<json_columns>] | [<json_dtypes>] | [<json_filenames>]"
+        var (delimStr, allFlag, ncolsStr, nfilesStr, arraysStr) = payload.splitMsgToTuple(5);
+        var (jsoncols, jsondtypes, jsonfiles) = arraysStr.splitMsgToTuple(" | ", 3);
+        const delim = (try! delimStr:int):uint(8);
+        const allColumns = allFlag.toLower() == "true";
+        const ncols = try! ncolsStr:int;
+        const nfiles = try! nfilesStr:int;
+        csvLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s delim: %i allColumns: %t columns: %s dtypes: %s files: %s".format(
+                                  cmd, delim, allColumns, jsoncols, jsondtypes, jsonfiles));
+
+        var repMsg: string;
+        try {
+            var colNames = jsonToPdArray(jsoncols, ncols);
+            var colTypes = jsonToPdArray(jsondtypes, ncols);
+            var filenames = expandFilenames(jsonToPdArray(jsonfiles, nfiles));
+
+            // The columns are those of the header of the first file
+            const header = readHeader(filenames[0]);
+            const headerNames = lineFields(header, delim);
+            const nsel = if allColumns then headerNames.size else ncols;
+            var selNames: [0..#nsel] string;
+            var selTypes: [0..#nsel] string;
+            // Index among the selected columns of every column of the file, -1 if unselected
+            var colOf: [0..#headerNames.size] int = -1;
+            if allColumns {
+                selNames = headerNames;
+                colOf = 0..#headerNames.size;
+            }
+            for (name, dtype, i) in zip(colNames, colTypes, 0..) {
+                if !dtype.isEmpty() && !csvDtypes.find(dtype)(0) {
+                    throw getErrorWithContext(
+                              msg="Unsupported dtype %s of column %s".format(dtype, name),
+                              lineNumber=getLineNumber(),
+                              routineName=getRoutineName(),
+                              moduleName=getModuleName(),
+                              errorClass="ErrorWithContext");
+                }
+                const (found, idx) = headerNames.find(name);
+                if !found {
+                    throw getErrorWithContext(
+                              msg="Column %s not found in the header of %s".format(name, filenames[0]),
+                              lineNumber=getLineNumber(),
+                              routineName=getRoutineName(),
+                              moduleName=getModuleName(),
+                              errorClass="ErrorWithContext");
+                }
+                if allColumns {
+                    selTypes[idx] = dtype;
+                } else {
+                    if colOf[idx] != -1 {
+                        throw getErrorWithContext(
+                                  msg="Column %s is requested more than once".format(name),
+                                  lineNumber=getLineNumber(),
+                                  routineName=getRoutineName(),
+                                  moduleName=getModuleName(),
+                                  errorClass="ErrorWithContext");
+                    }
+                    colOf[idx] = i;
+                    selNames[i] = name;
+                    selTypes[i] = dtype;
+                }
+            }
+            if || reduce [t in selTypes] t.isEmpty() {
+                inferDtypes(filenames[0], delim, colOf, selTypes);
+            }
+            csvLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                            "reading columns %jt of dtypes %jt from %i files".format(
+                                                     selNames, selTypes, filenames.size));
+
+            const chunks = splitFiles(filenames);
+            const nchunks = chunks.size;
+
+            // First pass: count the rows and string bytes of every chunk,
+            // without indexing their fields
+            var rowCounts: [0..#nchunks] int;
+            var strBytes: [0..#nchunks, 0..#nsel] int;
+            const isStr = [t in selTypes] t == "str";
+            coforall loc in Locales do on loc {
+                const myFiles = filenames, myChunks = chunks, myColOf = colOf,
+                      myIsStr = isStr, myHeader = header;
+                for (ch, (fi, lo, hi, owner)) in zip(myChunks.domain, myChunks) {
+                    if owner != here.id then continue;
+                    var nbytes: [0..#nsel] int;
+                    rowCounts[ch] = countChunk(myFiles[fi], lo, hi, delim, myColOf, myIsStr,
+                                               myHeader, nbytes);
+                    strBytes[ch, ..] = nbytes;
+                }
+            }
+            const rowOffsets = (+ scan rowCounts) - rowCounts;
+            const nrows = + reduce rowCounts;
+            var byteOffsets: [0..#nchunks, 0..#nsel] int;
+            var totalBytes: [0..#nsel] int;
+            for c in 0..#nsel {
+                for ch in 0..#nchunks {
+                    byteOffsets[ch, c] = totalBytes[c];
+                    totalBytes[c] += strBytes[ch, c];
+                }
+            }
+            overMemLimit(nrows * 8 * nsel + (+ reduce totalBytes));
+
+            var entries: [0..#nsel] shared GenSymEntry?;
+            var valEntries: [0..#nsel] shared GenSymEntry?;
+            for c in 0..#nsel {
+                select selTypes[c] {
+                    when "int64", "datetime64[ns]" do entries[c] = new shared SymEntry(nrows, int);
+                    when "float64" do entries[c] = new shared SymEntry(nrows, real);
+                    when "bool" do entries[c] = new shared SymEntry(nrows, bool);
+                    when "str" {
+                        entries[c] = new shared SymEntry(nrows, int);
+                        valEntries[c] = new shared SymEntry(totalBytes[c], uint(8));
+                    }
+                }
+            }
+
+            // Second pass: parse the chunks again and fill the columns at
+            // the offsets of their rows and string bytes
+            coforall loc in Locales do on loc {
+                const myFiles = filenames, myChunks = chunks, myColOf = colOf,
+                      myNames = selNames, myTypes = selTypes,
+                      myRowOffsets = rowOffsets, myRowCounts = rowCounts,
+                      myByteOffsets = byteOffsets;
+                for (ch, (fi, lo, hi, owner)) in zip(myChunks.domain, myChunks) {
+                    if owner != here.id then continue;
+                    const path = myFiles[fi];
+                    // About the memory of the bytes of the chunk, the bounds of its
+                    // lines and fields and the parsed values of a column, which
+                    // every locale may hold at once
+                    overMemLimit(numLocales * ((hi - lo) + myRowCounts[ch] * (48 + 17 * nsel)));
+                    var pc = parseChunk(path, lo, hi, delim, myColOf, nsel);
+                    const off = myRowOffsets[ch];
+                    for c in 0..#nsel {
+                        const e = entries[c]!;
+                        select myTypes[c] {
+                            when "int64" {
+                                fillColumn(pc, c, toSymEntry(e, int).a, off, "int64", myNames[c], path);
+                            }
+                            when "float64" {
+                                fillColumn(pc, c, toSymEntry(e, real).a, off, "float64", myNames[c], path);
+                            }
+                            when "bool" {
+                                fillColumn(pc, c, toSymEntry(e, bool).a, off, "bool", myNames[c], path);
+                            }
+                            when "datetime64[ns]" {
+                                fillColumn(pc, c, toSymEntry(e, int).a, off, "datetime64[ns]", myNames[c], path);
+                            }
+                            when "str" {
+                                fillStrings(pc, c, toSymEntry(e, int).a,
+                                            toSymEntry(valEntries[c]!, uint(8)).a,
+                                            off, myByteOffsets[ch, c]);
+                            }
+                        }
+                    }
+                }
+            }
+
+            repMsg = "[";
+            for c in 0..#nsel {
+                var rname = st.nextName();
+                st.addEntry(rname, entries[c]: shared GenSymEntry);
+                var created = "created " + st.attrib(rname);
+                if selTypes[c] == "str" {
+                    var vname = st.nextName();
+                    st.addEntry(vname, valEntries[c]: shared GenSymEntry);
+                    created += "+created " + st.attrib(vname);
+                }
+                repMsg += "%s{\"name\": %jt, \"dtype\": %jt, \"created\": %jt}".format(
+                                 if c == 0 then "" else ", ", selNames[c], selTypes[c], created);
+            }
+            repMsg += "]";
+        } catch e: Error {
+            var errorMsg = "Unable to read CSV files %s: %s".format(jsonfiles, e.message());
+            csvLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        csvLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Expands a single filename as a glob expression, sorted for
+     * consistency, and returns a list of several filenames as is.
+     */
+    private proc expandFilenames(filelist: [] string) throws {
+        if filelist.size == 1 {
+            var matches = glob(filelist[0]);
+            csvLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                            "glob expanded %s to %i files".format(filelist[0], matches.size));
+            if matches.size == 0 {
+                throw getErrorWithContext(
+                          msg="No files matching %s".format(filelist[0]),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+            sort(matches);
+            return matches;
+        }
+        return filelist;
+    }
+
+    /*
+     * Returns the first record of path, the header, without its line
+     * terminator.
+     */
+    private proc readHeader(path: string): string throws {
+        const size = getFileSize(path);
+        const n = min(size, csvChunkBytes);
+        var buf: [0..#n] uint(8);
+        readRange(path, 0, n, buf);
+        const e = recordEnd(buf, 0, n);
+        if e == n && n < size {
+            throw getErrorWithContext(
+                      msg="The header of %s is longer than %i bytes".format(path, csvChunkBytes),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        const he = lineEnd(buf, 0, e);
+        if he == 0 {
+            throw getErrorWithContext(
+                      msg="The file %s has no header line".format(path),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        return bytesToString(buf, 0, he);
+    }
+
+    /*
+     * Splits the string line into its unquoted fields.
+     */
+    private proc lineFields(line: string, delim: uint(8)): [] string throws {
+        var buf = lineBytes(line);
+        var fields: list(string);
+        for (col, lo, hi, quoted) in fieldsOf(buf, 0, buf.size, delim) {
+            var field = bytesToString(buf, lo, hi);
+            fields.append(if quoted then field.replace("\"\"", "\"") else field);
+        }
+        return fields.toArray();
+    }
+
+    private proc lineBytes(line: string): [] uint(8) {
+        var buf: [0..#line.numBytes] uint(8);
+        for i in buf.domain do buf[i] = line.byte(i);
+        return buf;
+    }
+
+    private proc bytesToString(ref buf: [] uint(8), lo: int, hi: int): string throws {
+        if hi <= lo then return "";
+        return createStringWithNewBuffer(c_ptrTo(buf[lo]), hi - lo);
+    }
+
+    /*
+     * Yields the index, bounds and quotedness of the fields of the line
+     * buf[lo..hi-1]. The bounds of a quoted field exclude its quotes but
+     * include its doubled inner quotes.
+     */
+    private iter fieldsOf(ref buf: [] uint(8), lo: int, hi: int, delim: uint(8)) {
+        var col = 0;
+        var i = lo;
+        while true {
+            if i < hi && buf[i] == QUOTE {
+                // Quoted field, up to the quote not followed by another one
+                var j = i + 1;
+                while j < hi {
+                    if buf[j] == QUOTE {
+                        if j + 1 < hi && buf[j+1] == QUOTE then j += 2;
+                        else break;
+                    } else {
+                        j += 1;
+                    }
+                }
+                yield (col, i + 1, j, true);
+                i = j + 1;
+                // Skip anything between the closing quote and the delimiter
+                while i < hi && buf[i] != delim do i += 1;
+            } else {
+                var j = i;
+                while j < hi && buf[j] != delim do j += 1;
+                yield (col, i, j, false);
+                i = j;
+            }
+            if i >= hi then break;
+            // Skip the delimiter
+            i += 1;
+            col += 1;
+        }
+    }
+
+    /*
+     * Types the columns of types that have no dtype from the first
+     * csvSampleRows rows of path: bool if all of their fields are true or
+     * false, int64 if all are integers, float64 if all are numbers or
+     * empty, datetime64[ns] if all are ISO 8601 dates or datetimes, and
+     * str otherwise. Columns with empty fields are typed as if those were
+     * missing values, i.e. float64 or str.
+     */
+    private proc inferDtypes(path: string, delim: uint(8), const ref colOf: [] int,
+                             ref types: [] string) throws {
+        const nsel = types.size;
+        var seen, hasEmpty: [0..#nsel] bool;
+        var allBool, allInt, allReal, allDate: [0..#nsel] bool = true;
+        const size = getFileSize(path);
+        const n = min(size, csvChunkBytes);
+        var buf: [0..#n] uint(8);
+        readRange(path, 0, n, buf);
+        // Skip the header
+        var s = recordEnd(buf, 0, n) + 1;
+        var nread = 0;
+        while nread < csvSampleRows && s < n {
+            const e = recordEnd(buf, s, n);
+            // A record cut by the end of the buffer is not sampled
+            if e == n && n < size then break;
+            const le = lineEnd(buf, s, e);
+            if le > s {
+                nread += 1;
+                for (col, lo, hi, quoted) in fieldsOf(buf, s, le, delim) {
+                    if col >= colOf.size then break;
+                    const c = colOf[col];
+                    if c < 0 || !types[c].isEmpty() then continue;
+                    const (tlo, thi) = trimmed(buf, lo, hi);
+                    if thi == tlo {
+                        hasEmpty[c] = true;
+                        continue;
+                    }
+                    seen[c] = true;
+                    allBool[c] &&= parseBool(buf, tlo, thi)(0);
+                    allInt[c] &&= parseInt(buf, tlo, thi)(0);
+                    allReal[c] &&= parseReal(buf, tlo, thi)(0);
+                    allDate[c] &&= parseDatetime(buf, tlo, thi)(0);
+                }
+            }
+            s = e + 1;
+        }
+        for c in 0..#nsel {
+            if !types[c].isEmpty() then continue;
+            types[c] = if !seen[c] then "float64"
+                       else if allBool[c] && !hasEmpty[c] then "bool"
+                       else if allInt[c] && !hasEmpty[c] then "int64"
+                       else if allInt[c] || allReal[c] then "float64"
+                       else if allDate[c] && !hasEmpty[c] then "datetime64[ns]"
+                       else "str";
+        }
+        csvLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "inferred dtypes %jt from %i rows of %s".format(types, nread, path));
+    }
+
+    /*
+     * Cuts the concatenation of the files into one byte range per locale of
+     * about the same size, and returns the pieces of these ranges within
+     * every file, cut further into pieces of about csvChunkBytes, as (file
+     * index, first byte, end byte, locale) chunks. The bounds of the chunks
+     * are moved to the start of the next record, so that every row belongs
+     * to exactly one chunk. As quoted fields may contain newlines, a newline
+     * only ends a record if an even number of quotes precede it in its
+     * file, so the locales first count the quotes of their pieces.
+     */
+    private proc splitFiles(const ref filenames: [] string) throws {
+        var sizes: [filenames.domain] int;
+        for (size, path) in zip(sizes, filenames) do size = getFileSize(path);
+        const total = + reduce sizes;
+        var pieceList: list((int, int, int, int));
+        var fileStart = 0;
+        for (fi, size) in zip(filenames.domain, sizes) {
+            for loc in 0..#numLocales {
+                const locLo = total * loc / numLocales,
+                      locHi = total * (loc + 1) / numLocales;
+                const lo = max(locLo, fileStart) - fileStart,
+                      hi = min(locHi, fileStart + size) - fileStart;
+                var plo = lo;
+                while plo < hi {
+                    const phi = min(plo + csvChunkBytes, hi);
+                    pieceList.append((fi, plo, phi, loc));
+                    plo = phi;
+                }
+            }
+            fileStart += size;
+        }
+        const pieces = pieceList.toArray();
+        const npieces = pieces.size;
+
+        var quotes: [0..#npieces] int;
+        coforall loc in Locales do on loc {
+            const myFiles = filenames, myPieces = pieces;
+            for (k, (fi, lo, hi, owner)) in zip(myPieces.domain, myPieces) {
+                if owner != here.id then continue;
+                overMemLimit(numLocales * (hi - lo));
+                var buf: [0..#(hi - lo)] uint(8);
+                readRange(myFiles[fi], lo, hi, buf);
+                quotes[k] = + reduce [b in buf] (b == QUOTE):int;
+            }
+        }
+        // Whether an odd number of quotes precede each piece in its file
+        var oddQuotes: [0..#npieces] bool;
+        var count = 0;
+        for k in 0..#npieces {
+            if k > 0 && pieces[k](0) != pieces[k-1](0) then count = 0;
+            oddQuotes[k] = count % 2 == 1;
+            count += quotes[k];
+        }
+
+        // Start of the first record starting in or after each piece
+        var starts: [0..#npieces] int;
+        coforall loc in Locales do on loc {
+            const myFiles = filenames, mySizes = sizes, myPieces = pieces,
+                  myOddQuotes = oddQuotes;
+            for (k, (fi, lo, hi, owner)) in zip(myPieces.domain, myPieces) {
+                if owner != here.id then continue;
+                starts[k] = alignToRecord(myFiles[fi], lo, myOddQuotes[k], mySizes[fi]);
+            }
+        }
+        var chunks: list((int, int, int, int));
+        for (k, (fi, lo, hi, owner)) in zip(pieces.domain, pieces) {
+            const chi = if k + 1 < npieces && pieces[k+1](0) == fi then starts[k+1]
+                        else sizes[fi];
+            if starts[k] < chi then chunks.append((fi, starts[k], chi, owner));
+        }
+        return chunks.toArray();
+    }
+
+    /*
+     * Returns the offset of the first record of path starting at or after
+     * pos, given whether an odd number of quotes precede pos in the file.
+     */
+    private proc alignToRecord(path: string, pos: int, oddQuotes: bool, size: int): int throws {
+        if pos <= 0 || pos >= size then return min(max(pos, 0), size);
+        var f = open(path, iomode.r);
+        defer { try! f.close(); }
+        var r = f.reader(kind=ionative, locking=false, start=pos-1);
+        defer { try! r.close(); }
+        var b: uint(8);
+        var i = pos - 1;
+        r.read(b);
+        // Whether byte i is within a quoted field
+        var inQuotes = oddQuotes != (b == QUOTE);
+        while true {
+            if b == NEWLINE && !inQuotes then return i + 1;
+            if b == QUOTE then inQuotes = !inQuotes;
+            if !r.read(b) then return size;
+            i += 1;
+        }
+        return size;
+    }
+
+    /*
+     * Returns the index of the newline ending the record that starts at
+     * buf[s], i.e. of the first newline after s that is not within a quoted
+     * field, or hi if there is none before hi.
+     */
+    private proc recordEnd(ref buf: [] uint(8), s: int, hi: int): int {
+        var inQuotes = false;
+        for i in s..hi-1 {
+            const b = buf[i];
+            if b == QUOTE then inQuotes = !inQuotes;
+            else if b == NEWLINE && !inQuotes then return i;
+        }
+        return hi;
+    }
+
+    /*
+     * Returns the start of the first record of buf starting at or after
+     * pos > 0, given whether an odd number of quotes precede pos in buf, or
+     * hi if none starts before hi.
+     */
+    private proc nextRecord(ref buf: [] uint(8), pos: int, hi: int, oddQuotes: bool): int {
+        var inQuotes = oddQuotes != (buf[pos-1] == QUOTE);
+        for i in pos-1..hi-2 {
+            if buf[i] == NEWLINE && !inQuotes then return i + 1;
+            if buf[i] == QUOTE then inQuotes = !inQuotes;
+        }
+        return hi;
+    }
+
+    /* End of the record buf[s..e-1] without the carriage return of its line terminator */
+    private proc lineEnd(ref buf: [] uint(8), s: int, e: int): int {
+        return if e > s && buf[e-1] == CR then e - 1 else e;
+    }
+
+    /*
+     * Returns whether an odd number of quotes of buf[lo..] precede each of
+     * the nTasks blocks of buf[lo..hi-1], counting the quotes of the blocks
+     * in parallel.
+     */
+    private proc blockQuoteParity(ref buf: [] uint(8), lo: int, hi: int, nTasks: int) {
+        const m = hi - lo;
+        var counts: [0..#nTasks] int;
+        forall t in 0..#nTasks with (ref buf) {
+            for i in (lo + t*m/nTasks)..(lo + (t+1)*m/nTasks - 1) {
+                if buf[i] == QUOTE then counts[t] += 1;
+            }
+        }
+        const before = (+ scan counts) - counts;
+        var odd: [0..#nTasks] bool = [c in before] c % 2 == 1;
+        return odd;
+    }
+
+    /* Reads bytes lo..hi-1 of path into buf */
+    private proc readRange(path: string, lo: int, hi: int, ref buf: [] uint(8)) throws {
+        var f = open(path, iomode.r);
+        defer { try! f.close(); }
+        var r = f.reader(kind=ionative, locking=false, start=lo, end=hi);
+        defer { try! r.close(); }
+        r.read(buf);
+    }
+
+    /*
+     * Returns the number of non-empty records of bytes lo..hi-1 of path and
+     * sets nbytes[c], for every selected str column c, to the number of
+     * bytes of their fields, unescaped and null terminated, without indexing
+     * the fields. The first record of the file is checked against header and
+     * skipped.
+     */
+    private proc countChunk(path: string, lo: int, hi: int, delim: uint(8),
+                            const ref colOf: [] int, const ref isStr: [] bool,
+                            header: string, ref nbytes: [] int): int throws {
+        const n = hi - lo;
+        const nsel = isStr.size;
+        overMemLimit(numLocales * n);
+        var buf: [0..#n] uint(8);
+        readRange(path, lo, hi, buf);
+
+        var start = 0;
+        if lo == 0 && n > 0 {
+            const e = recordEnd(buf, 0, n);
+            if bytesToString(buf, 0, lineEnd(buf, 0, e)) != header {
+                throw getErrorWithContext(
+                          msg="The header of %s differs from that of the first file".format(path),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+            }
+            start = min(e + 1, n);
+        }
+
+        // Each task handles the records starting in its block of the buffer
+        const m = n - start;
+        const nTasks = max(1, min(here.maxTaskPar, m / 65536));
+        const oddQuotes = blockQuoteParity(buf, start, n, nTasks);
+        var taskRows: [0..#nTasks] int;
+        var taskBytes: [0..#nTasks, 0..#nsel] int;
+        forall t in 0..#nTasks with (ref buf) {
+            const blo = start + t*m/nTasks, bhi = start + (t+1)*m/nTasks;
+            var s = if t > 0 then nextRecord(buf, blo, bhi, oddQuotes[t]) else blo;
+            while s < bhi {
+                const e = recordEnd(buf, s, n);
+                const le = lineEnd(buf, s, e);
+                if le > s {
+                    taskRows[t] += 1;
+                    for (col, fs, fe, quoted) in fieldsOf(buf, s, le, delim) {
+                        if col >= colOf.size then break;
+                        const c = colOf[col];
+                        if c >= 0 && isStr[c] {
+                            taskBytes[t, c] += unescapedSize(buf, fs, fe, quoted) + 1;
+                        }
+                    }
+                }
+                s = e + 1;
+            }
+        }
+        for c in 0..#nsel do nbytes[c] = + reduce taskBytes[.., c];
+        return + reduce taskRows;
+    }
+
+    /*
+     * Reads bytes lo..hi-1 of path and finds the fields of the selected
+     * columns of its non-empty records. The first record of the file, checked
+     * by countChunk, is skipped.
+     */
+    private proc parseChunk(path: string, lo: int, hi: int, delim: uint(8),
+                            const ref colOf: [] int, nsel: int): ParsedChunk throws {
+        var pc: ParsedChunk;
+        const n = hi - lo;
+        pc.bufD = {0..#n};
+        readRange(path, lo, hi, pc.buf);
+
+        // Find the newlines outside quoted fields, with one task per block of
+        // the buffer
+        const nTasks = max(1, min(here.maxTaskPar, n / 65536));
+        const oddQuotes = blockQuoteParity(pc.buf, 0, n, nTasks);
+        var counts: [0..#nTasks] int;
+        forall t in 0..#nTasks with (ref pc) {
+            var inQuotes = oddQuotes[t];
+            for i in (t*n/nTasks)..((t+1)*n/nTasks - 1) {
+                const b = pc.buf[i];
+                if b == QUOTE then inQuotes = !inQuotes;
+                else if b == NEWLINE && !inQuotes then counts[t] += 1;
+            }
+        }
+        const ends = + scan counts;
+        const numNewlines = ends[nTasks-1];
+        var newlines: [0..#numNewlines] int;
+        forall t in 0..#nTasks with (ref pc) {
+            var j = ends[t] - counts[t];
+            var inQuotes = oddQuotes[t];
+            for i in (t*n/nTasks)..((t+1)*n/nTasks - 1) {
+                const b = pc.buf[i];
+                if b == QUOTE {
+                    inQuotes = !inQuotes;
+                } else if b == NEWLINE && !inQuotes {
+                    newlines[j] = i;
+                    j += 1;
+                }
+            }
+        }
+
+        // Bounds of the records, without their line terminators
+        const numLines = numNewlines +
+            (if n > 0 && (numNewlines == 0 || newlines[numNewlines-1] != n-1) then 1 else 0);
+        var lineLo, lineHi: [0..#numLines] int;
+        forall k in 0..#numLines with (ref pc) {
+            const s = if k == 0 then 0 else newlines[k-1] + 1;
+            var e = if k < numNewlines then newlines[k] else n;
+            if e > s && pc.buf[e-1] == CR then e -= 1;
+            lineLo[k] = s;
+            lineHi[k] = e;
+        }
+        const first = if lo == 0 then 1 else 0;
+        var keep: [0..#numLines] int = [k in 0..#numLines] (k >= first && lineHi[k] > lineLo[k]):int;
+        const keepEnds = + scan keep;
+        const nrows = if numLines > 0 then keepEnds[numLines-1] else 0;
+
+        pc.rowD = {0..#nrows};
+        pc.fieldD = {0..#nrows, 0..#nsel};
+        forall k in 0..#numLines with (ref pc) {
+            if keep[k] == 1 {
+                const row = keepEnds[k] - 1;
+                for (col, s, e, quoted) in fieldsOf(pc.buf, lineLo[k], lineHi[k], delim) {
+                    if col >= colOf.size then break;
+                    const c = colOf[col];
+                    if c >= 0 {
+                        pc.fieldLo[row, c] = s;
+                        pc.fieldHi[row, c] = e;
+                        pc.fieldQuoted[row, c] = quoted;
+                    }
+                }
+            }
+        }
+        return pc;
+    }
+
+    /* Size of a field once its doubled quotes are unescaped */
+    private proc unescapedSize(ref buf: [] uint(8), lo: int, hi: int, quoted: bool): int {
+        if !quoted then return hi - lo;
+        var size = 0;
+        var i = lo;
+        while i < hi {
+            if buf[i] == QUOTE then i += 1;
+            size += 1;
+            i += 1;
+        }
+        return size;
+    }
+
+    /*
+     * Parses column c of pc as kind into A[off..], raising an error naming
+     * the first field that cannot be parsed.
+     */
+    private proc fillColumn(ref pc: ParsedChunk, c: int, ref A: [] ?t, off: int,
+                            param kind: string, colName: string, path: string) throws {
+        var vals: [pc.rowD] t;
+        var firstBad = max(int);
+        forall r in pc.rowD with (min reduce firstBad, ref pc) {
+            const (lo, hi) = trimmed(pc.buf, pc.fieldLo[r, c], pc.fieldHi[r, c]);
+            var ok: bool;
+            if kind == "int64" {
+                (ok, vals[r]) = parseInt(pc.buf, lo, hi);
+            } else if kind == "float64" {
+                (ok, vals[r]) = parseReal(pc.buf, lo, hi);
+            } else if kind == "bool" {
+                (ok, vals[r]) = parseBool(pc.buf, lo, hi);
+            } else {
+                (ok, vals[r]) = parseDatetime(pc.buf, lo, hi);
+            }
+            if !ok then firstBad = min(firstBad, r);
+        }
+        if firstBad != max(int) {
+            const field = bytesToString(pc.buf, pc.fieldLo[firstBad, c], pc.fieldHi[firstBad, c]);
+            throw getErrorWithContext(
+                      msg="Cannot read \"%s\" in column %s of %s as %s".format(
+                                                          field, colName, path, kind),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        if pc.rowD.size > 0 then A[off..#pc.rowD.size] = vals;
+    }
+
+    /*
+     * Copies the unescaped strings of column c of pc, null terminated, into
+     * V[byteOff..] and their offsets into O[off..].
+     */
+    private proc fillStrings(ref pc: ParsedChunk, c: int, ref O: [] int, ref V: [] uint(8),
+                             off: int, byteOff: int) throws {
+        if pc.rowD.size == 0 then return;
+        var lens: [pc.rowD] int;
+        forall r in pc.rowD with (ref pc) {
+            lens[r] = unescapedSize(pc.buf, pc.fieldLo[r, c], pc.fieldHi[r, c],
+                                    pc.fieldQuoted[r, c]) + 1;
+        }
+        const ends = + scan lens;
+        const nbytes = ends[pc.rowD.high];
+        // Zero filled, which terminates the strings
+        var vals: [0..#nbytes] uint(8);
+        forall r in pc.rowD with (ref pc) {
+            var j = ends[r] - lens[r];
+            var i = pc.fieldLo[r, c];
+            const hi = pc.fieldHi[r, c];
+            while i < hi {
+                vals[j] = pc.buf[i];
+                if pc.fieldQuoted[r, c] && pc.buf[i] == QUOTE then i += 1;
+                i += 1;
+                j += 1;
+            }
+        }
+        O[off..#pc.rowD.size] = (ends - lens) + byteOff;
+        V[byteOff..#nbytes] = vals;
+    }
+
+    /* Bounds of buf[lo..hi-1] without its leading and trailing spaces */
+    private proc trimmed(ref buf: [] uint(8), lo: int, hi: int): (int, int) {
+        var s = lo, e = hi;
+        while s < e && buf[s] == SPACE do s += 1;
+        while e > s && buf[e-1] == SPACE do e -= 1;
+        return (s, e);
+    }
+
+    private proc isDigit(b: uint(8)): bool {
+        return b >= ZERO && b <= NINE;
+    }
+
+    private proc parseInt(ref buf: [] uint(8), lo: int, hi: int): (bool, int) {
+        var i = lo;
+        var neg = false;
+        if i < hi && (buf[i] == PLUS || buf[i] == MINUS) {
+            neg = buf[i] == MINUS;
+            i += 1;
+        }
+        if i >= hi then return (false, 0);
+        var v = 0;
+        while i < hi {
+            if !isDigit(buf[i]) then return (false, 0);
+            v = v * 10 + (buf[i] - ZERO):int;
+            i += 1;
+        }
+        return (true, if neg then -v else v);
+    }
+
+    /* Parses a real, reading an empty field as NaN */
+    private proc parseReal(ref buf: [] uint(8), lo: int, hi: int): (bool, real) {
+        if hi <= lo then return (true, nan);
+        try {
+            return (true, bytesToString(buf, lo, hi):real);
+        } catch {
+            return (false, 0.0);
+        }
+    }
+
+    /* Parses true or false, in any case */
+    private proc parseBool(ref buf: [] uint(8), lo: int, hi: int): (bool, bool) {
+        if hi - lo == 4 && matchesWord(buf, lo, "true") then return (true, true);
+        if hi - lo == 5 && matchesWord(buf, lo, "false") then return (true, false);
+        return (false, false);
+    }
+
+    private proc matchesWord(ref buf: [] uint(8), lo: int, word: string): bool {
+        for i in 0..#word.numBytes {
+            var b = buf[lo + i];
+            // lower case
+            if b >= 65 && b <= 90 then b += 32;
+            if b != word.byte(i) then return false;
+        }
+        return true;
+    }
+
+    /*
+     * Parses an ISO 8601 date or datetime, YYYY-MM-DD[(T| )HH:MM[:SS[.f]]][Z],
+     * into nanoseconds since the epoch.
+     */
+    private proc parseDatetime(ref buf: [] uint(8), lo: int, hi: int): (bool, int) {
+        var i = lo;
+        const (okYear, year) = parseDigits(buf, i, hi, 4);
+        if !okYear || !skipByte(buf, i, hi, MINUS) then return (false, 0);
+        const (okMonth, month) = parseDigits(buf, i, hi, 2);
+        if !okMonth || !skipByte(buf, i, hi, MINUS) then return (false, 0);
+        const (okDay, day) = parseDigits(buf, i, hi, 2);
+        if !okDay || month < 1 || month > 12 || day < 1 || day > 31 then return (false, 0);
+        var ns = daysFromCivil(year, month, day) * 86400 * 10**9;
+        if i < hi && (buf[i] == UPPER_T || buf[i] == SPACE) {
+            i += 1;
+            const (okHour, hour) = parseDigits(buf, i, hi, 2);
+            if !okHour || !skipByte(buf, i, hi, COLON) then return (false, 0);
+            const (okMinute, minute) = parseDigits(buf, i, hi, 2);
+            if !okMinute then return (false, 0);
+            var second = 0, frac = 0;
+            if skipByte(buf, i, hi, COLON) {
+                const (okSecond, s) = parseDigits(buf, i, hi, 2);
+                if !okSecond then return (false, 0);
+                second = s;
+                if skipByte(buf, i, hi, DOT) {
+                    // Digits past nanoseconds are truncated
+                    var scale = 10**8, ndigits = 0;
+                    while i < hi && isDigit(buf[i]) {
+                        frac += (buf[i] - ZERO):int * scale;
+                        scale /= 10;
+                        ndigits += 1;
+                        i += 1;
+                    }
+                    if ndigits == 0 then return (false, 0);
+                }
+            }
+            if hour > 23 || minute > 59 || second > 60 then return (false, 0);
+            ns += ((hour * 60 + minute) * 60 + second) * 10**9 + frac;
+        }
+        skipByte(buf, i, hi, UPPER_Z);
+        return (i == hi, ns);
+    }
+
+    private proc parseDigits(ref buf: [] uint(8), ref i: int, hi: int, n: int): (bool, int) {
+        var v = 0;
+        for 1..n {
+            if i >= hi || !isDigit(buf[i]) then return (false, 0);
+            v = v * 10 + (buf[i] - ZERO):int;
+            i += 1;
+        }
+        return (true, v);
+    }
+
+    private proc skipByte(ref buf: [] uint(8), ref i: int, hi: int, b: uint(8)): bool {
+        if i < hi && buf[i] == b {
+            i += 1;
+            return true;
+        }
+        return false;
+    }
+
+    /* Days since 1970-01-01 of a date of the proleptic Gregorian calendar */
+    private proc daysFromCivil(y0: int, m: int, d: int): int {
+        const y = if m <= 2 then y0 - 1 else y0;
+        const era = (if y >= 0 then y else y - 399) / 400;
+        const yoe = y - era * 400;
+        // Days since the first of March
+        const doy = (153 * ((m + 9) % 12) + 2) / 5 + d - 1;
+        const doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+        return era * 146097 + doe - 719468;
+    }
+}
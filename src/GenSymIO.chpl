@@ -21,6 +21,8 @@ module GenSymIO {
     use ServerConfig;
     use Search;
     use IndexingMsg;
+    use Compression;
+    use PrivateFiles;
     
     private config const logLevel = ServerConfig.logLevel;
     const gsLogger = new Logger(logLevel);
@@ -31,31 +33,66 @@ module GenSymIO {
     config const NULL_STRINGS_VALUE = 0:uint(8);
     config const TRUNCATE: int = 0;
     config const APPEND: int = 1;
+    config const APPEND_ROWS: int = 2;
+    /* Default size in bytes of the chunks of compressed or shuffled datasets */
+    config const HDF5_CHUNK_BYTES: int = 1048576;
+
+    /*
+     * Number of ints describing a dataset of a file in a manifest: segmented,
+     * class (0 int, 1 float, 2 other), bytesize, signed, boolean, length and
+     * the length of the values of a segmented dataset
+     */
+    param MANIFEST_FIELDS = 7;
+
+    /*
+     * Storage layout and filters of the datasets written by tohdf. Datasets
+     * are contiguous unless they are compressed, shuffled, given a chunk
+     * size or extendable, in which case they are chunked. Rows are appended
+     * to extendable datasets that already exist instead of creating them.
+     */
+    record HdfWriteOptions {
+        var gzipLevel: int = -1; // -1 for no compression
+        var shuffle: bool = false;
+        var chunkElems: int = 0; // 0 for chunks of HDF5_CHUNK_BYTES
+        var extendable: bool = false;
+        
+        proc isContiguous(): bool {
+            return gzipLevel < 0 && !shuffle && chunkElems == 0 && !extendable;
+        }
+    }
 
     /*
      * Creates a pdarray server-side and returns the SymTab name used to
-     * retrieve the pdarray from the SymTab.
+     * retrieve the pdarray from the SymTab. The args contain the dtype and
+     * size of the array and the payload contains the raw array bytes in
+     * native (little-endian) byte order. An optional third arg names the
+     * codec with which the client compressed the payload.
      */
-    proc arrayMsg(cmd: string, payload: bytes, st: borrowed SymTab): MsgTuple throws {
+    proc arrayMsg(cmd: string, args: string, payload: bytes, 
+                                             st: borrowed SymTab): MsgTuple throws {
         // Set up our return items
         var msgType = MsgType.NORMAL;
         var msg:string = "";
         var rname:string = "";
 
         // TODO: Surround everything with a try/catch to eliminate try! killing the server
-        var (dtypeBytes, sizeBytes, data) = payload.splitMsgToTuple(b" ", 3);
-        var dtype = str2dtype(try! dtypeBytes.decode());
-        var size = try! sizeBytes:int;
+        var (dtypeStr, sizeStr, codec) = args.splitMsgToTuple(3);
+        var dtype = str2dtype(dtypeStr);
+        var size = try! sizeStr:int;
         var tmpf:file; defer { ensureClose(tmpf); }
         overMemLimit(2*8*size);
 
         gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
-                                          "dtype: %t size: %i".format(dtype,size));
+                          "dtype: %t size: %i codec: %s".format(dtype,size,codec));
+
+        // Restore the raw array bytes if the client compressed them
+        var data = if codec.isEmpty() then payload
+                   else decompressBytes(payload, size*dtypeSize(dtype), dtypeSize(dtype), codec);
 
         // Write the data payload composing the pdarray to a memory buffer
         try {
             tmpf = openmem();
-            var tmpw = tmpf.writer(kind=iobig);
+            var tmpw = tmpf.writer(kind=ionative);
             tmpw.write(data);
             tmpw.close();
         } catch {
@@ -74,7 +111,7 @@ module GenSymIO {
             } else if dtype == DType.UInt8 {
                 rname = makeEntry(size, uint(8), st, tmpf);
             } else {
-                msg = "Unhandled data type %s".format(dtypeBytes);
+                msg = "Unhandled data type %s".format(dtypeStr);
                 msgType = MsgType.ERROR;
                 gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),msg);
             }
@@ -99,9 +136,13 @@ module GenSymIO {
     */
     private proc makeEntry(size:int, type t, st: borrowed SymTab, tmpf:file): string throws {
         var entry = new shared SymEntry(size, t);
-        var tmpr = tmpf.reader(kind=iobig, start=0);
-        tmpr.read(entry.a);
+        // Read into a local array with a single bulk native-endian read and
+        // then distribute it with one bulk assignment
+        var localA: [0..#size] t;
+        var tmpr = tmpf.reader(kind=ionative, start=0);
+        tmpr.read(localA);
         tmpr.close(); 
+        entry.a = localA;
         var name = st.nextName();
         st.addEntry(name, entry);
         return name;
@@ -122,26 +163,177 @@ module GenSymIO {
 
     /*
      * Outputs the pdarray as a Numpy ndarray in the form of a 
-     * Chapel Bytes object
+     * Chapel Bytes object, compressed with the codec optionally
+     * following the array name
      */
     proc tondarrayMsg(cmd: string, payload: string, st: 
                                           borrowed SymTab): bytes throws {
+        var (name, codec) = payload.splitMsgToTuple(2);
+        var entry = st.lookup(name);
+        return compressReply(entryToBytes(entry, 0..#entry.size), entry.itemsize, codec);
+    }
+
+    /*
+     * Returns the raw bytes of elements [start, stop) of a pdarray, so that
+     * clients can stream an array too large to transfer in one message.
+     */
+    proc tondarraySliceMsg(cmd: string, payload: string, st: 
+                                          borrowed SymTab): bytes throws {
+        var (name, startStr, stopStr, codec) = payload.splitMsgToTuple(4);
+        var entry = st.lookup(name);
+        var start = try! startStr:int;
+        var stop = try! stopStr:int;
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "name: %s start: %i stop: %i".format(name,start,stop));
+        if start < 0 || stop > entry.size || start > stop {
+            var errorMsg = "Error: slice [%i, %i) out of bounds for array of size %i".format(
+                                                                  start, stop, entry.size);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return try! b"Error: slice [%i, %i) out of bounds for array of size %i".format(
+                                                                  start, stop, entry.size);
+        }
+        return compressReply(entryToBytes(entry, start..stop-1), entry.itemsize, codec);
+    }
+
+    /*
+     * Creates a pdarray from the native-endian bytes that a client on the
+     * same host wrote to a file in sharedMemoryDir, sparing the copy of the
+     * array through the socket. The args contain the dtype, size and path
+     * of the file, which the client deletes once the reply is received.
+     */
+    proc arrayShmMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var (dtypeStr, sizeStr, path) = args.splitMsgToTuple(3);
+        var dtype = str2dtype(dtypeStr);
+        var size = try! sizeStr:int;
+        checkSharedMemoryPath(path);
+        overMemLimit(2*8*size);
+
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                          "dtype: %t size: %i path: %s".format(dtype,size,path));
+
+        var f = openNoFollow(path); defer { ensureClose(f); }
+        if f.size != size*dtypeSize(dtype) {
+            var errorMsg = "Expected %i bytes in %s but found %i".format(
+                                                 size*dtypeSize(dtype), path, f.size);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var rname: string;
+        if dtype == DType.Int64 {
+            rname = makeEntry(size, int, st, f);
+        } else if dtype == DType.Float64 {
+            rname = makeEntry(size, real, st, f);
+        } else if dtype == DType.Bool {
+            rname = makeEntry(size, bool, st, f);
+        } else if dtype == DType.UInt8 {
+            rname = makeEntry(size, uint(8), st, f);
+        } else {
+            var errorMsg = "Unhandled data type %s".format(dtypeStr);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var repMsg = "created " + st.attrib(rname);
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Writes a pdarray, or elements [start, stop) of it if the args follow
+     * its name with start and stop, in native byte order to a new file in
+     * sharedMemoryDir and returns the path of the file, which the client maps
+     * into memory and deletes.
+     */
+    proc tondarrayShmMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        var (name, startStr, stopStr) = args.splitMsgToTuple(3);
+        var entry = st.lookup(name);
+        var start = if startStr.isEmpty() then 0 else try! startStr:int;
+        var stop = if stopStr.isEmpty() then entry.size else try! stopStr:int;
+        if sharedMemoryDir.isEmpty() {
+            var errorMsg = "Shared memory transfers are disabled";
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        if start < 0 || stop > entry.size || start > stop {
+            var errorMsg = "slice [%i, %i) out of bounds for array of size %i".format(
+                                                                  start, stop, entry.size);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        overMemLimit((stop-start)*entry.itemsize);
+        // The file is only readable by the server user, and its name cannot
+        // be guessed by other users of the host to plant a file or link there
+        var path = "%s/arkouda_%i_%s".format(sharedMemoryDir, ServerPort, randomToken());
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "name: %s start: %i stop: %i path: %s".format(name,start,stop,path));
+
+        var f = createPrivateFile(path); defer { ensureClose(f); }
+        var w = f.writer(kind=ionative);
+        if !writeEntry(w, entry, start..stop-1) {
+            w.close();
+            remove(path);
+            var errorMsg = "Unhandled dtype %s".format(entry.dtype);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        w.close();
+        return new MsgTuple(path, MsgType.NORMAL);
+    }
+
+    /*
+     * Replies whether a file that a client created in sharedMemoryDir is
+     * visible to the server, that is whether they run on the same host.
+     */
+    proc shmprobeMsg(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+        checkSharedMemoryPath(args);
+        var repMsg = if exists(args) && !isLink(args) then "true" else "false";
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "path: %s exists: %s".format(args,repMsg));
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
+    /*
+     * Throws an error unless path names an arkouda file directly within
+     * sharedMemoryDir, whose name is made of letters, digits and underscores
+     * as those of mkstemp and tondarrayShmMsg are, so that clients cannot
+     * have the server access arbitrary files through the shared memory
+     * commands. Symbolic links are refused when the file is opened.
+     */
+    private proc checkSharedMemoryPath(path: string) throws {
+        const prefix = sharedMemoryDir + "/arkouda_";
+        if sharedMemoryDir.isEmpty() || !path.startsWith(prefix) ||
+                        !path[prefix.size..].replace("_", "").isAlnum() {
+            throw getErrorWithContext(
+                      msg="Invalid shared memory path %s".format(path),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+    }
+
+    /*
+     * Compresses the array bytes of a reply if the client requested a codec,
+     * leaving error messages readable.
+     */
+    private proc compressReply(arrayBytes: bytes, itemsize: int, codec: string): bytes throws {
+        if codec.isEmpty() || arrayBytes.startsWith(b"Error:") {
+            return arrayBytes;
+        }
+        return compressBytes(arrayBytes, itemsize, codec);
+    }
+
+    /*
+     * Serializes the elements of entry within rng into a native-endian byte
+     * buffer, or an error message if the buffer cannot be built.
+     */
+    private proc entryToBytes(entry: borrowed GenSymEntry, rng: range): bytes throws {
         var arrayBytes: bytes;
-        var entry = st.lookup(payload);
-        overMemLimit(2*entry.size*entry.itemsize);
+        overMemLimit(2*rng.size*entry.itemsize);
         var tmpf: file; defer { ensureClose(tmpf); }
         try {
             tmpf = openmem();
-            var tmpw = tmpf.writer(kind=iobig);
-            if entry.dtype == DType.Int64 {
-                tmpw.write(toSymEntry(entry, int).a);
-            } else if entry.dtype == DType.Float64 {
-                tmpw.write(toSymEntry(entry, real).a);
-            } else if entry.dtype == DType.Bool {
-                tmpw.write(toSymEntry(entry, bool).a);
-            } else if entry.dtype == DType.UInt8 {
-                tmpw.write(toSymEntry(entry, uint(8)).a);
-            } else {
+            var tmpw = tmpf.writer(kind=ionative);
+            if !writeEntry(tmpw, entry, rng) {
                 var errorMsg = "Error: Unhandled dtype %s".format(entry.dtype);                
                 gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);            
                 return try! b"Error: Unhandled dtype %s".format(entry.dtype);
@@ -152,21 +344,42 @@ module GenSymIO {
         }
 
         try {
-            var tmpr = tmpf.reader(kind=iobig, start=0);
+            var tmpr = tmpf.reader(kind=ionative, start=0);
             tmpr.readbytes(arrayBytes);
             tmpr.close();
         } catch {
             return b"Error: Unable to copy array from memory buffer to string";
         }
-        //var repMsg = try! "Array: %i".format(arraystr.length) + arraystr;
-        /*
-         Engin: fwiw, if you want to achieve the above, you can:
+        return arrayBytes;
+    }
 
-         return b"Array: %i %|t".format(arrayBytes.length, arrayBytes);
+    /*
+     * Writes the elements of entry within rng to a channel in native byte
+     * order, returning false if the dtype of entry is not handled.
+     */
+    private proc writeEntry(w, entry: borrowed GenSymEntry, rng: range): bool throws {
+        if entry.dtype == DType.Int64 {
+            writeLocalCopy(w, toSymEntry(entry, int).a, rng);
+        } else if entry.dtype == DType.Float64 {
+            writeLocalCopy(w, toSymEntry(entry, real).a, rng);
+        } else if entry.dtype == DType.Bool {
+            writeLocalCopy(w, toSymEntry(entry, bool).a, rng);
+        } else if entry.dtype == DType.UInt8 {
+            writeLocalCopy(w, toSymEntry(entry, uint(8)).a, rng);
+        } else {
+            return false;
+        }
+        return true;
+    }
 
-         But I think the main problem is how to separate the length from the data
-         */
-       return arrayBytes;
+    /*
+     * Gathers a distributed array into a local array so that the channel
+     * can write it with one bulk native-endian write rather than
+     * serializing it element by element.
+     */
+    private proc writeLocalCopy(w, A: [?D] ?t, rng: range) throws {
+        var localA: [0..#rng.size] t = A[rng];
+        w.write(localA);
     }
 
     /*
@@ -454,19 +667,42 @@ module GenSymIO {
      * Reads all datasets from 1..n HDF5 files into an Arkouda symbol table. 
      */
     proc readAllHdfMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
-        // reqMsg = "readAllHdf <ndsets> <nfiles> [<json_dsetname>] | [<json_filenames>]"
+        // reqMsg = "readAllHdf <strictTypes> <ndsets> <nfiles> <rows> <files> [<json_dsetname>] | [<json_filenames>] [| [<json_manifest>]]"
         var repMsg: string;
         // May need a more robust delimiter then " | "
-        var (strictFlag, ndsetsStr, nfilesStr, arraysStr) = payload.splitMsgToTuple(4);
+        var (strictFlag, ndsetsStr, nfilesStr, rowsStr, filesStr, arraysStr) = payload.splitMsgToTuple(6);
         var strictTypes: bool = true;
         if (strictFlag.toLower() == "false") {
           strictTypes = false;
         }
-        var (jsondsets, jsonfiles) = arraysStr.splitMsgToTuple(" | ",2);
+        var (jsondsets, jsonfiles, jsonmanifest) = arraysStr.splitMsgToTuple(" | ",3);
         var ndsets = try! ndsetsStr:int;
         var nfiles = try! nfilesStr:int;
         var dsetlist: [0..#ndsets] string;
         var filelist: [0..#nfiles] string;
+        /*
+         * The metadata of each dataset in each file, MANIFEST_FIELDS ints per 
+         * dataset and file, if given by the client from a manifest, in which 
+         * case the files are not probed
+         */
+        const useManifest = !jsonmanifest.isEmpty();
+        var manifest: [0..#(if useManifest then ndsets*nfiles*MANIFEST_FIELDS else 0)] int;
+
+        if useManifest {
+            try {
+                manifest = jsonToPdArrayInt(jsonmanifest, manifest.size);
+            } catch {
+                var errorMsg = "Could not decode json manifest (%i datasets, %i files)".format(
+                                               ndsets, nfiles);
+                gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+            if filesStr != "all" {
+                var errorMsg = "The subset of files of a manifest must be selected by the client";
+                gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+        }
 
         try {
             dsetlist = jsonToPdArray(jsondsets, ndsets);
@@ -491,7 +727,7 @@ module GenSymIO {
         var filenames: [filedom] string;
         dsetnames = dsetlist;
 
-        if filelist.size == 1 {
+        if filelist.size == 1 && !useManifest {
             var tmp = glob(filelist[0]);
             gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                   "glob expanded %s to %i files".format(filelist[0], tmp.size));
@@ -507,15 +743,37 @@ module GenSymIO {
         } else {
             filenames = filelist;
         }
+        if filesStr != "all" {
+            try {
+                var subset = select_files(filenames, filesStr);
+                filedom = subset.domain;
+                filenames = subset;
+            } catch e: Error {
+                var errorMsg = "Invalid subset %s of %i files: %s".format(filesStr, filenames.size, e.message());
+                gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+            gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                  "selected %i files with %s".format(filenames.size, filesStr));
+        }
         var segArrayFlags: [filedom] bool;
         var dclasses: [filedom] C_HDF5.hid_t;
         var bytesizes: [filedom] int;
         var signFlags: [filedom] bool;
+        var boolFlags: [filedom] bool;
+        var lengths: [filedom] int;
+        var valueLengths: [filedom] int;
         var rnames: string;
-        for dsetName in dsetnames do {
+        for (d, dsetName) in zip(dsetdom, dsetnames) do {
             for (i, fname) in zip(filedom, filenames) {
                 try {
-                    (segArrayFlags[i], dclasses[i], bytesizes[i], signFlags[i]) = get_dtype(fname, dsetName);
+                    if useManifest {
+                        (segArrayFlags[i], dclasses[i], bytesizes[i], signFlags[i], 
+                         boolFlags[i], lengths[i], valueLengths[i]) = 
+                                    manifest_entry(manifest, (d * filedom.size + i - filedom.low));
+                    } else {
+                        (segArrayFlags[i], dclasses[i], bytesizes[i], signFlags[i]) = get_dtype(fname, dsetName);
+                    }
                 } catch e: FileNotFoundError {
                     var errorMsg = "File %s not found".format(fname);
                     gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
@@ -562,14 +820,38 @@ module GenSymIO {
                                            "Verified all dtypes across files for dataset %s".format(dsetName));
             var subdoms: [filedom] domain(1);
             var segSubdoms: [filedom] domain(1);
+            // Index in each file of the first row or byte read from it
+            var fileStarts: [filedom] int;
+            var segFileStarts: [filedom] int;
             var len: int;
             var nSeg: int;
             try {
                 if isSegArray {
-                    (segSubdoms, nSeg) = get_subdoms(filenames, dsetName + "/" + SEGARRAY_OFFSET_NAME);
-                    (subdoms, len) = get_subdoms(filenames, dsetName + "/" + SEGARRAY_VALUE_NAME);
+                    if useManifest {
+                        (segSubdoms, nSeg) = lengths_to_subdoms(lengths);
+                        (subdoms, len) = lengths_to_subdoms(valueLengths);
+                    } else {
+                        (segSubdoms, nSeg) = get_subdoms(filenames, dsetName + "/" + SEGARRAY_OFFSET_NAME);
+                        (subdoms, len) = get_subdoms(filenames, dsetName + "/" + SEGARRAY_VALUE_NAME);
+                    }
+                    if rowsStr != "all" {
+                        const (start, stop) = parse_slice(rowsStr, nSeg);
+                        var fileSegs = segSubdoms;
+                        (segSubdoms, segFileStarts, nSeg) = select_subdoms(segSubdoms, start, stop);
+                        (subdoms, fileStarts, len) = select_value_subdoms(filenames, 
+                                              dsetName + "/" + SEGARRAY_OFFSET_NAME, fileSegs, 
+                                              segSubdoms, segFileStarts, subdoms);
+                    }
                 } else {
-                    (subdoms, len) = get_subdoms(filenames, dsetName);
+                    if useManifest {
+                        (subdoms, len) = lengths_to_subdoms(lengths);
+                    } else {
+                        (subdoms, len) = get_subdoms(filenames, dsetName);
+                    }
+                    if rowsStr != "all" {
+                        const (start, stop) = parse_slice(rowsStr, len);
+                        (subdoms, fileStarts, len) = select_subdoms(subdoms, start, stop);
+                    }
                 }
             } catch e: HDF5RankError {
                 var errorMsg = notImplementedError("readhdf", "Rank %i arrays".format(e.rank));
@@ -593,10 +875,12 @@ module GenSymIO {
                         return new MsgTuple(errorMsg, MsgType.ERROR);
                     }
                     var entrySeg = new shared SymEntry(nSeg, int);
-                    read_files_into_distributed_array(entrySeg.a, segSubdoms, filenames, dsetName + "/" + SEGARRAY_OFFSET_NAME);
-                    fixupSegBoundaries(entrySeg.a, segSubdoms, subdoms);
+                    read_files_into_distributed_array(entrySeg.a, segSubdoms, filenames, 
+                                              dsetName + "/" + SEGARRAY_OFFSET_NAME, segFileStarts);
+                    fixupSegBoundaries(entrySeg.a, segSubdoms, subdoms, fileStarts);
                     var entryVal = new shared SymEntry(len, uint(8));
-                    read_files_into_distributed_array(entryVal.a, subdoms, filenames, dsetName + "/" + SEGARRAY_VALUE_NAME);
+                    read_files_into_distributed_array(entryVal.a, subdoms, filenames, 
+                                              dsetName + "/" + SEGARRAY_VALUE_NAME, fileStarts);
                     var segName = st.nextName();
                     st.addEntry(segName, entrySeg);
                     var valName = st.nextName();
@@ -608,7 +892,7 @@ module GenSymIO {
                     gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                                   "Initialized int entry for dataset %s".format(dsetName));
 
-                    read_files_into_distributed_array(entryInt.a, subdoms, filenames, dsetName);
+                    read_files_into_distributed_array(entryInt.a, subdoms, filenames, dsetName, fileStarts);
                     var rname = st.nextName();
                     
                     /*
@@ -617,7 +901,8 @@ module GenSymIO {
                      * pdarray, (2) create a new SymEntry of type bool, (3) set the SymEntry pdarray 
                      * reference to the bool pdarray, and (4) add the entry to the SymTable
                      */
-                    if isBooleanDataset(filenames[0],dsetName) {
+                    if (if useManifest then boolFlags[filedom.first] 
+                                       else isBooleanDataset(filenames[0],dsetName)) {
                         //var a_bool = entryInt.a:bool;
                         var entryBool = new shared SymEntry(len, bool);
                         entryBool.a = entryInt.a:bool;
@@ -632,7 +917,7 @@ module GenSymIO {
                     var entryReal = new shared SymEntry(len, real);
                     gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                                                       "Initialized float entry");
-                    read_files_into_distributed_array(entryReal.a, subdoms, filenames, dsetName);
+                    read_files_into_distributed_array(entryReal.a, subdoms, filenames, dsetName, fileStarts);
                     var rname = st.nextName();
                     st.addEntry(rname, entryReal);
                     rnames = rnames + "created " + st.attrib(rname) + " , ";
@@ -651,20 +936,104 @@ module GenSymIO {
         return new MsgTuple(repMsg,MsgType.NORMAL);
     }
 
+    /*
+     * Probes the dtype and length of each dataset of each file once, so that the
+     * client can save them in a manifest and pass them to readAllHdf instead of 
+     * having every read open every file. The files are probed in parallel, 
+     * each locale opening a share of them.
+     */
+    proc hdfmanifestMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
+        // reqMsg = "hdfmanifest <ndsets> <nfiles> [<json_dsetname>] | [<json_filenames>]"
+        var (ndsetsStr, nfilesStr, arraysStr) = payload.splitMsgToTuple(3);
+        var (jsondsets, jsonfiles) = arraysStr.splitMsgToTuple(" | ",2);
+        var ndsets = try! ndsetsStr:int;
+        var nfiles = try! nfilesStr:int;
+        var dsetnames: [0..#ndsets] string;
+        var filelist: [0..#nfiles] string;
+
+        try {
+            dsetnames = jsonToPdArray(jsondsets, ndsets);
+            filelist = jsonToPdArray(jsonfiles, nfiles);
+        } catch {
+            var errorMsg = "Could not decode json dataset names or filenames (%i datasets, %i files)".format(
+                                               ndsets, nfiles);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+
+        var filedom = filelist.domain;
+        var filenames: [filedom] string;
+        if filelist.size == 1 {
+            var tmp = glob(filelist[0]);
+            if tmp.size == 0 {
+                var errorMsg = "No files matching %s".format(filelist[0]);
+                gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+            // Glob returns filenames in weird order. Sort for consistency
+            sort(tmp);
+            filedom = tmp.domain;
+            filenames = tmp;
+        } else {
+            filenames = filelist;
+        }
+
+        const nf = filenames.size;
+        var info: [0..#ndsets*nf*MANIFEST_FIELDS] int;
+        try {
+            coforall loc in Locales do on loc {
+                for i in 0..#nf do if i % numLocales == here.id {
+                    const fname = filenames[i];
+                    for d in 0..#ndsets {
+                        const entry = probe_manifest_entry(fname, dsetnames[d]);
+                        const offset = (d * nf + i) * MANIFEST_FIELDS;
+                        for j in 0..#MANIFEST_FIELDS do info[offset + j] = entry[j];
+                    }
+                }
+            }
+        } catch e: Error {
+            var errorMsg = "Could not build the manifest: %s".format(e.message());
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+
+        var repMsg = "{\"files\": %jt, \"datasets\": %jt, \"info\": %jt}".format(
+                                               filenames, dsetnames, info);
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                           "built manifest of %i datasets in %i files".format(ndsets, nf));
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
     proc fixupSegBoundaries(a: [?D] int, segSubdoms: [?fD] domain(1), valSubdoms: [fD] domain(1)) {
+        var valStarts: [fD] int;
+        fixupSegBoundaries(a, segSubdoms, valSubdoms, valStarts);
+    }
+
+    /*
+     * Raises the segment offsets read from each file, which are relative to
+     * the values of the file, by the position of the first value read from
+     * the file in the values read from all files, minus its position in the
+     * file, valStarts.
+     */
+    proc fixupSegBoundaries(a: [?D] int, segSubdoms: [?fD] domain(1), valSubdoms: [fD] domain(1),
+                                                                       valStarts: [fD] int) {
         var boundaries: [fD] int; // First index of each region that needs to be raised
         var diffs: [fD] int;// Amount each region must be raised over previous region
-        forall (i, sd, vd, b) in zip(fD, segSubdoms, valSubdoms, boundaries) {
-            b = sd.low; // Boundary is index of first segment in file
-            // Height increase of next region is number of bytes in current region
-            if (i < fD.high) {
-                diffs[i+1] = vd.size;
+        var prevShift = 0;
+        // Files without segments are skipped, as their boundary is that of the next file
+        for (sd, vd, vs, b, d) in zip(segSubdoms, valSubdoms, valStarts, boundaries, diffs) {
+            if sd.size > 0 {
+                b = sd.low; // Boundary is index of first segment in file
+                d = (vd.low - vs) - prevShift;
+                prevShift = vd.low - vs;
             }
         }
         // Insert height increases at region boundaries
         var sparseDiffs: [D] int;
-        forall (b, d) in zip(boundaries, diffs) with (var agg = newDstAggregator(int)) {
-            agg.copy(sparseDiffs[b], d);
+        forall (sd, b, d) in zip(segSubdoms, boundaries, diffs) with (var agg = newDstAggregator(int)) {
+            if sd.size > 0 {
+                agg.copy(sparseDiffs[b], d);
+            }
         }
         // Make plateaus from peaks
         var corrections = + scan sparseDiffs;
@@ -672,6 +1041,153 @@ module GenSymIO {
         a += corrections;
     }
 
+    /*
+     * Returns the files of filenames selected by spec, either a slice
+     * "start:stop", with Python semantics and optional bounds, or a comma
+     * separated list of file indices.
+     */
+    proc select_files(filenames: [?FD] string, spec: string) throws {
+        var indD: domain(1);
+        var indices: [indD] int;
+        if spec.find(":") != -1 {
+            const (start, stop) = parse_slice(spec, filenames.size);
+            indD = {0..#(stop - start)};
+            indices = start..stop-1;
+        } else {
+            var fields = spec.split(",");
+            indD = {0..#fields.size};
+            for (field, i) in zip(fields, indices) {
+                i = field:int;
+                if i < 0 then i += filenames.size;
+                if i < 0 || i >= filenames.size {
+                    throw getErrorWithContext(
+                             msg="file index %s out of range".format(field),
+                             lineNumber=getLineNumber(), 
+                             routineName=getRoutineName(), 
+                             moduleName=getModuleName(), 
+                             errorClass='IndexError');
+                }
+            }
+        }
+        if indices.size == 0 {
+            throw getErrorWithContext(
+                     msg="no file selected",
+                     lineNumber=getLineNumber(), 
+                     routineName=getRoutineName(), 
+                     moduleName=getModuleName(), 
+                     errorClass='IndexError');
+        }
+        var selected: [0..#indices.size] string;
+        for (name, i) in zip(selected, indices) {
+            name = filenames[FD.low + i];
+        }
+        return selected;
+    }
+
+    /*
+     * Resolves the slice "start:stop", with Python semantics and optional
+     * bounds, of size elements into the bounds (start, stop) with
+     * 0 <= start <= stop <= size.
+     */
+    proc parse_slice(spec: string, size: int): (int, int) throws {
+        var (startStr, stopStr) = spec.splitMsgToTuple(":", 2);
+        const start = resolve_slice_bound(startStr, 0, size);
+        const stop = resolve_slice_bound(stopStr, size, size);
+        return (start, max(start, stop));
+    }
+
+    private proc resolve_slice_bound(bound: string, dflt: int, size: int): int throws {
+        if bound.isEmpty() then return dflt;
+        var b = bound: int;
+        if b < 0 then b += size;
+        return min(max(b, 0), size);
+    }
+
+    /*
+     * Restricts the subdomains of the files to the elements start..stop-1
+     * of their concatenation. Returns the subdomains of the selected
+     * elements in the array read, the index in each file of the first
+     * selected element, and the number of selected elements.
+     */
+    proc select_subdoms(subdoms: [?FD] domain(1), start: int, stop: int) {
+        var selected: [FD] domain(1);
+        var fileStarts: [FD] int;
+        var offset = 0;
+        for (sd, sel, fs) in zip(subdoms, selected, fileStarts) {
+            const lo = max(sd.low, start);
+            const n = max(min(sd.low + sd.size, stop) - lo, 0);
+            sel = {offset..#n};
+            fs = if n > 0 then lo - sd.low else 0;
+            offset += n;
+        }
+        return (selected, fileStarts, offset);
+    }
+
+    /*
+     * Returns the subdomains, first byte in each file and total number of
+     * bytes of the values of the strings selected by segSubdoms and
+     * segFileStarts, out of fileSegs and fileVals in the whole files. Only
+     * the offsets at the bounds of partially selected files are read.
+     */
+    proc select_value_subdoms(filenames: [?FD] string, segsName: string, 
+                              fileSegs: [FD] domain(1), segSubdoms: [FD] domain(1), 
+                              segFileStarts: [FD] int, fileVals: [FD] domain(1)) throws {
+        var selected: [FD] domain(1);
+        var fileStarts: [FD] int;
+        var offset = 0;
+        for i in FD {
+            var n = 0;
+            if segSubdoms[i].size > 0 {
+                const first = segFileStarts[i];
+                const last = first + segSubdoms[i].size;
+                fileStarts[i] = if first == 0 then 0 
+                                else read_hdf_element(filenames[i], segsName, first);
+                const stop = if last == fileSegs[i].size then fileVals[i].size 
+                             else read_hdf_element(filenames[i], segsName, last);
+                n = stop - fileStarts[i];
+            }
+            selected[i] = {offset..#n};
+            offset += n;
+        }
+        return (selected, fileStarts, offset);
+    }
+
+    /*
+     * Reads the element at index idx of the int64 dataset dsetName of
+     * filename.
+     */
+    proc read_hdf_element(filename: string, dsetName: string, idx: int): int throws {
+        var file_id = C_HDF5.H5Fopen(filename.c_str(), C_HDF5.H5F_ACC_RDONLY, 
+                                                            C_HDF5.H5P_DEFAULT);
+        defer { // Close the file on exit
+            C_HDF5.H5Fclose(file_id);
+        }
+        var dataset = C_HDF5.H5Dopen(file_id, dsetName.c_str(), C_HDF5.H5P_DEFAULT);
+        if dataset < 0 {
+            throw getErrorWithContext( 
+                msg="dataset %s does not exist in %s".format(dsetName, filename), 
+                lineNumber=getLineNumber(),
+                routineName=getRoutineName(),
+                moduleName=getModuleName(),
+                errorClass='DatasetNotFoundError');
+        }
+        defer {
+            C_HDF5.H5Dclose(dataset);
+        }
+        var dataspace = C_HDF5.H5Dget_space(dataset);
+        var dsetOffset = [idx: C_HDF5.hsize_t];
+        var dsetCount = [1: C_HDF5.hsize_t];
+        C_HDF5.H5Sselect_hyperslab(dataspace, C_HDF5.H5S_SELECT_SET, c_ptrTo(dsetOffset), 
+                                                             nil, c_ptrTo(dsetCount), nil);
+        var memspace = C_HDF5.H5Screate_simple(1, c_ptrTo(dsetCount), nil);
+        var value: [0..#1] int;
+        C_HDF5.H5Dread(dataset, getHDF5Type(int), memspace, dataspace, 
+                                             C_HDF5.H5P_DEFAULT, c_ptrTo(value));
+        C_HDF5.H5Sclose(memspace);
+        C_HDF5.H5Sclose(dataspace);
+        return value[0];
+    }
+
     /* 
      * Retrieves the datatype of the dataset read from HDF5 
      */
@@ -774,6 +1290,43 @@ module GenSymIO {
     }
 
 
+    /*
+     * Returns the MANIFEST_FIELDS ints describing the dataset dsetName of 
+     * filename in a manifest.
+     */
+    proc probe_manifest_entry(filename: string, dsetName: string): MANIFEST_FIELDS*int throws {
+        var (isSegArray, dataclass, bytesize, isSigned) = get_dtype(filename, dsetName);
+        var isBoolean = !isSegArray && isBooleanDataset(filename, dsetName);
+        var length, valuesLength: int;
+        if isSegArray {
+            length = get_dataset_length(filename, dsetName + "/" + SEGARRAY_OFFSET_NAME);
+            valuesLength = get_dataset_length(filename, dsetName + "/" + SEGARRAY_VALUE_NAME);
+        } else {
+            length = get_dataset_length(filename, dsetName);
+        }
+        const classCode = if dataclass == C_HDF5.H5T_INTEGER then 0
+                          else if dataclass == C_HDF5.H5T_FLOAT then 1
+                          else 2;
+        return (isSegArray:int, classCode, bytesize, isSigned:int, isBoolean:int, 
+                length, valuesLength);
+    }
+
+    /*
+     * Returns the dtype, boolean flag and lengths of the idx-th dataset and file
+     * of a manifest, in the order of get_dtype followed by the boolean flag, 
+     * the length and the length of the values of a segmented dataset.
+     */
+    proc manifest_entry(manifest: [] int, idx: int) {
+        const offset = idx * MANIFEST_FIELDS;
+        const classCode = manifest[offset + 1];
+        const dataclass: C_HDF5.hid_t = if classCode == 0 then C_HDF5.H5T_INTEGER
+                                         else if classCode == 1 then C_HDF5.H5T_FLOAT
+                                         else C_HDF5.H5T_NO_CLASS;
+        return (manifest[offset] != 0, dataclass, manifest[offset + 2], 
+                manifest[offset + 3] != 0, manifest[offset + 4] != 0, 
+                manifest[offset + 5], manifest[offset + 6]);
+    }
+
     /*
      * Returns boolean indicating whether the file is a valid HDF5 file.
      * Note: if the file cannot be opened due to permissions, throws
@@ -913,34 +1466,49 @@ module GenSymIO {
      *  as well as the total length of the array. 
      */
     proc get_subdoms(filenames: [?FD] string, dsetName: string) throws {
-        use SysCTypes;
-
         var lengths: [FD] int;
         for (i, filename) in zip(FD, filenames) {
-            try {
-                var file_id = C_HDF5.H5Fopen(filename.c_str(), C_HDF5.H5F_ACC_RDONLY, 
-                                           C_HDF5.H5P_DEFAULT);
-                defer { // Close the file on exit
-                    C_HDF5.H5Fclose(file_id);
-                }
+            lengths[i] = get_dataset_length(filename, dsetName);
+        }
+        return lengths_to_subdoms(lengths);
+    }
 
-                var dims: [0..#1] C_HDF5.hsize_t; // Only rank 1 for now
-                var dName = try! getReadDsetName(file_id, dsetName);
+    /*
+     * Returns the length of the one-dimensional dataset dsetName of filename.
+     */
+    proc get_dataset_length(filename: string, dsetName: string): int throws {
+        use SysCTypes;
 
-                // Read array length into dims[0]
-                C_HDF5.HDF5_WAR.H5LTget_dataset_info_WAR(file_id, dName.c_str(), 
-                                           c_ptrTo(dims), nil, nil);
-                lengths[i] = dims[0]: int;
-            } catch e: Error {
-                throw getErrorWithContext(
-                             msg="in getting dataset info %s".format(e.message()),
-                             lineNumber=getLineNumber(), 
-                             routineName=getRoutineName(), 
-                             moduleName=getModuleName(), 
-                             errorClass='WriteModeError'
-                );
+        try {
+            var file_id = C_HDF5.H5Fopen(filename.c_str(), C_HDF5.H5F_ACC_RDONLY, 
+                                       C_HDF5.H5P_DEFAULT);
+            defer { // Close the file on exit
+                C_HDF5.H5Fclose(file_id);
             }
+
+            var dims: [0..#1] C_HDF5.hsize_t; // Only rank 1 for now
+            var dName = try! getReadDsetName(file_id, dsetName);
+
+            // Read array length into dims[0]
+            C_HDF5.HDF5_WAR.H5LTget_dataset_info_WAR(file_id, dName.c_str(), 
+                                       c_ptrTo(dims), nil, nil);
+            return dims[0]: int;
+        } catch e: Error {
+            throw getErrorWithContext(
+                         msg="in getting dataset info %s".format(e.message()),
+                         lineNumber=getLineNumber(), 
+                         routineName=getRoutineName(), 
+                         moduleName=getModuleName(), 
+                         errorClass='WriteModeError'
+            );
         }
+    }
+
+    /*
+     * Returns the subdomains of the concatenation of files of the given
+     * lengths contained in each file, and the total length.
+     */
+    proc lengths_to_subdoms(lengths: [?FD] int) {
         // Compute subdomain of master array contained in each file
         var subdoms: [FD] domain(1);
         var offset = 0;
@@ -951,9 +1519,21 @@ module GenSymIO {
         return (subdoms, (+ reduce lengths));
     }
 
-    /* This function gets called when A is a BlockDist or DefaultRectangular array. */
+    /* Reads whole files into A. */
+    proc read_files_into_distributed_array(A, filedomains: [?FD] domain(1), 
+                                                 filenames: [FD] string, dsetName: string) {
+        var fileStarts: [FD] int;
+        read_files_into_distributed_array(A, filedomains, filenames, dsetName, fileStarts);
+    }
+
+    /*
+     * This function gets called when A is a BlockDist or DefaultRectangular array.
+     * The elements of A in filedomains[i] are read from filenames[i] starting at 
+     * index fileStarts[i] of its dataset.
+     */
     proc read_files_into_distributed_array(A, filedomains: [?FD] domain(1), 
-                                                 filenames: [FD] string, dsetName: string)
+                                                 filenames: [FD] string, dsetName: string,
+                                                 fileStarts: [FD] int)
         where (MyDmap == Dmap.blockDist || MyDmap == Dmap.defaultRectangular) {
             try! gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                      "entry.a.targetLocales() = %t".format(A.targetLocales()));
@@ -964,9 +1544,10 @@ module GenSymIO {
                 // Create local copies of args
                 var locFiles = filenames;
                 var locFiledoms = filedomains;
+                var locFileStarts = fileStarts;
                 /* On this locale, find all files containing data that belongs in
                  this locale's chunk of A */
-                for (filedom, filename) in zip(locFiledoms, locFiles) {
+                for (filedom, filename, fileStart) in zip(locFiledoms, locFiles, locFileStarts) {
                     var isopen = false;
                     var file_id: C_HDF5.hid_t;
                     var dataset: C_HDF5.hid_t;
@@ -984,7 +1565,7 @@ module GenSymIO {
                             }
                             // do A[intersection] = file[intersection - offset]
                             var dataspace = C_HDF5.H5Dget_space(dataset);
-                            var dsetOffset = [(intersection.low - filedom.low): C_HDF5.hsize_t];
+                            var dsetOffset = [(intersection.low - filedom.low + fileStart): C_HDF5.hsize_t];
                             var dsetStride = [intersection.stride: C_HDF5.hsize_t];
                             var dsetCount = [intersection.size: C_HDF5.hsize_t];
                             C_HDF5.H5Sselect_hyperslab(dataspace, C_HDF5.H5S_SELECT_SET, c_ptrTo(dsetOffset), 
@@ -998,7 +1579,8 @@ module GenSymIO {
 
                             try! gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                     "Locale %t intersection %t dataset slice %t".format(loc,intersection, 
-                                          (intersection.low - filedom.low, intersection.high - filedom.low)));
+                                          (intersection.low - filedom.low + fileStart, 
+                                           intersection.high - filedom.low + fileStart)));
 
                             /*
                              * The fact that intersection is a subset of a local subdomain means
@@ -1023,7 +1605,8 @@ module GenSymIO {
 
     /* This function is called when A is a CyclicDist array. */
     proc read_files_into_distributed_array(A, filedomains: [?FD] domain(1), 
-                                           filenames: [FD] string, dsetName: string)
+                                           filenames: [FD] string, dsetName: string,
+                                           fileStarts: [FD] int)
         where (MyDmap == Dmap.cyclicDist) {
             use CyclicDist;
             /*
@@ -1034,16 +1617,31 @@ module GenSymIO {
             forall fileind in fileSpace with (ref A) {
                 var filedom: subdomain(A.domain) = filedomains[fileind];
                 var filename = filenames[fileind];
-                var file_id = C_HDF5.H5Fopen(filename.c_str(), C_HDF5.H5F_ACC_RDONLY, 
-                                                                       C_HDF5.H5P_DEFAULT);
-                // TODO: use select_hyperslab to read directly into a strided slice of A
-                // Read file into a temporary array and copy into the correct chunk of A
-                var AA: [1..filedom.size] A.eltType;
+                if filedom.size > 0 {
+                    var file_id = C_HDF5.H5Fopen(filename.c_str(), C_HDF5.H5F_ACC_RDONLY, 
+                                                                           C_HDF5.H5P_DEFAULT);
+                    // TODO: use select_hyperslab to read directly into a strided slice of A
+                    // Read file into a temporary array and copy into the correct chunk of A
+                    var AA: [1..filedom.size] A.eltType;
                 
-                // Retrieve the dsetName that accounts for enclosing group, if applicable
-                try! readHDF5Dataset(file_id, getReadDsetName(file_id, dsetName), AA);
-                A[filedom] = AA;
-                C_HDF5.H5Fclose(file_id);
+                    // Retrieve the dsetName that accounts for enclosing group, if applicable
+                    var dataset = C_HDF5.H5Dopen(file_id, (try! getReadDsetName(file_id, dsetName)).c_str(), 
+                                                                           C_HDF5.H5P_DEFAULT);
+                    // Read the filedom.size elements from fileStarts[fileind] on
+                    var dataspace = C_HDF5.H5Dget_space(dataset);
+                    var dsetOffset = [fileStarts[fileind]: C_HDF5.hsize_t];
+                    var dsetCount = [filedom.size: C_HDF5.hsize_t];
+                    C_HDF5.H5Sselect_hyperslab(dataspace, C_HDF5.H5S_SELECT_SET, c_ptrTo(dsetOffset), 
+                                                                 nil, c_ptrTo(dsetCount), nil);
+                    var memspace = C_HDF5.H5Screate_simple(1, c_ptrTo(dsetCount), nil);
+                    C_HDF5.H5Dread(dataset, getHDF5Type(A.eltType), memspace, dataspace, 
+                                                          C_HDF5.H5P_DEFAULT, c_ptrTo(AA));
+                    A[filedom] = AA;
+                    C_HDF5.H5Sclose(memspace);
+                    C_HDF5.H5Sclose(dataspace);
+                    C_HDF5.H5Dclose(dataset);
+                    C_HDF5.H5Fclose(file_id);
+                }
            }
     }
 
@@ -1059,12 +1657,22 @@ module GenSymIO {
     }
 
     proc tohdfMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {               
-        var (arrayName, dsetName, modeStr, jsonfile, 
-                                      dataType, segsName) = payload.splitMsgToTuple(6);
+        var (arrayName, dsetName, modeStr, compression, shuffleStr, chunkStr, jsonfile, 
+                                      dataType, segsName) = payload.splitMsgToTuple(9);
 
         var mode = try! modeStr: int;
         var filename: string;
         var entry = st.lookup(arrayName);
+        var opts: HdfWriteOptions;
+
+        try {
+            opts = parseWriteOptions(compression, shuffleStr, chunkStr);
+            opts.extendable = mode == APPEND_ROWS;
+        } catch e: Error {
+            var errorMsg = "Invalid HDF5 storage options: %s".format(e.message());
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
 
         try {
             filename = jsonToPdArray(jsonfile, 1)[0];
@@ -1081,15 +1689,15 @@ module GenSymIO {
             select entry.dtype {
                 when DType.Int64 {
                     var e = toSymEntry(entry, int);
-                    warnFlag = write1DDistArray(filename, mode, dsetName, e.a, DType.Int64);
+                    warnFlag = write1DDistArray(filename, mode, dsetName, e.a, DType.Int64, opts);
                 }
                 when DType.Float64 {
                     var e = toSymEntry(entry, real);
-                    warnFlag = write1DDistArray(filename, mode, dsetName, e.a, DType.Float64);
+                    warnFlag = write1DDistArray(filename, mode, dsetName, e.a, DType.Float64, opts);
                 }
                 when DType.Bool {
                     var e = toSymEntry(entry, bool);
-                    warnFlag = write1DDistArray(filename, mode, dsetName, e.a, DType.Bool);
+                    warnFlag = write1DDistArray(filename, mode, dsetName, e.a, DType.Bool, opts);
                 }
                 when DType.UInt8 {
                     /*
@@ -1099,7 +1707,7 @@ module GenSymIO {
                     var e = toSymEntry(entry, uint(8));
                     var segsEntry = st.lookup(segsName);                   
                     var s_e = toSymEntry(segsEntry, int);
-                    warnFlag = write1DDistStrings(filename, mode, dsetName, e.a, DType.UInt8,s_e.a);
+                    warnFlag = write1DDistStrings(filename, mode, dsetName, e.a, DType.UInt8, s_e.a, opts);
                 } otherwise {
                     var errorMsg = unrecognizedTypeError("tohdf", dtype2str(entry.dtype));
                     gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);            
@@ -1137,7 +1745,8 @@ module GenSymIO {
      * Writes out the two pdarrays composing a Strings object to hdf5.
      */
     private proc write1DDistStrings(filename: string, mode: int, dsetName: string, A, 
-                                                                array_type: DType, SA) throws {
+                                    array_type: DType, SA,
+                                    opts: HdfWriteOptions = new HdfWriteOptions()) throws {
         var prefix: string;
         var extension: string;  
         var warnFlag: bool;      
@@ -1157,6 +1766,19 @@ module GenSymIO {
         // Create files with groups needed to persist values and segments pdarrays
         var group = getGroup(dsetName);
         warnFlag = processFilenames(filenames, matchingFilenames, mode, A, group);
+
+        /*
+         * Rows appended to the datasets of several columns must stay aligned,
+         * so the strings are written with the row partition of the numeric
+         * columns rather than by the layout of their bytes
+         */
+        if mode == APPEND_ROWS {
+            writeStringsByRows(filenames, group, A, SA, opts);
+            total.stop();
+            gsLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
+                          "Completed write1DDistStrings in %.17r seconds".format(total.elapsed()));
+            return warnFlag;
+        }
         
         /*
          * The shuffleLeftIndices object, which is a globally-scoped PrivateSpace, 
@@ -1242,7 +1864,8 @@ module GenSymIO {
              * arrays within a new group named after the dsetName. Consequently, need
              * to create the group within the existing hdf5 file.
              */
-            if mode == APPEND {
+            if mode == APPEND || 
+                       (mode == APPEND_ROWS && !hdfLinkExists(myFileID, "/" + group)) {
                 prepareGroup(myFileID, group);
             }
 
@@ -1402,7 +2025,7 @@ module GenSymIO {
                  var segmentsList = generateFinalSegmentsList(charList,idx);
              
                  // Write the finalized valuesList and segmentsList to the hdf5 group
-                 writeStringsToHdf(myFileID, idx, group, charList, segmentsList);
+                 writeStringsToHdf(myFileID, idx, group, charList, segmentsList, opts);
              } else {
                  /*
                   * The current local slice (idx) ends with the uint(8) null character,  
@@ -1484,7 +2107,7 @@ module GenSymIO {
                      var segmentsList = generateFinalSegmentsList(charList,idx);
  
                      // Write the finalized valuesList and segmentsList to the hdf5 group
-                     writeStringsToHdf(myFileID, idx, group, charList, segmentsList);
+                     writeStringsToHdf(myFileID, idx, group, charList, segmentsList, opts);
                   } else {
                       /*
                        * Check to see if previous locale (idx-1) ends with a null character.
@@ -1512,7 +2135,7 @@ module GenSymIO {
                       var segmentsList = generateFinalSegmentsList(charList,idx);
 
                       // Write the finalized valuesList and segmentsList to the hdf5 group
-                      writeStringsToHdf(myFileID, idx, group, charList, segmentsList);
+                      writeStringsToHdf(myFileID, idx, group, charList, segmentsList, opts);
                     }
                 }
         }
@@ -1522,16 +2145,53 @@ module GenSymIO {
         return warnFlag;
     }
 
+    /*
+     * Writes the strings of a Strings object to the file of each locale with
+     * the row partition of a pdarray of as many elements, i.e. the file of
+     * each locale receives the strings indexed by the local block of the
+     * segments array, along with the bytes of these strings wherever they are.
+     */
+    private proc writeStringsByRows(filenames: [] string, group: string, A, SA,
+                                    opts: HdfWriteOptions) throws {
+        const nstrings = SA.size, nbytes = A.size;
+        coforall (loc, idx) in zip(SA.targetLocales(), filenames.domain) do on loc {
+            const segsLocDom = SA.localSubdomain();
+            var charList: list(uint(8));
+            var segmentsList: list(int);
+            if segsLocDom.size > 0 {
+                const lo = SA[segsLocDom.first];
+                const hi = if segsLocDom.last + 1 < nstrings then SA[segsLocDom.last + 1]
+                           else nbytes;
+                var chars: [0..#(hi - lo)] uint(8) = A[lo..hi-1];
+                charList = new list(chars);
+                for s in SA.localSlice(segsLocDom) do segmentsList.append(s - lo);
+            }
+            var myFileID = C_HDF5.H5Fopen(filenames[idx].c_str(),
+                                          C_HDF5.H5F_ACC_RDWR, C_HDF5.H5P_DEFAULT);
+            defer { // Close the file on exit
+                C_HDF5.H5Fclose(myFileID);
+            }
+            if !hdfLinkExists(myFileID, "/" + group) {
+                prepareGroup(myFileID, group);
+            }
+            writeStringsToHdf(myFileID, idx, group, charList, segmentsList, opts);
+        }
+    }
+
     /*
      * Writes the float, int, or bool pdarray out to hdf5
      */
     proc write1DDistArray(filename: string, mode: int, dsetName: string, A,
-                                                                array_type: DType) throws {
+                          array_type: DType, 
+                          opts: HdfWriteOptions = new HdfWriteOptions()) throws {
         /* Output is 1 file per locale named <filename>_<loc>, and a dataset
         named <dsetName> is created in each one. If mode==1 (append) and the
         correct number of files already exists, then a new dataset named
         <dsetName> will be created in each. Strongly recommend only using
-        append mode to write arrays with the same domain. */
+        append mode to write arrays with the same domain. If mode==2 
+        (append rows), the local slice of each locale is appended to the
+        extendable dataset <dsetName> of its file, which is created with 
+        the files if they do not exist yet. */
 
         var prefix: string;
         var extension: string;
@@ -1575,7 +2235,8 @@ module GenSymIO {
              * Prepare the HDF5 group if the datatype requires the array to be written 
              * out to a group other than the top-level HDF5 group.
              */
-            if isGroupedDataType(dType) {
+            if isGroupedDataType(dType) && 
+                      !(mode == APPEND_ROWS && hdfLinkExists(myFileID, "/" + dsetName)) {
                 prepareGroup(fileId=myFileID, dsetName);
             }
             
@@ -1585,8 +2246,8 @@ module GenSymIO {
              * Depending upon the datatype, write the local slice out to the top-level
              * or nested, named group within the hdf5 file corresponding to the locale.
              */           
-            H5LTmake_dataset_WAR(myFileID, myDsetName.c_str(), 1, c_ptrTo(dims),
-                                      dType, c_ptrTo(A.localSlice(locDom)));
+            writeDataset(myFileID, myDsetName, locDom.size, dType, 
+                                      c_ptrTo(A.localSlice(locDom)), opts);
         }
         return warnFlag;
     }
@@ -1745,6 +2406,11 @@ module GenSymIO {
               );
           }
 
+      } else if mode == APPEND_ROWS {
+          // The files are created by the first write of rows
+          if checkAppendRowsFiles(filenames, matchingFilenames) {
+              return processFilenames(filenames, matchingFilenames, TRUNCATE, A, group);
+          }
       } else if mode == TRUNCATE { // if truncating, create new file per locale
           if matchingFilenames.size > 0 {
               warnFlag = true;
@@ -1838,6 +2504,11 @@ module GenSymIO {
                  errorClass='MismatchedAppendError'
               );
           }
+      } else if mode == APPEND_ROWS {
+          // The files are created by the first write of rows
+          if checkAppendRowsFiles(filenames, matchingFilenames) {
+              return processFilenames(filenames, matchingFilenames, TRUNCATE, A);
+          }
       } else if mode == TRUNCATE { // if truncating, create new file per locale
           if matchingFilenames.size > 0 {
               warnFlag = true;
@@ -1877,6 +2548,33 @@ module GenSymIO {
         return warnFlag;
     }
     
+    /*
+     * Returns whether the files to append rows to must be created, which is
+     * when none of them exists. Throws a MismatchedAppendError if only some 
+     * of them exist, or if files were written by a different number of locales.
+     */
+    private proc checkAppendRowsFiles(filenames: [] string, 
+                                      matchingFilenames: [] string): bool throws {
+        var nexist = 0;
+        for f in filenames {
+            if try! exists(f) then nexist += 1;
+        }
+        if nexist == 0 && matchingFilenames.size == 0 {
+            return true;
+        }
+        if nexist != filenames.size || matchingFilenames.size != filenames.size {
+            throw getErrorWithContext(
+                 msg="appending rows to existing files must be done with the same number " +
+                      "of locales. Try saving with a different directory or filename prefix?",
+                 lineNumber=getLineNumber(), 
+                 routineName=getRoutineName(), 
+                 moduleName=getModuleName(), 
+                 errorClass='MismatchedAppendError'
+            );
+        }
+        return false;
+    }
+
     /*
      * Generates an array of filenames to be matched in APPEND mode and to be
      * checked in TRUNCATE mode that will warn the user that 1..n files are
@@ -2088,7 +2786,8 @@ module GenSymIO {
      * Writes the values and segments lists to hdf5 within a group.
      */
     private proc writeStringsToHdf(fileId: int, idx: int, group: string, 
-                              valuesList: list(uint(8)), segmentsList: list(int)) throws {
+                              valuesList: list(uint(8)), segmentsList: list(int),
+                              opts: HdfWriteOptions) throws {
         // initialize timer
         var t1: Time.Timer;
         if logLevel == LogLevel.DEBUG {
@@ -2097,13 +2796,25 @@ module GenSymIO {
             t1.start();
         }
 
-        H5LTmake_dataset_WAR(fileId, '/%s/values'.format(group).c_str(), 1,
-                     c_ptrTo([valuesList.size:uint(64)]), getHDF5Type(uint(8)),
-                            c_ptrTo(valuesList.toArray()));
+        /*
+         * The segments of rows appended to a Strings dataset are offsets into
+         * its values, so they start after the values already in the file
+         */
+        var valuesOffset = 0;
+        if opts.extendable && hdfLinkExists(fileId, '/%s/values'.format(group)) {
+            valuesOffset = get_open_dataset_length(fileId, '/%s/values'.format(group));
+        }
 
-        H5LTmake_dataset_WAR(fileId, '/%s/segments'.format(group).c_str(), 1,
-                     c_ptrTo([segmentsList.size:uint(64)]),getHDF5Type(int),
-                           c_ptrTo(segmentsList.toArray()));
+        var values = valuesList.toArray();
+        writeDataset(fileId, '/%s/values'.format(group), values.size, getHDF5Type(uint(8)),
+                            c_ptrTo(values), opts);
+
+        var segments = segmentsList.toArray();
+        if valuesOffset > 0 {
+            segments += valuesOffset;
+        }
+        writeDataset(fileId, '/%s/segments'.format(group), segments.size, getHDF5Type(int),
+                           c_ptrTo(segments), opts);
 
         if logLevel == LogLevel.DEBUG {           
             t1.stop();  
@@ -2113,6 +2824,211 @@ module GenSymIO {
         }
     }
     
+    /*
+     * Parses the storage options of tohdf: the compression, "none" or
+     * "gzip:<level>", whether to shuffle and the number of elements per
+     * chunk, 0 for the default.
+     */
+    proc parseWriteOptions(compression: string, shuffleStr: string, 
+                                         chunkStr: string): HdfWriteOptions throws {
+        var opts: HdfWriteOptions;
+        if compression.startsWith("gzip:") {
+            opts.gzipLevel = compression[5..]: int;
+            if opts.gzipLevel < 0 || opts.gzipLevel > 9 {
+                throw getErrorWithContext(
+                           msg="gzip level %i is not in 0..9".format(opts.gzipLevel),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(), 
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+            }
+        } else if !compression.isEmpty() && compression != "none" {
+            throw getErrorWithContext(
+                       msg="unsupported compression %s".format(compression),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="ErrorWithContext");
+        }
+        opts.shuffle = shuffleStr.toLower() == "true";
+        if !chunkStr.isEmpty() {
+            opts.chunkElems = chunkStr: int;
+        }
+        if opts.chunkElems < 0 {
+            throw getErrorWithContext(
+                       msg="negative chunk size %i".format(opts.chunkElems),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="ErrorWithContext");
+        }
+        return opts;
+    }
+
+    /*
+     * Creates the one-dimensional dataset dsetName in the file fileId from
+     * the size elements of type dType at ptr, with the layout and filters
+     * of opts. Chunked datasets use chunks of opts.chunkElems elements, or
+     * of HDF5_CHUNK_BYTES by default, but no larger than the dataset, and
+     * are read back like contiguous ones since HDF5 applies the filters.
+     */
+    proc writeDataset(fileId: C_HDF5.hid_t, dsetName: string, size: int, 
+                      dType: C_HDF5.hid_t, ptr, opts: HdfWriteOptions) throws {
+        use C_HDF5.HDF5_WAR;
+        use SysCTypes;
+
+        if opts.extendable && hdfLinkExists(fileId, dsetName) {
+            appendToDataset(fileId, dsetName, size, dType, ptr);
+            return;
+        }
+        var dims = [size: C_HDF5.hsize_t];
+        // Empty datasets cannot be chunked, unless they are extendable
+        if opts.isContiguous() || (size == 0 && !opts.extendable) {
+            H5LTmake_dataset_WAR(fileId, dsetName.c_str(), 1, c_ptrTo(dims), dType, ptr);
+            return;
+        }
+        const chunkElems = if opts.chunkElems > 0 then opts.chunkElems
+                           else max(1, HDF5_CHUNK_BYTES / C_HDF5.H5Tget_size(dType): int);
+        // The chunks of extendable datasets are sized for the rows appended later
+        var chunkDims = [(if opts.extendable then chunkElems 
+                          else min(chunkElems, size)): C_HDF5.hsize_t];
+        // The maximum size of extendable datasets is H5S_UNLIMITED
+        var maxDims = [if opts.extendable then max(C_HDF5.hsize_t) 
+                       else size: C_HDF5.hsize_t];
+
+        var dcpl = C_HDF5.H5Pcreate(C_HDF5.H5P_DATASET_CREATE);
+        defer {
+            C_HDF5.H5Pclose(dcpl);
+        }
+        C_HDF5.H5Pset_chunk(dcpl, 1, c_ptrTo(chunkDims));
+        // The shuffle filter must come before compression to help it
+        if opts.shuffle {
+            C_HDF5.H5Pset_shuffle(dcpl);
+        }
+        if opts.gzipLevel >= 0 {
+            C_HDF5.H5Pset_deflate(dcpl, opts.gzipLevel: c_uint);
+        }
+        var dataspace = C_HDF5.H5Screate_simple(1, c_ptrTo(dims), c_ptrTo(maxDims));
+        defer {
+            C_HDF5.H5Sclose(dataspace);
+        }
+        var dataset = C_HDF5.H5Dcreate2(fileId, dsetName.c_str(), dType, dataspace,
+                                        C_HDF5.H5P_DEFAULT, dcpl, C_HDF5.H5P_DEFAULT);
+        if dataset < 0 {
+            throw getErrorWithContext(
+                       msg="unable to create dataset %s".format(dsetName),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="WriteModeError");
+        }
+        defer {
+            C_HDF5.H5Dclose(dataset);
+        }
+        if size > 0 && C_HDF5.H5Dwrite(dataset, dType, C_HDF5.H5S_ALL, C_HDF5.H5S_ALL, 
+                                           C_HDF5.H5P_DEFAULT, ptr) < 0 {
+            throw getErrorWithContext(
+                       msg="unable to write dataset %s".format(dsetName),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="ErrorWithContext");
+        }
+    }
+
+    /*
+     * Appends the size elements at ptr to the end of the extendable dataset
+     * dsetName, which must have been created with opts.extendable.
+     */
+    private proc appendToDataset(fileId: C_HDF5.hid_t, dsetName: string, size: int, 
+                                 dType: C_HDF5.hid_t, ptr) throws {
+        var dataset = C_HDF5.H5Dopen(fileId, dsetName.c_str(), C_HDF5.H5P_DEFAULT);
+        if dataset < 0 {
+            throw getErrorWithContext(
+                       msg="unable to open dataset %s".format(dsetName),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="WriteModeError");
+        }
+        defer {
+            C_HDF5.H5Dclose(dataset);
+        }
+
+        var fileType = C_HDF5.H5Dget_type(dataset);
+        const sameType = C_HDF5.H5Tget_class(fileType) == C_HDF5.H5Tget_class(dType) &&
+                         C_HDF5.H5Tget_size(fileType) == C_HDF5.H5Tget_size(dType);
+        C_HDF5.H5Tclose(fileType);
+        if !sameType {
+            throw getErrorWithContext(
+                       msg="cannot append rows of another dtype to dataset %s".format(dsetName),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="WriteModeError");
+        }
+
+        var dataspace = C_HDF5.H5Dget_space(dataset);
+        var dims: [0..#1] C_HDF5.hsize_t;
+        C_HDF5.H5Sget_simple_extent_dims(dataspace, c_ptrTo(dims), nil);
+        C_HDF5.H5Sclose(dataspace);
+        if size == 0 {
+            return;
+        }
+
+        var newDims = [dims[0] + size: C_HDF5.hsize_t];
+        if C_HDF5.H5Dset_extent(dataset, c_ptrTo(newDims)) < 0 {
+            throw getErrorWithContext(
+                       msg="dataset %s is not extendable, it must be created with mode='append_rows'".format(
+                                                                             dsetName),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="WriteModeError");
+        }
+
+        // Write the rows to the hyperslab of the new end of the dataset
+        dataspace = C_HDF5.H5Dget_space(dataset);
+        defer {
+            C_HDF5.H5Sclose(dataspace);
+        }
+        var dsetOffset = [dims[0]];
+        var dsetCount = [size: C_HDF5.hsize_t];
+        C_HDF5.H5Sselect_hyperslab(dataspace, C_HDF5.H5S_SELECT_SET, c_ptrTo(dsetOffset), 
+                                                         nil, c_ptrTo(dsetCount), nil);
+        var memspace = C_HDF5.H5Screate_simple(1, c_ptrTo(dsetCount), nil);
+        defer {
+            C_HDF5.H5Sclose(memspace);
+        }
+        if C_HDF5.H5Dwrite(dataset, dType, memspace, dataspace, 
+                                           C_HDF5.H5P_DEFAULT, ptr) < 0 {
+            throw getErrorWithContext(
+                       msg="unable to append to dataset %s".format(dsetName),
+                       lineNumber=getLineNumber(),
+                       routineName=getRoutineName(), 
+                       moduleName=getModuleName(),
+                       errorClass="ErrorWithContext");
+        }
+    }
+
+    /*
+     * Returns whether the group or dataset name exists in the open file, 
+     * where the parent groups of name must exist.
+     */
+    private proc hdfLinkExists(fileId: C_HDF5.hid_t, name: string): bool {
+        return C_HDF5.H5Lexists(fileId, name.c_str(), C_HDF5.H5P_DEFAULT) > 0;
+    }
+
+    /*
+     * Returns the length of the one-dimensional dataset dsetName of the open file.
+     */
+    private proc get_open_dataset_length(fileId: C_HDF5.hid_t, dsetName: string): int {
+        use C_HDF5.HDF5_WAR;
+        var dims: [0..#1] C_HDF5.hsize_t;
+        H5LTget_dataset_info_WAR(fileId, dsetName.c_str(), c_ptrTo(dims), nil, nil);
+        return dims[0]: int;
+    }
+
     /*
      * Returns a boolean indicating whether this is the last locale
      */
@@ -58,6 +58,52 @@ module Message {
         }
     }
     
+    /*
+     * Marks a message in the compact framing, which no JSON-formatted message
+     * starts with. Requests in this framing have the form
+     *
+     * \x01user\x1ftoken\x1fcmd\x1farg1 arg2
+     *
+     * and replies the form \x01<type>msg, where type is N, W or E.
+     */
+    const compactMarker = "\x01";
+    const compactSeparator = "\x1f";
+
+    /*
+     * Deserializes a request in the compact framing to a RequestMsg object,
+     * which avoids the cost of parsing JSON for small, frequent commands.
+     */
+    proc deserializeCompact(ref msg: RequestMsg, request: string) throws {
+        var fields: [0..3] string;
+        var n = 0;
+        for field in request[1..].split(compactSeparator, 3) {
+            fields[n] = field;
+            n += 1;
+        }
+        if n < 3 {
+            throw new owned ErrorWithContext("Incorrect compact format %s".format(request),
+                                       getLineNumber(),
+                                       getRoutineName(),
+                                       getModuleName(),
+                                       "ValueError");
+        }
+        msg.user = fields[0];
+        msg.token = fields[1];
+        msg.cmd = fields[2];
+        msg.args = fields[3];
+        msg.format = "STRING";
+    }
+
+   /*
+    * Serializes a reply message in the compact framing
+    */
+   proc serializeCompact(msg: string, msgType: MsgType) : string {
+       const tag = if msgType == MsgType.NORMAL then "N"
+                   else if msgType == MsgType.WARNING then "W"
+                   else "E";
+       return compactMarker + tag + msg;
+   }
+
    /*
     * Generates a ReplyMsg object and serializes it into a JSON-formatted reply message
     */
@@ -108,6 +108,33 @@ module MsgProcessing
         return new MsgTuple(repMsg, MsgType.NORMAL);
     }
 
+    /* 
+    Parse, execute, and respond to a deleteMany message, which deletes several
+    entries at once. Registered entries are skipped, as are names that are no
+    longer in the symbol table, so that clients may defer and coalesce deletes.
+
+    :arg payload: the number of names followed by the space-delimited names
+    :type payload: string
+
+    :arg st: SymTab to act on
+    :type st: borrowed SymTab 
+
+    :returns: (MsgTuple) response message
+    */
+    proc deleteManyMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
+        var (nstr, names) = payload.splitMsgToTuple(2);
+        var n = try! nstr:int;
+        var nDeleted = 0;
+        for name in names.split() {
+            if st.contains(name) && st.deleteEntry(name) {
+                nDeleted += 1;
+            }
+        }
+        var repMsg = "deleted %i of %i".format(nDeleted, n);
+        mpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);       
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+
     /* 
     Clear all unregistered symbols and associated data from sym table
     
@@ -8,13 +8,26 @@ module MultiTypeSymbolTable
     
     use MultiTypeSymEntry;
     use Map;
+    use List;
+    use Sort;
     use IO;
+    use Path;
+    use FileSystem;
+    use BinaryIO only writeEntryBlocks, readEntryBlocks, localBlockFile;
+    use PrivateFiles only randomToken;
     
     private config const logLevel = ServerConfig.logLevel;
     const mtLogger = new Logger(logLevel);
 
+    /* Orders (last use, name) pairs by last use */
+    private record LastUseComparator {
+        proc key(a: (int, string)) {
+            return a(0);
+        }
+    }
+
     /* symbol table */
-    class SymTab
+    class SymTab : MemReclaimer
     {
         /*
         Associative domain of strings
@@ -27,6 +40,42 @@ module MultiTypeSymbolTable
         var tab: map(string, shared GenSymEntry);
 
         var nid = 0;
+
+        /*
+        Logical time of the last lookup or creation of each entry, from
+        which the least recently used entries are spilled
+        */
+        var lastUse: map(string, int);
+
+        /*
+        Current logical time, advanced by each use of an entry
+        */
+        var clock = 0;
+
+        /*
+        Logical time at the start of the current command. Entries used since
+        may be borrowed by the command and are never spilled.
+        */
+        var commandStart = 0;
+
+        /*
+        Names of the entries whose arrays are spilled to disk. Their entries
+        in tab are placeholders with the same attributes.
+        */
+        var spilled: domain(string);
+
+        /*
+        Bytes in the arrays of the entries, not counting those spilled to
+        disk, kept up to date as entries are added, removed and spilled
+        */
+        var residentBytes = 0;
+
+        /*
+        Random part of the names of the spill files, so that other users of
+        the host cannot guess them to plant files or links in their place
+        */
+        var spillToken: string;
+
         /*
         Gives out symbol names.
         */
@@ -37,6 +86,8 @@ module MultiTypeSymbolTable
 
         proc regName(name: string, userDefinedName: string) throws {
             checkTable(name, "regName");
+            // registered entries are never spilled
+            if spilled.contains(name) then reload(name);
 
             // check to see if userDefinedName is already defined, with in-place modification, this will be an error
             if (registry.contains(userDefinedName)) {
@@ -61,7 +112,10 @@ module MultiTypeSymbolTable
             registry += userDefinedName; // add user defined name to registry
 
             // point at same shared table entry
+            if userDefinedName != name then residentBytes -= residentSize(userDefinedName);
             tab.addOrSet(userDefinedName, tab.getAndRemove(name));
+            lastUse.remove(name);
+            touch(userDefinedName);
         }
 
         proc unregName(name: string) throws {
@@ -94,8 +148,9 @@ module MultiTypeSymbolTable
         :returns: borrow of newly created `SymEntry(t)`
         */
         proc addEntry(name: string, len: int, type t): borrowed SymEntry(t) throws {
-            // check and throw if memory limit would be exceeded
-            if t == bool {overMemLimit(len);} else {overMemLimit(len*numBytes(t));}
+            const nbytes = if t == bool then len else len*numBytes(t);
+            // spill if needed, then check and throw if memory limit would be exceeded
+            overMemLimit(nbytes);
             
             var entry = new shared SymEntry(len, t);
             if (tab.contains(name)) {
@@ -106,7 +161,11 @@ module MultiTypeSymbolTable
                                                         "adding symbol: %s ".format(name));            
             }
 
+            residentBytes -= residentSize(name);
+            forgetSpill(name);
             tab.addOrSet(name, entry);
+            residentBytes += nbytes;
+            touch(name);
             return tab.getBorrowed(name).toSymEntry(t);
         }
 
@@ -122,7 +181,7 @@ module MultiTypeSymbolTable
         :returns: borrow of newly created GenSymEntry
         */
         proc addEntry(name: string, in entry: shared GenSymEntry): borrowed GenSymEntry throws {
-            // check and throw if memory limit would be exceeded
+            // spill if needed, then check and throw if memory limit would be exceeded
             overMemLimit(entry.size*entry.itemsize);
 
             if (tab.contains(name)) {
@@ -133,7 +192,12 @@ module MultiTypeSymbolTable
                                                         "adding symbol: %s ".format(name));            
             }
 
+            residentBytes -= residentSize(name);
+            forgetSpill(name);
+            const nbytes = entry.size*entry.itemsize;
             tab.addOrSet(name, entry);
+            residentBytes += nbytes;
+            touch(name);
             return tab.getBorrowed(name);
         }
 
@@ -180,6 +244,9 @@ module MultiTypeSymbolTable
             if !registry.contains(name) {
                 mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                        "Deleting unregistered entry: %s".format(name)); 
+                residentBytes -= residentSize(name);
+                forgetSpill(name);
+                lastUse.remove(name);
                 tab.remove(name);
                 return true;
             } else {
@@ -210,9 +277,184 @@ module MultiTypeSymbolTable
         */
         proc lookup(name: string): borrowed GenSymEntry throws {
             checkTable(name, "lookup");
+            touch(name);
+            if spilled.contains(name) then reload(name);
             return tab.getBorrowed(name);
         }
 
+        /*
+        Marks the start of a command. The entries it uses from now on are
+        not spilled until the next command starts.
+        */
+        proc beginCommand() {
+            commandStart = clock + 1;
+        }
+
+        /*
+        Records a use of an entry for LRU spilling
+        */
+        proc touch(name: string) {
+            clock += 1;
+            lastUse.addOrSet(name, clock);
+        }
+
+        /*
+        If the memory used and additional bytes more would exceed
+        spillThreshold percent of the memory limit, spills the least recently
+        used unregistered entries not used by the current command until they
+        fit in spillTarget percent, or no such entry is left. The memory used
+        is that measured by overMemLimit if memTrack is set, and otherwise
+        the bytes in the arrays of the symbol table.
+
+        :arg additional: number of bytes about to be allocated
+        :type additional: int
+        */
+        proc makeRoom(additional: int) throws {
+            if spillThreshold <= 0 {
+                return;
+            }
+            const limit = getMemLimit():real * numLocales;
+            var used = if memTrack then getMemUsedTotal() else residentBytes;
+            if used + additional <= (limit * spillThreshold / 100):int {
+                return;
+            }
+            const target = (limit * min(spillTarget, spillThreshold) / 100):int;
+            // the spillable entries, coldest first
+            var candidates: list((int, string));
+            for name in lastUse.keys() {
+                const t = lastUse.getValue(name);
+                if t < commandStart && !registry.contains(name) && !spilled.contains(name) &&
+                                                       isSpillable(tab.getBorrowed(name)) {
+                    candidates.append((t, name));
+                }
+            }
+            var coldest = candidates.toArray();
+            sort(coldest, comparator=new LastUseComparator());
+            for (_, name) in coldest {
+                if used + additional <= target {
+                    break;
+                }
+                const e = tab.getBorrowed(name);
+                used -= e.size*e.itemsize;
+                spill(name);
+            }
+        }
+
+        /*
+        Spills entries as makeRoom does, when called by overMemLimit
+        */
+        override proc reclaim(additional: int) throws {
+            makeRoom(additional);
+        }
+
+        /*
+        Writes the array of an entry to the scratch files of each locale in
+        spillDir and replaces the entry with a placeholder
+        */
+        private proc spill(name: string) throws {
+            const entry = tab.getBorrowed(name);
+            writeEntryBlocks(spillPrefix(name), entry, exclusive=true);
+            var placeholder: shared GenSymEntry;
+            select entry.dtype {
+                when DType.Int64 { placeholder = new shared GenSymEntry(int, entry.size); }
+                when DType.Float64 { placeholder = new shared GenSymEntry(real, entry.size); }
+                when DType.Bool { placeholder = new shared GenSymEntry(bool, entry.size); }
+                otherwise { placeholder = new shared GenSymEntry(uint(8), entry.size); }
+            }
+            const nbytes = entry.size*entry.itemsize;
+            tab.addOrSet(name, placeholder);
+            spilled += name;
+            residentBytes -= nbytes;
+            spillCount += 1;
+            mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                       "spilled %s of %i bytes".format(name, nbytes));
+        }
+
+        /*
+        Reads the array of a spilled entry back from its scratch files
+        */
+        private proc reload(name: string) throws {
+            const dtype = tab.getBorrowed(name).dtype;
+            const size = tab.getBorrowed(name).size;
+            // readEntryBlocks spills other entries to make room if needed
+            var entry = readEntryBlocks(spillPrefix(name), dtype, size, exclusive=true);
+            tab.addOrSet(name, entry);
+            forgetSpill(name);
+            residentBytes += size*dtypeSize(dtype);
+            reloadCount += 1;
+            mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                       "reloaded %s".format(name));
+        }
+
+        /*
+        Removes the scratch files of an entry if it is spilled
+        */
+        private proc forgetSpill(name: string) throws {
+            if spilled.contains(name) {
+                removeSpillFiles(name);
+                spilled -= name;
+            }
+        }
+
+        private proc removeSpillFiles(name: string) throws {
+            const prefix = spillPrefix(name);
+            coforall loc in Locales do on loc {
+                const path = localBlockFile(prefix, here.id);
+                if exists(path) then remove(path);
+            }
+        }
+
+        private proc spillPrefix(name: string): string throws {
+            if spillToken.isEmpty() then spillToken = randomToken();
+            return "%s%sarkouda_spill_%i_%s_%s".format(spillDir, pathSep, ServerPort,
+                                                       spillToken, name);
+        }
+
+        /*
+        Bytes in the array of an entry, 0 if there is no such entry or it is
+        spilled to disk
+        */
+        private proc residentSize(name: string): int {
+            if !tab.contains(name) || spilled.contains(name) {
+                return 0;
+            }
+            const e = tab.getBorrowed(name);
+            return e.size * e.itemsize;
+        }
+
+        private proc isSpillable(entry: borrowed GenSymEntry): bool {
+            select entry.dtype {
+                when DType.Int64, DType.Float64, DType.Bool, DType.UInt8 do return true;
+                otherwise do return false;
+            }
+        }
+
+        /*
+        Removes the scratch files of the spilled entries
+        */
+        proc deinit() {
+            for name in spilled {
+                try {
+                    removeSpillFiles(name);
+                } catch e: Error {
+                    mtLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
+                                       "unable to remove the spill files of %s".format(name));
+                }
+            }
+        }
+
+        /*
+        Returns whether a symbol is defined, without logging an error if it is not
+
+        :arg name: string to query in the sym table
+        :type name: string
+
+        :returns: bool
+        */
+        proc contains(name: string): bool {
+            return tab.contains(name);
+        }
+
         /*
         checks to see if a symbol is defined if it is not it throws an exception 
         */
@@ -242,11 +484,11 @@ module MultiTypeSymbolTable
         }
 
         /*
-        returns total bytes in arrays in the symbol table
+        returns total bytes in arrays in the symbol table, not counting
+        those spilled to disk
         */
         proc memUsed(): int {
-            var total: int = + reduce [e in tab.values()] e.size * e.itemsize;
-            return total;
+            return residentBytes;
         }
         
         /*
@@ -380,7 +622,7 @@ module MultiTypeSymbolTable
         */
         proc datastr(name: string, thresh:int): string throws {
             checkTable(name, "datastr");
-            var u: borrowed GenSymEntry = tab.getBorrowed(name);
+            var u: borrowed GenSymEntry = lookup(name);
             if (u.dtype == DType.UNDEF || u.dtype == DType.UInt8) {
                 var s = unrecognizedTypeError("datastr",dtype2str(u.dtype));
                 mtLogger.error(getModuleName(),getRoutineName(),getLineNumber(),s);
@@ -406,7 +648,7 @@ module MultiTypeSymbolTable
         */
         proc datarepr(name: string, thresh:int): string throws {
             checkTable(name, "datarepr");
-            var u: borrowed GenSymEntry = tab.getBorrowed(name);
+            var u: borrowed GenSymEntry = lookup(name);
             if (u.dtype == DType.UNDEF || u.dtype == DType.UInt8) {
                 var s = unrecognizedTypeError("datarepr",dtype2str(u.dtype));
                 mtLogger.error(getModuleName(),getRoutineName(),getLineNumber(),s);
@@ -0,0 +1,75 @@
+/* creation and opening of the scratch files that the server shares with
+   clients on the same host or spills arrays to, in world-writable
+   directories such as /dev/shm and /tmp */
+module PrivateFiles
+{
+    use IO;
+    use CPtr;
+    use SysCTypes;
+    use Reflection;
+    use Errors;
+
+    require "fcntl.h";
+
+    private extern "open" proc c_open(path: c_string, flags: c_int, mode: c_int): c_int;
+    private extern const O_RDONLY: c_int;
+    private extern const O_RDWR: c_int;
+    private extern const O_CREAT: c_int;
+    private extern const O_EXCL: c_int;
+    private extern const O_NOFOLLOW: c_int;
+
+    /*
+    Returns 16 random hexadecimal digits read from /dev/urandom, to make the
+    names of scratch files unpredictable to other users of the host
+
+    :returns: string
+    */
+    proc randomToken(): string throws {
+        var f = open("/dev/urandom", iomode.r);
+        defer { try! f.close(); }
+        var r = f.reader(kind=ionative, locking=false);
+        var x: uint;
+        r.read(x);
+        r.close();
+        return "%016xu".format(x);
+    }
+
+    /*
+    Creates a new file readable and writable by the server user only. Fails
+    if path already exists, even as a dangling symbolic link, so that a file
+    planted by another user is never written to.
+
+    :arg path: path of the file to create
+    :type path: string
+
+    :returns: file
+    */
+    proc createPrivateFile(path: string): file throws {
+        return openFd(path, O_RDWR | O_CREAT | O_EXCL | O_NOFOLLOW, 0o600, "create");
+    }
+
+    /*
+    Opens an existing file for reading, failing if path is a symbolic link
+
+    :arg path: path of the file to open
+    :type path: string
+
+    :returns: file
+    */
+    proc openNoFollow(path: string): file throws {
+        return openFd(path, O_RDONLY | O_NOFOLLOW, 0, "open");
+    }
+
+    private proc openFd(path: string, flags: c_int, mode: int, action: string): file throws {
+        const fd = c_open(path.c_str(), flags, mode:c_int);
+        if fd < 0 {
+            throw getErrorWithContext(
+                      msg="unable to %s %s".format(action, path),
+                      lineNumber=getLineNumber(),
+                      routineName=getRoutineName(),
+                      moduleName=getModuleName(),
+                      errorClass="ErrorWithContext");
+        }
+        return openfd(fd);
+    }
+}
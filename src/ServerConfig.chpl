@@ -57,6 +57,43 @@ module ServerConfig
     */
     config const authenticate : bool = false;
 
+    /*
+    Compression codecs accepted for binary array transfers
+    */
+    const compressionCodecs = ["zlib"];
+
+    /*
+    Directory, normally a tmpfs, through which arrays are exchanged with
+    clients on the same host, none if empty
+    */
+    config const sharedMemoryDir = "/dev/shm";
+
+    /*
+    Snapshot directory, written by ak.snapshot, whose registered entries are
+    restored at startup, none if empty
+    */
+    config const restorePath = "";
+
+    /*
+    Percentage of the memory limit that the server may use, as measured by
+    overMemLimit with memTrack and otherwise by the bytes in the arrays of
+    the symbol table, before the least recently used unregistered arrays
+    are spilled to disk, 0 to never spill. May be fractional, e.g. to spill at a few
+    megabytes when testing.
+    */
+    config const spillThreshold = 0.0;
+
+    /*
+    Percentage of the memory limit down to which arrays are spilled once
+    spillThreshold is exceeded
+    */
+    config const spillTarget = 50.0;
+
+    /*
+    Directory, on storage local to each locale, of the spilled arrays
+    */
+    config const spillDir = "/tmp";
+
     private config const lLevel = ServerConfig.logLevel;
     const scLogger = new Logger(lLevel);
    
@@ -85,6 +122,14 @@ module ServerConfig
                 [loc in LocaleSpace] new owned LocaleConfig();
             var authenticate: bool;
             var logLevel: LogLevel;
+            var compactMessages: bool;
+            var compressionCodecs: [0..#ServerConfig.compressionCodecs.size] string;
+            var sharedMemoryDir: string;
+            var spillThreshold: real;
+            var spillTarget: real;
+            var spillDir: string;
+            var spillCount: int;
+            var reloadCount: int;
         }
         var (Zmajor, Zminor, Zmicro) = ZMQ.version;
         var H5major: c_uint, H5minor: c_uint, H5micro: c_uint;
@@ -102,6 +147,14 @@ module ServerConfig
         cfg.distributionType = (makeDistDom(10).type):string;
         cfg.authenticate = authenticate; 
         cfg.logLevel = logLevel;
+        cfg.compactMessages = true;
+        cfg.compressionCodecs = ServerConfig.compressionCodecs;
+        cfg.sharedMemoryDir = sharedMemoryDir;
+        cfg.spillThreshold = spillThreshold;
+        cfg.spillTarget = spillTarget;
+        cfg.spillDir = spillDir;
+        cfg.spillCount = spillCount;
+        cfg.reloadCount = reloadCount;
 
         for loc in Locales {
             on loc {
@@ -148,12 +201,56 @@ module ServerConfig
     }
 
     var memHighWater:uint = 0;
+
+    /*
+    Number of times arrays of the symbol table were spilled to disk and
+    read back
+    */
+    var spillCount = 0;
+    var reloadCount = 0;
+
+    /*
+    Frees memory for an allocation, e.g. by spilling arrays to disk. The
+    symbol table of the server registers itself as memReclaimer.
+    */
+    class MemReclaimer {
+        /* Makes room for additional bytes more across all locales */
+        proc reclaim(additional: int) throws { }
+    }
+
+    var memReclaimer: shared MemReclaimer?;
+
+    /* Set while memReclaimer runs, so that a single task runs it at a time */
+    private var reclaiming: atomic bool;
+
+    /*
+    Get the memory used across all locales, estimated from this locale as
+    overMemLimit does
+    */
+    proc getMemUsedTotal(): int {
+        return getMemUsed():int * numLocales;
+    }
+
+    /*
+    Lets memReclaimer make room for additional bytes more. Tasks that call
+    this while it runs, including those of the reclaimer itself, go on
+    without reclaiming.
+    */
+    proc reclaimMemory(additionalAmount:int) throws {
+        // the symbol table lives on locale 0
+        if here.id != 0 || memReclaimer == nil || reclaiming.testAndSet() {
+            return;
+        }
+        defer { reclaiming.clear(); }
+        memReclaimer!.reclaim(additionalAmount);
+    }
     
     /*
-    check used + amount is over the memory limit
-    throw error if we would go over the limit
+    check used + amount is over the memory limit, after letting memReclaimer
+    make room for amount, and throw error if we would go over the limit
     */
     proc overMemLimit(additionalAmount:int) throws {
+        reclaimMemory(additionalAmount);
         // must set config var "-smemTrack=true"(compile time) or "--memTrack=true" (run time)
         // to use memoryUsed() procedure from Chapel's Memory module
         if (memTrack) {
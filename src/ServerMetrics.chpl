@@ -0,0 +1,215 @@
+/* per-command timing and memory metrics of the arkouda server */
+module ServerMetrics
+{
+    use Time only;
+    use Map;
+    use IO;
+    use ServerConfig;
+    use MultiTypeSymbolTable;
+    use Message;
+    use Reflection;
+    use Logging;
+
+    /*
+    File to which the metrics are written every metricsInterval seconds and at
+    shutdown, none if empty
+    */
+    config const metricsFile = "";
+
+    /*
+    Seconds between writes of the metrics to metricsFile
+    */
+    config const metricsInterval = 60.0;
+
+    /*
+    Seconds between samples of the symbol table size
+    */
+    config const metricsSampleInterval = 1.0;
+
+    /*
+    Number of symbol table samples kept, older samples are discarded
+    */
+    config const metricsHistorySize = 1000;
+
+    private config const logLevel = ServerConfig.logLevel;
+    const smLogger = new Logger(logLevel);
+
+    /*
+    Statistics of all executions of one command
+    */
+    record CommandMetrics {
+        var count: int;
+        var errors: int;
+        var totalTime: real;
+        var minTime: real = max(real);
+        var maxTime: real;
+        var maxMemDelta: int;
+    }
+
+    /*
+    Size of the symbol table at a point in time, in seconds since server start
+    */
+    record SymTabSample {
+        var time: real;
+        var entries: int;
+        var bytes: int;
+    }
+
+    private var timer: Time.Timer;
+    timer.start();
+
+    private var commandMetrics = new map(string, CommandMetrics);
+    private var history: [0..#metricsHistorySize] SymTabSample;
+    private var numSamples = 0;
+    private var lastSample = -metricsSampleInterval;
+    private var lastWrite = 0.0;
+
+    /*
+    Memory used by the server, in bytes: the memory allocated on all locales if
+    memory tracking is enabled, and that of the symbol table entries otherwise
+    */
+    proc metricsMemUsed(st: borrowed SymTab): int {
+        if memTrack {
+            return (getMemUsed():uint * numLocales:uint):int;
+        } else {
+            return st.memUsed();
+        }
+    }
+
+    /*
+    Captures the time and memory used at the start of a command, to be passed
+    to recordCommand once it completes.
+
+    :arg st: SymTab the command acts on
+    :type st: borrowed SymTab
+
+    :returns: (real, int) start time and memory used
+    */
+    proc startCommand(st: borrowed SymTab): (real, int) {
+        return (timer.elapsed(), metricsMemUsed(st));
+    }
+
+    /*
+    Adds an execution of a command to its metrics, samples the symbol table
+    size if metricsSampleInterval has passed and writes the metrics to
+    metricsFile if metricsInterval has passed.
+
+    :arg cmd: the command executed
+    :type cmd: string
+
+    :arg start: value returned by startCommand before the command was executed
+    :type start: (real, int)
+
+    :arg st: SymTab the command acted on
+    :type st: borrowed SymTab
+
+    :arg failed: whether the command resulted in an error
+    :type failed: bool
+    */
+    proc recordCommand(cmd: string, start: (real, int), st: borrowed SymTab,
+                       failed: bool = false) {
+        if cmd.isEmpty() {
+            return;
+        }
+        const now = timer.elapsed();
+        const elapsed = now - start(0);
+        const memUsed = metricsMemUsed(st);
+
+        if !commandMetrics.contains(cmd) {
+            commandMetrics.add(cmd, new CommandMetrics());
+        }
+        ref m = commandMetrics[cmd];
+        m.count += 1;
+        if failed {
+            m.errors += 1;
+        }
+        m.totalTime += elapsed;
+        m.minTime = min(m.minTime, elapsed);
+        m.maxTime = max(m.maxTime, elapsed);
+        m.maxMemDelta = max(m.maxMemDelta, memUsed - start(1));
+
+        if metricsHistorySize > 0 && now - lastSample >= metricsSampleInterval {
+            history[numSamples % metricsHistorySize] = new SymTabSample(time=now,
+                                                 entries=st.tab.size, bytes=st.memUsed());
+            numSamples += 1;
+            lastSample = now;
+        }
+        if !metricsFile.isEmpty() && now - lastWrite >= metricsInterval {
+            writeMetrics(st);
+        }
+    }
+
+    /*
+    Formats the metrics as a JSON object with the fields uptime, commands,
+    which maps each command name to its CommandMetrics, symTabEntries,
+    symTabBytes and symTabHistory, the list of SymTabSamples taken, oldest first.
+
+    :arg st: SymTab to report the size of
+    :type st: borrowed SymTab
+
+    :returns: string
+    */
+    proc getMetrics(st: borrowed SymTab): string throws {
+        var json = "{\"uptime\": %.6r, \"commands\": {".format(timer.elapsed());
+        var first = true;
+        for (name, m) in commandMetrics.items() {
+            json += "%s%jt: {\"count\": %i, \"errors\": %i, \"totalTime\": %.9r, ".format(
+                                if first then "" else ", ", name, m.count, m.errors,
+                                m.totalTime) +
+                    "\"minTime\": %.9r, \"maxTime\": %.9r, \"maxMemDelta\": %i}".format(
+                                m.minTime, m.maxTime, m.maxMemDelta);
+            first = false;
+        }
+        json += "}, \"symTabEntries\": %i, \"symTabBytes\": %i, \"symTabHistory\": [".format(
+                                st.tab.size, st.memUsed());
+        const kept = min(numSamples, metricsHistorySize);
+        for i in 0..#kept {
+            const s = history[(numSamples - kept + i) % metricsHistorySize];
+            json += "%s{\"time\": %.6r, \"entries\": %i, \"bytes\": %i}".format(
+                                if i == 0 then "" else ", ", s.time, s.entries, s.bytes);
+        }
+        json += "]}";
+        return json;
+    }
+
+    /*
+    Writes the metrics to metricsFile, logging rather than throwing any error
+    so that a bad path does not interrupt the processing of requests.
+
+    :arg st: SymTab to report the size of
+    :type st: borrowed SymTab
+    */
+    proc writeMetrics(st: borrowed SymTab) {
+        lastWrite = timer.elapsed();
+        try {
+            var f = open(metricsFile, iomode.cw);
+            var w = f.writer();
+            w.write(getMetrics(st));
+            w.close();
+            f.close();
+        } catch e: Error {
+            try! smLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
+                                "Error in writing metrics to %s: %s".format(metricsFile,
+                                                                           e.message()));
+        }
+    }
+
+    /*
+    Returns the per-command metrics and symbol table size history.
+
+    :arg cmd: request command
+    :type cmd: string
+
+    :arg payload: request arguments, none for this command
+    :type payload: string
+
+    :arg st: SymTab to report the size of
+    :type st: borrowed SymTab
+
+    :returns: (MsgTuple) the metrics as a JSON object
+    */
+    proc getmetricsMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
+        smLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),"cmd: %s".format(cmd));
+        return new MsgTuple(getMetrics(st), MsgType.NORMAL);
+    }
+}
@@ -16,6 +16,9 @@ use MultiTypeSymbolTable;
 use MultiTypeSymEntry;
 use MsgProcessing;
 use GenSymIO;
+use BinaryIO;
+use CsvIO;
+use ServerMetrics;
 use Reflection;
 use SymArrayDmap;
 use ServerErrorStrings;
@@ -123,7 +126,22 @@ proc main() {
 
     const arkDirectory = initArkoudaDirectory();
 
-    var st = new owned SymTab();
+    var st = new shared SymTab();
+    // let overMemLimit spill arrays of the symbol table to make room
+    memReclaimer = st;
+
+    // a snapshot that cannot be restored is logged, and the server starts empty
+    if !restorePath.isEmpty() {
+        try {
+            var names = restoreSnapshot(restorePath, st);
+            asLogger.info(getModuleName(), getRoutineName(), getLineNumber(),
+                          "restored %i registered entries from %s".format(names.size, restorePath));
+        } catch e: Error {
+            asLogger.error(getModuleName(), getRoutineName(), getLineNumber(),
+                           "could not restore the snapshot %s: %s".format(restorePath, e.message()));
+        }
+    }
+
     var shutdownServer = false;
     var serverToken : string;
     var serverMessage : string;
@@ -188,13 +206,34 @@ proc main() {
     } 
 
     /*
-     * Converts the incoming request JSON string into RequestMsg object.
+     * Whether the request being processed uses the compact framing, in which
+     * case the reply does as well.
+     */
+    var compactRequest = false;
+
+    /*
+     * Converts the incoming request JSON or compact string into RequestMsg object.
      */
     proc extractRequest(request : string) : RequestMsg throws {
         var rm = new RequestMsg();
-        deserialize(rm, request);
+        if request.startsWith(compactMarker) {
+            compactRequest = true;
+            deserializeCompact(rm, request);
+        } else {
+            deserialize(rm, request);
+        }
         return rm;
     }
+
+    /*
+     * Serializes a string reply in the framing of the request being processed.
+     */
+    proc serializeReply(msg: string, msgType: MsgType, user: string) : string throws {
+        if compactRequest {
+            return serializeCompact(msg, msgType);
+        }
+        return serialize(msg=msg, msgType=msgType, msgFormat=MsgFormat.STRING, user=user);
+    }
     
     /*
     Sets the shutdownServer boolean to true and sends the shutdown command to socket,
@@ -211,9 +250,22 @@ proc main() {
         // receive message on the zmq socket
         var reqMsgRaw = socket.recv(bytes);
 
+        /*
+         * The deletes queued by a client precede its next request in a frame
+         * of their own. They are executed once the request is authenticated.
+         */
+        var deletes: string;
+        if reqMsgRaw.startsWith(b"DELETE_MANY ") {
+            deletes = reqMsgRaw[b"DELETE_MANY ".size..].decode(decodePolicy.replace);
+            reqMsgRaw = socket.recv(bytes);
+        }
+
         reqCount += 1;
 
         var s0 = t1.elapsed();
+        const metricsStart = startCommand(st);
+        st.beginCommand();
+        compactRequest = false;
         
         /*
          * Separate the first tuple, which is a string binary containing the JSON binary
@@ -221,6 +273,15 @@ proc main() {
          * remaining payload.
          */
         var (rawRequest, payload) = reqMsgRaw.splitMsgToTuple(b"BINARY_PAYLOAD",2);
+
+        /*
+         * Clients send a binary payload in a frame of its own after the header,
+         * which then ends with the marker, so that the payload is not copied
+         * to join it to the header.
+         */
+        if payload.isEmpty() && reqMsgRaw.endsWith(b"BINARY_PAYLOAD") {
+            payload = socket.recv(bytes);
+        }
         var user, token, cmd: string;
 
         // parse requests, execute requests, format responses
@@ -259,6 +320,10 @@ proc main() {
                 authenticateUser(token);
             }
 
+            if !deletes.isEmpty() {
+                deleteManyMsg("deleteMany", deletes, st);
+            }
+
             if (trace) {
               try {
                 if (cmd != "array") {
@@ -294,86 +359,10 @@ proc main() {
 
             select cmd
             {
-                when "array"             {repTuple = arrayMsg(cmd, payload, st);}
+                when "array"             {repTuple = arrayMsg(cmd, args, payload, st);}
                 when "tondarray"         {binaryRepMsg = tondarrayMsg(cmd, args, st);}
-                when "cast"              {repTuple = castMsg(cmd, args, st);}
-                when "mink"              {repTuple = minkMsg(cmd, args, st);}
-                when "maxk"              {repTuple = maxkMsg(cmd, args, st);}
-                when "intersect1d"       {repTuple = intersect1dMsg(cmd, args, st);}
-                when "setdiff1d"         {repTuple = setdiff1dMsg(cmd, args, st);}
-                when "setxor1d"          {repTuple = setxor1dMsg(cmd, args, st);}
-                when "union1d"           {repTuple = union1dMsg(cmd, args, st);}
-                when "segmentLengths"    {repTuple = segmentLengthsMsg(cmd, args, st);}
-                when "segmentedHash"     {repTuple = segmentedHashMsg(cmd, args, st);}
-                when "segmentedEfunc"    {repTuple = segmentedEfuncMsg(cmd, args, st);}
-                when "segmentedPeel"     {repTuple = segmentedPeelMsg(cmd, args, st);}
-                when "segmentedIndex"    {repTuple = segmentedIndexMsg(cmd, args, st);}
-                when "segmentedBinopvv"  {repTuple = segBinopvvMsg(cmd, args, st);}
-                when "segmentedBinopvs"  {repTuple = segBinopvsMsg(cmd, args, st);}
-                when "segmentedGroup"    {repTuple = segGroupMsg(cmd, args, st);}
-                when "segmentedIn1d"     {repTuple = segIn1dMsg(cmd, args, st);}
-                when "segmentedFlatten"  {repTuple = segFlattenMsg(cmd, args, st);}
-                when "lshdf"             {repTuple = lshdfMsg(cmd, args, st);}
-                when "readhdf"           {repTuple = readhdfMsg(cmd, args, st);}
-                when "readAllHdf"        {repTuple = readAllHdfMsg(cmd, args, st);}
-                when "tohdf"             {repTuple = tohdfMsg(cmd, args, st);}
-                when "create"            {repTuple = createMsg(cmd, args, st);}
-                when "delete"            {repTuple = deleteMsg(cmd, args, st);}
-                when "binopvv"           {repTuple = binopvvMsg(cmd, args, st);}
-                when "binopvs"           {repTuple = binopvsMsg(cmd, args, st);}
-                when "binopsv"           {repTuple = binopsvMsg(cmd, args, st);}
-                when "opeqvv"            {repTuple = opeqvvMsg(cmd, args, st);}
-                when "opeqvs"            {repTuple = opeqvsMsg(cmd, args, st);}
-                when "efunc"             {repTuple = efuncMsg(cmd, args, st);}
-                when "efunc3vv"          {repTuple = efunc3vvMsg(cmd, args, st);}
-                when "efunc3vs"          {repTuple = efunc3vsMsg(cmd, args, st);}
-                when "efunc3sv"          {repTuple = efunc3svMsg(cmd, args, st);}
-                when "efunc3ss"          {repTuple = efunc3ssMsg(cmd, args, st);}
-                when "reduction"         {repTuple = reductionMsg(cmd, args, st);}
-                when "countReduction"    {repTuple = countReductionMsg(cmd, args, st);}
-                when "findSegments"      {repTuple = findSegmentsMsg(cmd, args, st);}
-                when "segmentedReduction"{repTuple = segmentedReductionMsg(cmd, args, st);}
-                when "broadcast"         {repTuple = broadcastMsg(cmd, args, st);}
-                when "arange"            {repTuple = arangeMsg(cmd, args, st);}
-                when "linspace"          {repTuple = linspaceMsg(cmd, args, st);}
-                when "randint"           {repTuple = randintMsg(cmd, args, st);}
-                when "randomNormal"      {repTuple = randomNormalMsg(cmd, args, st);}
-                when "randomStrings"     {repTuple = randomStringsMsg(cmd, args, st);}
-                when "histogram"         {repTuple = histogramMsg(cmd, args, st);}
-                when "in1d"              {repTuple = in1dMsg(cmd, args, st);}
-                when "unique"            {repTuple = uniqueMsg(cmd, args, st);}
-                when "value_counts"      {repTuple = value_countsMsg(cmd, args, st);}
-                when "set"               {repTuple = setMsg(cmd, args, st);}
-                when "info"              {repTuple = infoMsg(cmd, args, st);}
-                when "str"               {repTuple = strMsg(cmd, args, st);}
-                when "repr"              {repTuple = reprMsg(cmd, args, st);}
-                when "[int]"             {repTuple = intIndexMsg(cmd, args, st);}
-                when "[slice]"           {repTuple = sliceIndexMsg(cmd, args, st);}
-                when "[pdarray]"         {repTuple = pdarrayIndexMsg(cmd, args, st);}
-                when "[int]=val"         {repTuple = setIntIndexToValueMsg(cmd, args, st);}
-                when "[pdarray]=val"     {repTuple = setPdarrayIndexToValueMsg(cmd, args, st);}
-                when "[pdarray]=pdarray" {repTuple = setPdarrayIndexToPdarrayMsg(cmd, args, st);}
-                when "[slice]=val"       {repTuple = setSliceIndexToValueMsg(cmd, args, st);}
-                when "[slice]=pdarray"   {repTuple = setSliceIndexToPdarrayMsg(cmd, args, st);}
-                when "argsort"           {repTuple = argsortMsg(cmd, args, st);}
-                when "coargsort"         {repTuple = coargsortMsg(cmd, args, st);}
-                when "concatenate"       {repTuple = concatenateMsg(cmd, args, st);}
-                when "sort"              {repTuple = sortMsg(cmd, args, st);}
-                when "joinEqWithDT"      {repTuple = joinEqWithDTMsg(cmd, args, st);}
-                when "getconfig"         {repTuple = getconfigMsg(cmd, args, st);}
-                when "getmemused"        {repTuple = getmemusedMsg(cmd, args, st);}
-                when "register"          {repTuple = registerMsg(cmd, args, st);}
-                when "attach"            {repTuple = attachMsg(cmd, args, st);}
-                when "unregister"        {repTuple = unregisterMsg(cmd, args, st);}
-                when "clear"             {repTuple = clearMsg(cmd, args, st);}               
-
-
-                when "segmentedBinopvvInt"  {repTuple = segBinopvvIntMsg(cmd, args, st);}
-                when "segmentedBinopvsInt"  {repTuple = segBinopvsIntMsg(cmd, args, st);}
-                when "segmentedSuffixAry"   {repTuple = segSuffixArrayMsg(cmd, args, st);}
-                when "segmentedLCP"         {repTuple = segLCPMsg(cmd, args, st);}
-                when "segmentedSAFile"      {repTuple = segSAFileMsg(cmd, args, st);}
-                when "segmentedIn1dInt"     {repTuple = segIn1dIntMsg(cmd, args, st);}
+                when "tondarrayslice"    {binaryRepMsg = tondarraySliceMsg(cmd, args, st);}
+                when "batch"             {repTuple = batchMsg(cmd, args, st);}
 
 
                 when "connect" {
@@ -395,10 +384,7 @@ proc main() {
                 when "ruok" {
                     repTuple = new MsgTuple("imok", MsgType.NORMAL);
                 }
-                otherwise {
-                    repTuple = new MsgTuple("Unrecognized command: %s".format(cmd), MsgType.ERROR);
-                    asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),repTuple.msg);
-                }
+                otherwise                {repTuple = executeCommand(cmd, args, st);}
             }
 
             /*
@@ -410,9 +396,10 @@ proc main() {
                 // Since the repTuple.msg attribute is empty, this is a binary reply message
                 sendRepMsg(binaryRepMsg);
             } else {
-                sendRepMsg(serialize(msg=repTuple.msg,msgType=repTuple.msgType,
-                                                              msgFormat=MsgFormat.STRING, user=user));
+                sendRepMsg(serializeReply(msg=repTuple.msg,msgType=repTuple.msgType,
+                                                              user=user));
             }
+            recordCommand(cmd, metricsStart, st);
 
             /*
              * log that the request message has been handled and reply message has been sent along with 
@@ -427,17 +414,18 @@ proc main() {
                     "bytes of memory used after command %t".format(getMemUsed():uint * numLocales:uint));
             }
         } catch (e: ErrorWithMsg) {
-            // Generate a ReplyMsg of type ERROR and serialize to a JSON-formatted string
-            sendRepMsg(serialize(msg=e.msg,msgType=MsgType.ERROR, msgFormat=MsgFormat.STRING, 
-                                                        user=user));
+            // Generate a ReplyMsg of type ERROR and serialize it in the framing of the request
+            sendRepMsg(serializeReply(msg=e.msg,msgType=MsgType.ERROR, user=user));
+            recordCommand(cmd, metricsStart, st, failed=true);
             if trace {
                 asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
                     "<<< %s resulted in error %s in  %.17r sec".format(cmd, e.msg, t1.elapsed() - s0));
             }
         } catch (e: Error) {
-            // Generate a ReplyMsg of type ERROR and serialize to a JSON-formatted string
-            sendRepMsg(serialize(msg=unknownError(e.message()),msgType=MsgType.ERROR, 
-                                                         msgFormat=MsgFormat.STRING, user=user));
+            // Generate a ReplyMsg of type ERROR and serialize it in the framing of the request
+            sendRepMsg(serializeReply(msg=unknownError(e.message()),msgType=MsgType.ERROR, 
+                                                         user=user));
+            recordCommand(cmd, metricsStart, st, failed=true);
             if trace {
                 asLogger.error(getModuleName(), getRoutineName(), getLineNumber(), 
                     "<<< %s resulted in error: %s in %.17r sec".format(cmd, e.message(),
@@ -448,13 +436,199 @@ proc main() {
 
     t1.stop();
 
+    if !metricsFile.isEmpty() {
+        writeMetrics(st);
+    }
+
     deleteServerConnectionInfo();
 
+    // the symbol table, and its spill files, are freed on return
+    memReclaimer = nil;
+
     asLogger.info(getModuleName(), getRoutineName(), getLineNumber(),
                "requests = %i responseCount = %i elapsed sec = %i".format(reqCount,repCount,
                                                                                  t1.elapsed()));
 }
 
+/*
+Executes a command whose reply is a string, i.e. any command other than those
+that send or receive binary payloads or manage the client connection.
+
+:arg cmd: the command to execute
+:type cmd: string
+
+:arg args: the command arguments
+:type args: string
+
+:arg st: SymTab to act on
+:type st: borrowed SymTab
+
+:returns: (MsgTuple) response message
+*/
+proc executeCommand(cmd: string, args: string, st: borrowed SymTab): MsgTuple throws {
+    var repTuple: MsgTuple;
+    select cmd
+    {
+        when "cast"              {repTuple = castMsg(cmd, args, st);}
+        when "mink"              {repTuple = minkMsg(cmd, args, st);}
+        when "maxk"              {repTuple = maxkMsg(cmd, args, st);}
+        when "intersect1d"       {repTuple = intersect1dMsg(cmd, args, st);}
+        when "setdiff1d"         {repTuple = setdiff1dMsg(cmd, args, st);}
+        when "setxor1d"          {repTuple = setxor1dMsg(cmd, args, st);}
+        when "union1d"           {repTuple = union1dMsg(cmd, args, st);}
+        when "segmentLengths"    {repTuple = segmentLengthsMsg(cmd, args, st);}
+        when "segmentedHash"     {repTuple = segmentedHashMsg(cmd, args, st);}
+        when "segmentedEfunc"    {repTuple = segmentedEfuncMsg(cmd, args, st);}
+        when "segmentedPeel"     {repTuple = segmentedPeelMsg(cmd, args, st);}
+        when "segmentedIndex"    {repTuple = segmentedIndexMsg(cmd, args, st);}
+        when "segmentedBinopvv"  {repTuple = segBinopvvMsg(cmd, args, st);}
+        when "segmentedBinopvs"  {repTuple = segBinopvsMsg(cmd, args, st);}
+        when "segmentedGroup"    {repTuple = segGroupMsg(cmd, args, st);}
+        when "segmentedIn1d"     {repTuple = segIn1dMsg(cmd, args, st);}
+        when "segmentedFlatten"  {repTuple = segFlattenMsg(cmd, args, st);}
+        when "lshdf"             {repTuple = lshdfMsg(cmd, args, st);}
+        when "readhdf"           {repTuple = readhdfMsg(cmd, args, st);}
+        when "readAllHdf"        {repTuple = readAllHdfMsg(cmd, args, st);}
+        when "hdfmanifest"       {repTuple = hdfmanifestMsg(cmd, args, st);}
+        when "tohdf"             {repTuple = tohdfMsg(cmd, args, st);}
+        when "readnpy"           {repTuple = readnpyMsg(cmd, args, st);}
+        when "readbinary"        {repTuple = readbinaryMsg(cmd, args, st);}
+        when "tobinary"          {repTuple = tobinaryMsg(cmd, args, st);}
+        when "snapshot"          {repTuple = snapshotMsg(cmd, args, st);}
+        when "restore"           {repTuple = restoreMsg(cmd, args, st);}
+        when "readcsv"           {repTuple = readcsvMsg(cmd, args, st);}
+        when "arrayshm"          {repTuple = arrayShmMsg(cmd, args, st);}
+        when "tondarrayshm"      {repTuple = tondarrayShmMsg(cmd, args, st);}
+        when "shmprobe"          {repTuple = shmprobeMsg(cmd, args, st);}
+        when "create"            {repTuple = createMsg(cmd, args, st);}
+        when "delete"            {repTuple = deleteMsg(cmd, args, st);}
+        when "deleteMany"        {repTuple = deleteManyMsg(cmd, args, st);}
+        when "binopvv"           {repTuple = binopvvMsg(cmd, args, st);}
+        when "binopvs"           {repTuple = binopvsMsg(cmd, args, st);}
+        when "binopsv"           {repTuple = binopsvMsg(cmd, args, st);}
+        when "opeqvv"            {repTuple = opeqvvMsg(cmd, args, st);}
+        when "opeqvs"            {repTuple = opeqvsMsg(cmd, args, st);}
+        when "efunc"             {repTuple = efuncMsg(cmd, args, st);}
+        when "efunc3vv"          {repTuple = efunc3vvMsg(cmd, args, st);}
+        when "efunc3vs"          {repTuple = efunc3vsMsg(cmd, args, st);}
+        when "efunc3sv"          {repTuple = efunc3svMsg(cmd, args, st);}
+        when "efunc3ss"          {repTuple = efunc3ssMsg(cmd, args, st);}
+        when "reduction"         {repTuple = reductionMsg(cmd, args, st);}
+        when "countReduction"    {repTuple = countReductionMsg(cmd, args, st);}
+        when "findSegments"      {repTuple = findSegmentsMsg(cmd, args, st);}
+        when "segmentedReduction"{repTuple = segmentedReductionMsg(cmd, args, st);}
+        when "broadcast"         {repTuple = broadcastMsg(cmd, args, st);}
+        when "arange"            {repTuple = arangeMsg(cmd, args, st);}
+        when "linspace"          {repTuple = linspaceMsg(cmd, args, st);}
+        when "randint"           {repTuple = randintMsg(cmd, args, st);}
+        when "randomNormal"      {repTuple = randomNormalMsg(cmd, args, st);}
+        when "randomStrings"     {repTuple = randomStringsMsg(cmd, args, st);}
+        when "histogram"         {repTuple = histogramMsg(cmd, args, st);}
+        when "in1d"              {repTuple = in1dMsg(cmd, args, st);}
+        when "unique"            {repTuple = uniqueMsg(cmd, args, st);}
+        when "value_counts"      {repTuple = value_countsMsg(cmd, args, st);}
+        when "set"               {repTuple = setMsg(cmd, args, st);}
+        when "info"              {repTuple = infoMsg(cmd, args, st);}
+        when "str"               {repTuple = strMsg(cmd, args, st);}
+        when "repr"              {repTuple = reprMsg(cmd, args, st);}
+        when "[int]"             {repTuple = intIndexMsg(cmd, args, st);}
+        when "[slice]"           {repTuple = sliceIndexMsg(cmd, args, st);}
+        when "[pdarray]"         {repTuple = pdarrayIndexMsg(cmd, args, st);}
+        when "[int]=val"         {repTuple = setIntIndexToValueMsg(cmd, args, st);}
+        when "[pdarray]=val"     {repTuple = setPdarrayIndexToValueMsg(cmd, args, st);}
+        when "[pdarray]=pdarray" {repTuple = setPdarrayIndexToPdarrayMsg(cmd, args, st);}
+        when "[slice]=val"       {repTuple = setSliceIndexToValueMsg(cmd, args, st);}
+        when "[slice]=pdarray"   {repTuple = setSliceIndexToPdarrayMsg(cmd, args, st);}
+        when "argsort"           {repTuple = argsortMsg(cmd, args, st);}
+        when "coargsort"         {repTuple = coargsortMsg(cmd, args, st);}
+        when "concatenate"       {repTuple = concatenateMsg(cmd, args, st);}
+        when "sort"              {repTuple = sortMsg(cmd, args, st);}
+        when "joinEqWithDT"      {repTuple = joinEqWithDTMsg(cmd, args, st);}
+        when "getconfig"         {repTuple = getconfigMsg(cmd, args, st);}
+        when "getmemused"        {repTuple = getmemusedMsg(cmd, args, st);}
+        when "getmetrics"        {repTuple = getmetricsMsg(cmd, args, st);}
+        when "register"          {repTuple = registerMsg(cmd, args, st);}
+        when "attach"            {repTuple = attachMsg(cmd, args, st);}
+        when "unregister"        {repTuple = unregisterMsg(cmd, args, st);}
+        when "clear"             {repTuple = clearMsg(cmd, args, st);}               
+        when "segmentedBinopvvInt"  {repTuple = segBinopvvIntMsg(cmd, args, st);}
+        when "segmentedBinopvsInt"  {repTuple = segBinopvsIntMsg(cmd, args, st);}
+        when "segmentedSuffixAry"   {repTuple = segSuffixArrayMsg(cmd, args, st);}
+        when "segmentedLCP"         {repTuple = segLCPMsg(cmd, args, st);}
+        when "segmentedSAFile"      {repTuple = segSAFileMsg(cmd, args, st);}
+        when "segmentedIn1dInt"     {repTuple = segIn1dIntMsg(cmd, args, st);}
+        otherwise {
+            repTuple = new MsgTuple("Unrecognized command: %s".format(cmd), MsgType.ERROR);
+            asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),repTuple.msg);
+        }
+    }
+    return repTuple;
+}
+
+/*
+Executes a batch of commands in order and replies with all of their responses
+at once. The i-th command of the batch is assigned the placeholder name
+__batch_<first+i>__, which later commands of the batch may use to refer to the
+array it creates. Execution stops at the first command that fails, in which
+case the arrays created by the preceding commands of the batch are deleted.
+
+:arg payload: the number of commands, the number of the first placeholder and
+              a JSON list of "cmd args" strings
+:type payload: string
+
+:arg st: SymTab to act on
+:type st: borrowed SymTab
+
+:returns: (MsgTuple) JSON list of the serialized reply to each command
+*/
+proc batchMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
+    var (nstr, firststr, json) = payload.splitMsgToTuple(3);
+    var n = try! nstr:int;
+    var first = try! firststr:int;
+    var commands = jsonToPdArray(json, n);
+    var replies: [0..#n] string;
+    var names: [0..#n] string;
+    asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                          "executing batch of %i commands".format(n));
+    for (command, i) in zip(commands, 0..) {
+        var (subCmd, subArgs) = command.splitMsgToTuple(2);
+        // substitute the names of arrays created earlier in the batch
+        for j in 0..#i {
+            if !names[j].isEmpty() {
+                subArgs = subArgs.replace("__batch_%i__".format(first+j), names[j]);
+            }
+        }
+        var subRepTuple: MsgTuple;
+        const subStart = startCommand(st);
+        try {
+            subRepTuple = executeCommand(subCmd, subArgs, st);
+        } catch (e: ErrorWithMsg) {
+            subRepTuple = new MsgTuple(e.msg, MsgType.ERROR);
+        } catch (e: Error) {
+            subRepTuple = new MsgTuple(unknownError(e.message()), MsgType.ERROR);
+        }
+        recordCommand(subCmd, subStart, st, failed=subRepTuple.msgType == MsgType.ERROR);
+        if subRepTuple.msgType == MsgType.ERROR {
+            for j in 0..#i {
+                if !names[j].isEmpty() {
+                    st.deleteEntry(names[j]);
+                }
+            }
+            var errorMsg = "batch command %i (%s) failed: %s".format(i, subCmd, 
+                                                                  subRepTuple.msg);
+            asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        replies[i] = serialize(msg=subRepTuple.msg, msgType=subRepTuple.msgType,
+                                               msgFormat=MsgFormat.STRING, user="");
+        if subRepTuple.msg.startsWith("created ") {
+            var fields = subRepTuple.msg.split();
+            names[i] = fields[fields.domain.low+1];
+        }
+    }
+    return new MsgTuple("%jt".format(replies), MsgType.NORMAL);
+}
+
 /*
 Creates the serverConnectionInfo file on arkouda_server startup
 */
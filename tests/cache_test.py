@@ -0,0 +1,170 @@
+import numpy as np
+from base_test import ArkoudaTest
+from context import arkouda as ak
+
+'''
+Tests the caching of scalar reduction results on unmodified pdarrays
+'''
+class ReductionCacheTest(ArkoudaTest):
+
+    def setUp(self):
+        ArkoudaTest.setUp(self)
+        ak.enable_reduction_cache()
+        ak.clear_reduction_cache()
+
+    def tearDown(self):
+        ak.disable_reduction_cache()
+        ak.clear_reduction_cache()
+        ArkoudaTest.tearDown(self)
+
+    def test_repeated_reductions(self):
+        a = ak.arange(0, 10, 1)
+        self.assertEqual(45, a.sum())
+        self.assertEqual(45, a.sum())
+        self.assertEqual(9, a.max())
+        self.assertTrue(a.is_sorted())
+        self.assertTrue(a.is_sorted())
+        info = ak.reduction_cache_info()
+        self.assertEqual(2, info['hits'])
+        self.assertEqual(3, info['misses'])
+        self.assertEqual(3, info['entries'])
+        self.assertAlmostEqual(0.4, info['hit_rate'])
+
+    def test_invalidation(self):
+        a = ak.arange(0, 10, 1)
+        self.assertEqual(45, a.sum())
+        a[0] = 10
+        self.assertEqual(55, a.sum())
+        self.assertFalse(a.is_sorted())
+        a[ak.arange(0, 1, 1)] = 0
+        self.assertEqual(45, a.sum())
+        a[:2] = 5
+        self.assertEqual(54, a.sum())
+        a += 1
+        self.assertEqual(64, a.sum())
+        a.fill(1)
+        self.assertEqual(10, a.sum())
+        self.assertEqual(0, ak.reduction_cache_info()['hits'])
+
+        # Another pdarray referring to the same array sees the modifications
+        b = ak.arange(0, 10, 1)
+        b.register('reduction_cache_test')
+        try:
+            self.assertEqual(45, b.sum())
+            c = ak.attach_pdarray('reduction_cache_test')
+            c[0] = 100
+            self.assertEqual(145, b.sum())
+        finally:
+            b.unregister()
+
+    def test_disable(self):
+        a = ak.arange(0, 10, 1)
+        ak.disable_reduction_cache()
+        self.assertEqual(45, a.sum())
+        self.assertEqual(45, a.sum())
+        info = ak.reduction_cache_info()
+        self.assertFalse(info['enabled'])
+        self.assertEqual(0, info['hits'])
+        self.assertEqual(0, info['entries'])
+
+    def test_other_client(self):
+        a = ak.arange(0, 10, 1)
+        a.register('reduction_cache_other_client')
+        client = ak.client.Client()
+        client.connect(server=ArkoudaTest.server, port=ArkoudaTest.port)
+        try:
+            # With the cache enabled, a modification made through another
+            # client is not seen
+            self.assertEqual(45, a.sum())
+            with client.use():
+                b = ak.attach_pdarray('reduction_cache_other_client')
+                b[0] = 100
+            self.assertEqual(45, a.sum())
+
+            # Disabled, as by default, reductions see it
+            ak.disable_reduction_cache()
+            self.assertEqual(145, a.sum())
+            with client.use():
+                b[1] = 101
+            self.assertEqual(245, a.sum())
+        finally:
+            a.unregister()
+            client.disconnect()
+
+    def test_per_client(self):
+        a = ak.arange(0, 10, 1)
+        self.assertEqual(45, a.sum())
+        client = ak.client.Client()
+        client.connect(server=ArkoudaTest.server, port=ArkoudaTest.port)
+        try:
+            with client.use():
+                b = ak.arange(0, 10, 1)
+                self.assertEqual(45, b.sum())
+            # Each client caches the results of the arrays it created, and
+            # connecting again only drops those of the connecting client
+            self.assertIn(b.name, client.arrayCache.results)
+            self.assertNotIn(b.name, ak.client.arrayCache.results)
+            client.connect(server=ArkoudaTest.server, port=ArkoudaTest.port)
+            self.assertEqual(0, len(client.arrayCache.results))
+            self.assertEqual(45, a.sum())
+            self.assertEqual(1, ak.reduction_cache_info()['hits'])
+        finally:
+            client.disconnect()
+
+'''
+Tests the reuse and eviction of groupings cached by ak.GroupBy
+'''
+class GroupByCacheTest(ArkoudaTest):
+
+    def setUp(self):
+        ArkoudaTest.setUp(self)
+        ak.enable_groupby_cache(2**30)
+        ak.clear_groupby_cache()
+
+    def tearDown(self):
+        ak.disable_groupby_cache()
+        ak.clear_groupby_cache()
+        ArkoudaTest.tearDown(self)
+
+    def test_reuse(self):
+        keys = ak.array(np.array([3, 1, 2, 1, 3, 3]))
+        strings = ak.array(['b', 'a', 'b', 'c', 'a', 'b'])
+        for k in (keys, strings, [keys, keys]):
+            g = ak.GroupBy(k)
+            h = ak.GroupBy(k)
+            self.assertEqual(g.permutation.name, h.permutation.name)
+            self.assertEqual(g.segments.name, h.segments.name)
+            self.assertListEqual(g.count()[1].to_ndarray().tolist(),
+                                 h.count()[1].to_ndarray().tolist())
+        info = ak.groupby_cache_info()
+        self.assertEqual(3, info['hits'])
+        self.assertEqual(3, info['misses'])
+        self.assertEqual(3, info['entries'])
+        self.assertTrue(0 < info['bytes'] <= info['max_bytes'])
+
+        # A grouping of other options or of modified keys is computed again
+        g = ak.GroupBy(keys, assume_sorted=True)
+        keys[0] = 2
+        h = ak.GroupBy(keys)
+        self.assertNotEqual(g.permutation.name, h.permutation.name)
+        self.assertListEqual([2, 2, 2], h.count()[1].to_ndarray().tolist())
+        self.assertEqual(3, ak.groupby_cache_info()['hits'])
+
+    def test_eviction(self):
+        a = ak.arange(0, 100, 1)
+        b = ak.arange(0, 100, 1)
+        g = ak.GroupBy(a)
+        nbytes = ak.groupby_cache_info()['bytes']
+        ak.enable_groupby_cache(nbytes)
+        ak.GroupBy(b)
+        info = ak.groupby_cache_info()
+        self.assertEqual(1, info['entries'])
+        self.assertEqual(1, info['evictions'])
+        self.assertNotEqual(g.permutation.name, ak.GroupBy(a).permutation.name)
+
+        # Deleting the keys of a grouping drops it
+        c = ak.arange(0, 100, 1)
+        ak.GroupBy(c)
+        self.assertEqual(1, ak.groupby_cache_info()['entries'])
+        del c
+        self.assertEqual(0, ak.groupby_cache_info()['entries'])
@@ -1,10 +1,17 @@
+import asyncio
+import os
+import unittest
+import numpy as np
+import zmq
+from concurrent.futures import ThreadPoolExecutor
 from base_test import ArkoudaTest
 from context import arkouda as ak
 
 '''
 Tests basic Arkouda client functionality
 '''
-from util.test.util import start_arkouda_server
+from util.test.util import get_arkouda_numlocales, get_server_info, set_server_info, \
+     start_arkouda_server, stop_arkouda_server
 class ClientTest(ArkoudaTest):
     
     def test_client_connected(self):
@@ -93,6 +100,28 @@ class ClientTest(ArkoudaTest):
         except Exception as e:
             raise AssertionError(e)
         self.assertTrue(mem_used > 0)
+
+    def test_get_server_metrics(self):
+        '''
+        Tests that ak.get_server_metrics reports the commands executed by the
+        server and the size of its symbol table
+
+        :return: None
+        :raise: AssertionError if the metrics are missing or incorrect
+        '''
+        before = ak.get_server_metrics()
+        a = ak.arange(0, 10, 1)
+        a.sum()
+        a.sum()
+        metrics = ak.get_server_metrics()
+        count = before['commands'].get('reduction', {}).get('count', 0)
+        reduction = metrics['commands']['reduction']
+        self.assertEqual(count + 2, reduction['count'])
+        self.assertTrue(reduction['minTime'] <= reduction['maxTime'] <= reduction['totalTime'])
+        self.assertTrue(metrics['uptime'] >= before['uptime'])
+        self.assertTrue(metrics['symTabEntries'] >= 1)
+        self.assertTrue(metrics['symTabBytes'] >= a.size * a.itemsize)
+        self.assertIsInstance(metrics['symTabHistory'], list)
         
         
     def test_no_op(self):
@@ -103,7 +132,137 @@ class ClientTest(ArkoudaTest):
         :raise: AssertionError if return message is not 'noop'
         '''   
         self.assertEqual('noop', ak.client._no_op())
-        
+
+    def test_compact_messages(self):
+        '''
+        Tests that requests and replies in the compact framing negotiated at
+        connect and in the JSON framing are handled alike
+
+        :return: None
+        :raise: AssertionError if the compact framing was not negotiated or
+                a reply differs between the two framings
+        '''
+        self.assertTrue(ak.client.get_config()['compactMessages'])
+        a = ak.arange(0, 10, 1)
+        try:
+            for compact in (True, False):
+                ak.client.compactMessages = compact
+                self.assertEqual('noop', ak.client._no_op())
+                self.assertEqual(45, a.sum())
+                self.assertListEqual(list(range(10)), ak.array(a.to_ndarray()).to_ndarray().tolist())
+                with self.assertRaises(RuntimeError):
+                    ak.client.generic_msg(cmd='efunc', args='not_a_function {}'.format(a.name))
+        finally:
+            ak.client.set_defaults()
+
+    def test_compression(self):
+        '''
+        Tests that arrays transferred with zlib compression round-trip for
+        each dtype and that an unsupported codec is rejected
+
+        :return: None
+        :raise: AssertionError if the server does not support zlib, if a
+                transferred array differs from the original or if an
+                unsupported codec is accepted
+        '''
+        self.assertIn('zlib', ak.client.get_config()['compressionCodecs'])
+        with self.assertRaises(ValueError):
+            ak.client.Client().connect(server=ak.client.defaultClient.pspStr,
+                                       compression='lz4')
+        arrays = [np.sort(np.random.randint(0, 2**40, 1000)), np.random.rand(1000),
+                  np.arange(1000) % 3 == 0, np.arange(0)]
+        try:
+            ak.client.defaultClient.compression = 'zlib'
+            ak.client.compressionThreshold = 0
+            for a in arrays:
+                pda = ak.array(a)
+                self.assertTrue(np.array_equal(a, pda.to_ndarray()))
+                if a.size > 0:
+                    self.assertTrue(np.array_equal(a, np.concatenate(list(pda.iter_chunks(800)))))
+        finally:
+            ak.client.defaultClient.compression = None
+            ak.client.set_defaults()
+
+    def test_shared_memory(self):
+        '''
+        Tests that arrays exchanged through shared memory with a server on
+        the same host round-trip for each dtype and that no file is left over
+
+        :return: None
+        :raise: AssertionError if shared memory was not negotiated, if a
+                transferred array differs from the original or if a shared
+                memory file is left over
+        '''
+        client = ak.client.Client()
+        client.connect(server=ArkoudaTest.server, port=ArkoudaTest.port, shared_memory=True)
+        self.assertEqual(ak.client.get_config()['sharedMemoryDir'], client.sharedMemoryDir)
+        before = set(os.listdir(client.sharedMemoryDir))
+        arrays = [np.arange(1000), np.random.rand(1000), np.arange(1000) % 3 == 0]
+        try:
+            ak.client.sharedMemoryThreshold = 0
+            with client.use():
+                for a in arrays:
+                    pda = ak.array(a)
+                    b = pda.to_ndarray()
+                    self.assertTrue(np.array_equal(a, b))
+                    self.assertTrue(np.array_equal(a, np.concatenate(list(pda.iter_chunks(1600)))))
+                    b[0] = a[1]
+                    self.assertEqual(a[0], pda[0])
+        finally:
+            ak.client.set_defaults()
+            client.disconnect()
+        self.assertEqual(before, set(os.listdir(client.sharedMemoryDir)))
+
+    def test_get_config_spill(self):
+        '''
+        Tests that the server configuration reports the spill settings and
+        counters
+
+        :return: None
+        :raise: AssertionError if a spill setting or counter is missing
+        '''
+        config = ak.client.get_config()
+        for key in ('spillThreshold', 'spillTarget', 'spillDir', 'spillCount', 'reloadCount'):
+            self.assertIn(key, config)
+        self.assertLessEqual(config['reloadCount'], config['spillCount'])
+
+    @unittest.skipUnless(ArkoudaTest.full_stack_mode, 'starts a second arkouda_server')
+    def test_spill(self):
+        '''
+        Tests that a server started with a spill threshold of a few megabytes
+        spills the least recently used arrays and reads them back unchanged
+
+        :return: None
+        :raise: AssertionError if no array is spilled or reloaded or if an
+                array differs from the original
+        '''
+        config = ak.client.get_config()
+        # the memory limit of the server is 90 percent of the physical memory
+        limit = 0.9 * config['physicalMemory'] * config['numLocales']
+        threshold = 100 * 2**22 / limit
+        info = get_server_info()
+        port = ArkoudaTest.port + 1
+        start_arkouda_server(numlocales=get_arkouda_numlocales(), port=port,
+                             server_args=['--spillThreshold={}'.format(threshold),
+                                          '--spillTarget={}'.format(threshold / 2)])
+        client = ak.client.Client()
+        try:
+            client.connect(server=ArkoudaTest.server, port=port)
+            with client.use():
+                arrays = [ak.arange(i, i + 2**17, 1) for i in range(8)]
+                config = ak.client.get_config()
+                self.assertGreater(config['spillCount'], 0)
+                self.assertEqual(0, config['reloadCount'])
+                # the first arrays are the least recently used ones
+                self.assertTrue(np.array_equal(np.arange(2**17), arrays[0].to_ndarray()))
+                self.assertGreater(ak.client.get_config()['reloadCount'], 0)
+                self.assertEqual(2 * (2**17 - 1), (arrays[1] + arrays[-1] - 8).max())
+        finally:
+            if client.connected:
+                client.disconnect()
+            stop_arkouda_server()
+            set_server_info(info)
+
     def test_ruok(self):
         '''
         Tests the ak.client.ruok method
@@ -124,7 +283,175 @@ class ClientTest(ArkoudaTest):
         self.assertEqual(50, ak.client.pdarrayIterThresh)
         self.assertEqual(1048576000, ak.client.maxTransferBytes)
         self.assertTrue(ak.client.verbose)
+        ak.client.deleteQueueMaxCount = 10
+        ak.client.deleteQueueMaxBytes = 1024
+        self.assertEqual(10, ak.client.deleteQueueMaxCount)
+        self.assertEqual(1024, ak.client.deleteQueueMaxBytes)
         ak.client.set_defaults()
         self.assertEqual(100, ak.client.pdarrayIterThresh)
         self.assertEqual(1073741824, ak.client.maxTransferBytes)
         self.assertFalse(ak.client.verbose)
+        self.assertEqual(1000, ak.client.deleteQueueMaxCount)
+        self.assertEqual(1073741824, ak.client.deleteQueueMaxBytes)
+
+    def test_batch(self):
+        '''
+        Tests the ak.batch() context manager
+
+        :return: None
+        :raise: AssertionError if batched results differ from unbatched ones or
+                a failed batch does not raise a RuntimeError
+        '''
+        a = ak.arange(0, 10, 1)
+        with ak.batch():
+            b = a * 2
+            c = ak.abs(b - 15)
+            c[0] = 0
+            self.assertTrue(len(ak.client.batchQueue) > 0)
+        self.assertEqual(0, len(ak.client.batchQueue))
+        self.assertListEqual([0, 13, 11, 9, 7, 5, 3, 1, 1, 3], c.to_ndarray().tolist())
+        self.assertEqual(10, c.size)
+
+        # The dtype and size of elementwise results are known without a
+        # flush, so size checks of chained operations stay in the batch
+        with ak.batch():
+            d = a + 1
+            self.assertEqual(ak.int64, d.dtype)
+            self.assertEqual(10, d.size)
+            e = d + a
+            f = (e / 2)[1:5]
+            self.assertEqual(ak.float64, f.dtype)
+            self.assertEqual(4, f.size)
+            # nothing was flushed: d, e, e / 2 and the slice are queued
+            self.assertGreaterEqual(len(ak.client.batchQueue), 4)
+        self.assertListEqual(list(range(1, 20, 2)), e.to_ndarray().tolist())
+        self.assertListEqual([1.5, 2.5, 3.5, 4.5], f.to_ndarray().tolist())
+
+        # Reading an attribute the client cannot predict flushes the queue
+        with ak.batch():
+            g = a[a > 4]
+            self.assertEqual(5, g.size)
+            self.assertEqual(0, len(ak.client.batchQueue))
+
+        with self.assertRaises(RuntimeError):
+            with ak.batch():
+                f = a * 2
+                ak.client.generic_msg(cmd='efunc', args='not_a_function {}'.format(a.name))
+        with self.assertRaises(RuntimeError):
+            f.size
+
+        # The in-place commands before the failing one remain applied
+        h = ak.arange(0, 10, 1)
+        with self.assertRaises(RuntimeError):
+            with ak.batch():
+                h[0] = 100
+                h += 1
+                ak.client.generic_msg(cmd='efunc', args='not_a_function {}'.format(h.name))
+        self.assertListEqual([101] + list(range(2, 11)), h.to_ndarray().tolist())
+
+    def test_deferred_deletes(self):
+        '''
+        Tests that deletes of garbage-collected pdarrays are queued and sent
+        along with the next request or once the queue threshold is reached
+
+        :return: None
+        :raise: AssertionError if a delete is not queued or not executed
+        '''
+        a = ak.arange(0, 10, 1)
+        b = a + 1
+        name = b.name
+        del b
+        self.assertIn(name, ak.client.deleteQueue)
+        # The queued delete is executed before the next command
+        with self.assertRaises(RuntimeError):
+            ak.attach_pdarray(name)
+        self.assertEqual(0, len(ak.client.deleteQueue))
+
+        ak.client.deleteQueueMaxCount = 2
+        try:
+            arrays = [a + i for i in range(3)]
+            del arrays
+            # The first two deletes were sent on reaching the threshold
+            self.assertEqual(1, len(ak.client.deleteQueue))
+        finally:
+            ak.client.set_defaults()
+
+        # The delete is queued on the client that created the array, not on
+        # the current client of the thread that collects it
+        client = ak.client.Client()
+        client.connect(server=ArkoudaTest.server, port=ArkoudaTest.port)
+        try:
+            with client.use():
+                c = ak.arange(0, 10, 1)
+            name = c.name
+            del c
+            self.assertIn(name, client.deleteQueue)
+            self.assertNotIn(name, ak.client.deleteQueue)
+        finally:
+            client.disconnect()
+
+    def test_async_client(self):
+        '''
+        Tests that concurrent requests sent through an ak.AsyncClient each
+        receive their own reply
+
+        :return: None
+        :raise: AssertionError if a reply is matched to the wrong request
+        '''
+        arrays = [ak.arange(0, 10, 1) * i for i in range(4)]
+
+        async def fetch_all():
+            async with ak.AsyncClient(ArkoudaTest.server, ArkoudaTest.port) as ac:
+                results = await asyncio.gather(*[ac.to_ndarray(a) for a in arrays],
+                                               ac.generic_msg(cmd='noop'))
+                with self.assertRaises(RuntimeError):
+                    await ac.generic_msg(cmd='efunc', args='not_a_function {}'.\
+                                         format(arrays[0].name))
+                return results
+
+        results = asyncio.run(fetch_all())
+        for i in range(4):
+            self.assertListEqual([j * i for j in range(10)], results[i].tolist())
+        self.assertEqual('noop', results[4])
+
+    def test_async_client_receive_error(self):
+        '''
+        Tests that a failure to receive replies is raised in the pending
+        request of an ak.AsyncClient and in every later request
+
+        :return: None
+        :raise: AssertionError if a request hangs or does not fail
+        '''
+        async def fail_receiving():
+            async with ak.AsyncClient(ArkoudaTest.server, ArkoudaTest.port) as ac:
+                async def recv_multipart(*args, **kwargs):
+                    raise zmq.ZMQError(zmq.ETERM)
+                ac._receiver.cancel()
+                ac._receiver = None
+                ac.socket.recv_multipart = recv_multipart
+                for _ in range(2):
+                    with self.assertRaises(ConnectionError):
+                        await asyncio.wait_for(ac.generic_msg(cmd='noop'), 10)
+
+        asyncio.run(fail_receiving())
+
+    def test_client_pool(self):
+        '''
+        Tests that threads checking out connections of an ak.ClientPool send
+        their requests through their own connection
+
+        :return: None
+        :raise: AssertionError if a thread does not use its checked out
+                connection or a result is incorrect
+        '''
+        def partial_sum(i):
+            with pool.connection() as client:
+                self.assertIs(client, ak.client._current_client())
+                return ak.arange(i*10, (i+1)*10, 1).sum()
+
+        with ak.ClientPool(2, ArkoudaTest.server, ArkoudaTest.port) as pool:
+            with ThreadPoolExecutor(4) as executor:
+                sums = list(executor.map(partial_sum, range(8)))
+        self.assertListEqual([sum(range(i*10, (i+1)*10)) for i in range(8)], sums)
+        self.assertIs(ak.client.defaultClient, ak.client._current_client())
+        self.assertTrue(ak.client.connected)
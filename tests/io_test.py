@@ -1,9 +1,11 @@
-import os, shutil, glob
+import os, shutil, glob, unittest
 import numpy as np
 from typing import List, Mapping, Union
 from base_test import ArkoudaTest
 from context import arkouda as ak
 from arkouda import io_util
+from util.test.util import get_arkouda_numlocales, get_server_info, set_server_info, \
+     start_arkouda_server, stop_arkouda_server
 import h5py
 
 '''
@@ -273,6 +275,173 @@ class IOTest(ArkoudaTest):
         self.assertTrue((fp == rfp).all())
         self.assertEqual(len(self.bool_pdarray), len(retrieved_columns['bool_pdarray']))
 
+    def testReadAllRowsAndFilesSubset(self):
+        '''
+        Saves slices of an int pdarray and a Strings to two sets of files and confirms that
+        reading row ranges and subsets of the files returns the matching slices
+        '''
+        ints = ak.arange(0, 1000, 1)
+        strs = ak.array(['s{}'.format(i) * (i % 4) for i in range(1000)])
+        for k, (lo, hi) in enumerate([(0, 300), (300, 1000)]):
+            prefix = '{}/iotest_rows{}'.format(IOTest.io_test_dir, k)
+            ints[lo:hi].save(prefix, dataset='ints')
+            strs[lo:hi].save(prefix, dataset='strs', mode='append')
+        pattern = '{}/iotest_rows*'.format(IOTest.io_test_dir)
+        nints = ints.to_ndarray()
+        nstrs = np.array(strs.to_ndarray())
+
+        for rows in [slice(250, 700), slice(None, 10), slice(-5, None), range(0, 1000),
+                     slice(600, 500)]:
+            data = ak.read_all(pattern, rows=rows)
+            self.assertListEqual(nints[rows].tolist(), data['ints'].to_ndarray().tolist())
+            self.assertListEqual(nstrs[rows].tolist(), data['strs'].to_ndarray().tolist())
+
+        first = ak.read_all(pattern, datasets='ints', files_subset=slice(0, 1))
+        self.assertListEqual(nints[:first.size].tolist(), first.to_ndarray().tolist())
+        last = ak.read_all(pattern, datasets='strs', files_subset=[-1])
+        self.assertListEqual(nstrs[-last.size:].tolist(), last.to_ndarray().tolist())
+        part = ak.read_all(pattern, datasets='strs', files_subset=[-1], rows=slice(1, 3))
+        self.assertListEqual(nstrs[-last.size:][1:3].tolist(), part.to_ndarray().tolist())
+
+        head = ak.read_hdf_head(pattern, n=3)
+        self.assertListEqual([0, 1, 2], head['ints'].to_ndarray().tolist())
+        self.assertListEqual(nstrs[:3].tolist(), head['strs'].to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            ak.read_all(pattern, rows=slice(0, 10, 2))
+        with self.assertRaises(RuntimeError):
+            ak.read_all(pattern, files_subset=[100])
+
+    def testReadAllManifest(self):
+        '''
+        Builds a manifest of files of int, bool and Strings datasets and confirms that
+        reading them with the manifest returns the same arrays as reading them without it
+        '''
+        ints = ak.arange(0, 500, 1)
+        bools = ints % 3 == 0
+        strs = ak.array(['m{}'.format(i) * (i % 3) for i in range(500)])
+        for k, (lo, hi) in enumerate([(0, 200), (200, 500)]):
+            prefix = '{}/iotest_manifest{}'.format(IOTest.io_test_dir, k)
+            ints[lo:hi].save(prefix, dataset='ints')
+            bools[lo:hi].save(prefix, dataset='bools', mode='append')
+            strs[lo:hi].save(prefix, dataset='strs', mode='append')
+        pattern = '{}/iotest_manifest*'.format(IOTest.io_test_dir)
+        path = '{}/manifest.json'.format(IOTest.io_test_dir)
+
+        manifest = ak.build_manifest(pattern, path=path)
+        self.assertSetEqual({'ints', 'bools', 'strs'}, set(manifest['datasets'].keys()))
+        self.assertEqual(500, sum(manifest['datasets']['ints']['length']))
+        self.assertListEqual([1] * len(manifest['files']),
+                             manifest['datasets']['strs']['segmented'])
+
+        expected = ak.read_all(pattern)
+        for m in [manifest, path]:
+            data = ak.read_all(pattern, manifest=m)
+            for dset in ('ints', 'bools', 'strs'):
+                self.assertListEqual(expected[dset].to_ndarray().tolist(),
+                                     data[dset].to_ndarray().tolist())
+        self.assertEqual(ak.bool, data['bools'].dtype)
+
+        part = ak.read_all(pattern, datasets='strs', rows=slice(100, 300), manifest=manifest)
+        self.assertListEqual(strs[100:300].to_ndarray().tolist(),
+                             part.to_ndarray().tolist())
+        last = ak.read_hdf('ints', pattern, files_subset=[-1], manifest=path)
+        self.assertListEqual(ints[-last.size:].to_ndarray().tolist(),
+                             last.to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            ak.read_all('{}/nothing*'.format(IOTest.io_test_dir), manifest=manifest)
+        with self.assertRaises(ValueError):
+            ak.read_all(pattern, datasets='missing', manifest=manifest)
+
+    def testSaveAppendRows(self):
+        '''
+        Saves three batches of int, bool and Strings columns with mode='append_rows' and
+        confirms that the number of files stays the same, that reading them returns
+        the concatenation of the batches and that, with any number of locales, every
+        row of the columns comes from the same row of a batch
+        '''
+        prefix = '{}/iotest_append_rows'.format(IOTest.io_test_dir)
+        pattern = '{}_LOCALE*'.format(prefix)
+        batches = []
+        for lo, hi in [(0, 100), (100, 350), (350, 360)]:
+            batch = {'ints' : ak.arange(lo, hi, 1),
+                     'bools' : ak.arange(lo, hi, 1) % 2 == 0,
+                     # strings of very different lengths, whose bytes are
+                     # spread over the locales unlike their rows
+                     'strs' : ak.array(['{}_'.format(i) + 'x' * (i % 7) ** 3
+                                        for i in range(lo, hi)])}
+            ak.save_all(batch, prefix, mode='append_rows')
+            batches.append(batch)
+            self.assertEqual(ak.get_config()['numLocales'], len(glob.glob(pattern)))
+
+        data = ak.read_all(pattern)
+        self.assertEqual(360, data['ints'].size)
+        self.assertEqual(ak.bool, data['bools'].dtype)
+        # The rows of each file are in the order of the batches
+        ints = data['ints'].to_ndarray()
+        self.assertListEqual(list(range(360)), sorted(ints.tolist()))
+        self.assertListEqual((ints % 2 == 0).tolist(), data['bools'].to_ndarray().tolist())
+        # Each string starts with the int of its source row
+        strs = data['strs'].to_ndarray().tolist()
+        self.assertListEqual(ints.tolist(), [int(s.split('_')[0]) for s in strs])
+        self.assertListEqual(['x' * (i % 7) ** 3 for i in ints.tolist()],
+                             [s.split('_')[1] for s in strs])
+
+        ak.arange(0, 10, 1).save(prefix, dataset='fixed', mode='append')
+        with self.assertRaises(RuntimeError):
+            ak.arange(0, 10, 1).save(prefix, dataset='fixed', mode='append_rows')
+        with self.assertRaises(RuntimeError):
+            ak.linspace(0, 1, 10).save(prefix, dataset='ints', mode='append_rows')
+        with self.assertRaises(ValueError):
+            ak.arange(0, 10, 1).save(prefix, dataset='ints', mode='grow')
+
+    def testSaveLoadGroupByAndCategorical(self):
+        '''
+        Saves a Categorical and GroupBys of one and two keys and confirms that loading
+        them restores their components and gives the same aggregations
+        '''
+        prefix = '{}/iotest_grouping'.format(IOTest.io_test_dir)
+        strs = ak.array(['k{}'.format(i % 7) for i in range(1000)])
+        cat = ak.Categorical(strs)
+        cat.save(prefix, dataset='cat')
+        loaded = ak.Categorical.load(prefix, dataset='cat')
+        for piece in ('codes', 'permutation', 'segments'):
+            self.assertListEqual(getattr(cat, piece).to_ndarray().tolist(),
+                                 getattr(loaded, piece).to_ndarray().tolist())
+        self.assertListEqual(cat.categories.to_ndarray().tolist(),
+                             loaded.categories.to_ndarray().tolist())
+
+        ints = ak.arange(0, 1000, 1) % 13
+        values = ak.arange(0, 1000, 1)
+        for keys in [ints, strs, [ints, cat]]:
+            g = ak.GroupBy(keys)
+            g.save(prefix, dataset='g')
+            h = ak.GroupBy.load(prefix, dataset='g')
+            self.assertEqual(g.nkeys, h.nkeys)
+            self.assertListEqual(g.permutation.to_ndarray().tolist(),
+                                 h.permutation.to_ndarray().tolist())
+            gk, gsums = g.sum(values)
+            hk, hsums = h.sum(values)
+            self.assertListEqual(gsums.to_ndarray().tolist(), hsums.to_ndarray().tolist())
+        self.assertIsInstance(h.unique_keys[1], ak.Categorical)
+        self.assertFalse(h.assume_sorted)
+        self.assertTrue(h.hash_strings)
+
+        # Non-default flags are restored
+        g = ak.GroupBy([ak.arange(0, 1000, 1), strs], assume_sorted=True, hash_strings=False)
+        g.save(prefix, dataset='flagged')
+        h = ak.GroupBy.load(prefix, dataset='flagged')
+        self.assertTrue(h.assume_sorted)
+        self.assertFalse(h.hash_strings)
+        self.assertListEqual(g.count()[1].to_ndarray().tolist(),
+                             h.count()[1].to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            ak.GroupBy.load(prefix, dataset='missing')
+        with self.assertRaises(ValueError):
+            ak.Categorical.load(prefix, dataset='missing')
+
     def testLoad(self):
         '''
         Creates 1..n files depending upon the number of arkouda_server locales with three columns 
@@ -345,7 +514,37 @@ class IOTest(ArkoudaTest):
                             format(IOTest.io_test_dir), dsetName='strings/values'))
         self.assertIsNotNone(ak.read_hdf(filenames='{}/strings-test_LOCALE0000'.\
                             format(IOTest.io_test_dir), dsetName='strings/segments'))
-     
+
+    def testSaveCompressed(self):
+        prefix = '{}/iotest_compressed'.format(IOTest.io_test_dir)
+        ids = ak.arange(0, 100000, 1)
+        strings = ak.array(['id{}'.format(i % 100) for i in range(1000)])
+        ak.save_all({'ids' : ids, 'floats' : self.float_pdarray, 'bools' : self.bool_pdarray},
+                    prefix, compression='gzip', shuffle=True, chunk_elems=1000)
+        strings.save(prefix, dataset='strings', mode='append', compression='gzip',
+                     compression_opts=9)
+
+        data = ak.load_all(prefix)
+        self.assertTrue((ids == data['ids']).all())
+        self.assertTrue((self.float_pdarray == data['floats']).all())
+        self.assertTrue((self.bool_pdarray == data['bools']).all())
+        self.assertTrue((strings == data['strings']).all())
+        self.assertListEqual(list(range(500, 510)), ak.read_all(
+                    '{}*'.format(prefix), datasets='ids', rows=slice(500, 510)).to_ndarray().tolist())
+
+        with h5py.File('{}_LOCALE0000'.format(prefix), 'r') as f:
+            self.assertEqual('gzip', f['ids'].compression)
+            self.assertTrue(f['ids'].shuffle)
+            self.assertEqual(1000, f['ids'].chunks[0])
+            self.assertEqual(9, f['strings/values'].compression_opts)
+
+        with self.assertRaises(ValueError):
+            ids.save(prefix, compression='lzf')
+        with self.assertRaises(ValueError):
+            ids.save(prefix, compression='gzip', compression_opts=10)
+        with self.assertRaises(ValueError):
+            ids.save(prefix, chunk_elems=0)
+
     def testSaveLongStringsDataset(self):
         # Create, save, and load Strings dataset
         strings = ak.array(['testing a longer string{} to be written, loaded and appended'.\
@@ -461,6 +660,187 @@ class IOTest(ArkoudaTest):
         new_empty_ones = ak.array(n_empty_ones)
         self.assertTrue((empty_ones.to_ndarray() == new_empty_ones.to_ndarray()).all())
 
+    def testNpy(self):
+        path = '{}/array.npy'.format(IOTest.io_test_dir)
+        arrays = [np.random.randint(-1000, 1000, 1000), np.random.rand(1000),
+                  np.arange(1000) % 3 == 0, np.arange(1000).astype(np.uint8),
+                  np.arange(0)]
+        for a in arrays:
+            np.save(path, a)
+            pda = ak.read_npy(path)
+            self.assertEqual(a.dtype, pda.dtype)
+            self.assertTrue(np.array_equal(a, pda.to_ndarray()))
+            pda.to_npy(path)
+            b = np.load(path)
+            self.assertEqual(a.dtype, b.dtype)
+            self.assertTrue(np.array_equal(a, b))
+
+        np.save(path, np.arange(10).reshape(2, 5))
+        with self.assertRaises(RuntimeError):
+            ak.read_npy(path)
+        np.save(path, np.arange(10, dtype=np.int32))
+        with self.assertRaises(RuntimeError):
+            ak.read_npy(path)
+
+    def testBinary(self):
+        path = '{}/array.bin'.format(IOTest.io_test_dir)
+        a = np.random.rand(1000)
+        a.tofile(path)
+        self.assertTrue(np.array_equal(a, ak.read_binary(path, dtype=ak.float64).to_ndarray()))
+        self.assertTrue(np.array_equal(a[10:], ak.read_binary(path, ak.float64,
+                                                             offset=80).to_ndarray()))
+        ak.arange(0, 1000, 1).to_binary(path)
+        self.assertTrue(np.array_equal(np.arange(1000), np.fromfile(path, dtype=np.int64)))
+
+        with self.assertRaises(RuntimeError):
+            ak.read_binary(path, offset=4)
+        with self.assertRaises(TypeError):
+            ak.read_binary(path, dtype=ak.str_)
+        with self.assertRaises(ValueError):
+            ak.read_binary(path, offset=-8)
+
+    def testSnapshotRestore(self):
+        path = '{}/snapshot'.format(IOTest.io_test_dir)
+        a = ak.randint(0, 100, 1000).register('snap_ints')
+        s = ak.random_strings_uniform(1, 10, 100).register('snap_strings')
+        a_np, s_np = a.to_ndarray(), s.to_ndarray()
+        ak.snapshot(path)
+
+        with self.assertRaises(RuntimeError):
+            ak.restore(path)
+        a.unregister()
+        s.unregister()
+        del a, s
+
+        self.assertListEqual(sorted(['snap_ints', 'snap_strings.offsets', 'snap_strings.bytes']),
+                             sorted(ak.restore(path)))
+        a = ak.pdarray.attach('snap_ints')
+        s = ak.Strings.attach('snap_strings')
+        self.assertTrue(np.array_equal(a_np, a.to_ndarray()))
+        self.assertTrue(np.array_equal(s_np, s.to_ndarray()))
+        a.unregister()
+        s.unregister()
+
+        with self.assertRaises(RuntimeError):
+            ak.restore('{}/no_snapshot'.format(IOTest.io_test_dir))
+
+    @unittest.skipUnless(ArkoudaTest.full_stack_mode, 'starts a second arkouda_server')
+    def testRestorePath(self):
+        path = '{}/snapshot'.format(IOTest.io_test_dir)
+        a = ak.randint(0, 100, 1000).register('startup_ints')
+        s = ak.random_strings_uniform(1, 10, 100).register('startup_strings')
+        a_np, s_np = a.to_ndarray(), s.to_ndarray()
+        ak.snapshot(path)
+        a.unregister()
+        s.unregister()
+
+        info = get_server_info()
+        port = ArkoudaTest.port + 1
+        client = ak.client.Client()
+        try:
+            start_arkouda_server(numlocales=get_arkouda_numlocales(), port=port,
+                                 server_args=['--restorePath={}'.format(path)])
+            client.connect(server=ArkoudaTest.server, port=port)
+            with client.use():
+                a = ak.pdarray.attach('startup_ints')
+                s = ak.Strings.attach('startup_strings')
+                self.assertTrue(np.array_equal(a_np, a.to_ndarray()))
+                self.assertTrue(np.array_equal(s_np, s.to_ndarray()))
+            client.disconnect()
+            stop_arkouda_server()
+
+            # a snapshot that cannot be restored does not stop the server from starting
+            start_arkouda_server(numlocales=get_arkouda_numlocales(), port=port,
+                                 server_args=['--restorePath={}/no_snapshot'.format(
+                                                                   IOTest.io_test_dir)])
+            client.connect(server=ArkoudaTest.server, port=port)
+            with client.use():
+                self.assertEqual('imok', ak.client.ruok())
+                with self.assertRaises(RuntimeError):
+                    ak.pdarray.attach('startup_ints')
+        finally:
+            if client.connected:
+                client.disconnect()
+            stop_arkouda_server()
+            set_server_info(info)
+
+    def testReadCsv(self):
+        header = 'id,score,flag,name,time\n'
+        rows = [['{}'.format(i), '{}'.format(i/4) if i % 3 else '',
+                 'True' if i % 2 else 'False', '"n,{}"'.format(i) if i % 5 else '',
+                 '2021-03-{:02d}T12:30:00'.format(i % 28 + 1)] for i in range(100)]
+        for k in range(2):
+            with open('{}/table{}.csv'.format(IOTest.io_test_dir, k), 'w') as f:
+                f.write(header)
+                f.write(''.join(','.join(row) + '\n' for row in rows[k*50:(k+1)*50]))
+
+        data = ak.read_csv('{}/table*.csv'.format(IOTest.io_test_dir))
+        self.assertListEqual(['id', 'score', 'flag', 'name', 'time'], list(data.keys()))
+        self.assertTrue(np.array_equal(np.arange(100), data['id'].to_ndarray()))
+        score = data['score'].to_ndarray()
+        self.assertTrue(np.isnan(score[::3]).all())
+        self.assertTrue(np.array_equal(np.arange(100)[1::3]/4, score[1::3]))
+        self.assertTrue(np.array_equal(np.arange(100) % 2 == 1, data['flag'].to_ndarray()))
+        self.assertIsInstance(data['name'], ak.Strings)
+        self.assertListEqual(['n,{}'.format(i) if i % 5 else '' for i in range(100)],
+                             data['name'].to_ndarray().tolist())
+        self.assertIsInstance(data['time'], ak.Datetime)
+        self.assertTrue(np.array_equal(np.array([row[4] for row in rows], dtype='datetime64[ns]'),
+                                       data['time'].to_ndarray()))
+
+        data = ak.read_csv(['{}/table0.csv'.format(IOTest.io_test_dir)],
+                           columns=['name', 'id'], dtypes={'id': ak.float64})
+        self.assertListEqual(['name', 'id'], list(data.keys()))
+        self.assertEqual(ak.float64, data['id'].dtype)
+        self.assertEqual(50, data['id'].size)
+
+        with self.assertRaises(RuntimeError):
+            ak.read_csv('{}/table*.csv'.format(IOTest.io_test_dir), columns=['missing'])
+        with self.assertRaises(RuntimeError):
+            ak.read_csv('{}/table*.csv'.format(IOTest.io_test_dir), dtypes={'name': 'int64'})
+        with self.assertRaises(TypeError):
+            ak.read_csv('{}/table*.csv'.format(IOTest.io_test_dir), dtypes={'id': 'int32'})
+
+    def testReadCsvQuotedFields(self):
+        names = ['a,b', 'line\nbreak', 'say ""hi""', 'crlf\r\nx,y', 'plain']
+        with open('{}/quoted.csv'.format(IOTest.io_test_dir), 'w', newline='') as f:
+            f.write('id,name\r\n')
+            f.write(''.join('{},"{}"\r\n'.format(i, name) for i, name in enumerate(names)))
+
+        data = ak.read_csv('{}/quoted.csv'.format(IOTest.io_test_dir))
+        self.assertListEqual(list(range(5)), data['id'].to_ndarray().tolist())
+        self.assertListEqual([name.replace('""', '"') for name in names],
+                             data['name'].to_ndarray().tolist())
+
+    @unittest.skipUnless(ArkoudaTest.full_stack_mode, 'starts a second arkouda_server')
+    def testReadCsvChunkBoundaryInQuotedField(self):
+        # fields longer than the chunks, with newlines and delimiters, so that
+        # the chunk boundaries fall inside quoted fields
+        names = ['{},\n""{}""\n'.format(i, 'x\n,' * (10 + i)) for i in range(40)]
+        with open('{}/long.csv'.format(IOTest.io_test_dir), 'w') as f:
+            f.write('id,name,score\n')
+            f.write(''.join('{},"{}",{}\n'.format(i, name, i/2) for i, name in enumerate(names)))
+
+        info = get_server_info()
+        port = ArkoudaTest.port + 1
+        start_arkouda_server(numlocales=get_arkouda_numlocales(), port=port,
+                             server_args=['--csvChunkBytes=64'])
+        client = ak.client.Client()
+        try:
+            client.connect(server=ArkoudaTest.server, port=port)
+            with client.use():
+                data = ak.read_csv('{}/long.csv'.format(IOTest.io_test_dir),
+                                   dtypes={'id': ak.int64, 'name': 'str', 'score': ak.float64})
+                self.assertListEqual(list(range(40)), data['id'].to_ndarray().tolist())
+                self.assertListEqual([name.replace('""', '"') for name in names],
+                                     data['name'].to_ndarray().tolist())
+                self.assertListEqual([i/2 for i in range(40)], data['score'].to_ndarray().tolist())
+        finally:
+            if client.connected:
+                client.disconnect()
+            stop_arkouda_server()
+            set_server_info(info)
+
     def tearDown(self):
         super(IOTest, self).tearDown()
         for f in glob.glob('{}/*'.format(IOTest.io_test_dir)):
@@ -574,3 +574,54 @@ class PdarrayCreationTest(ArkoudaTest):
         
         ones.fill(np.float64(2))  
         self.assertTrue((np.float64(2) == ones.to_ndarray()).all())  
+
+    def test_array_from_chunks(self):
+        pda = ak.array_from_chunks(np.arange(i, i+10) for i in range(0, 100, 10))
+        self.assertIsInstance(pda, ak.pdarray)
+        self.assertTrue((np.arange(100) == pda.to_ndarray()).all())
+
+        strings = ak.array_from_chunks([['one', 'two'], ['three'], ['four', 'five']])
+        self.assertIsInstance(strings, ak.Strings)
+        self.assertListEqual(['one', 'two', 'three', 'four', 'five'],
+                             strings.to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            ak.array_from_chunks(iter([]))
+
+        # A chunk of another dtype is rejected before the next chunk is read
+        consumed = []
+        def chunks():
+            for c in (np.arange(3), np.arange(3, dtype=np.float64), ['a'], np.arange(3)):
+                consumed.append(c)
+                yield c
+        with self.assertRaises(ValueError):
+            ak.array_from_chunks(chunks())
+        self.assertEqual(2, len(consumed))
+        with self.assertRaises(ValueError):
+            ak.array_from_chunks([np.arange(3), ['a', 'b']])
+
+    def test_iter_chunks(self):
+        pda = ak.arange(0, 100, 1)
+        chunks = list(pda.iter_chunks(80))
+        self.assertEqual(10, len(chunks))
+        self.assertTrue((np.arange(100) == np.concatenate(chunks)).all())
+        # A chunk always holds at least one element
+        self.assertEqual(100, len(list(pda.iter_chunks(1))))
+
+        strings = ak.array(['string {}'.format(i) for i in range(0, 50)])
+        chunks = list(strings.iter_chunks(64))
+        self.assertGreater(len(chunks), 1)
+        self.assertListEqual(strings.to_ndarray().tolist(),
+                             np.concatenate(chunks).tolist())
+
+        # Chunks of skewed strings stay within chunk_bytes, counting the
+        # null terminator and offset of each string
+        skewed = ['x' * 500 if i % 10 == 0 else 'y' for i in range(100)]
+        chunks = list(ak.array(skewed).iter_chunks(600))
+        self.assertListEqual(skewed, np.concatenate(chunks).tolist())
+        for chunk in chunks:
+            if len(chunk) > 1:
+                self.assertLessEqual(sum(len(x) + 1 + 8 for x in chunk), 600)
+
+        with self.assertRaises(ValueError):
+            next(pda.iter_chunks(0))
@@ -0,0 +1,76 @@
+import csv, json, os, tempfile, unittest
+from base_test import ArkoudaTest
+from context import arkouda as ak
+from arkouda.profiler import Profile, ProfileRecord
+
+'''
+Tests the recording, aggregation and export of client request profiles
+'''
+class ProfileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = Profile()
+        self.profile.records = [
+            ProfileRecord(cmd='binopvs', request_bytes=100, reply_bytes=50, roundtrip=0.5,
+                          client_time=0.1, api='arkouda.pdarrayclass.__add__', callsite='a.py:1 (f)'),
+            ProfileRecord(cmd='binopvs', request_bytes=110, reply_bytes=50, roundtrip=1.5,
+                          client_time=0.1, api='arkouda.pdarrayclass.__mul__', callsite='a.py:2 (f)'),
+            ProfileRecord(cmd='reduction', request_bytes=90, reply_bytes=20, roundtrip=1.0,
+                          client_time=0.2, api='arkouda.pdarrayclass.sum', callsite='a.py:2 (f)')]
+
+    def test_summary(self):
+        rows = self.profile.summary()
+        self.assertListEqual(['binopvs', 'reduction'], [row['cmd'] for row in rows])
+        self.assertEqual(2, rows[0]['count'])
+        self.assertEqual(210, rows[0]['request_bytes'])
+        self.assertAlmostEqual(2.0, rows[0]['roundtrip'])
+        self.assertAlmostEqual(1.0, rows[0]['mean_roundtrip'])
+
+        rows = self.profile.summary(by='callsite')
+        self.assertListEqual(['a.py:2 (f)', 'a.py:1 (f)'], [row['callsite'] for row in rows])
+        with self.assertRaises(ValueError):
+            self.profile.summary(by='user')
+
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'profile.json')
+            self.profile.to_json(path)
+            with open(path) as f:
+                records = json.load(f)
+            self.assertEqual(3, len(records))
+            self.assertEqual('reduction', records[2]['cmd'])
+
+            path = os.path.join(tmp_dir, 'profile.csv')
+            self.profile.to_csv(path, by='api')
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual('arkouda.pdarrayclass.__mul__', rows[0]['api'])
+            self.assertEqual('110', rows[0]['request_bytes'])
+
+class ProfilerTest(ArkoudaTest):
+
+    def test_profile(self):
+        '''
+        Tests that ak.profile() records each request sent within its block
+
+        :return: None
+        :raise: AssertionError if a request is not recorded or is recorded
+                with incorrect values
+        '''
+        a = ak.arange(0, 10, 1)
+        with ak.profile() as p:
+            (a + 1).sum()
+        self.assertListEqual(['binopvs', 'reduction'], [r.cmd for r in p.records])
+        self.assertEqual('arkouda.pdarrayclass.sum', p.records[1].api)
+        self.assertTrue(p.records[1].callsite.startswith(__file__))
+        self.assertTrue(all(r.roundtrip > 0 and r.reply_bytes > 0 for r in p.records))
+
+        a.sum()
+        self.assertEqual(2, len(p.records))
+
+        # a.sum() is answered from the reduction cache, so a.max() is sent
+        enabled = ak.enable_profiling()
+        a.max()
+        self.assertIs(enabled, ak.disable_profiling())
+        self.assertEqual(1, len(enabled.records))
+        self.assertIsNone(ak.disable_profiling())
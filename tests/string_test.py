@@ -520,6 +520,15 @@ class StringTest(ArkoudaTest):
         lengths = s1.get_lengths()
         self.assertTrue((ak.array([3,3,5,4,4]) == lengths).all())
 
+    def test_utf8_round_trip(self):
+        words = ['plain', '', 'caf\u00e9', '\u65e5\u672c\u8a9e', 'emoji \U0001f600']
+        strings = ak.array(words)
+        self.assertListEqual(words, strings.to_ndarray().tolist())
+        # Lengths and byte counts are in UTF-8 bytes, not characters
+        self.assertListEqual([len(w.encode()) for w in words],
+                             strings.get_lengths().to_ndarray().tolist())
+        self.assertEqual(sum(len(w.encode()) + 1 for w in words), strings.nbytes)
+
     def test_concatenate(self):
         s1 = self._get_strings('string',51)
         s2 = self._get_strings('string-two', 51)
@@ -0,0 +1,50 @@
+import unittest
+from context import arkouda as ak
+from arkouda.typecheck import typechecked
+from arkouda.dtypes import check_np_dtype
+
+class TypecheckTest(unittest.TestCase):
+
+    def tearDown(self):
+        ak.set_typecheck(True)
+
+    def testSetTypecheck(self):
+        self.assertTrue(ak.get_typecheck())
+        with self.assertRaises(TypeError):
+            check_np_dtype('int64')
+
+        ak.set_typecheck(False)
+        self.assertFalse(ak.get_typecheck())
+        # The function body is reached, which also accepts a dtype name
+        self.assertIsNone(check_np_dtype('int64'))
+
+        ak.set_typecheck(True)
+        with self.assertRaises(TypeError):
+            check_np_dtype('int64')
+
+    def testTypecheckedMethod(self):
+        class Counter:
+            def __init__(self) -> None:
+                self.count = 0
+
+            @typechecked
+            def add(self, n : int) -> int:
+                self.count += n
+                return self.count
+
+            @typechecked()
+            def total(self) -> int:
+                return self.count
+
+        c = Counter()
+        self.assertEqual(3, c.add(3))
+        self.assertEqual('add', Counter.add.__name__)
+        with self.assertRaises(TypeError):
+            c.add(0.5)
+
+        ak.set_typecheck(False)
+        self.assertEqual(3.5, c.add(0.5))
+        ak.set_typecheck(True)
+        # The float count now fails the check of the return value
+        with self.assertRaises(TypeError):
+            c.total()
@@ -159,7 +159,8 @@ def kill_server(server_process):
             logging.warn('Attempting dirty server shutdown')
             server_process.kill()
 
-def start_arkouda_server(numlocales, verbose=False, log=False, port=5555, host=None):
+def start_arkouda_server(numlocales, verbose=False, log=False, port=5555, host=None,
+                         server_args=None):
     """
     Start the Arkouda server and wait for it to start running. Connection info
     is written to `get_arkouda_server_info_file()`.
@@ -169,6 +170,7 @@ def start_arkouda_server(numlocales, verbose=False, log=False, port=5555, host=N
     :param bool log: indicates whether to start arkouda_server with logging enabled
     :param int port: the desired arkouda_server port, defaults to 5555
     :param str host: the desired arkouda_server host, defaults to None
+    :param list server_args: additional arkouda_server arguments, defaults to None
     :return: tuple containing server host, port, and process
     :rtype: ServerInfo(host, port, process)
     """
@@ -180,6 +182,8 @@ def start_arkouda_server(numlocales, verbose=False, log=False, port=5555, host=N
            '--trace={}'.format('true' if log else 'false'),
            '--serverConnectionInfo={}'.format(connection_file),
            '-nl {}'.format(numlocales), '--ServerPort={}'.format(port)]
+    if server_args:
+        cmd += server_args
 
     logging.info('Starting "{}"'.format(cmd))
     process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)